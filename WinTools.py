@@ -1,38 +1,74 @@
-import os
+from wintools_core.startup import startup_profile # Primeiro import: marca a origem do relógio de inicialização
+
 import sys
+if __name__ == "__main__":
+    from wintools_core.cli import is_cli_invocation
+    if is_cli_invocation(sys.argv[1:]):
+        # Modo linha de comando (port, localip, externalip, run): JSON/NDJSON sem carregar o Qt
+        from wintools_core.cli import main as cli_main
+        sys.exit(cli_main())
+
+startup_profile.begin("imports")
+
+import os
 import subprocess
-import re
-import requests
-import qrcode
-import uuid
-import json
-import webbrowser
 import socket 
+import threading
+import time
 from datetime import datetime
 from PySide6.QtCore import Qt, QSize, QUrl
 
-# Importa PIL/Image para o QR Code (necessário para a função generate_qr_code)
-try:
-    from PIL import Image
-except ImportError:
-    # Atenção: Se essa mensagem aparecer, instale o Pillow: pip install Pillow
-    print("Atenção: A biblioteca 'Pillow' (PIL) não está instalada. O QR Code não funcionará.")
-    class DummyImage: pass
-    Image = DummyImage
+# qrcode, requests e os módulos de cada ferramenta (wintools_core.*) são importados
+# no primeiro uso, dentro das funções: a janela abre sem pagar por recursos pouco usados.
 
 # --- 🚨 DEPENDÊNCIA QT: PY SIDE 6 ---
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLineEdit, QListWidget, QListWidgetItem, QDialog,
-    QLabel, QMessageBox, QInputDialog, QStyleFactory, QTextEdit, QSizePolicy, QFileDialog
+    QPushButton, QLineEdit, QListWidget, QListWidgetItem, QListView, QDialog,
+    QLabel, QMessageBox, QInputDialog, QStyleFactory, QPlainTextEdit, QSizePolicy, QFileDialog
+)
+from PySide6.QtCore import Qt, QSize, QObject, QTimer, Signal, QAbstractListModel, QModelIndex, QFileSystemWatcher
+from PySide6.QtGui import QIcon, QPalette, QColor, QFont, QDesktopServices, QTextCursor, QShortcut, QKeySequence
+
+from wintools_core.outputstore import OutputStore, RawCapture, split_lines, tail_lines
+from wintools_core.runner import CommandRunner
+from wintools_core.resultcache import default_cache
+from wintools_core.telemetry import (
+    default_telemetry, ExecutionRecord, command_key, runner_status, KIND_COMMAND, KIND_TERMINAL, KIND_PORT, KIND_HTTP, KIND_CACHE, STATUS_OK, STATUS_ERROR, STATUS_TIMEOUT
 )
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QIcon, QPalette, QColor, QFont, QDesktopServices
+from wintools_core.commands import CommandRegistry, OUTPUT_TERMINAL, OUTPUT_MESSAGE, OUTPUT_DIALOG, OUTPUT_EXTERNAL, OUTPUT_SUBMENU
+
+startup_profile.end("imports")
 
 # --- VARIÁVEIS DE VERSÃO E DIRETÓRIO ---
 APP_VERSION = "2.0.14" 
+default_telemetry.version = APP_VERSION # Vai em cada registro do trace (comparar versões entre máquinas)
 THIRD_PARTY_DIR = "FerramentasTerceiros"
+THIRD_PARTY_MAX_DEPTH = 4 # Níveis de subpastas catalogados em FerramentasTerceiros
 ICON_PATH = "w_tools.ico" # Arquivo do ícone deve estar na mesma pasta do script
+OUTPUT_SCROLLBACK_LINES = 50000 # Linhas mantidas na tela do OutputDialog (a saída completa fica em disco)
+OUTPUT_FLUSH_LINES = 2000 # Linhas inseridas por ciclo do timer; com o scrollback cheio, cada 1000 custa ~15 ms
+
+# Categorias (emojis) do menu principal
+CATEGORY_NET = "🌐" ; CATEGORY_SYS = "⚙️" ; CATEGORY_DISK = "💾" ; CATEGORY_ADMIN = "🚨" ; CATEGORY_UTIL = "💡"
+CATEGORY_THIRD_PARTY = "📦" ; CATEGORY_INFO = "ℹ️" ; CATEGORY_CONFIG = "🎨"
+
+# Comandos Rápidos (Win + R): (comando, descrição)
+QUICK_COMMANDS = [
+    ("cmd", "Prompt de Comando"), ("powershell", "Windows PowerShell"),
+    ("regedit", "Editor de Registro"), ("msconfig", "Configurações do Sistema"),
+    ("taskmgr", "Gerenciador de Tarefas"), ("explorer", "Explorador de Arquivos"),
+    ("dxdiag", "Diagnóstico do DirectX"), ("msinfo32", "Informações do Sistema"),
+    ("eventvwr.msc", "Visualizador de Eventos"), ("perfmon.msc", "Monitor de Desempenho"),
+    ("services.msc", "Serviços do Windows"), ("compmgmt.msc", "Gerenciamento do Computador"),
+    ("devmgmt.msc", "Gerenciador de Dispositivos"), ("diskmgmt.msc", "Gerenciamento de Disco"),
+    ("appwiz.cpl", "Programas e Recursos"), ("cleanmgr", "Limpeza de Disco"),
+    ("secpol.msc", "Diretivas de Segurança Local"), ("gpedit.msc", "Editor de Política de Grupo Local"),
+    ("control", "Painel de Controle clássico"), ("ncpa.cpl", "Conexões de Rede"),
+    ("powercfg.cpl", "Opções de Energia"), ("sysdm.cpl", "Propriedades do Sistema"),
+    ("main.cpl", "Propriedades do Mouse"), ("osk", "Teclado Virtual"),
+    ("winver", "Versão do Windows"),
+]
 
 # --- Funções de Utilitários ---
 
@@ -40,130 +76,110 @@ def run_command(command, blocking=False):
     """
     Executa um comando no terminal (CMD /K) em um novo processo não-bloqueante.
     Ajustado para usar 'start' diretamente com o comando.
+    (A telemetria mede só o disparo: o terminal continua aberto por conta do usuário.)
     """
     if command:
-        try:
-            # Comando: start "Título" cmd /K "Comando"
-            full_command = f'start "WinTools Command" cmd /K "{command}"'
-            subprocess.Popen(full_command, shell=True) 
-        except Exception as e:
-            QMessageBox.critical(None, "Erro de Execução", f"Não foi possível iniciar o comando '{command}'.\nErro: {e}")
+        with default_telemetry.span(KIND_TERMINAL, command) as trace:
+            try:
+                # Comando: start "Título" cmd /K "Comando"
+                full_command = f'start "WinTools Command" cmd /K "{command}"'
+                subprocess.Popen(full_command, shell=True) 
+            except Exception as e:
+                trace.status = STATUS_ERROR
+                trace.detail = str(e)
+                QMessageBox.critical(None, "Erro de Execução", f"Não foi possível iniciar o comando '{command}'.\nErro: {e}")
 
 def check_port_with_socket(host, port, timeout=5):
-    """Verifica se uma porta TCP está aberta usando o módulo socket do Python."""
+    """Verifica se uma porta TCP está aberta usando o módulo socket do Python (IPv4 ou IPv6)."""
+    with default_telemetry.span(KIND_PORT, f"{host}:{port}", key=f"tcp:{port}") as trace:
+        result, trace.status, trace.detail = _check_port(host, port, timeout)
+        return result
+
+def _check_port(host, port, timeout):
+    """Retorna (texto do resultado, status da telemetria, detalhe)."""
+    from wintools_core.resolver import default_resolver, connect_any
     try:
-        ip = socket.gethostbyname(host)
+        # Resolvedor compartilhado: nomes já consultados vêm do cache, sem nova consulta DNS
+        addresses = default_resolver.resolve(host)
     except socket.gaierror:
-        return f"Erro: Não foi possível resolver o hostname/IP: {host}"
+        return f"Erro: Não foi possível resolver o hostname/IP: {host}", STATUS_ERROR, "DNS"
 
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    s.settimeout(timeout)
-    
+    s = None
+    ip = addresses[0][1]
     try:
-        s.connect((ip, int(port)))
+        # Endereços em ordem: um IPv6 sem rota (ou recusando) não esconde o IPv4 que responde
+        s, ip, error = connect_any(addresses, int(port), timeout)
+        if error is not None:
+            raise error
         return (f"Conexão BEM SUCEDIDA!\n"
                 f"Host: {host} ({ip})\n"
                 f"Porta: {port}\n"
                 f"Tempo Limite: {timeout}s\n\n"
-                f"A porta está aberta e acessível.")
+                f"A porta está aberta e acessível."), STATUS_OK, "aberta"
     except socket.timeout:
         return (f"Conexão FALHOU (Timeout).\n"
                 f"Host: {host} ({ip})\n"
                 f"Porta: {port}\n\n"
-                f"O host não respondeu dentro de {timeout} segundos (Firewall ou Serviço Inativo).")
+                f"O host não respondeu dentro de {timeout} segundos (Firewall ou Serviço Inativo)."), STATUS_TIMEOUT, "timeout"
     except ConnectionRefusedError:
         return (f"Conexão RECUSADA.\n"
                 f"Host: {host} ({ip})\n"
                 f"Porta: {port}\n\n"
-                f"O host está online, mas a porta está ativamente rejeitando a conexão (Serviço Inativo ou filtragem local).")
+                f"O host está online, mas a porta está ativamente rejeitando a conexão (Serviço Inativo ou filtragem local)."), STATUS_ERROR, "recusada"
     except Exception as e:
         return (f"Erro Inesperado na Conexão:\n"
                 f"Host: {host} ({ip})\n"
                 f"Porta: {port}\n\n"
-                f"Erro: {e}")
+                f"Erro: {e}"), STATUS_ERROR, str(e)
     finally:
-        s.close()
+        if s is not None:
+            s.close()
 
 
 def get_external_ip_info():
-    """Consulta o IP externo e dados de geolocalização usando ip-api.com."""
-    try:
-        response = requests.get('http://ip-api.com/json/?fields=status,message,country,countryCode,regionName,city,lat,lon,isp,query')
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('status') == 'success':
-                return (
-                    f"🌐 Endereço IP Externo: {data.get('query')}\n"
-                    f"🔗 Provedor (ISP): {data.get('isp')}\n"
-                    f"🗺️ Localização: {data.get('city')}, {data.get('regionName')}, {data.get('country')}"
-                )
-            else:
-                return f"Erro na API: {data.get('message', 'Status não foi sucesso')}"
-        else:
-            return f"Erro HTTP ao consultar IP externo: {response.status_code}"
-    except requests.exceptions.RequestException as e:
-        return f"Erro de Conexão ao consultar IP externo:\n{e}"
+    """Consulta o IP externo e dados de geolocalização (ip-api.com, com provedores de reserva e cache)."""
+    from wintools_core.external_ip import ExternalIpError, default_lookup, format_external_ip
+    with default_telemetry.span(KIND_HTTP, "ip externo") as trace:
+        try:
+            return format_external_ip(default_lookup.lookup())
+        except ExternalIpError as e:
+            trace.status = STATUS_ERROR
+            trace.detail = str(e)
+            return str(e)
 
-def get_local_ip_info():
-    """Extrai informações filtradas de IP (IPv4, Máscara, Gateway, MAC) de adaptadores conectados usando ipconfig /all."""
+def get_local_ip_info(token=None):
+    """
+    Extrai informações filtradas de IP (IPv4, Máscara, Gateway, MAC, DNS) de adaptadores conectados usando ipconfig /all.
+    Com `token` (CancellationToken de uma tarefa), cancelar encerra o ipconfig.
+    """
+    from wintools_core.ipconfig_parser import parse_ipconfig, format_adapter_summary
     try:
-        # Tenta a decodificação cp850 (padrão do CMD)
-        result = subprocess.run(['ipconfig', '/all'], capture_output=True, text=True, encoding='cp850', timeout=10)
-        output = result.stdout
+        with default_telemetry.span(KIND_COMMAND, "ipconfig /all") as trace:
+            process = subprocess.Popen(['ipconfig', '/all'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            unregister = token.on_cancel(process.kill) if token is not None else None
+            try:
+                stdout, stderr = process.communicate(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+            finally:
+                if unregister:
+                    unregister()
+            trace.exit_code = process.returncode
+            trace.stdout_bytes, trace.stderr_bytes = len(stdout), len(stderr)
+            trace.status = STATUS_OK if process.returncode == 0 else STATUS_ERROR
+        # Codificação detectada (UTF-8, BOM ou a página de código do console, ex.: cp850)
+        from wintools_core.codepage import decode_output
+        output = decode_output(stdout)
         
         if not output: return "Não foi possível obter a saída do ipconfig."
 
-        adapters = {}
-        current_adapter_name = "N/A"
-        
-        # Padrões mais robustos para o português
-        adapter_pattern = re.compile(r"Adaptador\s(?:Ethernet|de Rede Sem Fio|de Rede Local|de Loopback)[\w\s-]*:\s*([^\n]+)", re.IGNORECASE)
-        ipv4_pattern = re.compile(r"Endereço IPv4\. [\. ]+:\s*([0-9\.]+)", re.IGNORECASE)
-        mask_pattern = re.compile(r"Máscara de Sub-rede\. [\. ]+:\s*([0-9\.]+)", re.IGNORECASE)
-        gateway_pattern = re.compile(r"Gateway Padrão\. [\. ]+:\s*([0-9\.]+)", re.IGNORECASE)
-        mac_pattern = re.compile(r"Endereço Físico\. [\. ]+:\s*([0-9A-Fa-f-]{17})", re.IGNORECASE)
-
-        for line in output.splitlines():
-            adapter_match = adapter_pattern.search(line)
-            if adapter_match:
-                current_adapter_name = adapter_match.group(1).strip()
-                if current_adapter_name.startswith("Adaptador"):
-                    current_adapter_name = current_adapter_name.split(':')[-1].strip()
-                
-                adapters[current_adapter_name] = {'IPv4': 'N/D', 'Máscara': 'N/D', 'Gateway': 'N/D', 'MAC': 'N/D', 'Status': 'Desconectado'}
-                
-                if 'Mídia desconectada' not in line and 'Estado da mídia' in line:
-                    adapters[current_adapter_name]['Status'] = 'Conectado'
-                continue
-
-            if current_adapter_name in adapters:
-                if ipv4_match := ipv4_pattern.search(line):
-                    adapters[current_adapter_name]['IPv4'] = ipv4_match.group(1)
-                elif mask_match := mask_pattern.search(line):
-                    adapters[current_adapter_name]['Máscara'] = mask_match.group(1)
-                elif gateway_match := gateway_pattern.search(line):
-                    adapters[current_adapter_name]['Gateway'] = gateway_match.group(1)
-                elif mac_match := mac_pattern.search(line):
-                    adapters[current_adapter_name]['MAC'] = mac_match.group(1)
-
-        filtered_info = ["Informações de IP Local (Filtrado):"]
-        valid_adapter_found = False
-        for name, data in adapters.items():
-            # Filtra adaptadores não conectados, loopbacks e sem IP válido
-            if data['IPv4'] not in ('N/D', '127.0.0.1') and data['Status'] == 'Conectado': 
-                valid_adapter_found = True
-                filtered_info.append("="*40)
-                filtered_info.append(f"Adaptador: {name}")
-                filtered_info.append(f"  Status: {data['Status']}")
-                filtered_info.append(f"  IPv4: {data['IPv4']}")
-                filtered_info.append(f"  Máscara: {data['Máscara']}")
-                filtered_info.append(f"  Gateway: {data['Gateway']}")
-                filtered_info.append(f"  MAC: {data['MAC']}")
-
-        if valid_adapter_found:
-            return "\n".join(filtered_info)
+        # Parser independente de idioma (pt-BR, en-US, es) com padrões pré-compilados
+        summary = format_adapter_summary(parse_ipconfig(output))
+        if summary:
+            return summary
         else:
-            # Retorna a mensagem de erro que você já havia visto
             return "Não foi possível extrair as informações de IP local (IPv4, Máscara, Gateway, MAC)." 
 
     except Exception as e:
@@ -180,6 +196,7 @@ def generate_qr_code(parent):
 
     if choice == 1:
         data_to_encode, ok = QInputDialog.getText(parent, "QR Code - Texto/URL", "Digite o texto ou URL:")
+        description = data_to_encode if len(data_to_encode) <= 120 else data_to_encode[:117] + "..."
     elif choice == 2:
         ssid, ok1 = QInputDialog.getText(parent, "QR Code - Wi-Fi", "Nome da Rede (SSID):", QLineEdit.Normal)
         if not ok1: return
@@ -193,43 +210,84 @@ def generate_qr_code(parent):
         elif "WEP" in security: encryption = "WEP"
         else: encryption = "nopass"
 
-        data_to_encode = f"WIFI:T:{encryption};S:{ssid};P:{password};;"
+        from wintools_core.qrcodes import wifi_payload
+        data_to_encode = wifi_payload(ssid, password, encryption)
+        description = f"Wi-Fi: {ssid} ({encryption})"
 
     if not data_to_encode: return
 
     try:
-        qr = qrcode.QRCode(
-            version=1, error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=10, border=4,
-        )
-        qr.add_data(data_to_encode)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white").convert('RGB')
-        
-        # Cria um arquivo temporário para a imagem
-        temp_dir = os.path.join(os.environ.get('TEMP', os.environ.get('TMP', '/tmp')))
-        filename = f"qrcode_wintools_{uuid.uuid4().hex}.png"
-        temp_path = os.path.join(temp_dir, filename)
-        
-        img.save(temp_path)
-        
-        QMessageBox.information(
-            parent,
-            "QR Code Gerado com Sucesso",
-            f"O QR Code foi gerado e salvo como:\n{temp_path}\n\nA imagem será aberta no seu visualizador padrão."
-        )
-        # Usa QDesktopServices para abrir o arquivo de forma segura
-        QDesktopServices.openUrl(QUrl.fromLocalFile(temp_path))
-        
-    except Exception as e:
-        QMessageBox.critical(parent, "Erro ao Gerar QR Code", f"Ocorreu um erro: {e}")
+        import qrcode # Carregado só aqui; a imagem é desenhada pelo Qt, sem passar por arquivo
+    except ImportError:
+        QMessageBox.critical(parent, "Erro ao Gerar QR Code", "A biblioteca 'qrcode' não está instalada.\nInstale com: pip install qrcode")
+        return
+
+    from wintools_core.qrcode_dialog import QrCodeDialog
+    dialog = QrCodeDialog(parent, data_to_encode, description)
+    dialog.exec()
+
+def cleanup_temp_files():
+    """Ao sair: remove os PNGs de QR Code que versões anteriores deixavam na pasta temporária."""
+    from wintools_core.qrcodes import cleanup_temp_files as cleanup_qr_files
+    cleanup_qr_files()
+
+def shutdown_jobs():
+    """Ao sair: cancela as tarefas em segundo plano (encerrando seus processos), se alguma foi criada."""
+    jobs = sys.modules.get("wintools_core.jobs")
+    if jobs is not None:
+        jobs.default_jobs.shutdown()
 
 
 # ----------------------------------------------------------------------
 # --- DIÁLOGOS: ThirdPartyAppDialog e OutputDialog ---
 # ----------------------------------------------------------------------
 
+class AppListModel(QAbstractListModel):
+    """Lista das ferramentas: as linhas visíveis são posições em `apps`, atualizadas no lugar a cada busca."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.apps = []
+        self.visible = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def data(self, index, role=Qt.DisplayRole):
+        app = self.apps[self.visible[index.row()]]
+        if role == Qt.DisplayRole:
+            return app['name']
+        if role == Qt.UserRole or role == Qt.ToolTipRole:
+            return app['path']
+        return None
+
+    def set_apps(self, apps):
+        self.beginResetModel()
+        self.apps = list(apps)
+        self.visible = []
+        self.endResetModel()
+
+    def set_visible(self, positions):
+        """Troca o resultado reaproveitando as linhas existentes (só insere/remove a diferença no final)."""
+        old_count, new_count = len(self.visible), len(positions)
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            self.visible = self.visible[:new_count]
+            self.endRemoveRows()
+        elif new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self.visible = self.visible + positions[old_count:]
+            self.endInsertRows()
+        changed = [row for row in range(min(old_count, new_count)) if self.visible[row] != positions[row]]
+        self.visible = list(positions)
+        if changed:
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+
+
+class CatalogBridge(QObject):
+    """Avisa a interface quando a atualização do catálogo (em outra thread) termina."""
+    refreshed = Signal(bool, str)
+
+
 class ThirdPartyAppDialog(QDialog):
     """Diálogo para listar e executar ferramentas de terceiros com busca."""
     def __init__(self, parent=None):
@@ -240,10 +298,14 @@ class ThirdPartyAppDialog(QDialog):
         self.layout = QVBoxLayout(self)
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("🔎 Digite para buscar...")
-        self.search_input.textChanged.connect(self.filter_list)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start()) # Debounce: busca após uma pausa na digitação
         self.layout.addWidget(self.search_input)
-        self.app_list_widget = QListWidget()
-        self.app_list_widget.itemDoubleClicked.connect(self.execute_selected_app)
+        self.app_model = AppListModel(self)
+        self.app_list_widget = QListView()
+        self.app_list_widget.setModel(self.app_model)
+        self.app_list_widget.setUniformItemSizes(True)
+        self.app_list_widget.setEditTriggers(QListView.NoEditTriggers)
+        self.app_list_widget.doubleClicked.connect(self.execute_selected_app)
         self.layout.addWidget(self.app_list_widget)
         self.execute_button = QPushButton("Executar Selecionado")
         self.execute_button.clicked.connect(self.execute_selected_app)
@@ -252,53 +314,114 @@ class ThirdPartyAppDialog(QDialog):
         self.path_button.clicked.connect(self.open_third_party_folder)
         self.layout.addWidget(self.path_button)
         
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(120)
+        self.search_timer.timeout.connect(self.filter_list)
+
+        self.status_label = QLabel("")
+        self.layout.addWidget(self.status_label)
+        self.rescan_button = QPushButton("🔄 Reler Pasta Completa")
+        self.rescan_button.clicked.connect(lambda: self.refresh_catalog(force=True))
+        self.layout.addWidget(self.rescan_button)
+
+        from wintools_core.appcatalog import get_catalog
         self.all_apps = [] 
+        self.search_index = None
+        self.catalog = get_catalog(THIRD_PARTY_DIR, THIRD_PARTY_MAX_DEPTH)
+        self.refreshing = False
+        self.pending_dirs = set()
+        self.catalog_bridge = CatalogBridge(self)
+        self.catalog_bridge.refreshed.connect(self.catalog_refreshed)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.directory_changed)
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(500)
+        self.rescan_timer.timeout.connect(self.rescan_changed_dirs)
         self.load_apps()
         
     def load_apps(self):
-        """Carrega executáveis da pasta de terceiros."""
-        self.all_apps = []
-        self.app_list_widget.clear()
-        EXECUTABLE_EXTENSIONS = ('.exe', '.com', '.bat', '.cmd', '.vbs', '.msi')
+        """Mostra as ferramentas do catálogo na hora e atualiza em segundo plano só as pastas que mudaram."""
+        if not os.path.exists(THIRD_PARTY_DIR):
+            QMessageBox.critical(self, "Erro", f"A pasta '{THIRD_PARTY_DIR}' não existe.")
+            return
 
-        try:
-            if not os.path.exists(THIRD_PARTY_DIR):
-                QMessageBox.critical(self, "Erro", f"A pasta '{THIRD_PARTY_DIR}' não existe.")
-                return
+        if not self.catalog.loaded:
+            self.catalog.load()
+        self.show_catalog_apps()
+        self.refresh_catalog()
 
-            for item in os.listdir(THIRD_PARTY_DIR):
-                full_path = os.path.join(THIRD_PARTY_DIR, item)
-                
-                if os.path.isfile(full_path) and item.lower().endswith(EXECUTABLE_EXTENSIONS):
-                    self.all_apps.append({'name': item, 'path': full_path})
-                
-                elif os.path.isdir(full_path):
-                    for sub_item in os.listdir(full_path):
-                        if sub_item.lower().endswith(EXECUTABLE_EXTENSIONS):
-                            app_name = f"{item} ({sub_item})"
-                            app_path = os.path.join(full_path, sub_item)
-                            self.all_apps.append({'name': app_name, 'path': app_path})
-                            break
-                            
-        except Exception as e:
-            QMessageBox.critical(self, "Erro ao Listar", f"Erro ao ler a pasta de ferramentas: {e}")
+    def show_catalog_apps(self):
+        """Recarrega a lista e o índice de busca a partir do catálogo, mantendo a busca atual."""
+        from wintools_core.appsearch import AppSearchIndex
+        self.all_apps = self.catalog.apps()
+        self.search_index = AppSearchIndex(app['name'] for app in self.all_apps)
+        self.app_model.set_apps(self.all_apps)
+        self.filter_list()
+        directories = self.catalog.directories()
+        watched = set(self.watcher.directories())
+        stale = [d for d in watched if d not in directories]
+        if stale: self.watcher.removePaths(stale)
+        new = [d for d in directories if d not in watched]
+        if new: self.watcher.addPaths(new)
+
+    def refresh_catalog(self, force=False, start=None):
+        """Compara a pasta com o catálogo numa thread; `start` limita a atualização a algumas subpastas."""
+        if self.refreshing:
+            self.pending_dirs.update(start or [""])
             return
-            
-        if not self.all_apps:
+        self.refreshing = True
+        self.status_label.setText(f"{len(self.all_apps)} ferramenta(s) | 🔄 Verificando alterações...")
+
+        def work():
+            try:
+                changed = self.catalog.refresh(force=force, start=start)
+                if changed:
+                    self.catalog.save()
+                error = ""
+            except Exception as e:
+                changed, error = False, str(e)
+            try:
+                self.catalog_bridge.refreshed.emit(changed, error)
+            except RuntimeError:
+                pass # Diálogo já destruído
+
+        threading.Thread(target=work, daemon=True, name="wintools-catalog-refresh").start()
+
+    def catalog_refreshed(self, changed, error):
+        self.refreshing = False
+        if error:
+            QMessageBox.critical(self, "Erro ao Listar", f"Erro ao ler a pasta de ferramentas: {error}")
+        elif changed:
+            self.show_catalog_apps()
+        self.status_label.setText(f"{len(self.all_apps)} ferramenta(s) em '{THIRD_PARTY_DIR}' (até {THIRD_PARTY_MAX_DEPTH} subpastas)")
+        if not error and not self.all_apps and not self.pending_dirs:
             QMessageBox.information(self, "Info", "Nenhum executável encontrado na pasta.")
-            
-        self.filter_list()
-        
+        if self.pending_dirs:
+            self.rescan_timer.start()
+
+    def directory_changed(self, path):
+        """Observador de arquivos: agenda a releitura só da pasta alterada (agrupando eventos próximos)."""
+        rel = os.path.relpath(path, THIRD_PARTY_DIR)
+        self.pending_dirs.add("" if rel == os.curdir else rel)
+        self.rescan_timer.start()
+
+    def rescan_changed_dirs(self):
+        if self.refreshing:
+            return # Reagendado ao fim da atualização em curso
+        dirs, self.pending_dirs = self.pending_dirs, set()
+        self.refresh_catalog(force=True, start=dirs)
+
     def filter_list(self):
-        """Filtra a lista de aplicativos com base no texto de busca."""
-        search_text = self.search_input.text().lower()
-        self.app_list_widget.clear()
-        
-        for app in self.all_apps:
-            if search_text in app['name'].lower():
-                item = QListWidgetItem(app['name'])
-                item.setData(Qt.UserRole, app['path']) 
-                self.app_list_widget.addItem(item)
+        """Filtra e ordena a lista por relevância (índice normalizado + busca aproximada)."""
+        self.search_timer.stop()
+        if self.search_index is None:
+            return
+        self.app_model.set_visible(self.search_index.search(self.search_input.text()))
+        if self.app_model.rowCount():
+            # O primeiro resultado fica selecionado: Enter executa a melhor correspondência
+            self.app_list_widget.setCurrentIndex(self.app_model.index(0))
                 
     def open_third_party_folder(self):
         """Abre a pasta de ferramentas de terceiros no Explorador de Arquivos."""
@@ -310,12 +433,12 @@ class ThirdPartyAppDialog(QDialog):
             
     def execute_selected_app(self):
         """Executa o aplicativo selecionado, com tratamento especial para speedtest.exe."""
-        selected_item = self.app_list_widget.currentItem()
-        if not selected_item:
+        selected_index = self.app_list_widget.currentIndex()
+        if not selected_index.isValid():
             QMessageBox.warning(self, "Aviso", "Selecione uma ferramenta para executar.")
             return
 
-        full_app_path = selected_item.data(Qt.UserRole)
+        full_app_path = selected_index.data(Qt.UserRole)
         app_dir_absolute = os.path.dirname(full_app_path)
         app_name_lower = os.path.basename(full_app_path).lower()
 
@@ -350,40 +473,327 @@ class ThirdPartyAppDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Erro de Execução", f"Não foi possível iniciar a ferramenta.\nErro: {e}")
 
+class CommandRunnerBridge(QObject):
+    """Repassa os callbacks do CommandRunner (threads de leitura) para a thread da interface."""
+    output_received = Signal(str, object) # object: o texto passa sem cópia para QString
+    finished = Signal(object)
+
+    def attach(self, runner):
+        runner.on_output = self.output_received.emit
+        runner.on_finished = self.finished.emit
+        return runner
+
+
 class OutputDialog(QDialog):
-    """Diálogo para exibir a saída de comandos de forma formatada."""
-    def __init__(self, parent, title, command, output):
+    """
+    Diálogo para exibir a saída de comandos de forma formatada (completa ou em tempo real).
+    A saída completa fica no OutputStore (disco); a tela mantém só as últimas `scrollback_lines` linhas.
+    Com `runner_factory`, start() executa o comando (ou mostra o resultado em cache, se houver) e o
+    botão "Atualizar" executa de novo ignorando o cache.
+    Cada resultado exibido vai para o histórico de saídas (`keep_history=False` para reexibir um antigo).
+    Execuções ao vivo também guardam os bytes originais (RawCapture), que podem ser salvos sem conversão.
+    Com `submit_job(título, runner, prioridade)`, cada execução vira uma tarefa em segundo plano e pode
+    esperar na fila da sua categoria antes de iniciar (ver wintools_core.jobs); a revalidação de um
+    resultado vencido do cache também, com prioridade baixa.
+    """
+    def __init__(self, parent, title, command, output, runner=None, scrollback_lines=OUTPUT_SCROLLBACK_LINES,
+                 runner_factory=None, cache=None, keep_history=True, submit_job=None):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.setMinimumSize(700, 550)
         self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
-        
-        self.output_content = output
+
         self.command_executed = command
-        
+        self.runner = runner
+        self.runner_factory = runner_factory
+        self.cache = cache
+        self.submit_job = submit_job
+        self.job = None
+        self.scrollback_lines = scrollback_lines
+        self.keep_history = keep_history
+        self.stderr_header_shown = False
+        self.store = OutputStore()
+        self.raw = RawCapture()
+        self.pending_chunks = []
+        self.finished.connect(self.close_store)
+
         layout = QVBoxLayout(self)
-        
+
         command_label = QLabel(f"Comando Executado: **{command}**")
         command_label.setStyleSheet("font-weight: bold; padding-bottom: 5px;")
         layout.addWidget(command_label)
-        
-        self.output_text = QTextEdit()
+
+        # QPlainTextEdit só faz o layout dos blocos visíveis e descarta os mais antigos acima do limite
+        self.output_text = QPlainTextEdit()
         self.output_text.setReadOnly(True)
-        self.output_text.setFontFamily("Consolas") 
-        self.output_text.setText(output)
+        self.output_text.setFont(QFont("Consolas"))
+        self.output_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.output_text.setMaximumBlockCount(scrollback_lines)
         layout.addWidget(self.output_text)
-        
+
+        self.truncated_label = QLabel(
+            f"ℹ️ Exibindo apenas as últimas {scrollback_lines} linhas. "
+            "O arquivo salvo contém a saída completa."
+        )
+        self.truncated_label.setVisible(False)
+        layout.addWidget(self.truncated_label)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
         button_layout = QHBoxLayout()
         self.save_button = QPushButton("💾 Salvar Output (TXT)")
         self.save_button.clicked.connect(self.save_output)
         button_layout.addWidget(self.save_button)
+        self.save_raw_button = QPushButton("💾 Bytes Originais")
+        self.save_raw_button.setToolTip("Salva a saída exatamente como o comando a escreveu, sem conversão de codificação.")
+        self.save_raw_button.clicked.connect(self.save_raw_output)
+        self.save_raw_button.setEnabled(False)
+        button_layout.addWidget(self.save_raw_button)
+        self.refresh_button = QPushButton("🔄 Atualizar")
+        self.refresh_button.setToolTip("Executa o comando novamente, ignorando o resultado em cache.")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.refresh_button.setVisible(runner_factory is not None)
+        button_layout.addWidget(self.refresh_button)
+        self.cancel_button = QPushButton("⏹️ Cancelar")
+        self.cancel_button.clicked.connect(self.cancel_command)
+        button_layout.addWidget(self.cancel_button)
         close_button = QPushButton("Fechar")
         close_button.clicked.connect(self.close)
         button_layout.addWidget(close_button)
         layout.addLayout(button_layout)
-        
+
+        # Os pedaços recebidos são agrupados e exibidos no máximo a cada 100 ms
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(100)
+        self.flush_timer.timeout.connect(self.flush_tick)
+
+        live = runner is not None or runner_factory is not None
+        if output:
+            self.append_output("stdout", output)
+            if not live:
+                self.add_to_history(None, STATUS_OK, None)
+
+        self.status_label.setVisible(live)
+        self.cancel_button.setVisible(live)
+        # Modo em tempo real: a saída chega em pedaços enquanto o comando roda
+        self.bridge = CommandRunnerBridge()
+        self.bridge.output_received.connect(self.append_output)
+        self.bridge.finished.connect(self.command_finished)
+        self.revalidation_bridge = CommandRunnerBridge()
+        self.revalidation_bridge.finished.connect(self.revalidated)
+        self.elapsed_timer = QTimer(self)
+        self.elapsed_timer.timeout.connect(self.update_elapsed)
+        if runner is not None:
+            self.bridge.attach(runner) # Quem criou o diálogo chama runner.start()
+            runner.on_raw = self.raw.append
+            self.elapsed_timer.start(250)
+            self.update_elapsed()
+
+    def start(self):
+        """Mostra o resultado em cache (revalidando em segundo plano se vencido) ou executa o comando."""
+        lookup = self.cache.lookup(self.command_executed) if self.cache is not None else None
+        if lookup is None:
+            self.start_runner(self.runner_factory())
+            return
+        entry, fresh = lookup
+        default_telemetry.record(ExecutionRecord(KIND_CACHE, self.command_executed, command_key(self.command_executed),
+                                                 time.time(), status=STATUS_OK, exit_code=entry.returncode,
+                                                 stdout_bytes=entry.size, detail="válido" if fresh else "vencido"))
+        if fresh:
+            self.show_cached(entry, "📦 Resultado em cache")
+        else:
+            self.show_cached(entry, "📦 Resultado em cache (vencido) | 🔄 Revalidando em segundo plano...")
+            submit = None
+            if self.submit_job is not None:
+                from wintools_core.jobs import PRIORITY_LOW
+                submit = lambda runner: self.submit_job(f"{self.command_executed} (revalidação do cache)", runner, PRIORITY_LOW)
+            self.cache.revalidate(self.command_executed, self.runner_factory,
+                                  on_done=self.revalidation_bridge.finished.emit, submit=submit)
+
+    def start_runner(self, runner):
+        """Executa `runner` exibindo a saída em tempo real (e guardando-a no cache, se o comando for cacheável)."""
+        self.runner = runner
+        self.bridge.attach(runner)
+        runner.on_raw = self.raw.append
+        if self.cache is not None:
+            self.cache.capture(self.command_executed, runner)
+        self.cancel_button.setText("⏹️ Cancelar")
+        self.cancel_button.setEnabled(True)
+        self.refresh_button.setEnabled(False)
+        self.elapsed_timer.start(250)
+        if self.submit_job is None:
+            runner.start()
+        else:
+            self.job = self.submit_job(self.command_executed, runner)
+        self.update_elapsed()
+
+    def refresh(self):
+        """Executa de novo, ignorando o cache (o novo resultado substitui a entrada)."""
+        if self.runner is not None and self.runner.finished_at is None:
+            return
+        self.reset_output()
+        self.start_runner(self.runner_factory())
+
+    def show_cached(self, entry, note):
+        """Exibe um resultado do cache, com a idade e o tempo que a execução original levou."""
+        self.reset_output()
+        self.append_output("stdout", entry.stdout)
+        if entry.stderr:
+            self.append_output("stderr", entry.stderr)
+        self.flush_pending_output()
+        stored_at = datetime.fromtimestamp(entry.stored_at).strftime('%H:%M:%S')
+        self.status_label.setText(f"{note} | Obtido às {stored_at} (há {entry.age / 60:.0f} min) | "
+                                  f"Execução original: {entry.duration_s:.1f}s")
+        self.cancel_button.setEnabled(False)
+
+    def revalidated(self, entry):
+        """Fim da revalidação em segundo plano: troca a exibição pelo resultado novo."""
+        if self.runner is not None and self.runner.finished_at is None:
+            return # O usuário pediu "Atualizar" enquanto isso; a execução ao vivo prevalece
+        if entry is None:
+            self.status_label.setText(self.status_label.text().replace(
+                "🔄 Revalidando em segundo plano...", "⚠️ A revalidação falhou; exibindo o resultado anterior"))
+        else:
+            self.show_cached(entry, "✅ Atualizado em segundo plano")
+            self.add_to_history(entry.returncode, STATUS_OK, entry.duration_s)
+
+    def reset_output(self):
+        """Descarta a saída exibida (nova execução ou troca pelo resultado do cache)."""
+        self.store.close()
+        self.store = OutputStore()
+        self.raw.close()
+        self.raw = RawCapture()
+        self.save_raw_button.setEnabled(False)
+        self.pending_chunks.clear()
+        self.stderr_header_shown = False
+        self.output_text.clear()
+        self.truncated_label.setVisible(False)
+
+    def close_store(self):
+        self.store.close()
+        self.raw.close()
+
+    def add_to_history(self, exit_code, status, duration_s):
+        """Grava a saída atual no histórico (a compressão e a indexação rodam em segundo plano)."""
+        from wintools_core.sensitive import reveals_secrets
+        if not self.keep_history or self.store.closed or reveals_secrets(self.command_executed):
+            return # Senhas (ex.: netsh ... key=clear) não vão para o disco
+        from wintools_core.history import default_history
+        default_history.add_async(self.command_executed, self.store.iter_chunks(),
+                                  exit_code=exit_code, status=status, duration_s=duration_s)
+
+    def set_note(self, text):
+        """Linha de status fixa (ex.: origem de um resultado reaberto do histórico)."""
+        self.status_label.setVisible(True)
+        self.status_label.setText(text)
+
+    @property
+    def output_content(self):
+        """Saída completa como texto (lida do armazenamento; evite em saídas muito grandes)."""
+        return self.store.getvalue()
+
+    def append_output(self, stream, text):
+        """Acrescenta um pedaço de saída; a exibição é feita em lote por flush_pending_output."""
+        if self.store.closed:
+            return
+        if stream == "stderr" and not self.stderr_header_shown:
+            self.stderr_header_shown = True
+            text = "\n\n--- ERRO PADRÃO (STDERR) ---\n" + text
+        self.store.append(text)
+        self.pending_chunks.append(text)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_tick(self):
+        """Ciclo do timer: exibe no máximo OUTPUT_FLUSH_LINES linhas e agenda o restante."""
+        self.flush_pending_output(OUTPUT_FLUSH_LINES)
+        if self.pending_chunks:
+            self.flush_timer.start()
+
+    def flush_pending_output(self, max_lines=None):
+        """
+        Exibe os pedaços pendentes (até `max_lines` linhas; o restante continua pendente).
+        Se o pendente sozinho já enche o scrollback, o documento é trocado pelas últimas linhas:
+        inserir e depois descartar milhares de blocos do topo custaria muito mais.
+        """
+        if not self.pending_chunks:
+            return
+        text = "".join(self.pending_chunks)
+        self.pending_chunks.clear()
+
+        scrollbar = self.output_text.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        if text.count('\n') >= self.scrollback_lines:
+            self.output_text.setPlainText(tail_lines(text, self.scrollback_lines))
+        else:
+            if max_lines is not None:
+                text, rest = split_lines(text, max_lines)
+                if rest:
+                    self.pending_chunks.append(rest)
+            cursor = self.output_text.textCursor()
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(text)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+        if self.store.line_count >= self.scrollback_lines:
+            self.truncated_label.setVisible(True)
+
+    def update_elapsed(self):
+        """Atualiza o tempo decorrido enquanto o comando está em execução (ou o tempo de espera na fila)."""
+        if self.runner.started_at is None and self.job is not None:
+            self.status_label.setText(f"🕒 Na fila ({self.job.category}: aguardando vaga)... {self.job.wait_time:.1f}s")
+            return
+        self.status_label.setText(f"⏳ Em execução... {self.runner.elapsed:.1f}s")
+
+    def command_finished(self, runner):
+        """Exibe o código de saída e o tempo total quando o comando termina."""
+        self.elapsed_timer.stop()
+        self.cancel_button.setEnabled(False)
+        self.refresh_button.setEnabled(True)
+        if runner.error:
+            self.append_output("stdout", ("\n\n" if self.store.size else "") + runner.error)
+        elif runner.returncode != 0 and not self.store.size:
+            self.append_output("stdout", f"Comando finalizado com código de erro {runner.returncode}.\n\nOutput/Erro não capturado.")
+
+        if runner.cancelled:
+            state = "⏹️ Cancelado"
+        elif runner.error:
+            state = "❌ Falhou"
+        else:
+            state = "✅ Concluído" if runner.returncode == 0 else "⚠️ Concluído com erro"
+        self.add_to_history(runner.returncode, runner_status(runner), runner.elapsed)
+        self.save_raw_button.setEnabled(self.raw.size("stdout") + self.raw.size("stderr") > 0)
+        encoding = f" | Codificação: {runner.detected_encoding}" if runner.detected_encoding else ""
+        code = "-" if runner.returncode is None else runner.returncode
+        cached = " | 📦 Guardado em cache" if self.cache is not None and self.cache.peek(self.command_executed) is not None \
+            and runner.returncode == 0 and not runner.cancelled else ""
+        self.status_label.setText(f"{state} | Código de saída: {code} | Tempo: {runner.elapsed:.1f}s{encoding}{cached}")
+
+    def cancel_command(self):
+        """Primeiro clique cancela o comando; o segundo força o encerramento (kill). Na fila, apenas desiste."""
+        if self.runner is not None and self.runner.started_at is None and self.job is not None:
+            self.job.cancel()
+            return
+        if not self.runner or not self.runner.running:
+            return
+        if not self.runner.cancelled:
+            self.runner.cancel()
+            self.cancel_button.setText("☠️ Forçar Encerramento")
+        else:
+            self.runner.cancel(force=True)
+
+    def reject(self):
+        """Encerra o comando em execução ao fechar a janela (Fechar, Esc ou X)."""
+        if self.runner and self.runner.running:
+            self.runner.cancel(force=True)
+        if self.job is not None:
+            self.job.cancel() # Ainda na fila: sai sem executar
+        super().reject()
+
     def save_output(self):
-        """Salva o conteúdo do output em um arquivo de texto."""
+        """Salva o conteúdo do output em um arquivo de texto, lendo em blocos do armazenamento."""
         base_name = self.command_executed.split()[0].replace('/', '').replace('\\', '')
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         default_filename = f"{base_name}_output_{timestamp}.txt"
@@ -403,18 +813,41 @@ class OutputDialog(QDialog):
                 header += "-----------------------\n\n"
                 
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(header + self.output_content)
+                    f.write(header)
+                    for chunk in self.store.iter_chunks():
+                        f.write(chunk)
                 
                 QMessageBox.information(self, "Sucesso", f"O output foi salvo em:\n{file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Erro ao Salvar", f"Não foi possível salvar o arquivo:\n{e}")
 
+    def save_raw_output(self):
+        """Salva os bytes originais do stdout (e do stderr, se houver, em <nome>_stderr) sem cabeçalho nem conversão."""
+        base_name = self.command_executed.split()[0].replace('/', '').replace('\\', '')
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Salvar Bytes Originais", f"{base_name}_raw_{timestamp}.txt",
+            "Arquivos de Texto (*.txt);;Todos os Arquivos (*.*)")
+        if not file_path:
+            return
+        try:
+            saved = [file_path]
+            self.raw.write_to("stdout", file_path)
+            if self.raw.size("stderr"):
+                root, ext = os.path.splitext(file_path)
+                saved.append(f"{root}_stderr{ext}")
+                self.raw.write_to("stderr", saved[-1])
+            QMessageBox.information(self, "Sucesso", "Bytes originais salvos em:\n" + "\n".join(saved))
+        except Exception as e:
+            QMessageBox.critical(self, "Erro ao Salvar", f"Não foi possível salvar o arquivo:\n{e}")
+
 
 # ----------------------------------------------------------------------
 # --- CLASSE PRINCIPAL: MainWindow (v2.0.14) ---
 # ----------------------------------------------------------------------
 
 class MainWindow(QMainWindow):
+    @startup_profile.timed("mainwindow_init")
     def __init__(self):
         super().__init__()
         
@@ -452,10 +885,21 @@ class MainWindow(QMainWindow):
         self.list_widget = QListWidget()
         self.list_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         main_layout.addWidget(self.list_widget)
+
+        palette_hint = QLabel("Ctrl+K: Paleta de Comandos (buscar qualquer comando ou sub-comando) | Ctrl+J: Tarefas")
+        palette_hint.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(palette_hint)
         
+        self.commands = self.build_command_registry()
         self.setup_menu_items()
+        self.list_widget.itemClicked.connect(self.handle_item_click) # Conectado uma única vez
+        QShortcut(QKeySequence("Ctrl+K"), self, self.open_command_palette)
+        QShortcut(QKeySequence("Ctrl+J"), self, self.toggle_jobs_panel)
+        self.job_signals = None # Painel e ponte de sinais das tarefas são criados na primeira tarefa
+        self.jobs_panel = None
         self.center_on_screen()
         
+    @startup_profile.timed("apply_theme")
     def apply_theme(self, theme_name):
         """Aplica o tema (Dark ou Light) à aplicação Qt."""
         QApplication.setStyle(QStyleFactory.create('Fusion'))
@@ -500,12 +944,20 @@ class MainWindow(QMainWindow):
         QApplication.setPalette(palette)
         self.current_theme = theme_name # Atualiza o estado
 
-        # Se a lista de itens existe, re-popula para aplicar a cor do texto do item divisor
+        # Se a lista de itens existe, ajusta a cor dos divisores no lugar (sem recriar os itens)
         if hasattr(self, 'list_widget'):
-            self.setup_menu_items()
+            self.restyle_menu_items()
 
 
         
+    def paintEvent(self, event):
+        """Registra a primeira pintura da janela (fim da inicialização, ver wintools_core.startup)."""
+        super().paintEvent(event)
+        if not startup_profile.finished:
+            startup_profile.mark("first_paint")
+            if startup_profile.emit():
+                QTimer.singleShot(0, QApplication.quit)
+
     def center_on_screen(self):
         """Centraliza a janela na tela."""
         screen = QApplication.primaryScreen().geometry()
@@ -515,100 +967,211 @@ class MainWindow(QMainWindow):
             (screen.height() - size.height()) // 2
         )
         
-    def execute_and_show_output(self, title, command, shell=True, encoding='cp850'):
-        """Executa um comando de forma bloqueante e exibe o output em um diálogo."""
-        try:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            
-            result = subprocess.run(
-                command, 
-                shell=shell, 
-                capture_output=True, 
-                text=True, 
-                encoding=encoding,
-                timeout=300 
-            )
-            
-            output = result.stdout
-            if result.stderr:
-                output += "\n\n--- ERRO PADRÃO (STDERR) ---\n" + result.stderr
+    def execute_and_show_output(self, title, command, shell=True, encoding=None):
+        """
+        Executa um comando em segundo plano e exibe o output em tempo real em um diálogo não-modal.
+        A codificação da saída é detectada por comando (`encoding` fixa uma, ex.: 'utf-8').
+        Comandos lentos e somente leitura (systeminfo, driverquery, winget list...) vêm do cache na hora.
+        """
+        dialog = OutputDialog(self, title, command, "", cache=default_cache, submit_job=self.submit_command_job,
+                              runner_factory=lambda: CommandRunner(command, shell=shell, encoding=encoding, timeout=300))
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+        dialog.start()
 
-            if result.returncode != 0 and not output:
-                 output = f"Comando finalizado com código de erro {result.returncode}.\n\nOutput/Erro não capturado."
-            
-        except FileNotFoundError:
-            output = f"Erro: O comando '{command.split()[0]}' não foi encontrado no PATH."
-        except subprocess.TimeoutExpired:
-            output = "Erro: O comando excedeu o tempo limite de 5 minutos (Timeout)."
-        except Exception as e:
-            output = f"Erro inesperado ao executar o comando:\n{e}"
-        finally:
-            QApplication.restoreOverrideCursor()
-        
-        dialog = OutputDialog(self, title, command, output)
-        dialog.exec()
+    # --- Tarefas em segundo plano ---
 
+    def ensure_jobs_panel(self):
+        """Cria (uma vez) a ponte de sinais e o painel de tarefas, acoplado embaixo e oculto."""
+        if self.jobs_panel is None:
+            from wintools_core.jobs import default_jobs
+            from wintools_core.jobs_dialog import JobSignals, JobsPanel
+            self.job_signals = JobSignals(default_jobs, self)
+            self.jobs_panel = JobsPanel(self, self.job_signals)
+            self.addDockWidget(Qt.BottomDockWidgetArea, self.jobs_panel)
+            self.jobs_panel.hide()
+        return self.jobs_panel
 
-    def setup_menu_items(self):
-        """Define e popula todos os itens de menu na lista principal."""
-        self.list_widget.clear() # Limpa para o re-populamento do tema
+    def toggle_jobs_panel(self):
+        """Ctrl+J: mostra/oculta o painel de tarefas."""
+        panel = self.ensure_jobs_panel()
+        panel.setVisible(not panel.isVisible())
 
-        # Categorias de Emojis
-        NET = "🌐" ; SYS = "⚙️" ; DISK = "💾" ; ADMIN = "🚨" ; UTIL = "💡" ; TERCEIROS = "📦" ; INFO = "ℹ️" ; CONFIG = "🎨"
-        
-        # Lista de Tuplas: (Nome da Opção, Função, Categoria)
-        self.menu_items = [
-            ("1 - Ping (Teste de Conexão)", self.run_ping_menu, NET),
-            ("2 - PathPing (Diagnóstico de Rota/Perda)", self.run_pathping_menu, NET),
-            ("3 - TraceCert (Rastreio de Rota)", lambda: self.run_simple_command_output("TraceCert", "Host ou IP:", "tracert"), NET),
-            ("4 - Telnet (Verificação de Porta - Python Puro)", self.run_telnet_menu_output, NET),
-            ("5 - Curl (Requisição HTTP/HTTPS)", self.run_curl_menu_output, NET), 
-            ("6 - NsLookup (Consulta DNS)", lambda: self.run_simple_command_output("NsLookup", "Host ou IP:", "nslookup"), NET),                      
-            ("7 - Netstat (Conexões de Rede Ativas)", lambda: self.run_simple_command_with_default_output("Netstat", "Parâmetros:", "netstat", "-ano"), NET),                       
-            ("8 - IP Config (Configurações da Placa de Rede)", self.run_ipconfig_menu_output, NET), 
-            ("9 - ARP (Tabela de Endereços Físicos - MAC)", lambda: self.run_arp_menu_output("Visualizar (arp -a)", "arp -a", "ARP"), NET),                           
-            ("10 - Netsh (Gerenciamento Avançado de Rede)", self.run_netsh_menu_output, ADMIN),                        
-            ("11 - SFC /Scannow (Verificar Arquivos do Sistema)", self.run_sfc_menu, ADMIN),                 
-            ("12 - MRT (Ferramenta de Remoção de Software Malicioso)", lambda: os.system("mrt.exe"), SYS),                          
-            ("13 - Winget (Gerenciador de Pacotes/Apps)", self.run_winget_menu_output, ADMIN),
-            ("14 - CHKDSK (Verificar e Corrigir Disco)", self.run_chkdsk_menu, DISK),     
-            ("15 - Limpeza de Disco (cleanmgr)", lambda: os.system("cleanmgr.exe"), DISK),   
-            ("16 - Otimizar/Desfragmentar (dfrgui)", lambda: os.system("dfrgui.exe"), DISK), 
-            ("17 - DISKPART (Utilitário de Particionamento - CUIDADO)", self.run_diskpart_menu, ADMIN), 
-            ("18 - Tasklist (Listar Processos em Execução)", lambda: self.execute_and_show_output("Tasklist", "tasklist"), SYS), 
-            ("19 - Gerenciamento de Disco (diskmgmt.msc)", lambda: os.system("diskmgmt.msc"), DISK), 
-            ("20 - Visualizador de Eventos (eventvwr.msc)", lambda: os.system("eventvwr.msc"), SYS), 
-            ("21 - Verificador de Arquivos de Driver (verifier)", self.run_verifier_menu, ADMIN), 
-            ("22 - DriverQuery (Listar Drivers Instalados)", lambda: self.execute_and_show_output("DriverQuery", "driverquery"), SYS),   
-            ("23 - Comandos Rápidos (Windows + R - EXPANDIDO)", self.run_quick_commands_menu, UTIL), 
-            ("24 - SystemInfo (Detalhes do Sistema/Hardware)", lambda: self.execute_and_show_output("SystemInfo", "systeminfo"), SYS), 
-            ("25 - Gerador de QR Code (Texto/URL/Wi-Fi)", lambda: generate_qr_code(self), UTIL), 
-            ("--", None, ""),
-            ("26 - FERRAMENTAS DE TERCEIROS (Com Busca - Pasta FerramentasTerceiros)", self.run_third_party_apps, TERCEIROS),
-            ("--", None, ""),
-            ("27 - Meu IP ISP (Externo - Geolocalização)", self.run_external_ip_info, NET), 
-            ("28 - Sobre o WinTools", self.show_about, INFO),
-            ("29 - Configurações de Tema (Dark/Light)", self.run_theme_config, CONFIG)
-        ]
-
-        for text, func, category in self.menu_items:
-            item = QListWidgetItem(f"{category} {text}")
-            if func is None:
-                item.setFlags(item.flags() & ~Qt.ItemIsSelectable)
-                # Garante que o divisor tenha cor neutra independente do tema
-                item.setForeground(QColor(150, 150, 150) if self.current_theme == "Dark" else QColor(100, 100, 100))
-            else:
-                item.setData(Qt.UserRole, func) 
+    def submit_job(self, title, func, category, priority=None, on_done=None):
+        """
+        Executa `func(job)` como tarefa em segundo plano; `on_done(job)` roda depois na thread da interface.
+        Se a categoria estiver no limite, a tarefa espera na fila e o painel aparece para mostrar o motivo.
+        """
+        from wintools_core.jobs import default_jobs, PRIORITY_NORMAL, STATE_QUEUED
+        self.ensure_jobs_panel()
+        job = default_jobs.submit(title, func, category, PRIORITY_NORMAL if priority is None else priority,
+                                  on_done=self.job_signals.on_gui(on_done) if on_done else None)
+        if job.state == STATE_QUEUED:
+            self.jobs_panel.show()
+        return job
+
+    def submit_command_job(self, title, runner, priority=None):
+        """Comando do OutputDialog como tarefa: categoria pelo comando (winget = pacotes, chkdsk = disco...)."""
+        from wintools_core.jobs import default_jobs, submit_command, PRIORITY_NORMAL, STATE_QUEUED
+        self.ensure_jobs_panel()
+        job = submit_command(default_jobs, title, runner, priority=PRIORITY_NORMAL if priority is None else priority)
+        if job.state == STATE_QUEUED:
+            self.jobs_panel.show()
+        return job
+
+    def show_job_message(self, title, job):
+        """Resultado (texto) de uma tarefa numa mensagem não-modal; canceladas não exibem nada."""
+        from wintools_core.jobs import STATE_CANCELLED, STATE_DONE
+        if job.state == STATE_CANCELLED:
+            return
+        text = job.result if job.state == STATE_DONE else f"Erro inesperado:\n{job.error}"
+        box = QMessageBox(QMessageBox.Information, title, text, QMessageBox.Ok, self)
+        box.setWindowModality(Qt.NonModal)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.show()
+
+
+    def build_command_registry(self):
+        """Registra todos os comandos (menu principal e sub-menus) com ID, categoria, Admin e modo de saída."""
+        registry = CommandRegistry()
+        add = registry.add
+        submenu = lambda command_id: (lambda: self.run_submenu(command_id))
+
+        # --- Rede ---
+        add("net.ping", "Ping (Teste de Conexão)", submenu("net.ping"), category=CATEGORY_NET, number=1, output=OUTPUT_SUBMENU, prompt="Selecione o modo:")
+        add("ping.continuous", "Ping Contínuo (ping -t)", lambda: self.run_ping("ping -t {host}"), parent="net.ping", number=1, output=OUTPUT_TERMINAL)
+        add("ping.count", "Ping Limitado (ping -n 4)", lambda: self.run_ping("ping -n 4 {host}"), parent="net.ping", number=2, output=OUTPUT_TERMINAL)
+        add("ping.size", "Ping com Tamanho (ping -l 1500 -n 1)", lambda: self.run_ping("ping -l 1500 -n 1 {host}"), parent="net.ping", number=3, output=OUTPUT_TERMINAL)
+        add("ping.monitor", "Monitor de Latência (Vários Destinos - Estatísticas ao Vivo)", self.run_latency_monitor, parent="net.ping", number=4, output=OUTPUT_DIALOG)
+        add("net.pathping", "PathPing (Diagnóstico de Rota/Perda)", self.run_pathping_menu, category=CATEGORY_NET, number=2, output=OUTPUT_TERMINAL)
+        add("net.tracert", "TraceCert (Rastreio de Rota)", lambda: self.run_simple_command_output("TraceCert", "Host ou IP:", "tracert"), category=CATEGORY_NET, number=3)
+        add("net.telnet", "Telnet / Scanner de Portas (Python Puro)", submenu("net.telnet"), category=CATEGORY_NET, number=4, output=OUTPUT_SUBMENU, prompt="Selecione o modo:")
+        add("telnet.single", "Porta Única (Host:Porta)", self.run_telnet_menu_output, parent="net.telnet", number=1)
+        add("telnet.scanner", "Scanner (Vários Hosts/Portas/CIDR)", self.run_port_scanner, parent="net.telnet", number=2, output=OUTPUT_DIALOG)
+        add("telnet.monitor", "Monitor de Disponibilidade (Portas TCP e URLs HTTP por Horas, com Alertas)", self.run_health_monitor, parent="net.telnet", number=3,
+            output=OUTPUT_DIALOG, keywords=("monitor", "disponibilidade", "uptime", "queda", "alerta", "incidente"))
+        add("net.curl", "Curl / HTTP (Requisição HTTP/HTTPS com Tempos DNS/TCP/TLS/TTFB)", submenu("net.curl"), category=CATEGORY_NET, number=5,
+            output=OUTPUT_SUBMENU, prompt="Modo:", keywords=("http", "https", "site", "ttfb", "latencia", "keep-alive"))
+        add("curl.head", "Cabeçalho (HEAD, como curl -I)", lambda: self.run_http_probe(method="HEAD"), parent="net.curl", number=1, output=OUTPUT_DIALOG)
+        add("curl.body", "Conteúdo (GET)", lambda: self.run_http_probe(method="GET"), parent="net.curl", number=2, output=OUTPUT_DIALOG)
+        add("curl.multi", "Vários URLs em Paralelo (Tabela de Tempos)", lambda: self.run_http_probe(ask_url=False), parent="net.curl", number=3, output=OUTPUT_DIALOG)
+        add("net.nslookup", "NsLookup / DNS (Vários Nomes, Tipos e Servidores Lado a Lado)", self.run_dns_query, category=CATEGORY_NET, number=6, output=OUTPUT_DIALOG, keywords=("nslookup", "dns", "mx", "txt", "srv", "ptr", "cname"))
+        add("net.netstat", "Netstat (Conexões de Rede Ativas)", submenu("net.netstat"), category=CATEGORY_NET, number=7, output=OUTPUT_SUBMENU, prompt="Selecione o modo:")
+        add("netstat.text", "Texto (netstat com Parâmetros)", lambda: self.run_simple_command_with_default_output("Netstat", "Parâmetros:", "netstat", "-ano"), parent="net.netstat", number=1)
+        add("netstat.monitor", "Monitor de Conexões (Atualização e Diferenças)", self.run_netstat_monitor, parent="net.netstat", number=2, output=OUTPUT_DIALOG)
+        add("net.ipconfig", "IP Config (Configurações da Placa de Rede)", submenu("net.ipconfig"), category=CATEGORY_NET, number=8, output=OUTPUT_SUBMENU)
+        add("ipconfig.summary", "Visualização Limpa (IP/Máscara/Gateway/MAC) - Mensagem", self.run_local_ip_info, parent="net.ipconfig", number=1, output=OUTPUT_MESSAGE)
+        add("ipconfig.all", "/all (Detalhado na Janela)", lambda: self.execute_and_show_output("IP Config /all", "ipconfig /all", shell=True), parent="net.ipconfig", number=2)
+        add("ipconfig.release", "/release (Liberar IP - Admin)", lambda: self.run_admin_terminal_command("ipconfig /release"), parent="net.ipconfig", number=3, admin=True, output=OUTPUT_TERMINAL)
+        add("ipconfig.renew", "/renew (Renovar IP - Admin)", lambda: self.run_admin_terminal_command("ipconfig /renew"), parent="net.ipconfig", number=4, admin=True, output=OUTPUT_TERMINAL)
+        add("ipconfig.flushdns", "/flushdns (Limpar Cache DNS)", lambda: self.execute_and_show_output("IP Config /flushdns", "ipconfig /flushdns", shell=True), parent="net.ipconfig", number=5)
+        add("ipconfig.registerdns", "/registerdns (Registrar DNS)", lambda: self.execute_and_show_output("IP Config /registerdns", "ipconfig /registerdns", shell=True), parent="net.ipconfig", number=6)
+        add("ipconfig.simple", "(Simples na Janela)", lambda: self.execute_and_show_output("IP Config Simples", "ipconfig", shell=True), parent="net.ipconfig", number=7)
+        add("net.arp", "ARP (Tabela de Endereços Físicos - MAC)", submenu("net.arp"), category=CATEGORY_NET, number=9, output=OUTPUT_SUBMENU, prompt="Selecione o modo:")
+        add("arp.show", "Visualizar (arp -a)", lambda: self.execute_and_show_output("ARP", "arp -a", shell=True), parent="net.arp", number=1)
+        add("arp.delete", "Excluir Tabela (arp -d - Admin)", lambda: self.run_admin_terminal_command("arp -d", "Excluir requer Admin."), parent="net.arp", number=2, admin=True, output=OUTPUT_TERMINAL)
+        add("net.netsh", "Netsh (Gerenciamento Avançado de Rede)", submenu("net.netsh"), category=CATEGORY_ADMIN, number=10, output=OUTPUT_SUBMENU, prompt="Comando Netsh:")
+        add("netsh.wlan", "Perfis/Interfaces Wi-Fi", lambda: self.execute_and_show_output("Netsh - Opção 1", "netsh wlan show all", shell=True), parent="net.netsh", number=1)
+        add("netsh.wifi_key", "Senha do Perfil Wi-Fi (Admin)", self.run_netsh_wifi_key, parent="net.netsh", number=2, admin=True)
+        add("netsh.interfaces", "Interfaces de Rede", lambda: self.execute_and_show_output("Netsh - Opção 3", "netsh interface show interface", shell=True), parent="net.netsh", number=3)
+        add("netsh.firewall", "Status do Firewall (show allprofiles)", lambda: self.execute_and_show_output("Netsh - Opção 4", "netsh advfirewall show allprofiles", shell=True), parent="net.netsh", number=4)
+        add("netsh.reset_stack", "RESET DE STACK DE REDE (Winsock, IP, TCP, Firewall - Admin)", self.run_netsh_reset_stack, parent="net.netsh", number=5, admin=True, output=OUTPUT_TERMINAL)
+        add("netsh.reset_ip", "Resetar Stack TCP/IP (OLD: netsh int ip reset - Admin - Abrir Terminal)", lambda: self.run_admin_terminal_command("netsh int ip reset"), parent="net.netsh", number=6, admin=True, output=OUTPUT_TERMINAL)
+
+        # --- Sistema e Disco ---
+        add("sys.sfc", "SFC /Scannow (Verificar Arquivos do Sistema)", self.run_sfc_menu, category=CATEGORY_ADMIN, number=11, admin=True, output=OUTPUT_TERMINAL)
+        add("sys.mrt", "MRT (Ferramenta de Remoção de Software Malicioso)", lambda: os.system("mrt.exe"), category=CATEGORY_SYS, number=12, output=OUTPUT_EXTERNAL)
+        add("pkg.winget", "Winget (Gerenciador de Pacotes/Apps)", submenu("pkg.winget"), category=CATEGORY_ADMIN, number=13, output=OUTPUT_SUBMENU, prompt="Comando Winget:")
+        add("winget.search", "Search", self.run_winget_search, parent="pkg.winget", number=1)
+        add("winget.install", "Install (Admin)", lambda: self.run_winget_package("install", "Instalação exige Admin.", "Winget - Install", "ID exato do pacote (Ex: VideoLAN.VLC):"), parent="pkg.winget", number=2, admin=True)
+        add("winget.upgrade", "Upgrade / Update (Admin)", self.run_winget_upgrade, parent="pkg.winget", number=3, admin=True)
+        add("winget.uninstall", "Uninstall (Admin)", lambda: self.run_winget_package("uninstall", "Desinstalação exige Admin.", "Winget - Uninstall", "ID exato do pacote:"), parent="pkg.winget", number=4, admin=True)
+        add("winget.list", "List", lambda: self.execute_and_show_output("Winget", "winget list", shell=True), parent="pkg.winget", number=5)
+        add("disk.chkdsk", "CHKDSK (Verificar e Corrigir Disco)", self.run_chkdsk_menu, category=CATEGORY_DISK, number=14, output=OUTPUT_TERMINAL)
+        add("disk.cleanmgr", "Limpeza de Disco (cleanmgr)", lambda: os.system("cleanmgr.exe"), category=CATEGORY_DISK, number=15, output=OUTPUT_EXTERNAL)
+        add("disk.dfrgui", "Otimizar/Desfragmentar (dfrgui)", lambda: os.system("dfrgui.exe"), category=CATEGORY_DISK, number=16, output=OUTPUT_EXTERNAL)
+        add("disk.diskpart", "DISKPART (Utilitário de Particionamento - CUIDADO)", self.run_diskpart_menu, category=CATEGORY_ADMIN, number=17, admin=True, output=OUTPUT_TERMINAL)
+        self._add_tabular_command(registry, "sys.tasklist", "Tasklist (Listar Processos em Execução)", 18, "Tasklist", "tasklist")
+        add("disk.diskmgmt", "Gerenciamento de Disco (diskmgmt.msc)", lambda: os.system("diskmgmt.msc"), category=CATEGORY_DISK, number=19, output=OUTPUT_EXTERNAL)
+        add("sys.eventvwr", "Visualizador de Eventos (eventvwr.msc)", lambda: os.system("eventvwr.msc"), category=CATEGORY_SYS, number=20, output=OUTPUT_EXTERNAL)
+        add("sys.verifier", "Verificador de Arquivos de Driver (verifier)", self.run_verifier_menu, category=CATEGORY_ADMIN, number=21, admin=True, output=OUTPUT_TERMINAL)
+        self._add_tabular_command(registry, "sys.driverquery", "DriverQuery (Listar Drivers Instalados)", 22, "DriverQuery", "driverquery")
+        add("util.quick", "Comandos Rápidos (Windows + R - EXPANDIDO)", submenu("util.quick"), category=CATEGORY_UTIL, number=23, output=OUTPUT_SUBMENU, prompt="Selecione o comando rápido:")
+        for number, (command, description) in enumerate(QUICK_COMMANDS, start=1):
+            add(f"quick.{command.split('.')[0]}", f"{command} ({description})", lambda command=command: os.system(command),
+                parent="util.quick", number=number, output=OUTPUT_EXTERNAL)
+        self._add_tabular_command(registry, "sys.systeminfo", "SystemInfo (Detalhes do Sistema/Hardware)", 24, "SystemInfo", "systeminfo", transpose=True)
+
+        # --- Utilitários, Terceiros e Configurações ---
+        add("util.qrcode", "Gerador de QR Code (Texto/URL/Wi-Fi)", lambda: generate_qr_code(self), category=CATEGORY_UTIL, number=25, output=OUTPUT_DIALOG)
+        add("util.third_party", "FERRAMENTAS DE TERCEIROS (Com Busca - Pasta FerramentasTerceiros)", self.run_third_party_apps, category=CATEGORY_THIRD_PARTY, number=26, output=OUTPUT_DIALOG, separator_before=True)
+        add("net.external_ip", "Meu IP ISP (Externo - Geolocalização)", self.run_external_ip_info, category=CATEGORY_NET, number=27, output=OUTPUT_MESSAGE, separator_before=True)
+        add("info.about", "Sobre o WinTools", self.show_about, category=CATEGORY_INFO, number=28, output=OUTPUT_MESSAGE)
+        add("config.theme", "Configurações de Tema (Dark/Light)", self.run_theme_config, category=CATEGORY_CONFIG, number=29, output=OUTPUT_DIALOG)
+        add("net.bundle", "Pacote de Diagnóstico (Coleta Paralela em .zip para Chamados)", self.run_diagnostic_bundle, category=CATEGORY_NET, number=30,
+            output=OUTPUT_DIALOG, keywords=("zip", "suporte", "chamado", "route", "evidencias"))
+        add("info.telemetry", "Telemetria de Execução (Tempos, Histogramas e Trace JSONL)", self.run_telemetry_view, category=CATEGORY_INFO, number=31,
+            output=OUTPUT_DIALOG, keywords=("desempenho", "latencia", "performance"))
+        add("info.history", "Histórico de Saídas (Busca em Execuções Anteriores)", self.run_history_view, category=CATEGORY_INFO, number=32,
+            output=OUTPUT_DIALOG, keywords=("historico", "busca", "resultado", "anterior", "log"))
+        add("info.jobs", "Tarefas em Segundo Plano (Fila, Progresso e Tempos - Ctrl+J)", self.toggle_jobs_panel, category=CATEGORY_INFO, number=33,
+            output=OUTPUT_DIALOG, keywords=("fila", "jobs", "cancelar", "paralelo", "execucao"))
+        return registry
+
+    def _add_tabular_command(self, registry, command_id, label, number, title, command, transpose=False):
+        """Comandos com saída /fo csv: sub-menu com tabela (ordenar/filtrar/exportar) ou texto."""
+        name = command_id.split('.')[1]
+        registry.add(command_id, label, lambda: self.run_submenu(command_id), category=CATEGORY_SYS, number=number,
+                     output=OUTPUT_SUBMENU, prompt="Selecione o modo de exibição:")
+        registry.add(f"{name}.table", "Tabela (Ordenar, Filtrar e Exportar CSV/JSON)", lambda: self.run_table_output(title, command, transpose),
+                     parent=command_id, number=1, output=OUTPUT_DIALOG)
+        registry.add(f"{name}.text", "Texto", lambda: self.execute_and_show_output(title, command), parent=command_id, number=2)
+
+    def setup_menu_items(self):
+        """Popula a lista principal a partir do registro (uma única vez; o tema só ajusta cores)."""
+        self.list_widget.clear()
+        for descriptor in self.commands.top_level():
+            if descriptor.separator_before:
+                separator = QListWidgetItem(" --")
+                separator.setFlags(separator.flags() & ~Qt.ItemIsSelectable)
+                self.list_widget.addItem(separator)
+            item = QListWidgetItem(f"{descriptor.category} {descriptor.title}")
+            item.setData(Qt.UserRole, descriptor.id)
+            if descriptor.admin:
+                item.setToolTip("Requer privilégios de Administrador")
             self.list_widget.addItem(item)
-            
-        self.list_widget.itemClicked.connect(self.handle_item_click)
+        self.restyle_menu_items()
+
+    def restyle_menu_items(self):
+        """Garante que os divisores tenham cor neutra independente do tema (ajuste no lugar)."""
+        color = QColor(150, 150, 150) if self.current_theme == "Dark" else QColor(100, 100, 100)
+        for row in range(self.list_widget.count()):
+            item = self.list_widget.item(row)
+            if item.data(Qt.UserRole) is None:
+                item.setForeground(color)
         
     def handle_item_click(self, item):
-        """Executa a função armazenada no item da lista."""
-        func = item.data(Qt.UserRole)
-        if func:
-            func()
-            
+        """Executa o comando do item da lista pelo ID."""
+        command_id = item.data(Qt.UserRole)
+        if command_id:
+            self.commands.dispatch(command_id)
+
+    def run_submenu(self, parent_id):
+        """Mostra os sub-comandos de um menu e despacha o escolhido pelo ID."""
+        parent = self.commands.get(parent_id)
+        children = self.commands.children(parent_id)
+        titles = [child.title for child in children]
+        choice, ok = QInputDialog.getItem(self, f"WinTools - {parent.label}", parent.prompt, titles, 0, False)
+        if ok and choice:
+            self.commands.dispatch(children[titles.index(choice)].id)
+
+    def open_command_palette(self):
+        """Ctrl+K: busca qualquer comando (inclusive de sub-menus) e executa pelo ID."""
+        from wintools_core.palette_dialog import CommandPaletteDialog
+        dialog = CommandPaletteDialog(self, self.commands)
+        if dialog.exec() and dialog.selected_id:
+            self.commands.dispatch(dialog.selected_id)
+
     # --- Funções de Comando para Terminal/Output Interno ---
             
     def run_simple_command_output(self, title, prompt, command_base):
@@ -625,21 +1188,30 @@ class MainWindow(QMainWindow):
             command = f"{command_base} {text}"
             self.execute_and_show_output(title, command, shell=True)
             
-    def run_ping_menu(self):
-        """Menu Ping para abrir no Terminal, focado no -t. (Usando run_command não-blocking)"""
-        host, ok = QInputDialog.getText(self, "WinTools - Ping", "Digite o Host ou IP:", QLineEdit.Normal, "8.8.8.8")
-        if ok and host:
-            mode, ok_mode = QInputDialog.getItem(
-                self, "WinTools - Modo de Ping", "Selecione o modo:", 
-                ["1 - Ping Contínuo (ping -t)", "2 - Ping Limitado (ping -n 4)", "3 - Ping com Tamanho (ping -l 1500 -n 1)"], 
-                0, False)
-            if ok_mode:
-                if "Contínuo" in mode:
-                    run_command(f"ping -t {host}")
-                elif "Limitado" in mode:
-                    run_command(f"ping -n 4 {host}")
-                elif "Tamanho" in mode:
-                    run_command(f"ping -l 1500 -n 1 {host}")
+    def run_netstat_monitor(self):
+        """Netstat: monitor estruturado com diferenças entre capturas."""
+        from wintools_core.netstat_dialog import NetstatMonitorDialog
+        dialog = NetstatMonitorDialog(self)
+        dialog.exec()
+
+    def ask_host(self, title, prompt="Digite o Host ou IP:", default="8.8.8.8"):
+        """Pede um Host/IP; retorna None se cancelado."""
+        host, ok = QInputDialog.getText(self, f"WinTools - {title}", prompt, QLineEdit.Normal, default)
+        return host if ok and host else None
+
+    def run_ping(self, command_template):
+        """Ping no Terminal (ex.: "ping -t {host}")."""
+        host = self.ask_host("Ping")
+        if host:
+            run_command(command_template.format(host=host))
+
+    def run_latency_monitor(self):
+        """Monitor de latência interno (vários destinos, estatísticas ao vivo)."""
+        host = self.ask_host("Ping", "Destino(s) (separe por vírgula):")
+        if host:
+            from wintools_core.probe_dialog import LatencyMonitorDialog
+            dialog = LatencyMonitorDialog(self, hosts=host)
+            dialog.exec()
 
     def run_pathping_menu(self):
         """PathPing abre no Terminal. (Usando run_command não-blocking)"""
@@ -647,6 +1219,19 @@ class MainWindow(QMainWindow):
         if ok and host:
             run_command(f"pathping {host}")
 
+    def run_port_scanner(self):
+        """Scanner de portas (vários hosts/portas/CIDR)."""
+        from wintools_core.portscan_dialog import PortScanDialog
+        dialog = PortScanDialog(self)
+        dialog.exec()
+
+    def run_health_monitor(self):
+        """Monitor de disponibilidade não-modal: continua verificando enquanto o resto do WinTools é usado."""
+        from wintools_core.monitor_dialog import HealthMonitorDialog
+        dialog = HealthMonitorDialog(self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
     def run_telnet_menu_output(self):
         """Teste de Porta (Telnet) usando socket Python puro."""
         host, ok1 = QInputDialog.getText(self, "WinTools - Telnet (Python Puro)", "Host (Ex: google.com):", QLineEdit.Normal, "google.com")
@@ -654,149 +1239,111 @@ class MainWindow(QMainWindow):
         porta, ok2 = QInputDialog.getText(self, "WinTools - Telnet (Python Puro)", "Porta (Ex: 80, 443, 23):", QLineEdit.Normal, "80")
         
         if ok2 and porta:
-            try:
-                QApplication.setOverrideCursor(Qt.WaitCursor)
-                # Chama a função de socket puro (blocking, mas rápido)
-                output = check_port_with_socket(host, porta, timeout=5)
-                title_out = f"Verificação de Porta - {host}:{porta}"
-            except Exception as e:
-                output = f"Erro ao executar verificação de porta:\n{e}"
-                title_out = "Verificação de Porta (Erro)"
-            finally:
-                QApplication.restoreOverrideCursor()
-                
-            # O output agora é o resultado da função check_port_with_socket
-            dialog = OutputDialog(self, title_out, f"Python Socket Check: {host}:{porta}", output)
-            dialog.exec()
+            from wintools_core.jobs import CATEGORY_NETWORK, PRIORITY_HIGH, STATE_CANCELLED, STATE_DONE
 
-    def run_curl_menu_output(self):
-        """Menu Curl com modos de execução."""
-        host, ok1 = QInputDialog.getText(self, "WinTools - Curl", "Host/URL:", QLineEdit.Normal, "google.com")
-        if not ok1 or not host: return
-        mode, ok2 = QInputDialog.getItem(self, "WinTools - Modo Curl", "Modo:", ["Cabeçalho (-I)", "Conteúdo"], 0, False)
+            def show(job):
+                if job.state == STATE_CANCELLED:
+                    return
+                if job.state == STATE_DONE:
+                    output, title_out = job.result, f"Verificação de Porta - {host}:{porta}"
+                else:
+                    output, title_out = f"Erro ao executar verificação de porta:\n{job.error}", "Verificação de Porta (Erro)"
+                # O output é o resultado da função check_port_with_socket
+                dialog = OutputDialog(self, title_out, f"Python Socket Check: {host}:{porta}", output)
+                dialog.setAttribute(Qt.WA_DeleteOnClose)
+                dialog.show()
+
+            # Socket puro numa tarefa de rede: vários testes podem rodar juntos sem travar a janela
+            self.submit_job(f"Porta {host}:{porta}", lambda job: check_port_with_socket(host, porta, timeout=5),
+                            CATEGORY_NETWORK, PRIORITY_HIGH, on_done=show)
+
+    def run_http_probe(self, method="GET", ask_url=True):
+        """Requisição HTTP/HTTPS nativa (sem o curl): pergunta a URL e já executa; sem URL abre a tabela para várias."""
+        from wintools_core.httpprobe_dialog import HttpProbeDialog
+        url = ""
+        if ask_url:
+            url, ok = QInputDialog.getText(self, "WinTools - HTTP", "Host/URL:", QLineEdit.Normal, "google.com")
+            if not ok or not url.strip():
+                return
+        dialog = HttpProbeDialog(self, urls=url.strip(), method=method)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+        if url:
+            dialog.start_probe()
+
+    def run_dns_query(self):
+        """Consulta DNS nativa (sem o nslookup): pergunta o nome e já consulta A/AAAA; vazio abre a tabela para vários."""
+        from wintools_core.dnsquery_dialog import DnsQueryDialog
+        name, ok = QInputDialog.getText(self, "WinTools - DNS", "Host ou IP (vazio = vários nomes):", QLineEdit.Normal, "google.com")
+        if not ok:
+            return
+        dialog = DnsQueryDialog(self, names=name.strip())
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+        if name.strip():
+            dialog.start_queries()
+
+    def run_local_ip_info(self):
+        """IP Config - visualização limpa em mensagem (o ipconfig roda como tarefa de rede)."""
+        from wintools_core.jobs import CATEGORY_NETWORK, PRIORITY_HIGH
+        self.submit_job("IP Local (ipconfig /all)", lambda job: get_local_ip_info(job.token), CATEGORY_NETWORK, PRIORITY_HIGH,
+                        on_done=lambda job: self.show_job_message("WinTools - IP Local (Filtrado)", job))
+
+    def run_admin_terminal_command(self, command, warning="Requer Admin."):
+        """Avisa que o comando exige Admin e o executa no Terminal."""
+        QMessageBox.warning(self, "Admin", warning)
+        run_command(command) # Usando run_command não-bloqueante
+
+    def run_netsh_wifi_key(self):
+        """Netsh - senha de um perfil Wi-Fi (Admin)."""
+        QMessageBox.warning(self, "Admin", "Requer Admin.")
+        perfil, ok = QInputDialog.getText(self, "Wi-Fi Senha", "Nome do perfil Wi-Fi:")
+        if ok and perfil:
+            self.execute_and_show_output("Netsh - Opção 2", f'netsh wlan show profile name="{perfil}" key=clear', shell=True)
+
+    def run_netsh_reset_stack(self):
+        """Netsh - agrupa os 4 comandos de reset da stack de rede (Admin + reboot)."""
+        QMessageBox.warning(self, "Admin e Reboot", "ESTE COMANDO EXIGE ADMIN E UMA REINICIALIZAÇÃO (REBOOT) APÓS A EXECUÇÃO.\n\nConfirmar execução dos 4 resets?")
         
-        if ok2:
-            command = f"curl -I {host}" if "Cabeçalho" in mode else f"curl {host}"
-            self.execute_and_show_output("Curl", command, shell=True)
-            
-    def run_ipconfig_menu_output(self):
-        """Opções do IP Config."""
-        menu_options = [
-            "1 - Visualização Limpa (IP/Máscara/Gateway/MAC) - Mensagem", 
-            "2 - /all (Detalhado na Janela)",
-            "3 - /release (Liberar IP - Admin)", "4 - /renew (Renovar IP - Admin)", 
-            "5 - /flushdns (Limpar Cache DNS)", "6 - /registerdns (Registrar DNS)",
-            "7 - (Simples na Janela)"
-        ]
-        opcao_ip_str, ok = QInputDialog.getItem(self, "WinTools - IP Config", "Selecione a Opção:", menu_options, 0, False)
-        if ok and opcao_ip_str:
-            int_opcao_ip = int(opcao_ip_str.split(' - ')[0])
-            
-            if int_opcao_ip == 1:
-                ip_info = get_local_ip_info() # Esta é uma função blocking
-                QMessageBox.information(self, "WinTools - IP Local (Filtrado)", ip_info)
-            elif int_opcao_ip == 2: self.execute_and_show_output("IP Config /all", "ipconfig /all", shell=True)
-            elif int_opcao_ip == 3: QMessageBox.warning(self, "Admin", "Requer Admin."); run_command("ipconfig /release")
-            elif int_opcao_ip == 4: QMessageBox.warning(self, "Admin", "Requer Admin."); run_command("ipconfig /renew")
-            elif int_opcao_ip == 5: self.execute_and_show_output("IP Config /flushdns", "ipconfig /flushdns", shell=True)
-            elif int_opcao_ip == 6: self.execute_and_show_output("IP Config /registerdns", "ipconfig /registerdns", shell=True)
-            elif int_opcao_ip == 7: self.execute_and_show_output("IP Config Simples", "ipconfig", shell=True)
-
-    def run_arp_menu_output(self, menu_text, command, title):
-        """Menu ARP (Visualizar e Excluir)."""
-        mode, ok = QInputDialog.getItem(self, "WinTools - ARP", "Selecione o modo:", [menu_text, "2 - Excluir Tabela (arp -d - Admin)"], 0, False)
-        if ok:
-            if "Visualizar" in mode:
-                self.execute_and_show_output(title, command, shell=True)
-            elif "Excluir" in mode: 
-                QMessageBox.warning(self, "Admin", "Excluir requer Admin.");
-                run_command("arp -d") # Usando run_command não-bloqueante
-
-    def run_netsh_menu_output(self):
-        """Menu Netsh Avançado (Comando de Reset Adicionado)."""
-        menu_options = [
-            "1 - Perfis/Interfaces Wi-Fi", 
-            "2 - Senha do Perfil Wi-Fi (Admin)", 
-            "3 - Interfaces de Rede",
-            "4 - Status do Firewall (show allprofiles)",
-            "5 - RESET DE STACK DE REDE (Winsock, IP, TCP, Firewall - Admin)", # NOVO COMANDO
-            "6 - Resetar Stack TCP/IP (OLD: netsh int ip reset - Admin - Abrir Terminal)"
-        ]
-        opcao_netsh_str, ok = QInputDialog.getItem(self, "WinTools - Netsh Avançado", "Comando Netsh:", menu_options, 0, False)
-        if ok and opcao_netsh_str:
-            int_opcao_netsh = int(opcao_netsh_str.split(' - ')[0])
-            strComando = ""
-            
-            if int_opcao_netsh == 1: 
-                strComando = "netsh wlan show all"
-            
-            elif int_opcao_netsh == 2: 
-                QMessageBox.warning(self, "Admin", "Requer Admin."); 
-                perfil, ok_q = QInputDialog.getText(self, "Wi-Fi Senha", "Nome do perfil Wi-Fi:");
-                if ok_q and perfil: strComando = f'netsh wlan show profile name="{perfil}" key=clear'
-            
-            elif int_opcao_netsh == 3: 
-                strComando = "netsh interface show interface"
-                
-            elif int_opcao_netsh == 4: 
-                strComando = "netsh advfirewall show allprofiles"
-                
-            elif int_opcao_netsh == 5: 
-                # NOVO: Agrupa os 4 comandos de reset
-                QMessageBox.warning(self, "Admin e Reboot", "ESTE COMANDO EXIGE ADMIN E UMA REINICIALIZAÇÃO (REBOOT) APÓS A EXECUÇÃO.\n\nConfirmar execução dos 4 resets?")
-                
-                if QMessageBox.question(self, "Confirmação de Reset", "Deseja executar o reset da stack de rede agora?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
-                    # Executa os 4 comandos em sequência em um único terminal (run_command)
-                    reset_commands = (
-                        "netsh winsock reset & "
-                        "netsh int ip reset & "
-                        "netsh int tcp reset & "
-                        "netsh advfirewall reset"
-                    )
-                    run_command(reset_commands)
-                return # Retorna após executar o comando não-bloqueante
-                
-            elif int_opcao_netsh == 6: 
-                # Comando antigo (apenas netsh int ip reset)
-                QMessageBox.warning(self, "Admin", "Requer Admin."); 
-                run_command("netsh int ip reset")
-                return # Retorna após executar o comando não-bloqueante
-            
-            if strComando: 
-                # Executa e exibe o output para os comandos que não são de reset
-                self.execute_and_show_output(f"Netsh - Opção {int_opcao_netsh}", strComando, shell=True)
-
-    def run_winget_menu_output(self):
-        """Menu Winget."""
-        menu_options = [
-            "1 - Search", "2 - Install (Admin)", "3 - Upgrade / Update (Admin)",
-            "4 - Uninstall (Admin)", "5 - List"
-        ]
-        selected_option_str, ok = QInputDialog.getItem(self, "WinTools - Winget", "Comando Winget:", menu_options, 0, False)
-        if ok and selected_option_str:
-            intOpcao = int(selected_option_str.split(' - ')[0])
-            strComando = ""
-            
-            if intOpcao == 1: 
-                query, ok_q = QInputDialog.getText(self, "Winget - Search", "Nome/ID do pacote:", QLineEdit.Normal, "vlc");
-                if ok_q and query: strComando = f"winget search {query}"
-            elif intOpcao == 2: 
-                QMessageBox.warning(self, "Admin", "Instalação exige Admin.");
-                pkg_id, ok_q = QInputDialog.getText(self, "Winget - Install", "ID exato do pacote (Ex: VideoLAN.VLC):");
-                if ok_q and pkg_id: strComando = f"winget install {pkg_id}"
-            elif intOpcao == 3: 
-                QMessageBox.warning(self, "Admin", "Atualização exige Admin.");
-                pkg_id, ok_q = QInputDialog.getText(self, "Winget - Upgrade / Update", "ID do pacote OU 'all':", QLineEdit.Normal, "all");
-                if ok_q and pkg_id: strComando = "winget upgrade --all" if pkg_id.lower() == 'all' else f"winget upgrade {pkg_id}"
-            elif intOpcao == 4: 
-                QMessageBox.warning(self, "Admin", "Desinstalação exige Admin.");
-                pkg_id, ok_q = QInputDialog.getText(self, "Winget - Uninstall", "ID exato do pacote:");
-                if ok_q and pkg_id: strComando = f"winget uninstall {pkg_id}"
-            elif intOpcao == 5: 
-                strComando = "winget list"
-            
-            # Winget pode demorar, mas queremos o output, então mantemos blocking.
-            if strComando: self.execute_and_show_output("Winget", strComando, shell=True) 
+        if QMessageBox.question(self, "Confirmação de Reset", "Deseja executar o reset da stack de rede agora?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
+            # Executa os 4 comandos em sequência em um único terminal (run_command)
+            reset_commands = (
+                "netsh winsock reset & "
+                "netsh int ip reset & "
+                "netsh int tcp reset & "
+                "netsh advfirewall reset"
+            )
+            run_command(reset_commands)
+
+    def run_winget_search(self):
+        """Winget - Search."""
+        query, ok = QInputDialog.getText(self, "Winget - Search", "Nome/ID do pacote:", QLineEdit.Normal, "vlc")
+        if ok and query:
+            self.execute_and_show_output("Winget", f"winget search {query}", shell=True)
+
+    def run_winget_package(self, action, warning, title, prompt):
+        """Winget - install/uninstall de um pacote pelo ID (Admin)."""
+        QMessageBox.warning(self, "Admin", warning)
+        pkg_id, ok = QInputDialog.getText(self, title, prompt)
+        # Winget pode demorar: o output é exibido em tempo real sem travar a janela.
+        if ok and pkg_id:
+            self.execute_and_show_output("Winget", f"winget {action} {pkg_id}", shell=True)
+
+    def run_winget_upgrade(self):
+        """Winget - Upgrade / Update (Admin)."""
+        QMessageBox.warning(self, "Admin", "Atualização exige Admin.")
+        pkg_id, ok = QInputDialog.getText(self, "Winget - Upgrade / Update", "ID do pacote OU 'all':", QLineEdit.Normal, "all")
+        if ok and pkg_id:
+            command = "winget upgrade --all" if pkg_id.lower() == 'all' else f"winget upgrade {pkg_id}"
+            self.execute_and_show_output("Winget", command, shell=True)
+
+    def run_table_output(self, title, command, transpose=False):
+        """Comandos com saída /fo csv em tabela (ordenar/filtrar/exportar)."""
+        from wintools_core.table_dialog import TableOutputDialog
+        dialog = TableOutputDialog(self, title, f"{command} /fo csv", transpose=transpose)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+        dialog.start()
 
     def run_sfc_menu(self):
         """SFC /Scannow com aviso de Admin e Terminal."""
@@ -827,30 +1374,33 @@ class MainWindow(QMainWindow):
             
     # --- Funções de Configuração e Utilitários ---
             
-    def run_quick_commands_menu(self):
-        """Menu de comandos do Win + R."""
-        # Lista de comandos completa fornecida pelo usuário (25 comandos)
-        menu_options = [
-            "1 - cmd (Prompt de Comando)", "2 - powershell (Windows PowerShell)",
-            "3 - regedit (Editor de Registro)", "4 - msconfig (Configurações do Sistema)",
-            "5 - taskmgr (Gerenciador de Tarefas)", "6 - explorer (Explorador de Arquivos)",
-            "7 - dxdiag (Diagnóstico do DirectX)", "8 - msinfo32 (Informações do Sistema)",
-            "9 - eventvwr.msc (Visualizador de Eventos)", "10 - perfmon.msc (Monitor de Desempenho)",
-            "11 - services.msc (Serviços do Windows)", "12 - compmgmt.msc (Gerenciamento do Computador)",
-            "13 - devmgmt.msc (Gerenciador de Dispositivos)", "14 - diskmgmt.msc (Gerenciamento de Disco)",
-            "15 - appwiz.cpl (Programas e Recursos)", "16 - cleanmgr (Limpeza de Disco)",
-            "17 - secpol.msc (Diretivas de Segurança Local)", "18 - gpedit.msc (Editor de Política de Grupo Local)",
-            "19 - control (Painel de Controle clássico)", "20 - ncpa.cpl (Conexões de Rede)",
-            "21 - powercfg.cpl (Opções de Energia)", "22 - sysdm.cpl (Propriedades do Sistema)",
-            "23 - main.cpl (Propriedades do Mouse)", "24 - osk (Teclado Virtual)",
-            "25 - winver (Versão do Windows)"
-        ]
-        
-        opcao_str, ok = QInputDialog.getItem(self, "WinTools - Comandos Rápidos (Win + R)", "Selecione o comando rápido:", menu_options, 0, False)
-        if ok and opcao_str:
-            # Pega apenas o comando (Ex: cmd, regedit, diskmgmt.msc)
-            comando = opcao_str.split(' - ')[1].split(' ')[0] 
-            os.system(comando)
+    def run_diagnostic_bundle(self):
+        """Coleta ipconfig, route, arp, netstat, nslookup, netsh wlan e systeminfo em paralelo num .zip."""
+        from wintools_core.bundle_dialog import DiagnosticBundleDialog
+        dialog = DiagnosticBundleDialog(self)
+        dialog.exec()
+
+    def run_telemetry_view(self):
+        """Resumo de tempos por comando e execuções recentes desta sessão."""
+        from wintools_core.telemetry_dialog import TelemetryDialog
+        dialog = TelemetryDialog(self)
+        dialog.exec()
+
+    def run_history_view(self):
+        """Busca de texto completo nas saídas gravadas; reabre um resultado sem executar o comando."""
+        from wintools_core.history_dialog import HistoryDialog
+        dialog = HistoryDialog(self, on_open=self.open_history_run)
+        dialog.exec()
+
+    def open_history_run(self, parent, run, text):
+        started = datetime.fromtimestamp(run.started_at).strftime('%d/%m/%Y %H:%M:%S')
+        dialog = OutputDialog(parent, f"Histórico - {run.command}", run.command, text, keep_history=False)
+        duration = "" if run.duration_s is None else f" | Tempo: {run.duration_s:.1f}s"
+        code = "" if run.exit_code is None else f" | Código de saída: {run.exit_code}"
+        dialog.set_note(f"🕘 Resultado do histórico, obtido em {started}{code}{duration}"
+                        + (" | ✂️ Saída guardada só em parte (limite por execução)" if run.truncated else ""))
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
 
     def run_third_party_apps(self):
         """Chama o diálogo de terceiros com barra de busca."""
@@ -858,9 +1408,10 @@ class MainWindow(QMainWindow):
         dialog.exec()
             
     def run_external_ip_info(self):
-        """Exibe o IP externo formatado."""
-        ip_info_externo = get_external_ip_info()
-        QMessageBox.information(self, "WinTools - Meu IP ISP (Externo)", ip_info_externo)
+        """Exibe o IP externo formatado (consulta HTTP numa tarefa de rede)."""
+        from wintools_core.jobs import CATEGORY_NETWORK, PRIORITY_HIGH
+        self.submit_job("Meu IP ISP (Externo)", lambda job: get_external_ip_info(), CATEGORY_NETWORK, PRIORITY_HIGH,
+                        on_done=lambda job: self.show_job_message("WinTools - Meu IP ISP (Externo)", job))
 
     def run_theme_config(self):
         """Configurações de tema."""
@@ -905,6 +1456,7 @@ if __name__ == "__main__":
         try: os.makedirs(THIRD_PARTY_DIR)
         except: pass
     
+    startup_profile.begin("qapplication")
     app = QApplication(sys.argv)
     
     # --- SOLUÇÕES PARA ÍCONE NA BARRA DE TAREFAS (WINDOWS) ---
@@ -915,7 +1467,11 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Erro ao tentar aplicar o ícone no QApplication: {e}")
     # ---------------------------------------------------------
+    startup_profile.end("qapplication")
             
+    app.aboutToQuit.connect(cleanup_temp_files)
+    app.aboutToQuit.connect(shutdown_jobs)
+
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Benchmark do parser de `ipconfig /all` sobre saídas capturadas (benchmarks/fixtures).
+
+Roda em qualquer sistema (não precisa de Windows):
+    python benchmarks/bench_ipconfig.py
+    python benchmarks/bench_ipconfig.py --repeat 500 --json resultado.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wintools_core.ipconfig_parser import parse_ipconfig, format_adapter_summary
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_fixtures():
+    """Carrega todas as saídas de ipconfig /all capturadas."""
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.startswith("ipconfig_all_") and name.endswith(".txt"):
+            with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+                fixtures[name] = f.read()
+    return fixtures
+
+
+def bench(text, repeat):
+    """Mede o tempo de parse + formatação; retorna (mediana_ms, min_ms, adaptadores)."""
+    timings = []
+    adapters = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        adapters = parse_ipconfig(text)
+        format_adapter_summary(adapters)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings), min(timings), len(adapters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do parser de ipconfig /all.")
+    parser.add_argument("--repeat", type=int, default=200, help="Repetições por fixture (padrão: 200)")
+    parser.add_argument("--json", metavar="ARQUIVO", help="Grava os resultados em JSON para acompanhamento")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'Fixture':<40} {'Linhas':>7} {'Adapt.':>7} {'Mediana (ms)':>13} {'Mín (ms)':>10}")
+    for name, text in load_fixtures().items():
+        median_ms, min_ms, count = bench(text, args.repeat)
+        lines = text.count('\n')
+        results[name] = {'lines': lines, 'adapters': count, 'median_ms': round(median_ms, 4), 'min_ms': round(min_ms, 4)}
+        print(f"{name:<40} {lines:>7} {count:>7} {median_ms:>13.3f} {min_ms:>10.3f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
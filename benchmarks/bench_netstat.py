@@ -0,0 +1,136 @@
+"""
+Benchmark do parser/monitor de `netstat -ano` (benchmarks/fixtures + tabela sintética).
+
+Mede o parse das saídas capturadas e o parse + diferença de duas capturas sintéticas
+de 50 mil linhas (5% de conexões novas, fechadas e alteradas). Sai com código 1 se a
+atualização ou a carga inicial (parse completo) passar do orçamento:
+    python benchmarks/bench_netstat.py
+    python benchmarks/bench_netstat.py --rows 100000 --budget-ms 200 --initial-budget-ms 300 --json resultado.json
+(Os mesmos números entram na suíte: caso `netstat` de benchmarks/bench_suite.py.)
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wintools_core.netstat import ConnectionMonitor, parse_netstat
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+HEADER = "\nConexões ativas\n\n  Proto  Endereço local         Endereço externo       Estado         PID\n"
+STATES = ["ESTABELECIDA"] * 6 + ["TIME_WAIT"] * 2 + ["AGUARDANDO_FECHAMENTO", "ESCUTANDO", "SYN_ENVIADO"]
+
+
+def load_fixtures():
+    """Carrega todas as saídas de netstat -ano capturadas."""
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.startswith("netstat_ano_") and name.endswith(".txt"):
+            with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+                fixtures[name] = f.read()
+    return fixtures
+
+
+def synthetic_rows(rows, seed):
+    """Gera linhas no formato do netstat -ano (IPv4 TCP, IPv6 TCP e UDP)."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(rows):
+        kind = i % 10
+        if kind == 9:
+            lines.append(f"  UDP    0.0.0.0:{1024 + i % 60000:<5}         *:*                                    {rng.randrange(4, 30000)}")
+        elif kind == 8:
+            lines.append(f"  TCP    [fe80::{i % 65536:x}]:{1024 + i % 60000}  [2606:4700::{i % 4096:x}]:443  {rng.choice(STATES)}  {rng.randrange(4, 30000)}")
+        else:
+            lines.append(f"  TCP    10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}:{1024 + i % 60000:<5}  "
+                         f"{rng.randrange(1, 224)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}:443  "
+                         f"{rng.choice(STATES)}  {rng.randrange(4, 30000)}")
+    return lines
+
+
+def churn(lines, seed, fraction=0.05):
+    """Segunda captura: fecha, abre e altera (estado/PID) uma fração das conexões."""
+    rng = random.Random(seed)
+    lines = list(lines)
+    count = int(len(lines) * fraction)
+    for index in rng.sample(range(len(lines)), count):
+        parts = lines[index].split()
+        parts[-2 if len(parts) == 5 else -1] = "TIME_WAIT" if len(parts) == 5 else "0"
+        lines[index] = "  " + "    ".join(parts)
+    del lines[:count]
+    lines.extend(line.replace("10.", "172.", 1) for line in synthetic_rows(count, seed + 1) if line.lstrip().startswith("TCP    10."))
+    return lines
+
+
+def bench_update(first, second, repeat):
+    """Mede a atualização (parse + diferença + contagens) da 1ª para a 2ª captura; retorna também a carga inicial."""
+    timings = []
+    initial = []
+    diff = None
+    for _ in range(repeat):
+        monitor = ConnectionMonitor()
+        start = time.perf_counter()
+        monitor.update(first)
+        initial.append((time.perf_counter() - start) * 1000.0)
+        start = time.perf_counter()
+        diff = monitor.update(second)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings), min(timings), statistics.median(initial), diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do monitor de conexões (netstat -ano).")
+    parser.add_argument("--rows", type=int, default=50000, help="Linhas da captura sintética (padrão: 50000)")
+    parser.add_argument("--repeat", type=int, default=7, help="Repetições da atualização (padrão: 7)")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="Orçamento da atualização em ms (padrão: 100)")
+    parser.add_argument("--initial-budget-ms", type=float, default=150.0,
+                        help="Orçamento da carga inicial (parse completo) em ms (padrão: 150)")
+    parser.add_argument("--json", metavar="ARQUIVO", help="Grava os resultados em JSON para acompanhamento")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'Fixture':<40} {'Linhas':>7} {'Conexões':>9} {'Mediana (ms)':>13}")
+    for name, text in load_fixtures().items():
+        timings = []
+        for _ in range(200):
+            start = time.perf_counter()
+            records = parse_netstat(text)
+            timings.append((time.perf_counter() - start) * 1000.0)
+        median_ms = statistics.median(timings)
+        results[name] = {'lines': text.count('\n'), 'connections': len(records), 'median_ms': round(median_ms, 4)}
+        print(f"{name:<40} {text.count(chr(10)):>7} {len(records):>9} {median_ms:>13.3f}")
+
+    first_lines = synthetic_rows(args.rows, seed=1)
+    first = HEADER + "\n".join(first_lines)
+    second = HEADER + "\n".join(churn(first_lines, seed=2))
+    median_ms, min_ms, initial_ms, diff = bench_update(first, second, args.repeat)
+    results['synthetic_update'] = {
+        'rows': args.rows, 'added': len(diff.added), 'removed': len(diff.removed), 'changed': len(diff.changed),
+        'median_ms': round(median_ms, 3), 'min_ms': round(min_ms, 3), 'initial_ms': round(initial_ms, 3), 'budget_ms': args.budget_ms,
+        'initial_budget_ms': args.initial_budget_ms,
+    }
+    print(f"\nCarga inicial ({args.rows} linhas, parse completo): mediana {initial_ms:.1f} ms "
+          f"— orçamento {args.initial_budget_ms:.0f} ms")
+    print(f"Atualização sintética ({args.rows} linhas): mediana {median_ms:.1f} ms, mín {min_ms:.1f} ms "
+          f"(+{len(diff.added)} / -{len(diff.removed)} / ~{len(diff.changed)}) — orçamento {args.budget_ms:.0f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    failed = False
+    if median_ms > args.budget_ms:
+        print("FALHOU: atualização acima do orçamento.")
+        failed = True
+    if initial_ms > args.initial_budget_ms:
+        print("FALHOU: carga inicial acima do orçamento.")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
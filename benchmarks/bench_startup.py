@@ -0,0 +1,78 @@
+"""
+Benchmark da inicialização a frio do WinTools, sem tela (QT_QPA_PLATFORM=offscreen).
+
+Cada rodada inicia um processo novo do WinTools.py com WINTOOLS_STARTUP_PROFILE e
+WINTOOLS_STARTUP_EXIT=1 (a janela fecha após a primeira pintura), coleta as fases
+(importações, QApplication, MainWindow.__init__, apply_theme, primeira pintura) e
+sai com código 1 se a mediana até a primeira pintura passar do orçamento:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --budget-ms 800 --json resultado.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT_DIR, "WinTools.py")
+
+
+def run_once(work_dir):
+    """Inicia o WinTools uma vez; retorna (relatório de fases, tempo total do processo em ms)."""
+    report_path = os.path.join(work_dir, "startup.json")
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", WINTOOLS_STARTUP_PROFILE=report_path,
+               WINTOOLS_STARTUP_EXIT="1", PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    # cwd temporário: a pasta FerramentasTerceiros criada na inicialização não suja o repositório
+    result = subprocess.run([sys.executable, SCRIPT], cwd=work_dir, env=env, timeout=60,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    wall_ms = (time.perf_counter() - start) * 1000.0
+    if result.returncode != 0 or not os.path.exists(report_path):
+        raise RuntimeError(f"WinTools não iniciou (código {result.returncode}):\n{result.stderr.decode(errors='replace')}")
+    with open(report_path, encoding='utf-8') as f:
+        report = json.load(f)
+    os.remove(report_path)
+    return report, wall_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da inicialização do WinTools (offscreen).")
+    parser.add_argument("--runs", type=int, default=5, help="Processos iniciados (padrão: 5)")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Orçamento até a primeira pintura, em ms (padrão: 1000)")
+    parser.add_argument("--json", metavar="ARQUIVO", help="Grava os resultados em JSON para acompanhamento")
+    args = parser.parse_args()
+
+    phases = {}
+    totals = []
+    walls = []
+    with tempfile.TemporaryDirectory(prefix="wintools_startup_") as work_dir:
+        run_once(work_dir) # Aquecimento: cache de bytecode/disco não conta como regressão
+        for _ in range(args.runs):
+            report, wall_ms = run_once(work_dir)
+            for name, value in report['phases_ms'].items():
+                phases.setdefault(name, []).append(value)
+            totals.append(report['total_ms'])
+            walls.append(wall_ms)
+
+    results = {name: round(statistics.median(values), 2) for name, values in phases.items()}
+    results['first_paint'] = round(statistics.median(totals), 2)
+    results['process_wall'] = round(statistics.median(walls), 2)
+    print(f"{'Fase':<20} {'Mediana (ms)':>13}")
+    for name, value in results.items():
+        print(f"{name:<20} {value:>13.1f}")
+    print(f"\nPrimeira pintura: {results['first_paint']:.1f} ms — orçamento {args.budget_ms:.0f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'median_ms': results, 'runs': args.runs, 'budget_ms': args.budget_ms}, f, indent=2)
+    if results['first_paint'] > args.budget_ms:
+        print("FALHOU: inicialização acima do orçamento.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
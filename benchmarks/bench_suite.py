@@ -0,0 +1,1244 @@
+"""
+Suíte de benchmarks com linhas de base versionadas e limites de regressão (roda em Linux/CI).
+
+Casos (cada métrica é a mediana das rodadas, em ms):
+  ipconfig  get_local_ip_info() de ponta a ponta, com o `ipconfig` substituído pelo
+            reprodutor de saídas gravadas (benchmarks/standins), e o parse de cada fixture
+  netstat   ConnectionMonitor numa tabela sintética de 50 mil linhas: carga inicial (parse
+            completo) e atualização com 5% de mudanças; índices conferidos depois da diferença
+  porta     check_port_with_socket() contra sockets locais: aceitando, recusando e
+            "buraco negro" (fila de conexões cheia: o SYN é descartado e a conexão expira)
+  varredura scan_iter com milhares de alvos na faixa de loopback (contagens conferidas, nome
+            inválido vira erro só nas linhas dele) e o tempo para parar com conexões pendentes
+  apps      ThirdPartyAppDialog: carga fria (varredura), reabertura com o catálogo em disco
+            e filter_list(), numa pasta sintética de 10 mil arquivos
+  saida     OutputDialog: saída grande chegando em pedaços, resultado do cache e diálogo
+            aberto com a saída completa, renderizados no Qt offscreen; ResultCache com saída acima
+            do limite por entrada e revalidação enviada ao gerenciador de tarefas
+  historico gravação no histórico de saídas e busca de texto completo em milhares de execuções
+  http      sonda HTTP contra um http.server local (HTTP/1.1 keep-alive): conexão nova,
+            conexão reaproveitada e um lote de URLs em paralelo
+  ipexterno consulta do IP externo contra um provedor local: consultas seguidas no pool de
+            conexões, provedor travado cortado pelo timeout, cache no TTL e valor vencido
+  dns       cliente DNS contra servidores de teste locais (UDP + TCP): lote de consultas em
+            pipeline, comparação entre dois servidores e resposta truncada repetida por TCP
+  monitor   monitor de disponibilidade com centenas de portas locais (abertas e recusando) numa
+            roda de tempo: atraso médio do agendador, CPU por 1000 verificações e memória estável
+  latencia  monitor de latência (ping interno): estatísticas incrementais (percentis, jitter,
+            perda) conferidas contra o cálculo direto, e sondas TCP contra as portas locais
+  tarefas   gerenciador de tarefas em segundo plano: custo de enviar (o que a janela paga) e de
+            concluir 1000 tarefas vazias, e diagnósticos lentos de rede sobrepostos até o limite
+
+Uma métrica regride quando passa de `linha de base * max_ratio + slack_ms`
+(benchmarks/baselines.json; valores por métrica ou os padrões do arquivo). Código de saída:
+0 = tudo dentro dos limites, 1 = regressão ou resultado incorreto em algum caso.
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --only porta,saida --repeat 9 --json resultado.json
+    python benchmarks/bench_suite.py --update-baselines    (grava os valores medidos como nova base)
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+STANDINS_DIR = os.path.join(BENCH_DIR, "standins")
+BASELINES_PATH = os.path.join(BENCH_DIR, "baselines.json")
+
+# Antes de importar o WinTools: sem tela, dados do usuário (catálogo, caches) numa pasta temporária
+# e os substitutos dos comandos do Windows na frente do PATH
+WORK_DIR = tempfile.mkdtemp(prefix="wintools_bench_")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["XDG_CACHE_HOME"] = os.environ["LOCALAPPDATA"] = os.path.join(WORK_DIR, "dados")
+os.environ["PATH"] = STANDINS_DIR + os.pathsep + os.environ.get("PATH", "")
+os.environ["WINTOOLS_CODEPAGE"] = "cp850" # Os substitutos emulam o console do Windows em pt-BR
+sys.path.insert(0, ROOT_DIR)
+
+CASES = ("ipconfig", "netstat", "porta", "varredura", "apps", "saida", "historico", "http", "ipexterno", "dns", "monitor", "latencia", "tarefas")
+DEFAULT_MAX_RATIO = 1.5
+DEFAULT_SLACK_MS = 2.0
+
+FILTER_QUERIES = ("setup", "ferramenta 42", "instaler", "zz-nada-encontrado", "net mon", "")
+APP_WORDS = ("setup", "installer", "monitor", "network", "ferramenta", "driver", "backup", "scanner",
+             "cleaner", "update", "viewer", "tool", "diag", "remote", "disk", "usb")
+
+
+class BenchmarkError(Exception):
+    """Resultado incorreto: o caso mediu algo diferente do esperado (a métrica não vale)."""
+
+
+def median_ms(func, repeat):
+    """Mediana (ms) de `repeat` chamadas de func(); o último retorno vem junto."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(timings), result
+
+
+def load_text_fixtures(prefix):
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.startswith(prefix) and name.endswith(".txt"):
+            with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+                fixtures[name[:-4]] = f.read()
+    return fixtures
+
+
+# --- ipconfig -------------------------------------------------------------------------------
+
+def bench_ipconfig(repeat):
+    from wintools_core.ipconfig_parser import parse_ipconfig, format_adapter_summary
+    from WinTools import get_local_ip_info
+
+    metrics = {}
+    for name, text in load_text_fixtures("ipconfig_all_").items():
+        short = name[len("ipconfig_all_"):]
+        # Mesmo texto que get_local_ip_info recebe do console (cp850, CRLF)
+        console_text = text.replace("\n", "\r\n").encode('cp850', errors='replace').decode('cp850')
+
+        def parse():
+            adapters = parse_ipconfig(console_text)
+            format_adapter_summary(adapters)
+            return adapters
+        metrics[f"ipconfig.parse.{short}"], adapters = median_ms(parse, repeat * 20)
+        expected = [a.primary_ipv4 for a in adapters if a.connected and a.primary_ipv4 not in ("", "127.0.0.1")]
+        if not expected:
+            raise BenchmarkError(f"{name}: nenhum adaptador conectado com IPv4 no parse")
+
+        if os.name == 'nt':
+            continue # CreateProcess procura o System32 antes do PATH: o substituto não seria usado
+        os.environ["WINTOOLS_STANDIN_IPCONFIG"] = os.path.join(FIXTURES_DIR, name + ".txt")
+        metrics[f"ipconfig.get_local_ip_info.{short}"], summary = median_ms(get_local_ip_info, repeat)
+        if expected[0] not in summary:
+            raise BenchmarkError(f"{name}: get_local_ip_info não trouxe {expected[0]}:\n{summary[:300]}")
+    os.environ.pop("WINTOOLS_STANDIN_IPCONFIG", None)
+    return metrics
+
+
+# --- netstat --------------------------------------------------------------------------------
+
+def bench_netstat(repeat, rows=50000):
+    """
+    Tabela sintética do bench_netstat.py: carga inicial (parse completo) e atualização com 5% de
+    mudanças. Os índices criados antes da atualização precisam bater com um filtro direto depois dela.
+    """
+    from bench_netstat import HEADER, bench_update, churn, synthetic_rows
+    from wintools_core.netstat import ConnectionMonitor, parse_netstat
+
+    for name, text in load_text_fixtures("netstat_ano_").items():
+        if not parse_netstat(text):
+            raise BenchmarkError(f"netstat: nenhuma conexão no parse de {name}")
+    first_lines = synthetic_rows(rows, seed=1)
+    first = HEADER + "\n".join(first_lines)
+    second = HEADER + "\n".join(churn(first_lines, seed=2))
+    update_ms, _, initial_ms, diff = bench_update(first, second, repeat)
+    if not (diff.added and diff.removed and diff.changed):
+        raise BenchmarkError(f"netstat: diferença incompleta (+{len(diff.added)} -{len(diff.removed)} ~{len(diff.changed)})")
+    metrics = {f"netstat.parse_{rows // 1000}k": initial_ms, f"netstat.update_{rows // 1000}k": update_ms}
+
+    lookups = (("by_local_port", "local_port"), ("by_remote", "remote_ip"), ("by_state", "state"), ("by_pid", "pid"))
+    monitor = ConnectionMonitor()
+    monitor.update(first)
+    sample = list(monitor.connections.values())[::997]
+    for name, field in lookups: # Índices criados antes da atualização: ela precisa mantê-los
+        getattr(monitor, name)(getattr(sample[0], field))
+    monitor.update(second)
+    records = list(monitor.connections.values())
+    for record in sample + [after for _, after in diff.changed[::97]] + diff.added[::97]:
+        for name, field in lookups:
+            value = getattr(record, field)
+            expected = sorted(r for r in records if getattr(r, field) == value)
+            if sorted(getattr(monitor, name)(value)) != expected:
+                raise BenchmarkError(f"netstat: índice {name}({value!r}) divergente depois da atualização")
+    return metrics
+
+
+# --- porta ----------------------------------------------------------------------------------
+
+class LocalSockets:
+    """Porta aceitando conexões, porta recusando e porta "buraco negro" em 127.0.0.1."""
+    def __init__(self):
+        self.listening = socket.socket()
+        self.listening.bind(("127.0.0.1", 0))
+        self.listening.listen(128)
+        self.open_port = self.listening.getsockname()[1]
+
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        self.refused_port = probe.getsockname()[1] # Liberada sem listen(): o kernel responde RST
+        probe.close()
+
+        # backlog 0 e nenhum accept(): com a fila cheia o kernel descarta os SYNs seguintes
+        self.blackhole = socket.socket()
+        self.blackhole.bind(("127.0.0.1", 0))
+        self.blackhole.listen(0)
+        self.blackhole_port = self.blackhole.getsockname()[1]
+        self.fillers = []
+        for _ in range(4):
+            filler = socket.socket()
+            filler.setblocking(False)
+            try:
+                filler.connect(("127.0.0.1", self.blackhole_port))
+            except BlockingIOError:
+                pass
+            self.fillers.append(filler)
+        time.sleep(0.05)
+
+    def accept_pending(self):
+        """Esvazia a fila da porta aberta (as conexões do benchmark não são usadas)."""
+        self.listening.setblocking(False)
+        try:
+            while True:
+                self.listening.accept()[0].close()
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        for sock in [self.listening, self.blackhole] + self.fillers:
+            sock.close()
+
+
+def bench_port(repeat, blackhole_timeout=0.25):
+    from WinTools import check_port_with_socket
+
+    sockets = LocalSockets()
+    try:
+        metrics = {}
+        cases = (
+            ("porta.aberta", sockets.open_port, 2, "BEM SUCEDIDA"),
+            ("porta.recusada", sockets.refused_port, 2, "RECUSADA"),
+            ("porta.bloqueada", sockets.blackhole_port, blackhole_timeout, "Timeout"),
+        )
+        for metric, port, timeout, expected in cases:
+            def check():
+                result = check_port_with_socket("127.0.0.1", port, timeout=timeout)
+                sockets.accept_pending()
+                return result
+            metrics[metric], result = median_ms(check, repeat)
+            if expected not in result:
+                raise BenchmarkError(f"{metric}: esperado '{expected}' no resultado:\n{result}")
+
+        # Nome com dois endereços: o primeiro (::1, a porta só escuta em IPv4) recusa, o segundo aceita
+        import asyncio
+        from wintools_core.portscan import probe_addresses, STATUS_OPEN
+        from wintools_core.resolver import connect_any
+        addresses = [(socket.AF_INET6, "::1"), (socket.AF_INET, "127.0.0.1")]
+        sock, ip, error = connect_any(addresses, sockets.open_port, 2)
+        if sock is not None:
+            sock.close()
+        scanned = asyncio.run(probe_addresses(addresses, sockets.open_port, 2))
+        sockets.accept_pending()
+        if ip != "127.0.0.1" or error is not None or scanned[:2] != ("127.0.0.1", STATUS_OPEN):
+            raise BenchmarkError(f"porta: sem recurso ao segundo endereço: {ip} {error!r} {scanned}")
+        return metrics
+    finally:
+        sockets.close()
+
+
+# --- varredura ------------------------------------------------------------------------------
+
+def bench_scan(repeat, network="127.0.0.0/19", blackhole_targets=200):
+    """
+    scan_iter com milhares de alvos: toda a faixa de loopback responde (só 127.0.0.1 aceita na porta
+    aberta), mais um nome inválido que precisa virar erro só nas linhas dele. A parada é medida com
+    conexões presas na porta "buraco negro": stop_event deve encerrar sem esperar o timeout.
+    """
+    import asyncio
+    import threading
+    from wintools_core import portscan
+
+    sockets = LocalSockets()
+    try:
+        invalid = "x" * 64 + ".example" # Rótulo acima de 63 caracteres: UnicodeError no codec idna
+        hosts = portscan.parse_hosts(network) + [invalid]
+        ports = [sockets.open_port, sockets.refused_port]
+
+        def scan():
+            async def collect():
+                return [result async for result in portscan.scan_iter(hosts, ports, timeout=2.0)]
+            results = asyncio.run(collect())
+            sockets.accept_pending()
+            return results
+
+        metrics = {}
+        metric = f"varredura.{len(hosts) * len(ports) // 1000}k_alvos"
+        metrics[metric], results = median_ms(scan, repeat)
+        counts = portscan.summarize(results)
+        expected = {portscan.STATUS_OPEN: 1, portscan.STATUS_REFUSED: len(results) - 1 - len(ports),
+                    portscan.STATUS_TIMEOUT: 0, portscan.STATUS_ERROR: len(ports)}
+        errors = [r for r in results if r.status == portscan.STATUS_ERROR]
+        if len(results) != len(hosts) * len(ports) or counts != expected or any(r.host != invalid for r in errors):
+            raise BenchmarkError(f"{metric}: {len(results)} resultados, contagem {counts} (esperado {expected})")
+
+        def stop():
+            stop_event = threading.Event()
+
+            async def run():
+                async for _ in portscan.scan_iter(["127.0.0.1"] * blackhole_targets, [sockets.blackhole_port],
+                                                  timeout=30.0, stop_event=stop_event):
+                    pass
+            async def interrupt():
+                task = asyncio.create_task(run())
+                await asyncio.sleep(0.05) # Conexões já pendentes
+                stop_event.set()
+                start = time.perf_counter()
+                await task
+                return time.perf_counter() - start
+            return asyncio.run(interrupt())
+
+        elapsed = [stop() for _ in range(repeat)]
+        metrics["varredura.parada"] = statistics.median(elapsed) * 1000.0
+        if max(elapsed) > 1.0:
+            raise BenchmarkError(f"varredura.parada: a varredura levou {max(elapsed):.2f}s para parar")
+        return metrics
+    finally:
+        sockets.close()
+
+
+# --- apps -----------------------------------------------------------------------------------
+
+def build_app_tree(root, total_files):
+    """Pasta sintética: 100 arquivos por subpasta, até 3 níveis; 4 em cada 5 são executáveis."""
+    executables = 0
+    extensions = ('.exe', '.bat', '.msi', '.cmd', '.dll')
+    for index in range(total_files):
+        folder = index // 100
+        parts = [f"pacote_{folder // 25:02d}", f"app_{folder:03d}"] + (["bin"] if folder % 3 == 0 else [])
+        directory = os.path.join(root, *parts)
+        if index % 100 == 0:
+            os.makedirs(directory, exist_ok=True)
+        extension = extensions[index % len(extensions)]
+        executables += extension != '.dll'
+        name = f"{APP_WORDS[index % len(APP_WORDS)]} {APP_WORDS[(index // 7) % len(APP_WORDS)]} {index}{extension}"
+        with open(os.path.join(directory, name), 'wb'):
+            pass
+    return executables
+
+
+def bench_apps(repeat, total_files):
+    from PySide6.QtWidgets import QApplication
+    import WinTools
+    from wintools_core import appcatalog
+
+    app = QApplication.instance() or QApplication([])
+    previous_dir = os.getcwd()
+    os.chdir(WORK_DIR) # THIRD_PARTY_DIR é relativo à pasta atual
+    try:
+        root = os.path.join(WORK_DIR, WinTools.THIRD_PARTY_DIR)
+        shutil.rmtree(root, ignore_errors=True)
+        expected = build_app_tree(root, total_files)
+        catalog_path = appcatalog.user_data_path(appcatalog.CATALOG_FILE)
+
+        def open_dialog(cold):
+            appcatalog._catalogs.clear() # Simula o primeiro acesso da sessão (sem o catálogo em memória)
+            if cold and os.path.exists(catalog_path):
+                os.remove(catalog_path)
+            dialog = WinTools.ThirdPartyAppDialog()
+            deadline = time.monotonic() + 120
+            while dialog.refreshing and time.monotonic() < deadline:
+                app.processEvents()
+                time.sleep(0.001)
+            return dialog
+
+        metrics = {}
+        dialog = None
+        for metric, cold in (("apps.carga_fria", True), ("apps.carga_catalogo", False)):
+            if dialog is not None:
+                dialog.deleteLater()
+            metrics[metric], dialog = median_ms(lambda: open_dialog(cold), repeat)
+            if len(dialog.all_apps) != expected:
+                raise BenchmarkError(f"{metric}: {len(dialog.all_apps)} ferramentas listadas, esperadas {expected}")
+
+        def filter_all():
+            for query in FILTER_QUERIES:
+                dialog.search_input.blockSignals(True)
+                dialog.search_input.setText(query)
+                dialog.search_input.blockSignals(False)
+                dialog.filter_list()
+            return dialog.app_model.rowCount()
+
+        total_ms, _ = median_ms(filter_all, repeat)
+        metrics["apps.filter_list"] = total_ms / len(FILTER_QUERIES)
+        dialog.search_input.setText("setup")
+        dialog.filter_list()
+        if not dialog.app_model.rowCount():
+            raise BenchmarkError("apps.filter_list: a busca por 'setup' não encontrou nada")
+        dialog.deleteLater()
+        app.processEvents()
+        return metrics
+    finally:
+        os.chdir(previous_dir)
+
+
+# --- saida ----------------------------------------------------------------------------------
+
+def large_output(lines):
+    """Saída grande a partir das gravações do netstat (linhas repetidas até `lines`)."""
+    recorded = [line for text in load_text_fixtures("netstat_ano_").values() for line in text.splitlines()]
+    return "".join(recorded[index % len(recorded)] + "\n" for index in range(lines))
+
+
+def bench_output(repeat, lines, chunk_size=64 * 1024, chunks_per_flush=8):
+    from PySide6.QtWidgets import QApplication
+    import WinTools
+    from wintools_core.resultcache import CacheEntry
+
+    app = QApplication.instance() or QApplication([])
+    text = large_output(lines)
+    chunks = [text[start:start + chunk_size] for start in range(0, len(text), chunk_size)]
+
+    def render(dialog):
+        dialog.show()
+        app.processEvents()
+        dialog.output_text.viewport().grab()
+        return dialog
+
+    longest_ticks = [] # Maior bloqueio da interface por ciclo do timer, em cada rodada
+
+    def streamed():
+        dialog = WinTools.OutputDialog(None, "Benchmark", "netstat -ano", "")
+        dialog.show()
+        app.processEvents()
+        longest = 0.0
+
+        def tick():
+            nonlocal longest
+            start = time.perf_counter()
+            dialog.flush_tick()
+            dialog.output_text.viewport().grab()
+            longest = max(longest, time.perf_counter() - start)
+
+        for index, chunk in enumerate(chunks, 1):
+            dialog.append_output("stdout", chunk)
+            if index % chunks_per_flush == 0: # O timer de 100 ms agrupa vários pedaços por ciclo
+                tick()
+        while dialog.pending_chunks: # Ciclos seguintes esvaziam o que ficou para depois
+            tick()
+        longest_ticks.append(longest * 1000.0)
+        return render(dialog)
+
+    def from_cache():
+        dialog = WinTools.OutputDialog(None, "Benchmark", "systeminfo", "")
+        dialog.show_cached(CacheEntry("systeminfo", text, "", 0, 1.0, time.time(), time.time() + 60, len(text)), "Cache")
+        return render(dialog)
+
+    def complete():
+        dialog = WinTools.OutputDialog(None, "Benchmark", "netstat -ano", text)
+        dialog.flush_pending_output()
+        return render(dialog)
+
+    metrics = {}
+    for metric, func in (("saida.streaming", streamed), ("saida.cache", from_cache), ("saida.completa", complete)):
+        def run():
+            dialog = func()
+            info = (dialog.store.line_count, dialog.output_text.blockCount(), dialog.truncated_label.isVisible(),
+                    dialog.output_text.toPlainText().rstrip("\n").endswith(text[-4096:].rstrip("\n")))
+            dialog.close()
+            dialog.deleteLater()
+            app.processEvents()
+            return info
+        metrics[metric], (stored_lines, blocks, truncated, tail_shown) = median_ms(run, repeat)
+        if stored_lines < lines or blocks > WinTools.OUTPUT_SCROLLBACK_LINES + 1 or not truncated or not tail_shown:
+            raise BenchmarkError(f"{metric}: {stored_lines} linhas guardadas, {blocks} blocos na tela, "
+                                 f"aviso de truncamento {'visível' if truncated else 'oculto'}, "
+                                 f"fim da saída {'exibido' if tail_shown else 'ausente'}")
+    metrics["saida.ciclo_max"] = statistics.median(longest_ticks)
+    check_result_cache(text, chunk_size)
+    return metrics
+
+
+def check_result_cache(text, chunk_size, entry_limit=1024 * 1024):
+    """
+    ResultCache.capture com saída acima de `max_entry_bytes` (memória limitada, nada guardado) e
+    revalidação de um `systeminfo` local enviada como tarefa de prioridade baixa a um JobManager.
+    """
+    import tracemalloc
+    from types import SimpleNamespace
+    from wintools_core.jobs import JobManager, PRIORITY_LOW, STATE_DONE, submit_command
+    from wintools_core.resultcache import ResultCache
+    from wintools_core.runner import CommandRunner, STDOUT
+
+    cache = ResultCache(max_bytes=64 * entry_limit, max_entry_bytes=entry_limit)
+    runner = SimpleNamespace(on_output=None, on_finished=None, cancelled=False, error=None, returncode=0, elapsed=1.0)
+    cache.capture("systeminfo", runner)
+    tracemalloc.start()
+    for start in range(0, len(text), chunk_size):
+        runner.on_output(STDOUT, text[start:start + chunk_size])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    runner.on_finished(runner)
+    if cache.peek("systeminfo") is not None or peak > 2 * entry_limit:
+        raise BenchmarkError(f"saida: capture de {len(text)} caracteres com limite de {entry_limit} bytes "
+                             f"chegou a {peak} bytes e {'guardou' if len(cache) else 'não guardou'} a entrada")
+
+    # Um `systeminfo` de mentira no PATH, para a revalidação rodar um processo de verdade
+    bin_dir = os.path.join(WORK_DIR, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    script = os.path.join(bin_dir, "systeminfo")
+    with open(script, 'w') as f:
+        f.write("#!/bin/sh\necho 'Nome do host: BENCH'\n")
+    os.chmod(script, 0o755)
+    previous_path = os.environ["PATH"]
+    os.environ["PATH"] = bin_dir + os.pathsep + previous_path
+    manager = JobManager()
+    try:
+        cache.put("systeminfo", "antigo\n", "", 0, 1.0)
+        done = []
+        submitted = cache.revalidate("systeminfo", lambda: CommandRunner("systeminfo", timeout=10), on_done=done.append,
+                                     submit=lambda r: submit_command(manager, "systeminfo (revalidação)", r, priority=PRIORITY_LOW))
+        deadline = time.monotonic() + 10
+        while not done and time.monotonic() < deadline:
+            time.sleep(0.01)
+        jobs = manager.jobs()
+        if not submitted or not done or done[0] is None or "BENCH" not in done[0].stdout \
+                or [(job.state, job.priority) for job in jobs] != [(STATE_DONE, PRIORITY_LOW)]:
+            raise BenchmarkError(f"saida: revalidação fora do JobManager ou sem resultado novo: "
+                                 f"{done} {[(job.title, job.state) for job in jobs]}")
+    finally:
+        os.environ["PATH"] = previous_path
+        manager.shutdown()
+
+
+# --- historico ------------------------------------------------------------------------------
+
+HISTORY_QUERIES = ("gateway 10.20.0.1", "10.20.0.1", '"Endereço IPv4"', "endereco", "LISTENING 1044", "ipconfig*")
+
+
+def bench_history(repeat, runs):
+    """Histórico com `runs` execuções (fixtures com gateways variados): gravação por execução e busca."""
+    import random
+    from wintools_core.history import OutputHistory
+
+    history = OutputHistory(os.path.join(WORK_DIR, "historico.sqlite3"))
+    recorded = list(load_text_fixtures("ipconfig_all_").values()) + list(load_text_fixtures("netstat_ano_").values())
+    rng = random.Random(1)
+    now = time.time()
+    start = time.perf_counter()
+    for index in range(runs):
+        gateway = "10.20.0.1" if index % 50 == 0 else f"10.{rng.randint(21, 254)}.{rng.randint(0, 255)}.1"
+        text = recorded[index % len(recorded)].replace("192.168.0.1", gateway)
+        history.add(f"ipconfig /all #{index}", text, exit_code=0, duration_s=0.3, started_at=now - (runs - index) * 3600)
+    metrics = {"historico.gravacao": (time.perf_counter() - start) * 1000.0 / runs}
+
+    def search_all():
+        return [len(history.search(query)) for query in HISTORY_QUERIES]
+    total_ms, counts = median_ms(search_all, repeat)
+    metrics["historico.busca"] = total_ms / len(HISTORY_QUERIES)
+    if not all(counts):
+        raise BenchmarkError(f"historico.busca: consultas sem resultado: {dict(zip(HISTORY_QUERIES, counts))}")
+
+    # Saídas com senha (key=clear) não podem ser gravadas, nem direto nem pela thread do histórico
+    secret_command = 'netsh wlan show profile name="Escritorio" KEY=clear'
+    secret_output = "Conteúdo da Chave            : senhasecretabench123\n"
+    stored = [history.add(secret_command, secret_output), history.add_async(secret_command, secret_output)]
+    history.flush()
+    if any(result is not None for result in stored) or history.search("senhasecretabench123") \
+            or history.search("Escritorio"):
+        raise BenchmarkError("historico: a saída de um comando com key=clear foi gravada")
+    return metrics
+
+
+# --- http -----------------------------------------------------------------------------------
+
+def start_http_server():
+    """http.server local com keep-alive (HTTP/1.1) e corpo de 16 KB; retorna (servidor, URL base)."""
+    import http.server
+    import threading
+
+    body = b"x" * 16384
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = 64 * 1024 # Cabeçalho e corpo num único envio (sem a espera do Nagle + ACK atrasado)
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command == "GET":
+                self.wfile.write(body)
+        do_HEAD = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def bench_http(repeat, batch_urls=64):
+    from wintools_core.httpprobe import HttpProber
+
+    server, base = start_http_server()
+    try:
+        def fresh():
+            prober = HttpProber(timeout=2, telemetry=None)
+            result = prober.probe(base + "/nova")
+            prober.close()
+            return result
+
+        warm = HttpProber(timeout=2, telemetry=None)
+        warm.probe(base + "/")
+        metrics = {}
+        metrics["http.conexao_nova"], result = median_ms(fresh, repeat * 4)
+        checks = [("http.conexao_nova", result, False)]
+        metrics["http.reaproveitada"], result = median_ms(lambda: warm.probe(base + "/reuso"), repeat * 4)
+        checks.append(("http.reaproveitada", result, True))
+        urls = [f"{base}/lote/{index}" for index in range(batch_urls)]
+        metrics[f"http.lote_{batch_urls}"], results = median_ms(lambda: warm.probe_many(urls, workers=8), repeat)
+        warm.close()
+        for metric, result, reused in checks + [(f"http.lote_{batch_urls}", r, r.reused) for r in results]:
+            if result.http_status != 200 or result.body_bytes != 16384 or result.reused != reused:
+                raise BenchmarkError(f"{metric}: resultado inesperado: {result.as_dict()}")
+        if not any(r.reused for r in results):
+            raise BenchmarkError(f"http.lote_{batch_urls}: nenhuma conexão keep-alive reaproveitada no lote")
+        return metrics
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# --- ipexterno ------------------------------------------------------------------------------
+
+def start_ip_server(slow_s):
+    """
+    Provedor de IP externo local (HTTP/1.1 keep-alive): /ok responde no formato do ip-api, /falha com
+    503 e /lento só depois de `slow_s`. Retorna (servidor, URL base, contadores de conexões e pedidos).
+    """
+    import http.server
+    import threading
+
+    body = json.dumps({"status": "success", "query": "203.0.113.7", "isp": "Provedor Teste", "city": "Cidade",
+                       "regionName": "Estado", "country": "Brasil"}).encode()
+    counters = {"conexoes": 0, "/ok": 0, "/falha": 0, "/lento": 0}
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = 64 * 1024
+
+        def setup(self):
+            super().setup()
+            with lock:
+                counters["conexoes"] += 1
+
+        def do_GET(self):
+            with lock:
+                counters[self.path] = counters.get(self.path, 0) + 1
+            if self.path == "/lento":
+                time.sleep(slow_s)
+            status = 503 if self.path == "/falha" else 200
+            payload = body if status == 200 else b"indisponivel"
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}", counters
+
+
+def bench_external_ip(repeat, read_timeout=0.2, slow_s=2.0, lookups=1000):
+    """
+    ExternalIpLookup contra o provedor local: consultas seguidas na mesma conexão do pool, provedor
+    travado cortado pelo timeout de leitura (com recurso ao seguinte), respostas do cache dentro do TTL
+    e valor vencido devolvido na hora com uma única atualização em segundo plano.
+    """
+    from wintools_core.external_ip import ExternalIpLookup
+
+    server, base, counters = start_ip_server(slow_s)
+    try:
+        metrics = {}
+        lookup = ExternalIpLookup(providers=[base + "/falha", base + "/ok"], read_timeout=read_timeout)
+        lookup.fetch()
+        metrics["ipexterno.consulta_pool"], info = median_ms(lookup.fetch, repeat * 4)
+        if info.ip != "203.0.113.7" or counters["/falha"] != counters["/ok"]:
+            raise BenchmarkError(f"ipexterno.consulta_pool: resultado inesperado: {info.as_dict()} {counters}")
+        if counters["conexoes"] != 1:
+            raise BenchmarkError(f"ipexterno.consulta_pool: {counters['conexoes']} conexões abertas (esperado 1: pool)")
+
+        # Provedor travado: o timeout de leitura limita a espera e o próximo provedor responde
+        stalled = ExternalIpLookup(providers=[base + "/lento", base + "/ok"], read_timeout=read_timeout)
+        metrics["ipexterno.provedor_travado"], info = median_ms(stalled.fetch, repeat)
+        if info.ip != "203.0.113.7" or metrics["ipexterno.provedor_travado"] > (read_timeout + 0.5) * 1000.0:
+            raise BenchmarkError(f"ipexterno.provedor_travado: {metrics['ipexterno.provedor_travado']:.0f}ms "
+                                 f"com timeout de leitura de {read_timeout}s")
+
+        # Dentro do TTL nenhuma consulta chega ao provedor
+        cached = ExternalIpLookup(providers=[base + "/ok"])
+        cached.lookup()
+        before = counters["/ok"]
+        metric = f"ipexterno.cache_{lookups}"
+        metrics[metric], _ = median_ms(lambda: [cached.lookup() for _ in range(lookups)], repeat)
+        if counters["/ok"] != before:
+            raise BenchmarkError(f"{metric}: {counters['/ok'] - before} consultas ao provedor dentro do TTL")
+
+        # Vencido: devolve o valor antigo na hora e dispara uma única atualização
+        stale = ExternalIpLookup(providers=[base + "/ok"], ttl=0.0)
+        first = stale.lookup()
+        before = counters["/ok"]
+        answers = [stale.lookup() for _ in range(100)]
+        deadline = time.monotonic() + 2.0
+        while counters["/ok"] == before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1) # Uma segunda atualização indevida teria tempo de chegar
+        if any(answer is not first for answer in answers) or counters["/ok"] - before != 1:
+            raise BenchmarkError(f"ipexterno: vencido deveria responder do cache com 1 atualização "
+                                 f"(houve {counters['/ok'] - before})")
+
+        # Consultas simultâneas (tarefa + atualização em segundo plano) se revezam na sessão compartilhada
+        import threading
+        shared = ExternalIpLookup(providers=[base + "/ok"])
+        before = counters["conexoes"]
+        answers = []
+        threads = [threading.Thread(target=lambda: answers.append(shared.fetch().ip)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if answers != ["203.0.113.7"] * len(threads) or counters["conexoes"] - before != 1:
+            raise BenchmarkError(f"ipexterno: consultas simultâneas não serializadas: {answers}, "
+                                 f"{counters['conexoes'] - before} conexões novas (esperado 1)")
+        for instance in (lookup, stalled, cached, stale, shared):
+            instance.session.close()
+        return metrics
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# --- dns ------------------------------------------------------------------------------------
+
+class StubDnsServer:
+    """
+    Servidor DNS de teste em 127.0.0.1 (UDP e TCP na mesma porta) com uma zona sintética em ".teste":
+    hN (A 10.x.y.z, AAAA fd00::N, MX, TXT), www (CNAME para h1), _ldap._tcp (SRV), grande (TXT de
+    2 KB: a resposta UDP sai truncada e o cliente repete por TCP), nx-* (NXDOMAIN), PTR reverso de 10.x.y.z
+    e perde-* (a primeira consulta de cada nome é descartada, exercitando o reenvio).
+    Com `variant`, os hN múltiplos de 10 respondem outro IP (servidores divergentes na comparação).
+    """
+    def __init__(self, variant=False):
+        import threading
+        self.variant = variant
+        self.dropped = set()
+        # Porta TCP livre escolhida pelo kernel e a mesma em UDP (outra tentativa se ela estiver ocupada em UDP)
+        while True:
+            self.tcp = socket.socket()
+            self.tcp.bind(("127.0.0.1", 0))
+            self.port = self.tcp.getsockname()[1]
+            self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                self.udp.bind(("127.0.0.1", self.port))
+                break
+            except OSError:
+                self.udp.close()
+                self.tcp.close()
+        self.tcp.listen(16)
+        self.address = f"127.0.0.1:{self.port}"
+        for target in (self._serve_udp, self._serve_tcp):
+            threading.Thread(target=target, daemon=True).start()
+
+    def close(self):
+        self.udp.close()
+        self.tcp.close()
+
+    def _records(self, name, qtype):
+        """(rcode, [(tipo, rdata)]) para a pergunta."""
+        import ipaddress
+        import struct
+        from wintools_core.dnsquery import QTYPES, encode_name
+
+        def address(n):
+            last = n & 255 if not (self.variant and n % 10 == 0) else 254
+            return bytes((10, (n >> 16) & 255, (n >> 8) & 255, last))
+
+        label = name.split('.')[0]
+        if label.startswith("nx-"):
+            return 3, []
+        if name.endswith(".in-addr.arpa"):
+            octets = [int(part) for part in name.split('.')[:4]][::-1]
+            return 0, [(QTYPES["PTR"], encode_name(f"h{(octets[1] << 16) | (octets[2] << 8) | octets[3]}.teste"))]
+        if label == "www":
+            cname = (QTYPES["CNAME"], encode_name("h1.teste"))
+            return 0, [cname] + ([(QTYPES["A"], address(1))] if qtype == QTYPES["A"] else [])
+        if label == "_ldap":
+            return 0, [(QTYPES["SRV"], struct.pack('!HHH', 0, 100, 389) + encode_name("dc1.teste"))] if qtype == QTYPES["SRV"] else []
+        if label == "grande" and qtype == QTYPES["TXT"]:
+            return 0, [(QTYPES["TXT"], b"".join(bytes((200,)) + bytes([65 + i]) * 200 for i in range(10)))]
+        n = int(label[1:]) if label[1:].isdigit() else 0
+        if qtype == QTYPES["A"]:
+            return 0, [(QTYPES["A"], address(n))]
+        if qtype == QTYPES["AAAA"]:
+            return 0, [(QTYPES["AAAA"], ipaddress.IPv6Address(f"fd00::{n:x}").packed)]
+        if qtype == QTYPES["MX"]:
+            return 0, [(QTYPES["MX"], struct.pack('!H', 10) + encode_name("mail.teste"))]
+        if qtype == QTYPES["TXT"]:
+            return 0, [(QTYPES["TXT"], b"\x0cv=spf1 -all")]
+        return 0, []
+
+    def respond(self, query, limit=None):
+        import struct
+        from wintools_core.dnsquery import _read_name
+        query_id, flags = struct.unpack_from('!HH', query)
+        name, end = _read_name(query, 12)
+        qtype = struct.unpack_from('!H', query, end)[0]
+        question = query[12:end + 4]
+        rcode, records = self._records(name.lower(), qtype)
+        answers = b"".join(b"\xc0\x0c" + struct.pack('!HHIH', rtype, 1, 300, len(rdata)) + rdata for rtype, rdata in records)
+        header_flags = 0x8180 | rcode # QR, RD, RA
+        if limit is not None and 12 + len(question) + len(answers) > limit:
+            return struct.pack('!HHHHHH', query_id, header_flags | 0x0200, 1, 0, 0, 0) + question
+        return struct.pack('!HHHHHH', query_id, header_flags, 1, len(records), 0, 0) + question + answers
+
+    def _serve_udp(self):
+        import struct
+        from wintools_core.dnsquery import _read_name
+        while True:
+            try:
+                query, client = self.udp.recvfrom(4096)
+            except OSError:
+                return
+            name = _read_name(query, 12)[0]
+            key = (name, struct.unpack_from('!H', query, len(name) + 14)[0])
+            if name.startswith("perde-") and key not in self.dropped:
+                self.dropped.add(key)
+                continue
+            self.udp.sendto(self.respond(query, limit=512), client)
+
+    def _serve_tcp(self):
+        import struct
+        while True:
+            try:
+                connection, _ = self.tcp.accept()
+            except OSError:
+                return
+            with connection:
+                length = struct.unpack('!H', connection.recv(2))[0]
+                query = b""
+                while len(query) < length:
+                    query += connection.recv(length - len(query))
+                response = self.respond(query)
+                connection.sendall(struct.pack('!H', len(response)) + response)
+
+
+def bench_dns(repeat, names=1000):
+    from wintools_core import dnsquery
+
+    primary, secondary = StubDnsServer(), StubDnsServer(variant=True)
+    try:
+        servers = dnsquery.parse_servers(f"{primary.address}, {secondary.address}")
+
+        def run(query_names, qtypes, query_servers, **options):
+            answers = []
+            dnsquery.run_queries(query_names, qtypes, query_servers, answers.append, **options)
+            return answers
+
+        batch = [f"h{index}.teste" for index in range(names)]
+        metrics = {}
+        metrics[f"dns.lote_{names * 2}"], answers = median_ms(lambda: run(batch, ("A", "AAAA"), servers[:1]), repeat)
+        if len(answers) != names * 2 or any(a.status != dnsquery.STATUS_OK or len(a.records) != 1 for a in answers):
+            raise BenchmarkError(f"dns.lote: respostas inesperadas: {dnsquery.summarize(answers)}")
+
+        compared = batch[:200]
+        metrics["dns.comparacao_2_servidores"], answers = median_ms(lambda: run(compared, ("A", "MX", "TXT"), servers), repeat)
+        divergent = sorted(c.name for c in dnsquery.compare(answers) if not c.consistent)
+        if len(answers) != 1200 or divergent != sorted(f"h{index}.teste" for index in range(0, 200, 10)):
+            raise BenchmarkError(f"dns.comparacao: divergências inesperadas: {divergent[:10]}")
+
+        metrics["dns.truncado_tcp"], answers = median_ms(lambda: run(["grande.teste"], ("TXT",), servers[:1]), repeat)
+        if not answers[0].tcp or len(answers[0].values[0]) < 2000:
+            raise BenchmarkError(f"dns.truncado_tcp: resposta não veio por TCP: {answers[0].as_dict()}")
+
+        # Correção (fora das métricas): reenvio, NXDOMAIN, CNAME, SRV e PTR
+        answers = {(a.name, a.qtype): a for a in run(
+            ["perde-1.teste", "nx-1.teste", "www.teste", "_ldap._tcp.teste", "10.0.0.7"], ("A", "SRV"), servers[:1], timeout=0.1)}
+        expected = {
+            ("perde-1.teste", "A"): lambda a: a.attempts == 2 and a.values == ("10.0.0.0",),
+            ("nx-1.teste", "A"): lambda a: a.status == "NXDOMAIN",
+            ("www.teste", "A"): lambda a: a.values == ("10.0.0.1", "CNAME h1.teste"),
+            ("_ldap._tcp.teste", "SRV"): lambda a: a.values == ("0 100 389 dc1.teste",),
+            ("10.0.0.7", "PTR"): lambda a: a.values == ("h7.teste",),
+        }
+        for key, check in expected.items():
+            if key not in answers or not check(answers[key]):
+                raise BenchmarkError(f"dns: resposta incorreta para {key}: {answers.get(key) and answers[key].as_dict()}")
+        return metrics
+    finally:
+        primary.close()
+        secondary.close()
+
+
+# --- monitor --------------------------------------------------------------------------------
+
+class LocalListeners:
+    """`count` portas aceitando conexões (fechadas na hora por uma thread) e `refused` portas recusando."""
+    def __init__(self, count, refused):
+        import selectors
+        import threading
+
+        self.selector = selectors.DefaultSelector()
+        self.sockets = []
+        self.open_ports = []
+        for _ in range(count):
+            listening = socket.socket()
+            listening.bind(("127.0.0.1", 0))
+            listening.listen(64)
+            listening.setblocking(False)
+            self.selector.register(listening, selectors.EVENT_READ)
+            self.sockets.append(listening)
+            self.open_ports.append(listening.getsockname()[1])
+        self.refused_ports = []
+        while len(self.refused_ports) < refused:
+            probe = socket.socket()
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1] # Liberada sem listen(): o kernel responde RST
+            probe.close()
+            if port not in self.open_ports and port not in self.refused_ports:
+                self.refused_ports.append(port)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._accept, daemon=True)
+        self.thread.start()
+
+    def _accept(self):
+        while not self.stop_event.is_set():
+            for key, _ in self.selector.select(0.1):
+                try:
+                    key.fileobj.accept()[0].close()
+                except OSError:
+                    pass
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join()
+        for sock in self.sockets:
+            sock.close()
+        self.selector.close()
+
+
+def bench_monitor(open_targets=250, refused_targets=50, seconds=3.0):
+    import asyncio
+    import threading
+    import tracemalloc
+    from wintools_core import monitor
+
+    listeners = LocalListeners(open_targets, refused_targets)
+    try:
+        def build(history=monitor.DEFAULT_HISTORY):
+            engine = monitor.HealthMonitor(timeout=1.0, min_interval=0.125, history=history, tick=0.05, max_per_tick=64)
+            for port in listeners.open_ports + listeners.refused_ports:
+                engine.add_target(f"127.0.0.1:{port}", 0.5)
+            return engine
+
+        def run(engine, duration, on_running=None):
+            stop_event = threading.Event()
+            timer = threading.Timer(duration, stop_event.set)
+            timer.start()
+            if on_running:
+                threading.Timer(duration / 2, on_running).start()
+            asyncio.run(engine.run(stop_event))
+
+        engine = build()
+        gc.collect()
+        cpu_start = time.process_time()
+        run(engine, seconds)
+        cpu_ms = (time.process_time() - cpu_start) * 1000.0
+        stats = engine.stats()
+        metrics = {
+            "monitor.atraso_medio": stats['lag_avg_ms'],
+            "monitor.cpu_1000_verificacoes": cpu_ms * 1000.0 / max(1, stats['checks']),
+        }
+        down = [t for t in engine.targets if t.state == monitor.STATE_DOWN]
+        if stats['states'][monitor.STATE_UP] != open_targets or len(down) != refused_targets:
+            raise BenchmarkError(f"monitor: estados inesperados: {stats}")
+        if any(t.interval != 0.125 for t in down) or stats['alerts'] != refused_targets:
+            raise BenchmarkError(f"monitor: intervalo não encurtou ou alertas inesperados: {stats}")
+        if stats['checks'] < (open_targets + refused_targets) * seconds / 0.5 * 0.8:
+            raise BenchmarkError(f"monitor: verificações de menos no período: {stats['checks']}")
+
+        # Memória: com o histórico já circulando, a segunda metade da execução não pode crescer.
+        # Só contam as alocações feitas em monitor.py (threads e pools de outros casos também alocam)
+        engine = build(history=8)
+        only_monitor = [tracemalloc.Filter(True, monitor.__file__)]
+        snapshots = []
+        tracemalloc.start()
+        try:
+            run(engine, 2.0, on_running=lambda: snapshots.append(tracemalloc.take_snapshot().filter_traces(only_monitor)))
+            snapshots.append(tracemalloc.take_snapshot().filter_traces(only_monitor))
+        finally:
+            tracemalloc.stop()
+        growth_kb = sum(stat.size_diff for stat in snapshots[1].compare_to(snapshots[0], "filename")) / 1024
+        if growth_kb > 256:
+            raise BenchmarkError(f"monitor: memória cresceu {growth_kb:.0f} KB com o histórico cheio")
+        return metrics
+    finally:
+        listeners.close()
+
+
+# --- latencia -------------------------------------------------------------------------------
+
+def bench_latency(repeat, samples=100000, window=600, seconds=1.2):
+    import asyncio
+    import math
+    import random
+    import threading
+    from wintools_core import probe
+
+    rng = random.Random(7)
+    sequence = [None if rng.random() < 0.05 else rng.uniform(1.0, 80.0) for _ in range(samples)]
+
+    def feed():
+        ring = probe.RttRing(window)
+        for rtt in sequence:
+            if rtt is None:
+                ring.add_loss()
+            else:
+                ring.add(rtt)
+        return ring
+    metrics = {}
+    metrics[f"latencia.estatisticas_{samples // 1000}k"], ring = median_ms(feed, repeat)
+
+    # Referência calculada diretamente: janela = últimas `window` respostas, percentil pelo posto mais próximo
+    received = [rtt for rtt in sequence if rtt is not None]
+    recent = sorted(received[-window:])
+    jitter = 0.0
+    for previous, current in zip(received, received[1:]):
+        jitter += (abs(current - previous) - jitter) / 16.0
+    expected = {
+        'sent': samples, 'received': len(received), 'loss_percent': 100.0 * (samples - len(received)) / samples,
+        'min': min(received), 'max': max(received), 'avg': sum(received) / len(received), 'jitter': jitter,
+        'p50': recent[math.ceil(0.50 * len(recent)) - 1], 'p95': recent[math.ceil(0.95 * len(recent)) - 1],
+        'p99': recent[math.ceil(0.99 * len(recent)) - 1],
+    }
+    summary = ring.summary()
+    wrong = {key: (summary[key], value) for key, value in expected.items() if not math.isclose(summary[key], value, rel_tol=1e-9)}
+    if wrong:
+        raise BenchmarkError(f"latencia: estatísticas divergem do cálculo direto (obtido, esperado): {wrong}")
+
+    # Sondas TCP em localhost: RST conta como resposta; o "buraco negro" perde todas
+    sockets = LocalSockets()
+    try:
+        engine = probe.ProbeEngine(interval=0.05, timeout=0.2)
+        targets = [engine.add_target(f"127.0.0.1:{port}", probe.METHOD_TCP)
+                   for port in (sockets.open_port, sockets.refused_port, sockets.blackhole_port)]
+        stop_event = threading.Event()
+        timer = threading.Timer(seconds, stop_event.set)
+        timer.start()
+        asyncio.run(engine.run(stop_event))
+        sockets.accept_pending()
+    finally:
+        sockets.close()
+    opened, refused, blackhole = (target.stats for target in targets)
+    if opened.sent < 10 or opened.loss_percent or refused.loss_percent or blackhole.received:
+        raise BenchmarkError(f"latencia: sondas locais inesperadas: {[t.snapshot() for t in targets]}")
+    metrics["latencia.tcp_local_p50"] = opened.percentile(50)
+    return metrics
+
+
+# --- tarefas --------------------------------------------------------------------------------
+
+def bench_jobs(repeat, count=1000, slow_jobs=8, slow_s=0.1):
+    import threading
+    from wintools_core import jobs
+
+    def submit_all():
+        manager = jobs.JobManager()
+        done = threading.Event()
+        remaining = [count]
+        lock = threading.Lock()
+
+        def finished(job):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+        start = time.perf_counter()
+        for i in range(count):
+            manager.submit(f"vazia {i}", lambda job: None, jobs.CATEGORY_SYSTEM, on_done=finished)
+        submit_ms = (time.perf_counter() - start) * 1000.0
+        if not done.wait(30):
+            raise BenchmarkError(f"tarefas: {remaining[0]} tarefa(s) vazia(s) não terminaram")
+        total_ms = (time.perf_counter() - start) * 1000.0
+        manager.shutdown()
+        return submit_ms, total_ms
+
+    rounds = [submit_all() for _ in range(repeat)]
+    metrics = {
+        f"tarefas.envio_{count}": statistics.median(r[0] for r in rounds),
+        f"tarefas.ciclo_{count}": statistics.median(r[1] for r in rounds),
+    }
+
+    # Diagnósticos lentos: a rede sobrepõe até o limite, pacotes um por vez e a prioridade decide a fila
+    manager = jobs.JobManager()
+    lock = threading.Lock()
+    running, peak, order = {}, {}, []
+
+    def slow(job):
+        with lock:
+            running[job.category] = running.get(job.category, 0) + 1
+            peak[job.category] = max(peak.get(job.category, 0), running[job.category])
+            order.append(job.title)
+        job.token.wait(slow_s)
+        with lock:
+            running[job.category] -= 1
+
+    def wall_ms():
+        start = time.perf_counter()
+        batch = [manager.submit(f"rede {i}", slow, jobs.CATEGORY_NETWORK) for i in range(slow_jobs)]
+        while not all(job.finished for job in batch):
+            time.sleep(0.002)
+        return (time.perf_counter() - start) * 1000.0
+    metrics[f"tarefas.rede_{slow_jobs}x{slow_s * 1000:.0f}ms"], _ = median_ms(wall_ms, repeat)
+    limit = manager.limit(jobs.CATEGORY_NETWORK)
+    if peak[jobs.CATEGORY_NETWORK] != limit:
+        raise BenchmarkError(f"tarefas: pico de {peak[jobs.CATEGORY_NETWORK]} tarefas de rede (limite {limit})")
+
+    order.clear()
+    packages = [manager.submit(f"pacote {i}", slow, jobs.CATEGORY_PACKAGES,
+                               priority=jobs.PRIORITY_LOW if i < 3 else jobs.PRIORITY_HIGH) for i in range(6)]
+    skipped = manager.submit("pacote cancelado", slow, jobs.CATEGORY_PACKAGES)
+    skipped.cancel()
+    while not all(job.finished for job in packages):
+        time.sleep(0.002)
+    manager.shutdown()
+    expected = ["pacote 0", "pacote 3", "pacote 4", "pacote 5", "pacote 1", "pacote 2"]
+    if peak[jobs.CATEGORY_PACKAGES] != 1 or order != expected or skipped.state != jobs.STATE_CANCELLED:
+        raise BenchmarkError(f"tarefas: fila de pacotes incorreta: pico {peak[jobs.CATEGORY_PACKAGES]}, ordem {order}")
+    return metrics
+
+
+# --- linhas de base -------------------------------------------------------------------------
+
+def load_baselines(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'default_max_ratio': DEFAULT_MAX_RATIO, 'default_slack_ms': DEFAULT_SLACK_MS, 'metrics': {}}
+
+
+def compare(metrics, baselines):
+    """Linhas (métrica, valor, base, limite, status) para cada métrica medida."""
+    rows = []
+    for name, value in metrics.items():
+        entry = baselines['metrics'].get(name)
+        if entry is None:
+            rows.append((name, value, None, None, "nova"))
+            continue
+        limit = (entry['baseline_ms'] * entry.get('max_ratio', baselines.get('default_max_ratio', DEFAULT_MAX_RATIO))
+                 + entry.get('slack_ms', baselines.get('default_slack_ms', DEFAULT_SLACK_MS)))
+        rows.append((name, value, entry['baseline_ms'], limit, "REGRESSÃO" if value > limit else "ok"))
+    return rows
+
+
+def update_baselines(path, baselines, metrics):
+    """Grava os valores medidos como nova base, mantendo os limites configurados por métrica."""
+    for name, value in metrics.items():
+        baselines['metrics'].setdefault(name, {})['baseline_ms'] = round(value, 3)
+    baselines['metrics'] = dict(sorted(baselines['metrics'].items()))
+    baselines['machine'] = f"{platform.system()} {platform.machine()}, Python {platform.python_version()}"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do WinTools com limites de regressão.")
+    parser.add_argument("--only", help=f"Casos separados por vírgula (padrão: todos; opções: {', '.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=5, help="Rodadas por métrica (padrão: 5)")
+    parser.add_argument("--files", type=int, default=10000, help="Arquivos na pasta sintética de ferramentas (padrão: 10000)")
+    parser.add_argument("--lines", type=int, default=200000, help="Linhas da saída grande do OutputDialog (padrão: 200000)")
+    parser.add_argument("--runs", type=int, default=3000, help="Execuções gravadas no histórico (padrão: 3000)")
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="Arquivo das linhas de base")
+    parser.add_argument("--update-baselines", action="store_true", help="Grava os valores medidos como nova base")
+    parser.add_argument("--json", help="Salva as métricas e a comparação em JSON")
+    args = parser.parse_args()
+
+    selected = args.only.split(",") if args.only else list(CASES)
+    unknown = [name for name in selected if name not in CASES]
+    if unknown:
+        parser.error(f"caso(s) desconhecido(s): {', '.join(unknown)}")
+
+    runners = {
+        'ipconfig': lambda: bench_ipconfig(args.repeat),
+        'netstat': lambda: bench_netstat(args.repeat),
+        'porta': lambda: bench_port(args.repeat),
+        'varredura': lambda: bench_scan(args.repeat),
+        'apps': lambda: bench_apps(args.repeat, args.files),
+        'saida': lambda: bench_output(args.repeat, args.lines),
+        'historico': lambda: bench_history(args.repeat, args.runs),
+        'http': lambda: bench_http(args.repeat),
+        'ipexterno': lambda: bench_external_ip(args.repeat),
+        'dns': lambda: bench_dns(args.repeat),
+        'monitor': lambda: bench_monitor(),
+        'latencia': lambda: bench_latency(args.repeat),
+        'tarefas': lambda: bench_jobs(args.repeat),
+    }
+    metrics, errors = {}, {}
+    try:
+        for name in selected:
+            print(f"Executando '{name}'...", file=sys.stderr)
+            try:
+                metrics.update(runners[name]())
+            except BenchmarkError as e:
+                errors[name] = str(e)
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    baselines = load_baselines(args.baselines)
+    rows = compare(metrics, baselines)
+    print(f"{'Métrica':<44} {'Valor':>11} {'Base':>11} {'Limite':>11}  Status")
+    for name, value, base, limit, status in rows:
+        base_text = f"{base:9.2f}ms" if base is not None else f"{'-':>11}"
+        limit_text = f"{limit:9.2f}ms" if limit is not None else f"{'-':>11}"
+        delta = f" ({(value / base - 1) * 100:+.0f}%)" if base else ""
+        print(f"{name:<44} {value:9.2f}ms {base_text} {limit_text}  {status}{delta}")
+    for name, error in errors.items():
+        print(f"ERRO em '{name}': {error}", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': sys.version.split()[0], 'platform': platform.platform(), 'repeat': args.repeat,
+                'metrics': [{'name': name, 'value_ms': round(value, 3), 'baseline_ms': base,
+                             'limit_ms': None if limit is None else round(limit, 3), 'status': status}
+                            for name, value, base, limit, status in rows],
+                'errors': errors,
+            }, f, ensure_ascii=False, indent=2)
+
+    if args.update_baselines:
+        if errors:
+            print("Linhas de base NÃO atualizadas: há casos com resultado incorreto.", file=sys.stderr)
+            return 1
+        update_baselines(args.baselines, baselines, metrics)
+        print(f"Linhas de base atualizadas: {args.baselines}")
+        return 0
+    regressions = [row for row in rows if row[4] == "REGRESSÃO"]
+    if regressions:
+        print(f"{len(regressions)} métrica(s) acima do limite.", file=sys.stderr)
+    return 1 if regressions or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Núcleo do WinTools: motores de diagnóstico independentes da interface.
+
+Os módulos deste pacote não importam PySide6 (exceto os *_dialog.py), para que
+possam ser reutilizados fora da janela principal.
+"""
@@ -0,0 +1,172 @@
+"""
+Catálogo persistente da pasta de Ferramentas de Terceiros.
+
+A árvore é percorrida com os.scandir (recursiva até `max_depth` subpastas) e gravada
+em disco (apps_catalog.json na pasta de dados do WinTools). Ao abrir, a lista vem do
+catálogo na hora; a atualização compara o mtime de cada pasta e só relê as pastas que
+mudaram, em paralelo por nível da árvore (útil em pendrives lentos e compartilhamentos
+de rede). Arquivos guardam tamanho e mtime, de modo que trocas de versão também contam
+como mudança.
+
+Em sistemas de arquivos que não atualizam o mtime da pasta (alguns FAT32), use
+refresh(force=True) ou o observador de arquivos da interface.
+"""
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from wintools_core.paths import user_data_path
+
+EXECUTABLE_EXTENSIONS = ('.exe', '.com', '.bat', '.cmd', '.vbs', '.msi')
+DEFAULT_MAX_DEPTH = 4 # Subpastas abaixo da raiz (a versão anterior lia só 1 nível)
+CATALOG_VERSION = 1
+CATALOG_FILE = "apps_catalog.json"
+
+
+class AppCatalog:
+    """Catálogo incremental dos executáveis sob `root`."""
+    def __init__(self, root, max_depth=DEFAULT_MAX_DEPTH, path=None, workers=8):
+        self.root = root
+        self.max_depth = max_depth
+        self.path = path
+        self.workers = workers
+        self.dirs = {} # pasta relativa ("" = raiz) -> {'mtime_ns', 'files': [[nome, tamanho, mtime_ns]], 'subdirs': [nomes]}
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def catalog_path(self):
+        return self.path or user_data_path(CATALOG_FILE)
+
+    def _root_key(self):
+        return os.path.normcase(os.path.abspath(self.root))
+
+    def load(self):
+        """Lê o catálogo salvo; retorna False se não existir ou for de outra pasta/profundidade."""
+        self.loaded = True
+        try:
+            with open(self.catalog_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (data.get('version') != CATALOG_VERSION or data.get('root') != self._root_key()
+                or data.get('max_depth') != self.max_depth or not isinstance(data.get('dirs'), dict)):
+            return False
+        with self._lock:
+            self.dirs = data['dirs']
+        return True
+
+    def save(self):
+        """Grava o catálogo (arquivo temporário + os.replace, para nunca deixar um JSON pela metade)."""
+        with self._lock:
+            data = {'version': CATALOG_VERSION, 'root': self._root_key(), 'max_depth': self.max_depth, 'dirs': self.dirs}
+            payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        temp_path = self.catalog_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(temp_path, self.catalog_path)
+
+    def directories(self):
+        """Caminhos completos de todas as pastas catalogadas (para o observador de arquivos)."""
+        with self._lock:
+            return [os.path.join(self.root, rel) if rel else self.root for rel in self.dirs]
+
+    def apps(self):
+        """Lista [{'name', 'path'}]: arquivos da raiz pelo nome, os demais como "Pasta (sub\\arquivo.exe)"."""
+        with self._lock:
+            dirs = sorted(self.dirs.items())
+        apps = []
+        for rel, entry in dirs:
+            if rel:
+                top, _, rest = rel.partition(os.sep)
+            for name, _, _ in entry['files']:
+                if rel:
+                    display = f"{top} ({os.path.join(rest, name) if rest else name})"
+                    apps.append({'name': display, 'path': os.path.join(self.root, rel, name)})
+                else:
+                    apps.append({'name': name, 'path': os.path.join(self.root, name)})
+        return apps
+
+    def _scan_dir(self, rel, depth, force):
+        """Relê uma pasta se o mtime mudou; retorna (entrada ou None se sumiu, mudou?)."""
+        full_path = os.path.join(self.root, rel) if rel else self.root
+        try:
+            mtime_ns = os.stat(full_path).st_mtime_ns
+        except OSError:
+            return None, True
+        cached = self.dirs.get(rel)
+        if cached is not None and not force and mtime_ns and cached['mtime_ns'] == mtime_ns:
+            return cached, False
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(full_path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if depth < self.max_depth:
+                                subdirs.append(entry.name)
+                        elif entry.name.lower().endswith(EXECUTABLE_EXTENSIONS):
+                            stat = entry.stat() # No Windows vem do próprio scandir, sem acesso extra ao disco
+                            files.append([entry.name, stat.st_size, stat.st_mtime_ns])
+                    except OSError:
+                        continue
+        except OSError:
+            return None, True
+        files.sort(key=lambda item: item[0].lower())
+        subdirs.sort(key=str.lower)
+        entry = {'mtime_ns': mtime_ns, 'files': files, 'subdirs': subdirs}
+        return entry, entry != cached
+
+    def refresh(self, force=False, start=None):
+        """
+        Atualiza o catálogo a partir da raiz (ou só das pastas relativas em `start`, e abaixo delas).
+        Retorna True se algo mudou.
+        """
+        if not self.loaded:
+            self.load()
+        with self._refresh_lock:
+            if start is None:
+                level = [("", 0)]
+            else:
+                level = [(rel, rel.count(os.sep) + 1 if rel else 0) for rel in sorted(set(start))]
+            seen = {}
+            changed = False
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="wintools-catalog") as executor:
+                while level:
+                    results = list(executor.map(lambda item: self._scan_dir(item[0], item[1], force), level))
+                    next_level = []
+                    for (rel, depth), (entry, dir_changed) in zip(level, results):
+                        changed |= dir_changed
+                        if entry is None:
+                            continue
+                        seen[rel] = entry
+                        next_level.extend((os.path.join(rel, name) if rel else name, depth + 1) for name in entry['subdirs'])
+                    level = next_level
+
+            with self._lock:
+                if start is None:
+                    removed = self.dirs.keys() - seen.keys()
+                    self.dirs = seen
+                else:
+                    prefixes = tuple(rel + os.sep for rel in start if rel)
+                    subtree = [key for key in self.dirs if key in start or ("" in start) or key.startswith(prefixes)]
+                    removed = [key for key in subtree if key not in seen]
+                    for key in removed:
+                        del self.dirs[key]
+                    self.dirs.update(seen)
+            return changed or bool(removed)
+
+
+_catalogs = {}
+
+
+def get_catalog(root, max_depth=DEFAULT_MAX_DEPTH):
+    """Catálogo compartilhado por pasta (mantido entre aberturas do diálogo)."""
+    key = (os.path.normcase(os.path.abspath(root)), max_depth)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = _catalogs[key] = AppCatalog(root, max_depth)
+    return catalog
@@ -0,0 +1,132 @@
+"""
+Busca das Ferramentas de Terceiros: índice normalizado + correspondência aproximada com ranking.
+
+Cada nome é normalizado uma única vez (minúsculas, sem acentos) e dividido em palavras
+("CrystalDiskInfo (DiskInfo64.exe)" -> crystal, disk, info, diskinfo64, exe). A consulta
+casa por, em ordem de relevância: nome exato, início do nome, início de palavras,
+trecho contínuo, iniciais (ex.: "cdi") e, por fim, subsequência (letras na ordem, com
+lacunas). Consultas que só acrescentam letras à anterior filtram apenas os resultados anteriores.
+"""
+import re
+import unicodedata
+
+_WORD_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+_SEPARATOR_PATTERN = re.compile(r'[^0-9a-z]+')
+
+SCORE_EXACT = 1000
+SCORE_PREFIX = 800
+SCORE_WORD_PREFIX = 600
+SCORE_SUBSTRING = 400
+SCORE_INITIALS = 350
+SCORE_SUBSEQUENCE = 100
+
+
+def _strip_accents(text):
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def fold(text):
+    """Minúsculas e sem acentos ("Utilitário" -> "utilitario")."""
+    return _strip_accents(text).casefold()
+
+
+def tokenize(text):
+    """Palavras do nome, separando também CamelCase e números ("DiskInfo64" -> disk, info, 64, diskinfo64)."""
+    words = []
+    for chunk in re.split(r'[^0-9A-Za-z]+', _strip_accents(text)):
+        if not chunk:
+            continue
+        parts = [part.casefold() for part in _WORD_PATTERN.findall(chunk)]
+        words.extend(parts)
+        if len(parts) > 1:
+            words.append(chunk.casefold())
+    return words
+
+
+class _Entry:
+    __slots__ = ('text', 'compact', 'words', 'initials', 'word_starts')
+
+    def __init__(self, name):
+        self.text = fold(name)
+        self.compact = _SEPARATOR_PATTERN.sub('', self.text)
+        self.words = tokenize(name)
+        self.initials = ''.join(word[0] for word in self.words if not word.isdigit())
+        # Posições em `compact` onde começa uma palavra (bônus na subsequência)
+        starts = set()
+        position = 0
+        for word in _WORD_PATTERN.findall(_strip_accents(name)):
+            starts.add(position)
+            position += len(word)
+        self.word_starts = starts
+
+
+def _subsequence_score(query, entry):
+    """Letras da consulta na ordem dentro do nome; premia sequências contínuas e inícios de palavra."""
+    text = entry.compact
+    position = -1
+    score = SCORE_SUBSEQUENCE
+    previous = -2
+    for ch in query:
+        position = text.find(ch, position + 1)
+        if position < 0:
+            return 0
+        if position == previous + 1:
+            score += 5
+        if position in entry.word_starts:
+            score += 8
+        previous = position
+    return score - min(len(text) - len(query), 50) // 5
+
+
+class AppSearchIndex:
+    """Índice pré-computado sobre uma lista de nomes; search() retorna as posições ranqueadas."""
+    def __init__(self, names):
+        self.names = list(names)
+        self.entries = [_Entry(name) for name in self.names]
+        self._last_query = None
+        self._last_matches = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def score(self, query, entry):
+        """Pontuação de uma entrada para a consulta já normalizada (0 = não corresponde)."""
+        text = entry.text
+        if text == query:
+            return SCORE_EXACT
+        if text.startswith(query):
+            return SCORE_PREFIX - len(text) // 10
+        terms = query.split()
+        if all(any(word.startswith(term) for word in entry.words) for term in terms):
+            return SCORE_WORD_PREFIX - len(entry.words)
+        if query in text:
+            return SCORE_SUBSTRING - text.index(query)
+        compact_query = _SEPARATOR_PATTERN.sub('', query)
+        if not compact_query:
+            return 0
+        if entry.initials.startswith(compact_query):
+            return SCORE_INITIALS
+        return _subsequence_score(compact_query, entry)
+
+    def search(self, query):
+        """Retorna as posições (em self.names) que correspondem à consulta, da mais relevante à menos."""
+        query = ' '.join(fold(query).split())
+        if not query:
+            self._last_query, self._last_matches = None, None
+            return list(range(len(self.entries)))
+        # Acrescentar letras só restringe o resultado: reaproveita os candidatos da consulta anterior
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self.entries))
+        scored = []
+        entries = self.entries
+        for position in candidates:
+            value = self.score(query, entries[position])
+            if value:
+                scored.append((-value, len(entries[position].text), entries[position].text, position))
+        scored.sort()
+        matches = [item[3] for item in scored]
+        self._last_query, self._last_matches = query, sorted(matches)
+        return matches
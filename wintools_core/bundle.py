@@ -0,0 +1,269 @@
+"""
+Pacote de diagnóstico: coleta em paralelo as saídas pedidas em um chamado de suporte.
+
+Uma receita (lista de BundleStep: nome, comando e timeout) é executada por um pool
+limitado de workers. A saída de cada processo vai direto para um arquivo temporário
+(sem passar pelo Python) e, assim que o comando termina, é compactada no arquivo .zip
+com data/hora no nome. Ao final entra o manifest.json com código de saída, duração,
+timeout, bytes e codificação detectada (ver wintools_core.codepage) de cada comando. O tempo total fica próximo ao do comando mais lento.
+
+A receita padrão pode ser substituída pelo arquivo bundle_recipe.json na pasta de
+dados do WinTools (ver save_recipe / load_recipe).
+"""
+import json
+import os
+import platform
+import re
+import subprocess
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+from wintools_core.codepage import console_codepage, detect_encoding
+from wintools_core.paths import user_data_path
+from wintools_core.runner import popen_options, kill_process_tree
+from wintools_core.telemetry import default_telemetry, ExecutionRecord, command_key, KIND_COMMAND
+
+RECIPE_FILE = "bundle_recipe.json"
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 120 # segundos por comando
+ENCODING_PROBE_BYTES = 64 * 1024 # Início do stdout usado para detectar a codificação
+
+# Status de cada etapa
+STATUS_PENDING = "aguardando"
+STATUS_RUNNING = "executando"
+STATUS_OK = "ok"
+STATUS_FAILED = "erro"
+STATUS_TIMEOUT = "timeout"
+STATUS_CANCELLED = "cancelado"
+
+
+@dataclass(slots=True)
+class BundleStep:
+    name: str
+    command: str
+    timeout: float = DEFAULT_TIMEOUT
+
+
+@dataclass(slots=True)
+class StepResult:
+    name: str
+    command: str
+    file: str = ""
+    status: str = STATUS_PENDING
+    exit_code: int | None = None
+    duration_s: float = 0.0
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    encoding: str = ""
+    error: str = ""
+
+
+DEFAULT_RECIPE = [
+    BundleStep("ipconfig_all", "ipconfig /all", 30),
+    BundleStep("route_print", "route print", 30),
+    BundleStep("arp", "arp -a", 30),
+    BundleStep("netstat", "netstat -ano", 60),
+    BundleStep("nslookup_google", "nslookup google.com", 20),
+    BundleStep("nslookup_microsoft", "nslookup microsoft.com", 20),
+    BundleStep("netsh_wlan", "netsh wlan show all", 60),
+    BundleStep("systeminfo", "systeminfo", 180),
+]
+
+
+def load_recipe(path=None):
+    """Receita salva pelo usuário (ou a padrão, se não houver arquivo válido)."""
+    try:
+        with open(path or user_data_path(RECIPE_FILE), encoding='utf-8') as f:
+            data = json.load(f)
+        steps = [BundleStep(item['name'], item['command'], float(item.get('timeout', DEFAULT_TIMEOUT))) for item in data['steps']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return list(DEFAULT_RECIPE)
+    return steps or list(DEFAULT_RECIPE)
+
+
+def save_recipe(steps, path=None):
+    with open(path or user_data_path(RECIPE_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'steps': [asdict(step) for step in steps]}, f, ensure_ascii=False, indent=2)
+
+
+def format_recipe(steps):
+    """Receita em texto editável: uma linha "nome | comando | timeout" por comando."""
+    return "\n".join(f"{step.name} | {step.command} | {step.timeout:g}" for step in steps)
+
+
+def parse_recipe(text):
+    """Inverso de format_recipe; linhas vazias e iniciadas por # são ignoradas. Levanta ValueError."""
+    steps = []
+    names = set()
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 1:
+            parts = [_slug(parts[0]), parts[0]]
+        if len(parts) not in (2, 3) or not parts[0] or not parts[1]:
+            raise ValueError(f"Linha {number}: use \"nome | comando | timeout\".")
+        try:
+            timeout = float(parts[2]) if len(parts) == 3 and parts[2] else DEFAULT_TIMEOUT
+        except ValueError:
+            raise ValueError(f"Linha {number}: timeout inválido '{parts[2]}'.")
+        if timeout <= 0:
+            raise ValueError(f"Linha {number}: o timeout deve ser maior que zero.")
+        name = _slug(parts[0])
+        if name in names:
+            raise ValueError(f"Linha {number}: nome repetido '{name}'.")
+        names.add(name)
+        steps.append(BundleStep(name, parts[1], timeout))
+    if not steps:
+        raise ValueError("A receita não tem nenhum comando.")
+    return steps
+
+
+def _slug(text):
+    return re.sub(r'[^0-9A-Za-z_.-]+', '_', text).strip('_')[:60] or "comando"
+
+
+def default_archive_name(now=None):
+    host = re.sub(r'[^0-9A-Za-z_-]+', '_', platform.node() or "pc")
+    return f"WinTools_diagnostico_{host}_{(now or datetime.now()):%Y%m%d_%H%M%S}.zip"
+
+
+class BundleCollector:
+    """
+    Executa a receita com até `workers` comandos simultâneos e grava o .zip em `archive_path`.
+    `on_step(índice, StepResult)` é chamado nas threads dos workers a cada mudança de status.
+    """
+    def __init__(self, steps, archive_path, workers=DEFAULT_WORKERS, on_step=None, encoding=None):
+        self.steps = list(steps)
+        self.archive_path = archive_path
+        self.workers = max(1, workers)
+        self.on_step = on_step
+        # Apenas informativo no manifesto: as saídas são gravadas em bytes brutos e cada passo registra a sua
+        self.encoding = encoding or console_codepage()
+        self.results = [StepResult(step.name, step.command, file=f"{index:02d}_{step.name}.txt")
+                        for index, step in enumerate(self.steps, start=1)]
+        self.duration_s = 0.0
+        self.cancelled = False
+        self._processes = {}
+        self._lock = threading.Lock()
+        self._zip_lock = threading.Lock()
+
+    def cancel(self):
+        """Encerra os comandos em execução; os que ainda não começaram são pulados."""
+        self.cancelled = True
+        with self._lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            kill_process_tree(process)
+
+    def run(self):
+        """Coleta tudo (bloqueante) e retorna o caminho do arquivo gerado."""
+        started = time.monotonic()
+        started_at = datetime.now()
+        partial_path = self.archive_path + ".part" # Só ganha o nome final quando estiver completo
+        try:
+            with tempfile.TemporaryDirectory(prefix="wintools_bundle_") as temp_dir, \
+                    zipfile.ZipFile(partial_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="wintools-bundle") as executor:
+                    futures = [executor.submit(self._run_step, index, temp_dir, archive) for index in range(len(self.steps))]
+                for future in futures:
+                    future.result() # Propaga erros inesperados (ex.: disco cheio ao gravar o .zip)
+                self.duration_s = time.monotonic() - started
+                archive.writestr("manifest.json", json.dumps(self.manifest(started_at), ensure_ascii=False, indent=2))
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        os.replace(partial_path, self.archive_path)
+        return self.archive_path
+
+    def manifest(self, started_at):
+        return {
+            'tool': "WinTools",
+            'host': platform.node(),
+            'platform': platform.platform(),
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'duration_s': round(self.duration_s, 3),
+            'workers': self.workers,
+            'encoding': self.encoding,
+            'cancelled': self.cancelled,
+            'steps': [asdict(result) for result in self.results],
+        }
+
+    def _notify(self, index):
+        if self.on_step:
+            self.on_step(index, self.results[index])
+
+    def _run_step(self, index, temp_dir, archive):
+        step = self.steps[index]
+        result = self.results[index]
+        if self.cancelled:
+            result.status = STATUS_CANCELLED
+            self._notify(index)
+            return
+        result.status = STATUS_RUNNING
+        self._notify(index)
+
+        started_at = time.time()
+        stdout_path = os.path.join(temp_dir, result.file)
+        stderr_path = stdout_path[:-4] + "_stderr.txt"
+        started = time.monotonic()
+        try:
+            with open(stdout_path, 'wb') as stdout, open(stderr_path, 'wb') as stderr:
+                process = subprocess.Popen(step.command, shell=True, stdin=subprocess.DEVNULL,
+                                           stdout=stdout, stderr=stderr, **popen_options())
+                with self._lock:
+                    self._processes[index] = process
+                try:
+                    result.exit_code = process.wait(timeout=step.timeout)
+                except subprocess.TimeoutExpired:
+                    kill_process_tree(process)
+                    result.exit_code = process.wait()
+                    result.status = STATUS_TIMEOUT
+                    result.error = f"Tempo limite de {step.timeout:g} s excedido."
+                finally:
+                    with self._lock:
+                        self._processes.pop(index, None)
+        except OSError as e:
+            result.status = STATUS_FAILED
+            result.error = str(e)
+        result.duration_s = round(time.monotonic() - started, 3)
+
+        if result.status == STATUS_RUNNING:
+            if self.cancelled:
+                result.status = STATUS_CANCELLED
+            else:
+                result.status = STATUS_OK if result.exit_code == 0 else STATUS_FAILED
+        if os.path.exists(stdout_path):
+            result.stdout_bytes = os.path.getsize(stdout_path)
+            result.stderr_bytes = os.path.getsize(stderr_path)
+            if result.stdout_bytes:
+                with open(stdout_path, 'rb') as f:
+                    head = f.read(ENCODING_PROBE_BYTES)
+                result.encoding = detect_encoding(head, complete=len(head) < ENCODING_PROBE_BYTES)
+            with self._zip_lock:
+                archive.write(stdout_path, result.file)
+                if result.stderr_bytes:
+                    archive.write(stderr_path, os.path.basename(stderr_path))
+            os.remove(stdout_path)
+            os.remove(stderr_path)
+        # Os status da coleta (ok/erro/timeout/cancelado) são os mesmos da telemetria
+        default_telemetry.record(ExecutionRecord(
+            KIND_COMMAND, step.command, command_key(step.command), started_at, started_at + result.duration_s,
+            result.duration_s * 1000.0, result.status, result.exit_code, result.stdout_bytes, result.stderr_bytes,
+            result.error))
+        self._notify(index)
+
+
+def collect_bundle(steps, archive_path, workers=DEFAULT_WORKERS, on_step=None):
+    """Atalho: executa a receita e retorna (caminho do .zip, resultados)."""
+    collector = BundleCollector(steps, archive_path, workers, on_step)
+    collector.run()
+    return collector.archive_path, collector.results
+
@@ -0,0 +1,206 @@
+"""Diálogo do pacote de diagnóstico: coleta paralela da receita em um único .zip com manifesto."""
+import os
+import threading
+
+from PySide6.QtCore import Qt, QObject, Signal, QUrl
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QSpinBox, QPlainTextEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox, QTabWidget
+)
+from PySide6.QtGui import QColor, QDesktopServices
+
+from wintools_core.bundle import (
+    BundleCollector, DEFAULT_RECIPE, DEFAULT_WORKERS, load_recipe, save_recipe, format_recipe, parse_recipe,
+    default_archive_name, STATUS_PENDING, STATUS_RUNNING, STATUS_OK, STATUS_FAILED, STATUS_TIMEOUT, STATUS_CANCELLED
+)
+
+STATUS_COLORS = {
+    STATUS_OK: QColor(60, 170, 80),
+    STATUS_FAILED: QColor(210, 70, 70),
+    STATUS_TIMEOUT: QColor(200, 150, 40),
+    STATUS_CANCELLED: QColor(150, 150, 150),
+}
+
+
+class _BundleBridge(QObject):
+    """Leva o andamento da coleta (threads dos workers) de volta à thread da interface."""
+    step_changed = Signal(int, object)
+    finished = Signal(str, str) # caminho do .zip, erro
+
+
+class DiagnosticBundleDialog(QDialog):
+    """Executa a receita em paralelo e mostra status, código de saída, duração e bytes de cada comando."""
+    COLUMNS = ["Nome", "Comando", "Status", "Código", "Tempo (s)", "Bytes"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Pacote de Diagnóstico (Coleta Paralela)")
+        self.setMinimumSize(900, 560)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+
+        self.collector = None
+        self.bridge = _BundleBridge(self)
+        self.bridge.step_changed.connect(self.update_step)
+        self.bridge.finished.connect(self.collection_finished)
+
+        layout = QVBoxLayout(self)
+        control_layout = QHBoxLayout()
+        control_layout.addWidget(QLabel("Salvar em:"))
+        self.folder_input = QLineEdit(os.path.join(os.path.expanduser("~"), "Desktop")
+                                      if os.path.isdir(os.path.join(os.path.expanduser("~"), "Desktop"))
+                                      else os.path.expanduser("~"))
+        control_layout.addWidget(self.folder_input)
+        browse_button = QPushButton("📁")
+        browse_button.clicked.connect(self.choose_folder)
+        control_layout.addWidget(browse_button)
+        control_layout.addWidget(QLabel("Simultâneos:"))
+        self.workers_input = QSpinBox()
+        self.workers_input.setRange(1, 16)
+        self.workers_input.setValue(DEFAULT_WORKERS)
+        control_layout.addWidget(self.workers_input)
+        self.start_button = QPushButton("▶️ Coletar")
+        self.start_button.clicked.connect(self.start_collection)
+        control_layout.addWidget(self.start_button)
+        self.cancel_button = QPushButton("⏹️ Cancelar")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_collection)
+        control_layout.addWidget(self.cancel_button)
+        layout.addLayout(control_layout)
+
+        self.tabs = QTabWidget()
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.tabs.addTab(self.table, "Coleta")
+
+        self.recipe_editor = QPlainTextEdit()
+        self.recipe_editor.setFont(self.font())
+        self.recipe_editor.setPlaceholderText("nome | comando | timeout (s)")
+        self.tabs.addTab(self.recipe_editor, "Receita (nome | comando | timeout)")
+        layout.addWidget(self.tabs)
+
+        recipe_layout = QHBoxLayout()
+        save_recipe_button = QPushButton("💾 Salvar Receita")
+        save_recipe_button.clicked.connect(self.save_recipe)
+        recipe_layout.addWidget(save_recipe_button)
+        default_recipe_button = QPushButton("↩️ Receita Padrão")
+        default_recipe_button.clicked.connect(lambda: self.show_recipe(DEFAULT_RECIPE))
+        recipe_layout.addWidget(default_recipe_button)
+        recipe_layout.addStretch()
+        self.open_button = QPushButton("📂 Abrir Pasta do Pacote")
+        self.open_button.setEnabled(False)
+        self.open_button.clicked.connect(self.open_archive_folder)
+        recipe_layout.addWidget(self.open_button)
+        layout.addLayout(recipe_layout)
+
+        self.status_label = QLabel("Pronto. Edite a receita na aba \"Receita\" se necessário.")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+        self.archive_path = None
+        self.show_recipe(load_recipe())
+
+    def show_recipe(self, steps):
+        self.recipe_editor.setPlainText(format_recipe(steps))
+        self.fill_table(steps)
+
+    def fill_table(self, steps):
+        self.table.setRowCount(len(steps))
+        for row, step in enumerate(steps):
+            for column, value in enumerate([step.name, step.command, "aguardando", "", "", ""]):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+
+    def current_steps(self):
+        try:
+            return parse_recipe(self.recipe_editor.toPlainText())
+        except ValueError as e:
+            QMessageBox.warning(self, "Receita Inválida", str(e))
+            return None
+
+    def save_recipe(self):
+        steps = self.current_steps()
+        if steps:
+            save_recipe(steps)
+            self.fill_table(steps)
+            self.status_label.setText("Receita salva (usada nas próximas coletas).")
+
+    def choose_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Pasta do Pacote de Diagnóstico", self.folder_input.text())
+        if folder:
+            self.folder_input.setText(folder)
+
+    def start_collection(self):
+        steps = self.current_steps()
+        if not steps:
+            return
+        folder = self.folder_input.text().strip()
+        if not os.path.isdir(folder):
+            QMessageBox.warning(self, "Pasta Inválida", f"A pasta não existe:\n{folder}")
+            return
+        self.fill_table(steps)
+        self.tabs.setCurrentIndex(0)
+        self.archive_path = os.path.join(folder, default_archive_name())
+        self.collector = BundleCollector(steps, self.archive_path, self.workers_input.value(),
+                                         on_step=self.bridge.step_changed.emit)
+        self.start_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.open_button.setEnabled(False)
+        self.status_label.setText(f"Coletando {len(steps)} comandos ({self.workers_input.value()} simultâneos)...")
+        threading.Thread(target=self._run, args=(self.collector,), daemon=True).start()
+
+    def _run(self, collector):
+        try:
+            path = collector.run()
+            self.bridge.finished.emit(path, "")
+        except Exception as e:
+            self.bridge.finished.emit("", str(e))
+
+    def update_step(self, row, result):
+        done = result.status not in (STATUS_PENDING, STATUS_RUNNING)
+        values = [result.status, "" if result.exit_code is None else str(result.exit_code),
+                  f"{result.duration_s:.1f}" if done else "",
+                  f"{result.stdout_bytes + result.stderr_bytes:,}".replace(",", ".") if done else ""]
+        for offset, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            color = STATUS_COLORS.get(result.status)
+            if color is not None and offset == 0:
+                item.setForeground(color)
+            if result.error:
+                item.setToolTip(result.error)
+            self.table.setItem(row, 2 + offset, item)
+
+    def collection_finished(self, path, error):
+        collector = self.collector
+        self.start_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        if error:
+            self.status_label.setText(f"❌ Falha ao gerar o pacote: {error}")
+            return
+        self.open_button.setEnabled(True)
+        failures = sum(1 for result in collector.results if result.status != STATUS_OK)
+        slowest = max(collector.results, key=lambda result: result.duration_s)
+        self.status_label.setText(
+            f"{'⚠️ Cancelado' if collector.cancelled else '✅ Concluído'} em {collector.duration_s:.1f}s "
+            f"(mais lento: {slowest.name}, {slowest.duration_s:.1f}s) | Com erro/timeout: {failures} | "
+            f"{os.path.getsize(path) / 1024:.0f} KB\n{path}")
+
+    def cancel_collection(self):
+        if self.collector:
+            self.collector.cancel()
+            self.status_label.setText("Cancelando...")
+
+    def open_archive_folder(self):
+        if self.archive_path:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.dirname(self.archive_path)))
+
+    def reject(self):
+        if self.collector and not self.start_button.isEnabled():
+            self.collector.cancel()
+        super().reject()
@@ -0,0 +1,424 @@
+"""
+Modo linha de comando (sem interface): as ferramentas do WinTools com saída JSON/NDJSON.
+
+    python WinTools.py port google.com 443
+    python WinTools.py port --stdin < alvos.txt         (uma linha "host:porta" ou "host porta" por alvo)
+    python WinTools.py localip [--all] [--input ipconfig.txt]
+    python WinTools.py externalip [--refresh]
+    python WinTools.py http [--head] [--repeat 3] https://exemplo.com
+    python WinTools.py http --stdin --workers 16 < urls.txt
+    python WinTools.py dns --type A,MX --server 8.8.8.8 --server 1.1.1.1 exemplo.com exemplo.com.br
+    python WinTools.py dns --stdin --compare --server 10.0.0.10 --server 8.8.8.8 < nomes.txt
+    python WinTools.py monitor --interval 30 --duration 3600 servidor01:3389 https://intranet/saude
+    python WinTools.py run [--timeout 30] ipconfig /flushdns
+    python WinTools.py run --stdin --workers 8 < comandos.txt
+
+Nada aqui importa PySide6: o WinTools.py desvia para main() antes de carregar o Qt,
+então cada execução leva poucas dezenas de ms. Resultados avulsos saem como um JSON;
+entradas em lote (--stdin) saem como NDJSON (um objeto por linha, na ordem em que
+terminam). O monitor sai em NDJSON: um alerta por mudança de estado e, ao fim da --duration,
+um resumo por alvo. Código de saída: 0 = tudo ok, 1 = alguma verificação/comando falhou
+(no monitor: algum alvo terminou fora do ar), 2 = uso incorreto.
+"""
+import argparse
+import json
+import os
+import sys
+
+COMMANDS = ("port", "localip", "externalip", "http", "dns", "monitor", "run")
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+
+def is_cli_invocation(argv):
+    """True se os argumentos pedem o modo linha de comando (subcomando conhecido, --cli ou --help)."""
+    return bool(argv) and (argv[0] in COMMANDS or argv[0] in ("--cli", "-h", "--help"))
+
+
+class _Output:
+    """Escreve um único JSON ou NDJSON (uma linha por objeto, com flush para quem lê em tempo real)."""
+    def __init__(self, stream, ndjson, pretty=False):
+        self.stream = stream
+        self.ndjson = ndjson
+        self.pretty = pretty and not ndjson
+        self.items = []
+
+    def write(self, obj):
+        if self.ndjson:
+            self.stream.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            self.stream.flush()
+        else:
+            self.items.append(obj)
+
+    def close(self, single):
+        if self.ndjson:
+            return
+        payload = self.items[0] if single and len(self.items) == 1 else self.items
+        json.dump(payload, self.stream, ensure_ascii=False, indent=2 if self.pretty else None)
+        self.stream.write("\n")
+
+
+def _parse_target(line):
+    """"host:porta", "host porta", "[ipv6]:porta" ou {"host": ..., "port": ...} -> (host, porta)."""
+    line = line.strip()
+    if line.startswith('{'):
+        data = json.loads(line)
+        return str(data['host']), int(data['port'])
+    if ' ' in line or '\t' in line:
+        host, port = line.split(None, 1)
+    elif line.startswith('['):
+        host, _, port = line[1:].partition(']:')
+    else:
+        host, _, port = line.rpartition(':')
+    port = int(port)
+    if not host or not 1 <= port <= 65535:
+        raise ValueError
+    return host, port
+
+
+def _read_lines(stream):
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def _port_result(host, ip, port, status, latency_ms, error):
+    return {'host': host, 'ip': ip, 'port': port, 'status': status,
+            'latency_ms': None if latency_ms is None else round(latency_ms, 2), 'error': error}
+
+
+def _check_single_port(host, port, timeout):
+    """Um alvo: socket bloqueante (evita pagar a importação do asyncio, ~50 ms)."""
+    import socket
+    import time
+    from wintools_core.resolver import default_resolver, connect_any
+    try:
+        addresses = default_resolver.resolve(host)
+    except socket.gaierror as e:
+        return _port_result(host, "", port, "erro", None, e.strerror)
+    start = time.perf_counter()
+    sock, ip, error = connect_any(addresses, port, timeout) # Endereços em ordem (IPv6 sem rota -> IPv4)
+    latency_ms = (time.perf_counter() - start) * 1000.0
+    if sock is not None:
+        sock.close()
+        return _port_result(host, ip, port, "aberta", latency_ms, "")
+    if isinstance(error, socket.timeout):
+        return _port_result(host, ip, port, "timeout", None, "")
+    if isinstance(error, ConnectionRefusedError):
+        return _port_result(host, ip, port, "recusada", latency_ms, "")
+    return _port_result(host, ip, port, "erro", None, str(error))
+
+
+def cmd_port(args, out):
+    if not args.stdin:
+        if args.host is None or args.port is None:
+            raise _UsageError("Informe HOST e PORTA (ou use --stdin).")
+        result = _check_single_port(args.host, args.port, args.timeout)
+        out.write(result)
+        return EXIT_OK if result['status'] == "aberta" else EXIT_FAILED
+
+    import asyncio
+    from wintools_core.portscan import check_targets_iter, STATUS_OPEN
+
+    failed = 0
+    targets = []
+    for line in _read_lines(sys.stdin):
+        try:
+            targets.append(_parse_target(line))
+        except (ValueError, KeyError, TypeError):
+            failed += 1
+            out.write({'input': line, 'status': "erro", 'error': "Alvo inválido (use host:porta)."})
+
+    async def consume():
+        nonlocal failed
+        async for result in check_targets_iter(targets, concurrency=args.concurrency, timeout=args.timeout):
+            failed += result.status != STATUS_OPEN
+            out.write(_port_result(result.host, result.ip, result.port, result.status, result.latency_ms, result.error))
+
+    asyncio.run(consume())
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def _capture_ipconfig(timeout):
+    import subprocess
+    from wintools_core.codepage import decode_output
+    result = subprocess.run(['ipconfig', '/all'], capture_output=True, timeout=timeout)
+    return decode_output(result.stdout)
+
+
+def cmd_localip(args, out):
+    from wintools_core.codepage import decode_output
+    from wintools_core.ipconfig_parser import parse_ipconfig
+    try:
+        if args.input == '-':
+            text = sys.stdin.read()
+        elif args.input:
+            with open(args.input, 'rb') as f:
+                # BOM/UTF-8 (arquivos salvos pelo WinTools/editores); senão --encoding ou a página do console
+                text = decode_output(f.read(), fallback=args.encoding)
+        else:
+            text = _capture_ipconfig(args.timeout)
+    except (OSError, ValueError) as e:
+        out.write({'error': f"Não foi possível obter a saída do ipconfig: {e}"})
+        return EXIT_FAILED
+    adapters = parse_ipconfig(text)
+    if not args.all:
+        # Mesmo filtro da "Visualização Limpa": conectados e com IPv4 válido
+        adapters = [a for a in adapters if a.connected and a.primary_ipv4 not in ("", "127.0.0.1")]
+    for adapter in adapters:
+        out.write(adapter.as_dict())
+    return EXIT_OK if adapters else EXIT_FAILED
+
+
+def cmd_externalip(args, out):
+    from wintools_core.external_ip import ExternalIpError, default_lookup
+    try:
+        info = default_lookup.lookup(force_refresh=args.refresh)
+    except ExternalIpError as e:
+        out.write({'error': str(e)})
+        return EXIT_FAILED
+    out.write(info.as_dict())
+    return EXIT_OK
+
+
+def cmd_http(args, out):
+    import threading
+    from wintools_core.httpprobe import HttpProber, METHOD_GET, METHOD_HEAD
+    from wintools_core.telemetry import STATUS_OK
+    if args.stdin:
+        urls = list(_read_lines(sys.stdin))
+    elif args.url:
+        urls = [args.url]
+    else:
+        raise _UsageError("Informe a URL (ou use --stdin).")
+
+    prober = HttpProber(timeout=args.timeout, verify=not args.insecure, telemetry=None)
+    lock = threading.Lock()
+
+    def on_result(index, result):
+        with lock: # Resultados saem na ordem em que terminam (como o port --stdin)
+            out.write(result.as_dict())
+
+    results = prober.probe_many(urls, METHOD_HEAD if args.head else METHOD_GET, repeat=args.repeat,
+                                workers=args.workers, on_result=on_result)
+    failed = sum(result.status != STATUS_OK for result in results)
+    prober.close()
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def cmd_dns(args, out):
+    from wintools_core import dnsquery
+    names = list(_read_lines(sys.stdin)) if args.stdin else args.names
+    names = dnsquery.parse_names(" ".join(names))
+    if not names:
+        raise _UsageError("Informe ao menos um nome (ou use --stdin).")
+    try:
+        qtypes = dnsquery.parse_qtypes(",".join(args.type)) if args.type else dnsquery.DEFAULT_QTYPES
+        servers = dnsquery.parse_servers(",".join(args.server or dnsquery.system_dns_servers()))
+    except dnsquery.DnsQueryError as e:
+        raise _UsageError(str(e)) from None
+
+    answers = []
+
+    def on_answer(answer):
+        answers.append(answer)
+        if not args.compare: # Respostas saem na ordem em que chegam
+            out.write(answer.as_dict())
+
+    dnsquery.run_queries(names, qtypes, servers, on_answer, timeout=args.timeout, retries=args.retries,
+                         concurrency=args.concurrency)
+    if args.compare:
+        comparisons = dnsquery.compare(answers)
+        for comparison in comparisons:
+            out.write(comparison.as_dict())
+        failed = sum(not comparison.consistent for comparison in comparisons)
+    else:
+        failed = sum(answer.status != dnsquery.STATUS_OK for answer in answers)
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def cmd_monitor(args, out):
+    import asyncio
+    import threading
+    from wintools_core import monitor
+    specs = list(_read_lines(sys.stdin)) if args.stdin else args.targets
+    if not specs:
+        raise _UsageError("Informe ao menos um alvo host:porta ou URL (ou use --stdin).")
+    lock = threading.Lock()
+
+    def emit(obj):
+        with lock:
+            out.write(obj)
+
+    engine = monitor.HealthMonitor(
+        timeout=args.timeout, fail_threshold=args.threshold, recover_threshold=args.threshold,
+        min_interval=args.min_interval, verify=not args.insecure,
+        on_alert=lambda event, target: emit(dict(event.as_dict(), type="alerta")),
+        on_result=(lambda target: emit(dict(target.snapshot(), type="verificacao"))) if args.all else None)
+    try:
+        for spec in specs:
+            engine.add_target(spec, args.interval)
+    except monitor.MonitorError as e:
+        raise _UsageError(str(e)) from None
+
+    stop_event = threading.Event()
+    if args.duration:
+        timer = threading.Timer(args.duration, stop_event.set)
+        timer.daemon = True # Ctrl+C antes do fim não fica esperando o timer
+        timer.start()
+    asyncio.run(engine.run(stop_event))
+    snapshots = engine.snapshot()
+    for snapshot in snapshots:
+        emit(dict(snapshot, type="resumo"))
+    return EXIT_FAILED if any(s['state'] == monitor.STATE_DOWN for s in snapshots) else EXIT_OK
+
+
+def _run_one(command, timeout, encoding):
+    import threading
+    from wintools_core.runner import CommandRunner, STDOUT
+
+    chunks = {'stdout': [], 'stderr': []}
+    done = threading.Event()
+    runner = CommandRunner(command, encoding=encoding, timeout=timeout,
+                           on_output=lambda stream, text: chunks['stdout' if stream == STDOUT else 'stderr'].append(text),
+                           on_finished=lambda _: done.set())
+    runner.start()
+    done.wait()
+    return {
+        'command': command,
+        'exit_code': runner.returncode,
+        'duration_s': round(runner.elapsed, 3),
+        'timed_out': runner.timed_out,
+        'encoding': runner.detected_encoding,
+        'error': runner.error or "",
+        'stdout': "".join(chunks['stdout']),
+        'stderr': "".join(chunks['stderr']),
+    }
+
+
+def cmd_run(args, out):
+    if args.stdin:
+        commands = list(_read_lines(sys.stdin))
+    elif args.command:
+        commands = [" ".join(args.command)]
+    else:
+        raise _UsageError("Informe o comando (ou use --stdin).")
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(commands) or 1))) as executor:
+        futures = {executor.submit(_run_one, command, args.timeout, args.encoding): index
+                   for index, command in enumerate(commands)}
+        for future in as_completed(futures):
+            result = future.result()
+            result['index'] = futures[future]
+            failed += result['exit_code'] != 0
+            out.write(result)
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+class _UsageError(Exception):
+    pass
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="WinTools.py",
+        description="WinTools em linha de comando (sem interface gráfica). Saída em JSON ou NDJSON.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--format', choices=("json", "ndjson"),
+                        help="Padrão: json para um item, ndjson para entradas em lote (--stdin).")
+    common.add_argument('--pretty', action='store_true', help="JSON indentado.")
+    sub = parser.add_subparsers(dest='tool', required=True)
+
+    port = sub.add_parser('port', parents=[common], help="Verifica portas TCP (mesmo teste do Telnet em Python puro).")
+    port.add_argument('host', nargs='?')
+    port.add_argument('port', nargs='?', type=int)
+    port.add_argument('--stdin', action='store_true', help="Lê alvos do stdin (host:porta por linha).")
+    port.add_argument('--timeout', type=float, default=5.0, help="Segundos por conexão (padrão: 5).")
+    port.add_argument('--concurrency', type=int, default=500, help="Conexões simultâneas (padrão: 500).")
+
+    localip = sub.add_parser('localip', parents=[common], help="Adaptadores do ipconfig /all (IPv4, máscara, gateway, MAC, DNS).")
+    localip.add_argument('--all', action='store_true', help="Inclui adaptadores desconectados e sem IPv4.")
+    localip.add_argument('--input', help="Analisa um arquivo com a saída do ipconfig /all ('-' = stdin).")
+    localip.add_argument('--encoding', default=None,
+                         help="Codificação do arquivo de --input quando não for UTF-8 (padrão: a página de código do console).")
+    localip.add_argument('--timeout', type=float, default=10.0)
+
+    external = sub.add_parser('externalip', parents=[common], help="IP externo e geolocalização.")
+    external.add_argument('--refresh', action='store_true', help="Ignora o cache.")
+
+    http = sub.add_parser('http', parents=[common], help="Requisição HTTP/HTTPS com tempos de DNS, conexão, TLS, TTFB e total.")
+    http.add_argument('url', nargs='?')
+    http.add_argument('--stdin', action='store_true', help="Lê uma URL por linha do stdin.")
+    http.add_argument('--head', action='store_true', help="Só o cabeçalho (HEAD, como curl -I).")
+    http.add_argument('--repeat', type=int, default=1, help="Requisições por URL; a partir da 2ª reaproveitam a conexão (padrão: 1).")
+    http.add_argument('--workers', type=int, default=8, help="URLs simultâneas (padrão: 8).")
+    http.add_argument('--timeout', type=float, default=10.0, help="Segundos por fase de rede (padrão: 10).")
+    http.add_argument('--insecure', '-k', action='store_true', help="Não verifica o certificado TLS (como curl -k).")
+
+    dns = sub.add_parser('dns', parents=[common], help="Consultas DNS (A, AAAA, MX, TXT, CNAME, SRV, PTR...) em um ou vários servidores.")
+    dns.add_argument('names', nargs='*')
+    dns.add_argument('--stdin', action='store_true', help="Lê nomes/IPs do stdin (um por linha).")
+    dns.add_argument('--type', '-t', action='append',
+                     help="Tipos de registro, repetível ou separados por vírgula (padrão: A,AAAA). IPs consultam só PTR.")
+    dns.add_argument('--server', '-s', action='append',
+                     help="Servidor DNS (ip, ip:porta ou nome), repetível (padrão: os do sistema).")
+    dns.add_argument('--timeout', type=float, default=1.0, help="Segundos por tentativa (padrão: 1).")
+    dns.add_argument('--retries', type=int, default=2, help="Reenvios por UDP após timeout (padrão: 2).")
+    dns.add_argument('--concurrency', type=int, default=64, help="Consultas simultâneas (padrão: 64).")
+    dns.add_argument('--compare', action='store_true',
+                     help="Agrupa por nome e tipo com as respostas de cada servidor; código 1 se algum divergir.")
+
+    mon = sub.add_parser('monitor', parents=[common], help="Monitora portas TCP e URLs HTTP periodicamente, com alertas de queda/volta.")
+    mon.add_argument('targets', nargs='*', help="host:porta ou URL http(s)://")
+    mon.add_argument('--stdin', action='store_true', help="Lê um alvo por linha do stdin.")
+    mon.add_argument('--interval', type=float, default=30.0, help="Segundos entre verificações de um alvo no ar (padrão: 30).")
+    mon.add_argument('--min-interval', type=float, default=2.0,
+                     help="Intervalo mínimo enquanto o alvo falha; cai pela metade a cada falha (padrão: 2).")
+    mon.add_argument('--timeout', type=float, default=5.0, help="Segundos por verificação (padrão: 5).")
+    mon.add_argument('--threshold', type=int, default=2,
+                     help="Falhas seguidas para alertar a queda e sucessos seguidos para a volta (padrão: 2).")
+    mon.add_argument('--duration', type=float, default=None, help="Encerra após N segundos (padrão: até Ctrl+C).")
+    mon.add_argument('--all', action='store_true', help="Também emite cada verificação, não só os alertas.")
+    mon.add_argument('--insecure', '-k', action='store_true', help="Não verifica o certificado TLS.")
+
+    run = sub.add_parser('run', parents=[common], help="Executa comandos e devolve código de saída, tempo, stdout e stderr.")
+    run.add_argument('command', nargs=argparse.REMAINDER)
+    run.add_argument('--stdin', action='store_true', help="Lê um comando por linha do stdin.")
+    run.add_argument('--timeout', type=float, default=None, help="Segundos por comando (padrão: sem limite).")
+    run.add_argument('--workers', type=int, default=4, help="Comandos simultâneos no modo --stdin (padrão: 4).")
+    run.add_argument('--encoding', default=None, help="Codificação da saída dos comandos (padrão: detectada por comando).")
+    return parser
+
+
+HANDLERS = {'port': cmd_port, 'localip': cmd_localip, 'externalip': cmd_externalip, 'http': cmd_http, 'dns': cmd_dns, 'monitor': cmd_monitor, 'run': cmd_run}
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] == "--cli":
+        argv = argv[1:]
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE if e.code else EXIT_OK
+    batch = getattr(args, 'stdin', False) or args.tool in ('localip', 'monitor')
+    out = _Output(sys.stdout, ndjson=(args.format or ("ndjson" if batch else "json")) == "ndjson", pretty=args.pretty)
+    try:
+        code = HANDLERS[args.tool](args, out)
+        out.close(single=not batch)
+    except _UsageError as e:
+        print(f"{parser.prog} {args.tool}: erro: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Quem lia a saída fechou o pipe (ex.: "| head"): encerra sem rastreamento de erro
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_OK
+    return code
@@ -0,0 +1,172 @@
+"""
+Detecção da codificação da saída de comandos, por comando e de forma incremental.
+
+A ordem de decisão é:
+1. BOM no início (UTF-8, UTF-16 LE/BE): PowerShell e alguns utilitários redirecionados.
+2. UTF-16 LE sem BOM (bytes nulos alternados, como o `wmic` costuma gerar).
+3. Sonda UTF-8: no primeiro byte fora do ASCII, a sequência é validada como UTF-8
+   (`winget`, `chcp 65001`, ferramentas multiplataforma). Sequência válida = UTF-8.
+4. Página de código do console (GetConsoleOutputCP; sem console, a OEM do sistema, ex.: cp850).
+
+Enquanto só chega ASCII (idêntico em todas essas codificações) o texto sai na hora, sem
+esperar a decisão. Depois dela, a decodificação continua com o decodificador incremental
+da codificação escolhida (errors='replace': um byte inválido nunca derruba a saída).
+"""
+import codecs
+import os
+import re
+import sys
+
+DEFAULT_CODEPAGE = "cp850" # OEM do Windows em pt-BR/en-US; também a das saídas gravadas (benchmarks/fixtures)
+CODEPAGE_ENV = "WINTOOLS_CODEPAGE" # Força a página de código de reserva (fora do Windows ou para testes)
+
+# Como a codificação foi escolhida
+DETECTED_BOM = "BOM"
+DETECTED_UTF16 = "UTF-16 sem BOM"
+DETECTED_UTF8 = "sonda UTF-8"
+DETECTED_ASCII = "somente ASCII"
+DETECTED_CONSOLE = "página de código do console"
+DETECTED_FIXED = "fixa"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"), # O codec "utf-16" lê o BOM e o descarta
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_MAX_BOM = max(len(bom) for bom, _ in _BOMS)
+_START_BYTES = 8 # Mínimo para decidir entre BOM, UTF-16 sem BOM e o resto (pedaços menores esperam)
+_UTF16_PROBE_BYTES = 64
+_UTF8_PROBE_BYTES = 64
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+def _codec_name(codepage):
+    """Número de página de código do Windows -> nome de codec do Python (None se desconhecido)."""
+    name = "utf-8" if codepage == 65001 else f"cp{codepage}"
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def console_codepage():
+    """
+    Página de código usada pelos comandos do console. No Windows: a do console (GetConsoleOutputCP)
+    ou, sem console (app com janela) ou em UTF-8 (65001), a OEM. Fora do Windows: WINTOOLS_CODEPAGE
+    ou cp850 (as ferramentas são do Windows; no Linux só rodam substitutos com saídas gravadas).
+    """
+    override = os.environ.get(CODEPAGE_ENV)
+    if override:
+        try:
+            return codecs.lookup(override).name
+        except LookupError:
+            pass
+    if sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        # UTF-8 já é coberto pela sonda; se ela falhou, a saída está na página OEM
+        for codepage in (kernel32.GetConsoleOutputCP(), kernel32.GetOEMCP()):
+            if codepage and codepage != 65001:
+                name = _codec_name(codepage)
+                if name:
+                    return name
+    return DEFAULT_CODEPAGE
+
+
+def _bom_encoding(data):
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    return None
+
+
+def _looks_utf16le(data):
+    """Texto ASCII em UTF-16 LE: bytes ímpares nulos, pares não nulos."""
+    probe = bytes(data[:_UTF16_PROBE_BYTES])
+    pairs = len(probe) // 2
+    if pairs < 2:
+        return False
+    odd_nulls = probe[1::2].count(0)
+    even_nulls = probe[0::2].count(0)
+    return odd_nulls >= pairs * 0.7 and even_nulls <= pairs * 0.1
+
+
+class AutoDecoder:
+    """
+    Decodificador incremental que escolhe a codificação pelos primeiros bytes do fluxo.
+    Com `encoding` informado, a detecção é desligada (codificação fixa).
+    Depois da decisão, `encoding` e `detected_by` dizem o que foi escolhido e por quê.
+    """
+    def __init__(self, encoding=None, fallback=None, errors='replace'):
+        self.fallback = fallback
+        self.errors = errors
+        self.encoding = None
+        self.detected_by = None
+        self._decoder = None
+        self._pending = b"" # Bytes guardados enquanto a decisão depende do que vem depois
+        self._at_start = True
+        if encoding:
+            self._choose(encoding, DETECTED_FIXED)
+
+    def _choose(self, encoding, reason):
+        self.encoding = encoding
+        self.detected_by = reason
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors=self.errors)
+
+    def decode(self, data, final=False):
+        """Decodifica um pedaço (bytes ou memoryview); `final=True` no último."""
+        if self._decoder is not None:
+            return self._decoder.decode(data, final)
+        if self._pending:
+            data = self._pending + bytes(data)
+            self._pending = b""
+
+        if self._at_start:
+            if len(data) < _START_BYTES and not final:
+                self._pending = bytes(data)
+                return ""
+            head = bytes(data[:_MAX_BOM])
+            self._at_start = False
+            encoding = _bom_encoding(head)
+            if encoding:
+                self._choose(encoding, DETECTED_BOM)
+                return self._decoder.decode(data, final)
+            if _looks_utf16le(data):
+                self._choose("utf-16-le", DETECTED_UTF16)
+                return self._decoder.decode(data, final)
+
+        # Só ASCII até aqui: sai direto, a decisão fica para o primeiro byte acima de 0x7F
+        match = _NON_ASCII.search(data)
+        if match is None:
+            if final:
+                self._choose("ascii", DETECTED_ASCII)
+            return str(data, 'ascii')
+        prefix = str(data[:match.start()], 'ascii')
+        rest = bytes(data[match.start():])
+        probe = codecs.getincrementaldecoder('utf-8')(errors='strict')
+        try:
+            probed = probe.decode(rest[:_UTF8_PROBE_BYTES], final=final and len(rest) <= _UTF8_PROBE_BYTES)
+        except UnicodeDecodeError:
+            self._choose(self.fallback or console_codepage(), DETECTED_CONSOLE)
+            return prefix + self._decoder.decode(rest, final)
+        if not probed and not final:
+            self._pending = rest # Sequência multibyte incompleta: espera o próximo pedaço
+            return prefix
+        self._choose("utf-8", DETECTED_UTF8)
+        return prefix + self._decoder.decode(rest, final)
+
+    def describe(self):
+        """Ex.: "utf-8 (sonda UTF-8)"; vazio antes da decisão."""
+        return f"{self.encoding} ({self.detected_by})" if self.encoding else ""
+
+
+def decode_output(data, encoding=None, fallback=None):
+    """Saída completa (bytes) -> texto, com a mesma detecção do AutoDecoder."""
+    return AutoDecoder(encoding, fallback).decode(data, final=True)
+
+
+def detect_encoding(head, complete=True):
+    """Codificação que o AutoDecoder escolheria para um fluxo que começa com `head` ("ascii" se nada a distinguiu)."""
+    decoder = AutoDecoder()
+    decoder.decode(head, final=complete)
+    return decoder.encoding or "ascii"
@@ -0,0 +1,132 @@
+"""
+Registro declarativo dos comandos do WinTools (menu principal, sub-menus e paleta Ctrl+K).
+
+Cada comando é um CommandDescriptor com ID estável ("ipconfig.flushdns"), rótulo,
+categoria, indicação de Admin, modo de saída e a função que o executa. O menu e os
+sub-menus são montados a partir do registro e despacham pelo ID (busca O(1) em
+dicionário), sem depender do texto "N - rótulo" exibido. A busca da paleta usa um
+índice de prefixos das palavras normalizadas de cada comando.
+"""
+import re
+from dataclasses import dataclass, field
+
+# Modos de saída
+OUTPUT_WINDOW = "janela" # OutputDialog em tempo real
+OUTPUT_TERMINAL = "terminal" # Terminal externo (cmd /K)
+OUTPUT_MESSAGE = "mensagem" # Caixa de mensagem
+OUTPUT_DIALOG = "dialogo" # Diálogo próprio da ferramenta
+OUTPUT_EXTERNAL = "externo" # Programa do Windows com interface própria
+OUTPUT_SUBMENU = "submenu" # Abre a lista de sub-comandos
+
+MAX_PREFIX_LENGTH = 24
+
+
+@dataclass(frozen=True, slots=True)
+class CommandDescriptor:
+    id: str
+    label: str
+    handler: object # Chamável sem argumentos
+    category: str = ""
+    admin: bool = False
+    output: str = OUTPUT_WINDOW
+    parent: str = None # ID do sub-menu ao qual pertence (None = menu principal)
+    number: int = None # Número exibido ("N - rótulo")
+    separator_before: bool = False
+    prompt: str = "Selecione a opção:" # Texto do sub-menu (para comandos OUTPUT_SUBMENU)
+    keywords: tuple = field(default=())
+
+    @property
+    def title(self):
+        return f"{self.number} - {self.label}" if self.number is not None else self.label
+
+
+class CommandRegistry:
+    """Comandos por ID, na ordem de registro, com filhos por sub-menu e índice de prefixos para busca."""
+    def __init__(self):
+        self._commands = {}
+        self._children = {}
+        self._prefixes = None # prefixo -> {id: peso}; montado na primeira busca
+        self._order = {}
+
+    def __len__(self):
+        return len(self._commands)
+
+    def __contains__(self, command_id):
+        return command_id in self._commands
+
+    def register(self, descriptor):
+        if descriptor.id in self._commands:
+            raise ValueError(f"Comando duplicado: {descriptor.id}")
+        if descriptor.parent is not None and descriptor.parent not in self._commands:
+            raise ValueError(f"Sub-menu desconhecido para {descriptor.id}: {descriptor.parent}")
+        self._order[descriptor.id] = len(self._commands)
+        self._commands[descriptor.id] = descriptor
+        self._children.setdefault(descriptor.parent, []).append(descriptor)
+        self._prefixes = None
+        return descriptor
+
+    def add(self, command_id, label, handler, **options):
+        """Atalho: cria e registra um CommandDescriptor."""
+        return self.register(CommandDescriptor(command_id, label, handler, **options))
+
+    def get(self, command_id):
+        return self._commands[command_id]
+
+    def dispatch(self, command_id):
+        """Executa o comando pelo ID."""
+        return self._commands[command_id].handler()
+
+    def top_level(self):
+        return list(self._children.get(None, []))
+
+    def children(self, parent_id):
+        return list(self._children.get(parent_id, []))
+
+    def parent_of(self, descriptor):
+        return self._commands.get(descriptor.parent) if descriptor.parent else None
+
+    def _build_index(self):
+        """Índice de prefixos (feito só quando a paleta é usada, para não pesar na inicialização)."""
+        from wintools_core.appsearch import tokenize
+        self._prefixes = {}
+        for descriptor in self._commands.values():
+            self._index(descriptor, tokenize)
+
+    def _index(self, descriptor, tokenize):
+        # Palavras do próprio rótulo pesam 2; as do sub-menu pai, do ID e palavras-chave pesam 1
+        weights = {}
+        for word in tokenize(descriptor.label):
+            weights[word] = 2
+        parent = self.parent_of(descriptor)
+        secondary = descriptor.id.replace('.', ' ').replace('_', ' ') + ' ' + ' '.join(descriptor.keywords)
+        if parent is not None:
+            secondary += ' ' + parent.label
+        for word in tokenize(secondary):
+            weights.setdefault(word, 1)
+        if descriptor.number is not None:
+            weights.setdefault(str(descriptor.number), 1)
+        for word, weight in weights.items():
+            for length in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1):
+                bucket = self._prefixes.setdefault(word[:length], {})
+                if bucket.get(descriptor.id, 0) < weight:
+                    bucket[descriptor.id] = weight
+
+    def search(self, query, limit=50):
+        """Comandos cujas palavras começam com cada termo da consulta, os mais relevantes primeiro."""
+        from wintools_core.appsearch import fold
+        if self._prefixes is None:
+            self._build_index()
+        terms = re.findall(r'[0-9a-z]+', fold(query))
+        if not terms:
+            return [d for d in self._commands.values() if d.output != OUTPUT_SUBMENU][:limit]
+        scores = None
+        for term in terms:
+            bucket = self._prefixes.get(term[:MAX_PREFIX_LENGTH], {})
+            if scores is None:
+                scores = dict(bucket)
+            else:
+                scores = {command_id: score + bucket[command_id] for command_id, score in scores.items() if command_id in bucket}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self._order[item[0]]))
+        return [self._commands[command_id] for command_id, _ in ranked[:limit]]
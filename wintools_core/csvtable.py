@@ -0,0 +1,79 @@
+"""
+Leitura incremental das saídas `/fo csv` (tasklist, driverquery, systeminfo) e exportação.
+
+O CsvRowStream recebe a saída em pedaços (como chega do CommandRunner) e devolve as
+linhas completas já divididas em colunas; a primeira linha é o cabeçalho. Os valores
+numéricos no formato do Windows ("12.345 K", "1,024") ganham uma chave de ordenação numérica.
+"""
+import csv
+import json
+import re
+
+_NUMBER_PATTERN = re.compile(r'^\s*-?\d[\d.,\s  ]*(?:[KMG]B?)?\s*$', re.I)
+_NOT_DIGIT = re.compile(r'\D')
+
+
+class CsvRowStream:
+    """Divide a saída CSV em linhas à medida que chega (pedaços podem cortar linhas ao meio)."""
+    def __init__(self, transpose=False):
+        self.header = None
+        self.transpose = transpose # systeminfo: uma única linha larga -> pares (Campo, Valor)
+        self._source_header = None
+        self._partial = ""
+
+    def feed(self, text):
+        """Recebe um pedaço de texto; retorna as novas linhas de dados completas (listas de str)."""
+        text = self._partial + text
+        cut = text.rfind('\n')
+        if cut < 0:
+            self._partial = text
+            return []
+        self._partial = text[cut + 1:]
+        return self._rows(text[:cut + 1])
+
+    def close(self):
+        """Processa o que restou após o fim da saída."""
+        rest, self._partial = self._partial, ""
+        return self._rows(rest) if rest.strip() else []
+
+    def _rows(self, text):
+        rows = [row for row in csv.reader(text.splitlines()) if row]
+        if self.header is None and rows:
+            header = rows.pop(0)
+            self.header = ["Campo", "Valor"] if self.transpose else header
+            self._source_header = header
+        if self.transpose:
+            return [[name, value] for row in rows for name, value in zip(self._source_header, row)]
+        width = len(self.header)
+        return [row if len(row) == width else (row + [""] * width)[:width] for row in rows]
+
+
+def is_numeric(value):
+    return bool(_NUMBER_PATTERN.match(value))
+
+
+def numeric_key(value):
+    """"12.345 K" -> 12345 (separadores de milhar e unidades ignorados); vazio -> -1."""
+    digits = _NOT_DIGIT.sub('', value)
+    return int(digits) if digits else -1
+
+
+def sort_key_for(values):
+    """Escolhe a chave de ordenação de uma coluna: numérica se todos os valores preenchidos forem números."""
+    if all(is_numeric(v) for v in values if v):
+        return numeric_key
+    return str.casefold
+
+
+def export_csv(path, header, rows):
+    """Grava o conjunto completo em CSV (UTF-8 com BOM, para abrir direto no Excel)."""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def export_json(path, header, rows):
+    """Grava o conjunto completo como uma lista de objetos {coluna: valor}."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([dict(zip(header, row)) for row in rows], f, ensure_ascii=False, indent=2)
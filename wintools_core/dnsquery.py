@@ -0,0 +1,555 @@
+"""
+Cliente DNS próprio (substitui o nslookup): muitas consultas em paralelo, vários servidores lado a lado.
+
+- UDP em "pipeline": um socket por servidor e centenas de consultas em voo ao mesmo tempo,
+  casadas pela ID de 16 bits e pela pergunta. Sem resposta no prazo, a consulta é reenviada.
+- Resposta truncada (bit TC, ex.: TXT grandes) é repetida por TCP.
+- Tipos: A, AAAA, MX, TXT, CNAME, SRV, PTR, NS e SOA. PTR aceita o IP direto
+  (8.8.8.8 -> 8.8.8.8.in-addr.arpa); um IP na lista de nomes só gera a consulta PTR.
+- DnsComparison agrupa as respostas de cada (nome, tipo) por servidor e indica se os
+  servidores concordam (mesmo status e mesmos valores; o TTL não entra na comparação).
+"""
+import asyncio
+import ipaddress
+import random
+import re
+import socket
+import struct
+import sys
+import time
+from dataclasses import dataclass, field
+
+QTYPES = {"A": 1, "NS": 2, "CNAME": 5, "SOA": 6, "PTR": 12, "MX": 15, "TXT": 16, "AAAA": 28, "SRV": 33}
+QTYPE_NAMES = {number: name for name, number in QTYPES.items()}
+MENU_QTYPES = ("A", "AAAA", "MX", "TXT", "CNAME", "SRV", "PTR", "NS", "SOA")
+DEFAULT_QTYPES = ("A", "AAAA")
+RCODE_NAMES = {0: "NOERROR", 1: "FORMERR", 2: "SERVFAIL", 3: "NXDOMAIN", 4: "NOTIMP", 5: "REFUSED"}
+
+# Status de uma resposta: "ok" (NOERROR, com ou sem registros), o nome do RCODE (NXDOMAIN, SERVFAIL...),
+# timeout ou erro (rede/resposta inválida)
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "erro"
+
+DNS_PORT = 53
+DEFAULT_TIMEOUT = 1.0 # segundos por tentativa
+DEFAULT_RETRIES = 2 # reenvios depois da primeira tentativa
+DEFAULT_CONCURRENCY = 64 # consultas em voo (somando os servidores); mais que isso e servidores/firewalls começam a descartar
+EDNS_PAYLOAD = 1232 # Tamanho de UDP anunciado (EDNS0); acima disso o servidor trunca e a consulta vai por TCP
+
+_FLAG_QR = 0x8000
+_FLAG_TC = 0x0200
+_FLAG_RD = 0x0100
+_TYPE_OPT = 41
+_CLASS_IN = 1
+_SPLIT_PATTERN = re.compile(r"[\s,;]+")
+
+
+class DnsQueryError(Exception):
+    """Entrada inválida (servidor, nome ou tipo) ou resposta DNS malformada."""
+
+
+@dataclass(slots=True)
+class DnsServer:
+    label: str # Como o usuário escreveu (ex.: "8.8.8.8", "dns.empresa:5353")
+    ip: str
+    port: int = DNS_PORT
+    family: int = socket.AF_INET
+
+
+@dataclass(slots=True)
+class DnsRecord:
+    name: str
+    type: str
+    ttl: int
+    value: str
+
+
+@dataclass(slots=True)
+class DnsAnswer:
+    """Resposta de um servidor para (nome, tipo). `rtt_ms` é o tempo da tentativa que obteve a resposta."""
+    name: str
+    qtype: str
+    server: str
+    status: str = STATUS_OK
+    rcode: int | None = None
+    records: list = field(default_factory=list)
+    rtt_ms: float | None = None
+    attempts: int = 0
+    tcp: bool = False
+    error: str = ""
+
+    @property
+    def values(self):
+        """Valores ordenados (registros de outro tipo, como o CNAME da cadeia, levam o tipo na frente)."""
+        return tuple(sorted(r.value if r.type == self.qtype else f"{r.type} {r.value}" for r in self.records))
+
+    @property
+    def answered(self):
+        return self.status not in (STATUS_TIMEOUT, STATUS_ERROR)
+
+    def as_dict(self):
+        return {
+            'name': self.name, 'type': self.qtype, 'server': self.server, 'status': self.status,
+            'rtt_ms': None if self.rtt_ms is None else round(self.rtt_ms, 2), 'attempts': self.attempts,
+            'tcp': self.tcp, 'values': list(self.values),
+            'records': [{'name': r.name, 'type': r.type, 'ttl': r.ttl, 'value': r.value} for r in self.records],
+            'error': self.error,
+        }
+
+
+class DnsComparison:
+    """Respostas de vários servidores para o mesmo (nome, tipo)."""
+    __slots__ = ('name', 'qtype', 'answers')
+
+    def __init__(self, name, qtype):
+        self.name = name
+        self.qtype = qtype
+        self.answers = {} # servidor -> DnsAnswer
+
+    def add(self, answer):
+        self.answers[answer.server] = answer
+
+    @property
+    def consistent(self):
+        """True se todos os servidores que responderam concordam (timeouts e erros não contam)."""
+        return len({(a.status, a.values) for a in self.answers.values() if a.answered}) <= 1
+
+    def as_dict(self):
+        return {'name': self.name, 'type': self.qtype, 'consistent': self.consistent,
+                'servers': {server: answer.as_dict() for server, answer in self.answers.items()}}
+
+
+def compare(answers):
+    """Agrupa as respostas por (nome, tipo), na ordem em que cada par apareceu."""
+    groups = {}
+    for answer in answers:
+        key = (answer.name, answer.qtype)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = DnsComparison(answer.name, answer.qtype)
+        group.add(answer)
+    return list(groups.values())
+
+
+# --- Entrada ---------------------------------------------------------------------------------
+
+def parse_names(text):
+    """Nomes/IPs separados por espaço, vírgula, ponto e vírgula ou linha (sem repetir, na ordem)."""
+    names = []
+    for item in _SPLIT_PATTERN.split(text):
+        item = item.strip().rstrip('.')
+        if item and item not in names:
+            names.append(item)
+    return names
+
+
+def parse_qtypes(text):
+    """"A,MX txt" -> ("A", "MX", "TXT")."""
+    qtypes = []
+    for item in _SPLIT_PATTERN.split(text.upper()):
+        if not item:
+            continue
+        if item not in QTYPES:
+            raise DnsQueryError(f"Tipo de registro não suportado: {item} (use {', '.join(MENU_QTYPES)})")
+        if item not in qtypes:
+            qtypes.append(item)
+    return tuple(qtypes)
+
+
+def parse_server(text, resolver=None):
+    """"8.8.8.8", "1.1.1.1:53", "[2001:db8::1]:53", "::1" ou um nome (resolvido uma vez) -> DnsServer."""
+    label = text.strip()
+    host, port = label, DNS_PORT
+    if label.startswith('['):
+        host, _, rest = label[1:].partition(']')
+        if rest.startswith(':'):
+            port = rest[1:]
+    elif label.count(':') == 1:
+        host, port = label.split(':')
+    try:
+        port = int(port)
+        if not 1 <= port <= 65535:
+            raise ValueError
+    except ValueError:
+        raise DnsQueryError(f"Porta inválida no servidor DNS: {label}") from None
+    try:
+        address = ipaddress.ip_address(host)
+        family = socket.AF_INET6 if address.version == 6 else socket.AF_INET
+        return DnsServer(label, str(address), port, family)
+    except ValueError:
+        pass
+    from wintools_core.resolver import routable_addresses
+    if resolver is None:
+        from wintools_core.resolver import default_resolver as resolver
+    try:
+        # Primeiro endereço com rota (um AAAA sem rota IPv6 faria todas as consultas falharem)
+        family, ip = routable_addresses(resolver.resolve(host), port)[0]
+    except socket.gaierror as e:
+        raise DnsQueryError(f"Servidor DNS inválido: {label} ({e.strerror})") from None
+    return DnsServer(label, ip, port, family)
+
+
+def parse_servers(text, resolver=None):
+    servers = [parse_server(item, resolver) for item in _SPLIT_PATTERN.split(text) if item.strip()]
+    if not servers:
+        raise DnsQueryError("Informe ao menos um servidor DNS.")
+    return servers
+
+
+_system_servers = None
+
+
+def system_dns_servers():
+    """Servidores DNS configurados no sistema (ipconfig /all no Windows, /etc/resolv.conf nos demais)."""
+    global _system_servers
+    if _system_servers is not None:
+        return list(_system_servers)
+    servers = []
+    try:
+        if sys.platform == "win32":
+            import subprocess
+            from wintools_core.codepage import decode_output
+            from wintools_core.ipconfig_parser import parse_ipconfig
+            output = subprocess.run(['ipconfig', '/all'], capture_output=True, timeout=10,
+                                    creationflags=subprocess.CREATE_NO_WINDOW).stdout
+            for adapter in parse_ipconfig(decode_output(output)):
+                if adapter.connected:
+                    servers.extend(adapter.dns_servers)
+        else:
+            with open("/etc/resolv.conf", encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) >= 2 and parts[0] == "nameserver":
+                        servers.append(parts[1])
+    except (OSError, ValueError):
+        pass
+    _system_servers = []
+    for server in servers:
+        server = server.split('%', 1)[0] # fe80::1%12: a zona não vale fora do adaptador
+        if server not in _system_servers:
+            _system_servers.append(server)
+    return list(_system_servers)
+
+
+def query_name(name, qtype):
+    """Nome enviado na pergunta: IP + PTR vira o nome reverso (in-addr.arpa / ip6.arpa)."""
+    if qtype == "PTR":
+        try:
+            return ipaddress.ip_address(name).reverse_pointer
+        except ValueError:
+            pass
+    return name
+
+
+def is_ip(name):
+    try:
+        ipaddress.ip_address(name)
+        return True
+    except ValueError:
+        return False
+
+
+# --- Formato de mensagem (RFC 1035) ----------------------------------------------------------
+
+def encode_name(name):
+    """"www.exemplo.com" -> rótulos com prefixo de tamanho (nomes acentuados via IDNA)."""
+    name = name.rstrip('.')
+    try:
+        raw = name.encode('ascii')
+    except UnicodeEncodeError:
+        try:
+            raw = name.encode('idna')
+        except UnicodeError:
+            raise DnsQueryError(f"Nome inválido: {name}") from None
+    encoded = bytearray()
+    for label in raw.split(b'.') if raw else []:
+        if not 0 < len(label) < 64:
+            raise DnsQueryError(f"Nome inválido: {name}")
+        encoded.append(len(label))
+        encoded += label
+    encoded.append(0)
+    if len(encoded) > 255:
+        raise DnsQueryError(f"Nome longo demais: {name}")
+    return bytes(encoded)
+
+
+def build_query(query_id, name, qtype, edns=True):
+    """Mensagem de consulta (recursão desejada). Retorna (pacote, bytes da pergunta)."""
+    question = encode_name(name) + struct.pack('!HH', QTYPES[qtype], _CLASS_IN)
+    header = struct.pack('!HHHHHH', query_id, _FLAG_RD, 1, 0, 0, 1 if edns else 0)
+    packet = header + question
+    if edns:
+        packet += b'\x00' + struct.pack('!HHIH', _TYPE_OPT, EDNS_PAYLOAD, 0, 0)
+    return packet, question
+
+
+def _read_name(data, offset):
+    """Lê um nome (com ponteiros de compressão); retorna (nome, offset depois do nome)."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(data):
+            raise DnsQueryError("Resposta DNS malformada (nome cortado)")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data):
+                raise DnsQueryError("Resposta DNS malformada (ponteiro cortado)")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            jumps += 1
+            if jumps > 64:
+                raise DnsQueryError("Resposta DNS malformada (laço de compressão)")
+            continue
+        if length == 0:
+            offset += 1
+            break
+        labels.append(data[offset + 1:offset + 1 + length].decode('ascii', errors='replace'))
+        offset += 1 + length
+    return ".".join(labels), end if end is not None else offset
+
+
+def _character_strings(rdata):
+    strings = []
+    position = 0
+    while position < len(rdata):
+        length = rdata[position]
+        strings.append(rdata[position + 1:position + 1 + length].decode('utf-8', errors='replace'))
+        position += 1 + length
+    return strings
+
+
+def _format_rdata(data, rtype, start, length):
+    rdata = data[start:start + length]
+    if rtype == 1 and length == 4:
+        return socket.inet_ntop(socket.AF_INET, rdata)
+    if rtype == 28 and length == 16:
+        return socket.inet_ntop(socket.AF_INET6, rdata)
+    if rtype in (2, 5, 12):
+        return _read_name(data, start)[0]
+    if rtype == 15:
+        preference = struct.unpack_from('!H', data, start)[0]
+        return f"{preference} {_read_name(data, start + 2)[0]}"
+    if rtype == 16:
+        return " ".join(f'"{text}"' for text in _character_strings(rdata))
+    if rtype == 33:
+        priority, weight, port = struct.unpack_from('!HHH', data, start)
+        return f"{priority} {weight} {port} {_read_name(data, start + 6)[0]}"
+    if rtype == 6:
+        mname, offset = _read_name(data, start)
+        rname, offset = _read_name(data, offset)
+        serial, refresh, retry, expire, minimum = struct.unpack_from('!IIIII', data, offset)
+        return f"{mname} {rname} {serial} {refresh} {retry} {expire} {minimum}"
+    return f"\\# {length} {rdata.hex()}" # Formato genérico (RFC 3597)
+
+
+@dataclass(slots=True)
+class DnsResponse:
+    query_id: int
+    rcode: int
+    truncated: bool
+    records: list
+
+
+def parse_response(data):
+    """Cabeçalho e seção de respostas (autoridade e adicionais são ignoradas)."""
+    try:
+        query_id, flags, qdcount, ancount, _, _ = struct.unpack_from('!HHHHHH', data)
+        offset = 12
+        for _ in range(qdcount):
+            offset = _read_name(data, offset)[1] + 4
+        records = []
+        for _ in range(ancount):
+            name, offset = _read_name(data, offset)
+            rtype, _, ttl, length = struct.unpack_from('!HHIH', data, offset)
+            offset += 10
+            if offset + length > len(data):
+                raise DnsQueryError("Resposta DNS malformada (registro cortado)")
+            records.append(DnsRecord(name, QTYPE_NAMES.get(rtype, f"TYPE{rtype}"), ttl, _format_rdata(data, rtype, offset, length)))
+            offset += length
+    except (struct.error, IndexError, ValueError) as e:
+        raise DnsQueryError(f"Resposta DNS malformada ({e})") from None
+    return DnsResponse(query_id, flags & 0x000F, bool(flags & _FLAG_TC), records)
+
+
+# --- Transporte --------------------------------------------------------------------------------
+
+class _UdpChannel(asyncio.DatagramProtocol):
+    """Socket UDP "conectado" a um servidor; as respostas são entregues à consulta pela ID."""
+    def __init__(self):
+        self.transport = None
+        self.ready = None # Criação do socket (future)
+        self.pending = {} # id -> (pergunta, future)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if len(data) < 12 or not data[2] & 0x80: # Não é resposta
+            return
+        entry = self.pending.get(struct.unpack_from('!H', data)[0])
+        if entry is None:
+            return # Resposta atrasada de uma tentativa já encerrada
+        question, future = entry
+        # A pergunta precisa bater (servidores podem alterar maiúsculas/minúsculas: "0x20")
+        if data[12:12 + len(question)].lower() == question.lower() and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc):
+        # ICMP "porta inalcançável" etc.: não há como saber de qual consulta; todas as em voo falham
+        for _, future in list(self.pending.values()):
+            if not future.done():
+                future.set_exception(exc)
+
+    def connection_lost(self, exc):
+        self.error_received(exc or ConnectionAbortedError("Canal UDP fechado"))
+
+    def new_id(self):
+        while True:
+            query_id = random.getrandbits(16)
+            if query_id not in self.pending:
+                return query_id
+
+
+class DnsClient:
+    """Consultas assíncronas (usar dentro de um loop asyncio; close() ao terminar)."""
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES, concurrency=DEFAULT_CONCURRENCY, edns=True):
+        self.timeout = timeout
+        self.retries = retries
+        self.concurrency = concurrency
+        self.edns = edns
+        self._channels = {}
+
+    async def _channel(self, server):
+        key = (server.ip, server.port)
+        channel = self._channels.get(key)
+        if channel is None:
+            loop = asyncio.get_running_loop()
+            channel = self._channels[key] = _UdpChannel()
+            # As consultas que chegarem enquanto o socket é criado esperam pela mesma criação
+            channel.ready = asyncio.ensure_future(loop.create_datagram_endpoint(
+                lambda: channel, remote_addr=(server.ip, server.port), family=server.family))
+        try:
+            await asyncio.shield(channel.ready)
+        except OSError:
+            self._channels.pop(key, None)
+            raise
+        return channel
+
+    def close(self):
+        for channel in self._channels.values():
+            if channel.transport is not None:
+                channel.transport.close()
+        self._channels.clear()
+
+    async def _query_tcp(self, server, name, qtype):
+        """Mesma consulta por TCP (mensagem com prefixo de 2 bytes de tamanho)."""
+        packet, _ = build_query(random.getrandbits(16), name, qtype, edns=False)
+        reader, writer = await asyncio.open_connection(server.ip, server.port, family=server.family)
+        try:
+            writer.write(struct.pack('!H', len(packet)) + packet)
+            await writer.drain()
+            length = struct.unpack('!H', await reader.readexactly(2))[0]
+            return await reader.readexactly(length)
+        finally:
+            writer.close()
+
+    async def query(self, server, name, qtype):
+        """Consulta (nome, tipo) em `server`. Não levanta exceção: falhas ficam em status/error."""
+        answer = DnsAnswer(name, qtype, server.label)
+        try:
+            qname = query_name(name, qtype)
+            channel = await self._channel(server)
+            data = None
+            for attempt in range(1, self.retries + 2):
+                answer.attempts = attempt
+                query_id = channel.new_id()
+                packet, question = build_query(query_id, qname, qtype, self.edns)
+                future = asyncio.get_running_loop().create_future()
+                channel.pending[query_id] = (question, future)
+                start = time.perf_counter()
+                try:
+                    channel.transport.sendto(packet)
+                    data = await asyncio.wait_for(future, self.timeout)
+                    break
+                except asyncio.TimeoutError:
+                    continue
+                finally:
+                    channel.pending.pop(query_id, None)
+            if data is None:
+                answer.status = STATUS_TIMEOUT
+                answer.error = f"Sem resposta após {answer.attempts} tentativa(s) de {self.timeout:g} s."
+                return answer
+            response = parse_response(data)
+            if response.truncated:
+                answer.tcp = True
+                data = await asyncio.wait_for(self._query_tcp(server, qname, qtype), self.timeout * 2)
+                response = parse_response(data)
+            answer.rtt_ms = (time.perf_counter() - start) * 1000.0
+            answer.rcode = response.rcode
+            answer.status = STATUS_OK if response.rcode == 0 else RCODE_NAMES.get(response.rcode, f"RCODE {response.rcode}")
+            answer.records = response.records
+        except asyncio.TimeoutError:
+            answer.status = STATUS_TIMEOUT
+            answer.error = "Sem resposta na consulta por TCP."
+        except (DnsQueryError, OSError, asyncio.IncompleteReadError) as e:
+            answer.status = STATUS_ERROR
+            answer.error = str(e) or type(e).__name__
+        return answer
+
+    async def query_iter(self, names, qtypes, servers, stop_event=None):
+        """
+        Consulta cada nome x tipo em todos os servidores e gera DnsAnswer conforme chegam.
+        Os servidores ficam intercalados dentro de cada (nome, tipo): as linhas da comparação
+        se completam juntas. `stop_event` (threading.Event opcional) interrompe de forma ordenada.
+        """
+        jobs = ((name, qtype, server) for name in names for qtype in (("PTR",) if is_ip(name) else qtypes)
+                for server in servers)
+        results = asyncio.Queue()
+
+        async def worker():
+            for name, qtype, server in jobs:
+                if stop_event is not None and stop_event.is_set():
+                    break
+                await results.put(await self.query(server, name, qtype))
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, self.concurrency))]
+        done = asyncio.gather(*workers)
+        done.add_done_callback(lambda _: results.put_nowait(None)) # Sentinela de fim
+        try:
+            while (answer := await results.get()) is not None:
+                yield answer
+            done.result() # Propaga exceções inesperadas dos workers
+        finally:
+            for task in workers:
+                task.cancel()
+
+
+def run_queries(names, qtypes, servers, on_answer, stop_event=None, **options):
+    """Executa as consultas num loop asyncio próprio (útil em threads), chamando `on_answer` por resposta."""
+    async def consume():
+        client = DnsClient(**options)
+        try:
+            async for answer in client.query_iter(names, qtypes, servers, stop_event):
+                on_answer(answer)
+        finally:
+            client.close()
+    asyncio.run(consume())
+
+
+def summarize(answers):
+    """Contagem por status, consultas que usaram TCP/reenvio e tempo médio por servidor."""
+    counts = {}
+    per_server = {}
+    for answer in answers:
+        counts[answer.status] = counts.get(answer.status, 0) + 1
+        if answer.rtt_ms is not None:
+            total, count = per_server.get(answer.server, (0.0, 0))
+            per_server[answer.server] = (total + answer.rtt_ms, count + 1)
+    return {
+        'queries': len(answers), 'status': counts,
+        'tcp': sum(answer.tcp for answer in answers), 'retried': sum(answer.attempts > 1 for answer in answers),
+        'avg_rtt_ms': {server: total / count for server, (total, count) in per_server.items()},
+    }
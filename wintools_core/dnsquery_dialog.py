@@ -0,0 +1,342 @@
+"""Diálogo de consultas DNS: vários nomes, tipos e servidores, com as respostas lado a lado em tempo real."""
+import threading
+import time
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QPlainTextEdit, QPushButton, QLabel, QSpinBox,
+    QDoubleSpinBox, QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QSplitter, QFileDialog
+)
+from PySide6.QtGui import QColor, QFont
+
+from wintools_core import dnsquery
+from wintools_core.csvtable import export_csv
+
+OK_COLOR = QColor(60, 170, 80)
+WARNING_COLOR = QColor(200, 150, 40)
+ERROR_COLOR = QColor(210, 70, 70)
+TIMEOUT_COLOR = QColor(150, 150, 150)
+MAX_CELL_VALUES = 4 # Valores exibidos por célula; o painel de detalhes mostra todos
+
+
+class _QueryWorker(QThread):
+    """Executa o loop asyncio das consultas fora da thread da interface e envia as respostas em lotes."""
+    results_ready = Signal(object)
+    query_failed = Signal(str)
+
+    BATCH_INTERVAL = 0.1 # segundos entre envios para a interface
+
+    def __init__(self, names, qtypes, servers, options, parent=None):
+        super().__init__(parent)
+        self.names = names
+        self.qtypes = qtypes
+        self.servers = servers
+        self.options = options
+        self.stop_event = threading.Event()
+
+    def run(self):
+        batch = []
+        last_emit = time.monotonic()
+
+        def on_answer(answer):
+            nonlocal last_emit
+            batch.append(answer)
+            if time.monotonic() - last_emit >= self.BATCH_INTERVAL:
+                self.results_ready.emit(batch.copy())
+                batch.clear()
+                last_emit = time.monotonic()
+
+        try:
+            dnsquery.run_queries(self.names, self.qtypes, self.servers, on_answer, stop_event=self.stop_event, **self.options)
+        except Exception as e:
+            self.query_failed.emit(str(e))
+        if batch:
+            self.results_ready.emit(batch)
+
+
+def _cell_text(answer):
+    if not answer.answered:
+        return answer.status
+    values = answer.values
+    if not values:
+        text = "(sem registros)" if answer.status == dnsquery.STATUS_OK else answer.status
+    else:
+        text = " | ".join(values[:MAX_CELL_VALUES]) + (f" | +{len(values) - MAX_CELL_VALUES}" if len(values) > MAX_CELL_VALUES else "")
+    flags = (" TCP" if answer.tcp else "") + (f" {answer.attempts}x" if answer.attempts > 1 else "")
+    return f"{text}  ({answer.rtt_ms:.0f} ms{flags})"
+
+
+class DnsQueryDialog(QDialog):
+    """
+    Consulta A/AAAA/MX/TXT/CNAME/SRV/PTR/NS/SOA de uma lista de nomes em vários servidores ao mesmo tempo.
+    Uma linha por (nome, tipo), uma coluna por servidor; a última coluna indica se os servidores concordam.
+    """
+    def __init__(self, parent=None, names="", servers=None):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Consulta DNS (Vários Nomes, Tipos e Servidores)")
+        self.setMinimumSize(1000, 650)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+
+        self.worker = None
+        self.servers = []
+        self.answers = []
+        self.rows = {} # (nome, tipo) -> (linha, DnsComparison)
+        self.total = 0
+        self.started_at = 0.0
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.names_input = QPlainTextEdit(names)
+        self.names_input.setPlaceholderText("Nomes ou IPs (um por linha ou separados por vírgula)\nEx: empresa.com.br, _ldap._tcp.empresa.local, 10.0.0.5")
+        self.names_input.setMaximumHeight(90)
+        form.addRow("Nomes:", self.names_input)
+
+        self.servers_input = QLineEdit(", ".join(servers if servers is not None else dnsquery.system_dns_servers()))
+        self.servers_input.setPlaceholderText("Ex: 8.8.8.8, 1.1.1.1, 10.0.0.10:53, [2001:4860:4860::8888]")
+        self.servers_input.setToolTip("Um ou mais servidores; as respostas de cada um ficam lado a lado para comparação.")
+        form.addRow("Servidores DNS:", self.servers_input)
+
+        types_layout = QHBoxLayout()
+        self.type_inputs = {}
+        for qtype in dnsquery.MENU_QTYPES:
+            checkbox = QCheckBox(qtype)
+            checkbox.setChecked(qtype in dnsquery.DEFAULT_QTYPES)
+            self.type_inputs[qtype] = checkbox
+            types_layout.addWidget(checkbox)
+        types_layout.addStretch()
+        form.addRow("Tipos:", types_layout)
+
+        options_layout = QHBoxLayout()
+        self.timeout_input = QDoubleSpinBox()
+        self.timeout_input.setRange(0.1, 10.0)
+        self.timeout_input.setValue(dnsquery.DEFAULT_TIMEOUT)
+        self.timeout_input.setSuffix(" s")
+        options_layout.addWidget(QLabel("Timeout por tentativa:"))
+        options_layout.addWidget(self.timeout_input)
+        self.retries_input = QSpinBox()
+        self.retries_input.setRange(0, 5)
+        self.retries_input.setValue(dnsquery.DEFAULT_RETRIES)
+        options_layout.addWidget(QLabel("Reenvios:"))
+        options_layout.addWidget(self.retries_input)
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setRange(1, 1000)
+        self.concurrency_input.setValue(dnsquery.DEFAULT_CONCURRENCY)
+        options_layout.addWidget(QLabel("Consultas simultâneas:"))
+        options_layout.addWidget(self.concurrency_input)
+        options_layout.addStretch()
+        form.addRow(options_layout)
+        layout.addLayout(form)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("▶️ Consultar")
+        self.start_button.clicked.connect(self.start_queries)
+        button_layout.addWidget(self.start_button)
+        self.stop_button = QPushButton("⏹️ Parar")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_queries)
+        button_layout.addWidget(self.stop_button)
+        self.export_button = QPushButton("📤 Exportar CSV")
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.export_results)
+        button_layout.addWidget(self.export_button)
+        self.only_divergent_input = QCheckBox("Só divergências")
+        self.only_divergent_input.toggled.connect(self.apply_filter)
+        button_layout.addWidget(self.only_divergent_input)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.table = QTableWidget(0, 0)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.itemSelectionChanged.connect(self.show_details)
+        splitter.addWidget(self.table)
+        self.details_text = QPlainTextEdit()
+        self.details_text.setReadOnly(True)
+        self.details_text.setFont(QFont("Consolas"))
+        self.details_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.details_text.setPlaceholderText("Selecione uma linha para ver todos os registros (com TTL) de cada servidor.")
+        splitter.addWidget(self.details_text)
+        splitter.setSizes([400, 200])
+        layout.addWidget(splitter)
+
+        self.summary_label = QLabel("Pronto.")
+        layout.addWidget(self.summary_label)
+
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+    def start_queries(self):
+        """Valida a entrada, monta as colunas (uma por servidor) e inicia as consultas em segundo plano."""
+        names = dnsquery.parse_names(self.names_input.toPlainText())
+        qtypes = tuple(qtype for qtype, checkbox in self.type_inputs.items() if checkbox.isChecked())
+        try:
+            if not names:
+                raise dnsquery.DnsQueryError("Informe ao menos um nome ou IP.")
+            if not qtypes:
+                raise dnsquery.DnsQueryError("Selecione ao menos um tipo de registro.")
+            servers = dnsquery.parse_servers(self.servers_input.text())
+        except dnsquery.DnsQueryError as e:
+            QMessageBox.warning(self, "Entrada Inválida", str(e))
+            return
+
+        self.servers = servers
+        self.answers = []
+        self.rows = {}
+        self.details_text.clear()
+        headers = ["Nome", "Tipo"] + [server.label for server in servers] + ["Comparação"]
+        self.table.setRowCount(0)
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        for column in range(2, 2 + len(servers)):
+            self.table.setColumnWidth(column, 260)
+        self.total = sum(1 if dnsquery.is_ip(name) else len(qtypes) for name in names) * len(servers)
+        self.started_at = time.monotonic()
+
+        options = {
+            'timeout': self.timeout_input.value(),
+            'retries': self.retries_input.value(),
+            'concurrency': self.concurrency_input.value(),
+        }
+        self.worker = _QueryWorker(names, qtypes, servers, options, self)
+        self.worker.results_ready.connect(self.add_answers)
+        self.worker.query_failed.connect(lambda msg: QMessageBox.critical(self, "Erro na Consulta DNS", msg))
+        self.worker.finished.connect(self.queries_finished)
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.export_button.setEnabled(False)
+        self.update_summary("Consultando")
+        self.worker.start()
+
+    def stop_queries(self):
+        """Consultas em voo terminam; as demais não são enviadas."""
+        if self.worker:
+            self.worker.stop_event.set()
+            self.stop_button.setEnabled(False)
+
+    def add_answers(self, answers):
+        """Preenche as células das respostas recebidas (a linha é criada na primeira resposta do par)."""
+        server_columns = {server.label: 2 + index for index, server in enumerate(self.servers)}
+        compare_column = 2 + len(self.servers)
+        for answer in answers:
+            self.answers.append(answer)
+            key = (answer.name, answer.qtype)
+            entry = self.rows.get(key)
+            if entry is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+                name_item = QTableWidgetItem(answer.name)
+                name_item.setData(Qt.UserRole, key)
+                self.table.setItem(row, 0, name_item)
+                self.table.setItem(row, 1, QTableWidgetItem(answer.qtype))
+                entry = self.rows[key] = (row, dnsquery.DnsComparison(answer.name, answer.qtype))
+            row, comparison = entry
+            comparison.add(answer)
+            item = QTableWidgetItem(_cell_text(answer))
+            if answer.status == dnsquery.STATUS_TIMEOUT:
+                item.setForeground(TIMEOUT_COLOR)
+            elif answer.status != dnsquery.STATUS_OK:
+                item.setForeground(ERROR_COLOR)
+            item.setToolTip("\n".join(answer.values) or answer.error or answer.status)
+            self.table.setItem(row, server_columns[answer.server], item)
+            self.update_comparison(row, comparison, compare_column)
+        self.update_summary("Consultando")
+
+    def update_comparison(self, row, comparison, column):
+        pending = len(self.servers) - len(comparison.answers)
+        if not comparison.consistent:
+            item = QTableWidgetItem("⚠️ Divergente")
+            item.setForeground(WARNING_COLOR)
+        elif pending:
+            item = QTableWidgetItem(f"⏳ Aguardando {pending}")
+        elif len(self.servers) == 1:
+            item = QTableWidgetItem("-")
+        elif not any(answer.answered for answer in comparison.answers.values()):
+            item = QTableWidgetItem("❌ Sem resposta")
+            item.setForeground(ERROR_COLOR)
+        else:
+            item = QTableWidgetItem("✅ Iguais")
+            item.setForeground(OK_COLOR)
+        self.table.setItem(row, column, item)
+        if self.only_divergent_input.isChecked():
+            self.table.setRowHidden(row, comparison.consistent)
+
+    def apply_filter(self):
+        only_divergent = self.only_divergent_input.isChecked()
+        for row, comparison in self.rows.values():
+            self.table.setRowHidden(row, only_divergent and comparison.consistent)
+
+    def show_details(self):
+        row = self.table.currentRow()
+        item = self.table.item(row, 0) if row >= 0 else None
+        if item is None:
+            return
+        _, comparison = self.rows[item.data(Qt.UserRole)]
+        lines = [f"{comparison.name} {comparison.qtype}", ""]
+        for server in self.servers:
+            answer = comparison.answers.get(server.label)
+            if answer is None:
+                lines.append(f"[{server.label}] aguardando...")
+                continue
+            rtt = "-" if answer.rtt_ms is None else f"{answer.rtt_ms:.1f} ms"
+            lines.append(f"[{server.label}] {answer.status} | {rtt} | tentativas: {answer.attempts}{' | TCP' if answer.tcp else ''}")
+            if answer.error:
+                lines.append(f"  {answer.error}")
+            for record in answer.records:
+                lines.append(f"  {record.name}  {record.ttl}  {record.type}  {record.value}")
+            lines.append("")
+        self.details_text.setPlainText("\n".join(lines))
+
+    def update_summary(self, state):
+        elapsed = time.monotonic() - self.started_at
+        summary = dnsquery.summarize(self.answers)
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(summary['status'].items()))
+        divergent = sum(not comparison.consistent for _, comparison in self.rows.values())
+        averages = " | ".join(f"{server}: {avg:.0f} ms" for server, avg in summary['avg_rtt_ms'].items())
+        self.summary_label.setText(
+            f"{state}: {summary['queries']}/{self.total} em {elapsed:.1f}s | {statuses or '-'} | "
+            f"Divergências: {divergent} | Por TCP: {summary['tcp']} | Reenviadas: {summary['retried']}"
+            + (f"\nTempo médio por servidor: {averages}" if averages else "")
+        )
+
+    def queries_finished(self):
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.export_button.setEnabled(bool(self.rows)) # Sem ordenação: as linhas ficam na ordem das consultas
+        self.update_summary("Interrompido" if self.worker.stop_event.is_set() else "Concluído")
+
+    def export_results(self):
+        """Uma linha por (nome, tipo, servidor), com status, valores, tempo e a comparação."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Exportar Consultas DNS", f"dns_{timestamp}.csv",
+                                                   "CSV (*.csv);;Todos os Arquivos (*.*)")
+        if not file_path:
+            return
+        header = ["Nome", "Tipo", "Servidor", "Status", "Valores", "Tempo (ms)", "Tentativas", "TCP", "Comparação"]
+        rows = []
+        for _, comparison in self.rows.values():
+            verdict = "iguais" if comparison.consistent else "divergente"
+            for server in self.servers:
+                answer = comparison.answers.get(server.label)
+                if answer is not None:
+                    rtt = "" if answer.rtt_ms is None else f"{answer.rtt_ms:.1f}"
+                    rows.append([answer.name, answer.qtype, answer.server, answer.status, " | ".join(answer.values),
+                                 rtt, answer.attempts, "sim" if answer.tcp else "", verdict])
+        try:
+            export_csv(file_path, header, rows)
+            QMessageBox.information(self, "Sucesso", f"{len(rows)} linha(s) exportada(s) para:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Erro ao Salvar", f"Não foi possível salvar o arquivo:\n{e}")
+
+    def reject(self):
+        """Interrompe as consultas antes de fechar o diálogo (Fechar, Esc ou X)."""
+        if self.worker and self.worker.isRunning():
+            self.worker.stop_event.set()
+            self.worker.wait()
+        super().reject()
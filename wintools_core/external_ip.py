@@ -0,0 +1,172 @@
+"""
+Consulta do IP externo (e geolocalização) com sessão HTTP persistente, timeouts e cache.
+
+- Uma única requests.Session com pool de conexões é reaproveitada entre consultas. A Session
+  não é thread-safe: as consultas (da tarefa e da atualização em segundo plano) são serializadas.
+- Timeouts de conexão e leitura evitam que um provedor travado congele a aplicação.
+- O resultado fica em cache por `ttl` segundos; depois disso o valor antigo ainda é
+  devolvido na hora (até `max_stale`) enquanto uma atualização roda em segundo plano.
+- Vários provedores são tentados em ordem; a variável de ambiente WINTOOLS_IP_PROVIDERS
+  (URLs separadas por vírgula) substitui a lista padrão.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+DEFAULT_PROVIDERS = (
+    'http://ip-api.com/json/?fields=status,message,country,countryCode,regionName,city,lat,lon,isp,query',
+    'https://ipinfo.io/json',
+    'https://ipwho.is/',
+)
+CONNECT_TIMEOUT = 3.0 # segundos
+READ_TIMEOUT = 5.0
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_STALE = 3600.0
+
+
+class ExternalIpError(Exception):
+    """Nenhum provedor respondeu com sucesso."""
+
+
+@dataclass(slots=True)
+class ExternalIpInfo:
+    ip: str
+    isp: str
+    city: str
+    region: str
+    country: str
+    provider: str
+    fetched_at: float # time.time() da consulta
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+
+def _normalize(data, provider):
+    """Converte as respostas JSON dos provedores suportados (ip-api, ipinfo, ipwho.is) em ExternalIpInfo."""
+    if data.get('status') == 'fail' or data.get('success') is False:
+        raise ExternalIpError(f"Erro na API ({provider}): {data.get('message', 'Status não foi sucesso')}")
+    ip = data.get('query') or data.get('ip')
+    if not ip:
+        raise ExternalIpError(f"Resposta sem endereço IP ({provider}).")
+    connection = data.get('connection') if isinstance(data.get('connection'), dict) else {}
+    return ExternalIpInfo(
+        ip=ip,
+        isp=data.get('isp') or connection.get('isp') or data.get('org') or 'N/D',
+        city=data.get('city') or 'N/D',
+        region=data.get('regionName') or data.get('region') or 'N/D',
+        country=data.get('country') or 'N/D',
+        provider=provider,
+        fetched_at=time.time(),
+    )
+
+
+def _providers_from_env():
+    urls = os.environ.get('WINTOOLS_IP_PROVIDERS', '')
+    return tuple(url.strip() for url in urls.split(',') if url.strip()) or DEFAULT_PROVIDERS
+
+
+class ExternalIpLookup:
+    """Consulta com cache e revalidação em segundo plano (stale-while-revalidate)."""
+    def __init__(self, providers=None, ttl=DEFAULT_TTL, max_stale=DEFAULT_MAX_STALE,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT):
+        self.providers = tuple(providers) if providers else _providers_from_env()
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.timeout = (connect_timeout, read_timeout)
+        self._session = None
+        self._cached = None
+        self._cached_at = 0.0 # time.monotonic()
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock() # Uma consulta por vez na sessão compartilhada
+        self._refreshing = False
+
+    @property
+    def session(self):
+        """Sessão HTTP persistente (criada no primeiro uso) com pool de conexões keep-alive."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=len(self.providers), pool_maxsize=2, max_retries=0)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = 'WinTools'
+                self._session = session
+            return self._session
+
+    def fetch(self):
+        """Consulta os provedores em ordem (sem cache) e retorna o primeiro resultado válido."""
+        with self._fetch_lock:
+            return self._fetch()
+
+    def _fetch(self):
+        import requests
+        errors = []
+        for url in self.providers:
+            provider = url.split('/')[2]
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code != 200:
+                    errors.append(f"{provider}: Erro HTTP {response.status_code}")
+                    continue
+                info = _normalize(response.json(), provider)
+            except requests.exceptions.RequestException as e:
+                errors.append(f"{provider}: Erro de Conexão ({e.__class__.__name__})")
+                continue
+            except (ValueError, ExternalIpError) as e:
+                errors.append(f"{provider}: {e}")
+                continue
+            with self._lock:
+                self._cached = info
+                self._cached_at = time.monotonic()
+            return info
+        raise ExternalIpError("Nenhum provedor de IP externo respondeu:\n" + "\n".join(errors))
+
+    def lookup(self, force_refresh=False):
+        """
+        Retorna o IP externo. Dentro do TTL responde do cache; vencido (até max_stale)
+        responde do cache e atualiza em segundo plano; sem cache consulta na hora.
+        """
+        with self._lock:
+            cached = self._cached
+            age = time.monotonic() - self._cached_at
+            if cached is not None and not force_refresh:
+                if age < self.ttl:
+                    return cached
+                if age < self.max_stale:
+                    self._start_background_refresh()
+                    return cached
+        return self.fetch()
+
+    def _start_background_refresh(self):
+        """Dispara uma única atualização em segundo plano (chamar com o lock)."""
+        if self._refreshing:
+            return
+        self._refreshing = True
+
+        def refresh():
+            try:
+                self.fetch()
+            except ExternalIpError:
+                pass # Mantém o valor antigo; a próxima consulta tenta novamente
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, daemon=True, name="wintools-extip-refresh").start()
+
+
+# Instância compartilhada (mantém a sessão e o cache entre aberturas do menu)
+default_lookup = ExternalIpLookup()
+
+
+def format_external_ip(info):
+    """Texto exibido no menu "Meu IP ISP"."""
+    return (
+        f"🌐 Endereço IP Externo: {info.ip}\n"
+        f"🔗 Provedor (ISP): {info.isp}\n"
+        f"🗺️ Localização: {info.city}, {info.region}, {info.country}"
+    )
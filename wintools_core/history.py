@@ -0,0 +1,346 @@
+"""
+Histórico das saídas de comandos: SQLite com índice de texto completo (FTS5) e saídas comprimidas.
+
+Cada execução exibida no OutputDialog vira uma linha em `runs`, com a saída comprimida
+(zlib) em um BLOB. O texto é indexado numa tabela FTS5 sem conteúdo próprio (content=''):
+o índice guarda só os termos, de modo que a saída não é armazenada duas vezes. A busca
+("gateway 10.20.0.1", "\"Endereço IPv4\"", "ping*") responde em milissegundos mesmo com
+meses de histórico; o trecho exibido na lista é montado descomprimindo só até a primeira
+ocorrência.
+
+Retenção por tamanho: quando o banco (dados + índice) passa de `max_bytes`, as execuções
+mais antigas saem até voltar a 90% do limite, e o espaço é devolvido ao disco aos poucos
+(auto_vacuum incremental). Uma saída acima de `max_run_bytes` é guardada só até esse limite.
+
+As gravações ficam numa thread própria (add_async): fechar um diálogo não espera a
+compressão nem a indexação. Falhas do histórico nunca interrompem a execução dos comandos.
+
+Comandos que exibem senhas (`key=clear`; ver wintools_core.sensitive) nunca são gravados.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from wintools_core.paths import user_data_path
+from wintools_core.sensitive import reveals_secrets
+from wintools_core.telemetry import STATUS_OK
+
+HISTORY_FILE = "history.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_RUN_BYTES = 8 * 1024 * 1024 # Texto (UTF-8) guardado por execução
+RETENTION_TARGET = 0.9 # Fração do limite após a limpeza (evita limpar a cada gravação)
+COMPRESSION_LEVEL = 6
+SNIPPET_CHUNK_SIZE = 256 * 1024
+SNIPPET_WIDTH = 160
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    command TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration_s REAL,
+    exit_code INTEGER,
+    status TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    line_count INTEGER NOT NULL,
+    truncated INTEGER NOT NULL DEFAULT 0,
+    output BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5 (
+    command, output, content='', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+_TERM_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+
+@dataclass(slots=True)
+class HistoryRun:
+    id: int
+    command: str
+    started_at: float # time.time()
+    duration_s: float | None
+    exit_code: int | None
+    status: str
+    size: int # bytes do texto (UTF-8) guardado
+    stored_size: int # bytes comprimidos
+    line_count: int
+    truncated: bool
+    snippet: str = ""
+
+
+def parse_query(text):
+    """Termos da busca: palavras soltas ou "frases entre aspas"; `termo*` busca por prefixo."""
+    terms = []
+    for phrase, word in _TERM_PATTERN.findall(text or ""):
+        term = phrase or word
+        prefix = not phrase and term.endswith("*") and len(term) > 1
+        term = term.rstrip("*") if prefix else term
+        if term.strip():
+            terms.append((term, prefix))
+    return terms
+
+
+def fts_query(terms):
+    """Consulta FTS5 com cada termo entre aspas (pontos, dois-pontos e barras não viram operadores)."""
+    return " ".join('"' + term.replace('"', '""') + '"' + ("*" if prefix else "") for term, prefix in terms)
+
+
+def _fold(text):
+    """Minúsculas e sem acentos (como o tokenizador do índice: "Endereço" encontra "endereco")."""
+    return "".join(char for char in unicodedata.normalize('NFKD', text.lower()) if not unicodedata.combining(char))
+
+
+def _line_at(text, position):
+    line_start = text.rfind("\n", 0, position) + 1
+    line_end = text.find("\n", position)
+    line = text[line_start:line_end if line_end >= 0 else len(text)].strip()
+    return line if len(line) <= SNIPPET_WIDTH else line[:SNIPPET_WIDTH - 3] + "..."
+
+
+def _find_snippet(blob, terms, command=""):
+    """
+    Linha da ocorrência do termo mais específico (o mais longo), descomprimindo o BLOB em blocos
+    só até encontrá-la. Sem ocorrência literal, compara sem acentos (a linha sai sem acentos).
+    Termos que já aparecem no próprio comando não são procurados na saída.
+    """
+    folded_command = _fold(command)
+    needles = sorted({term.lower() for term, _ in terms if _fold(term) not in folded_command}, key=len, reverse=True)
+    if not needles:
+        return ""
+    decompressor = zlib.decompressobj()
+    tail = ""
+    for start in range(0, len(blob), SNIPPET_CHUNK_SIZE):
+        text = tail + decompressor.decompress(blob[start:start + SNIPPET_CHUNK_SIZE]).decode('utf-8', errors='ignore')
+        for lowered, source, candidates in ((text.lower(), text, needles), (None, None, None)):
+            if lowered is None:
+                source = lowered = _fold(text)
+                candidates = [_fold(needle) for needle in needles]
+            for needle in candidates:
+                position = lowered.find(needle)
+                if position >= 0:
+                    return _line_at(source, position)
+        tail = text[-len(needles[0]):]
+    return ""
+
+
+class OutputHistory:
+    """Execuções passadas com busca de texto completo. Seguro entre threads (uma conexão por operação)."""
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, max_run_bytes=DEFAULT_MAX_RUN_BYTES):
+        self._path = path
+        self.max_bytes = max_bytes
+        self.max_run_bytes = max_run_bytes
+        self.last_error = ""
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path or user_data_path(HISTORY_FILE)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL") # Só vale antes da primeira tabela
+                    conn.execute("PRAGMA journal_mode = WAL") # Leituras da busca não esperam as gravações
+                    conn.executescript(SCHEMA)
+                    self._purge_secrets(conn)
+                    self._schema_ready = True
+        return conn
+
+    # --- gravação ---------------------------------------------------------------------------
+
+    def add(self, command, chunks, exit_code=None, status=STATUS_OK, duration_s=None, started_at=None):
+        """Grava uma execução; `chunks` é um texto ou um iterável de pedaços. Retorna o id (None se ignorada)."""
+        if reveals_secrets(command):
+            return None
+        text, truncated = self._collect(chunks)
+        return self._insert(command, text, truncated, exit_code, status, duration_s, started_at)
+
+    def add_async(self, command, chunks, exit_code=None, status=STATUS_OK, duration_s=None, started_at=None):
+        """
+        Lê os pedaços agora (na thread de quem chama, que ainda é dona deles) e deixa compressão,
+        indexação e retenção para a thread do histórico. Retorna o Future (None se ignorada).
+        """
+        if reveals_secrets(command):
+            return None
+        text, truncated = self._collect(chunks)
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wintools-history")
+            return self._executor.submit(self._insert_safely, command, text, truncated, exit_code, status,
+                                         duration_s, started_at)
+
+    def flush(self):
+        """Aguarda as gravações pendentes."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _collect(self, chunks):
+        if isinstance(chunks, str):
+            chunks = (chunks,)
+        parts, size = [], 0
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            if size + len(data) > self.max_run_bytes:
+                parts.append(data[:self.max_run_bytes - size].decode('utf-8', errors='ignore'))
+                return "".join(parts), True
+            parts.append(chunk)
+            size += len(data)
+        return "".join(parts), False
+
+    def _insert_safely(self, *args):
+        try:
+            return self._insert(*args)
+        except (sqlite3.Error, OSError) as e:
+            self.last_error = str(e)
+            return None
+
+    def _insert(self, command, text, truncated, exit_code, status, duration_s, started_at):
+        data = text.encode('utf-8')
+        blob = zlib.compress(data, COMPRESSION_LEVEL)
+        if started_at is None:
+            started_at = time.time() - (duration_s or 0.0)
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO runs (command, started_at, duration_s, exit_code, status, size, stored_size, line_count,"
+                    " truncated, output) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (command, started_at, duration_s, exit_code, status, len(data), len(blob), text.count("\n"),
+                     int(truncated), blob))
+                run_id = cursor.lastrowid
+                conn.execute("INSERT INTO runs_fts (rowid, command, output) VALUES (?, ?, ?)", (run_id, command, text))
+            self._enforce_retention(conn)
+            return run_id
+        finally:
+            conn.close()
+
+    # --- retenção ---------------------------------------------------------------------------
+
+    @staticmethod
+    def _used_bytes(conn):
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def _delete_rows(self, conn, run_ids):
+        """Remove execuções e seus termos (tabela FTS sem conteúdo: a remoção precisa do texto original)."""
+        for run_id in run_ids:
+            row = conn.execute("SELECT command, output FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if row is None:
+                continue
+            text = zlib.decompress(row[1]).decode('utf-8', errors='replace')
+            conn.execute("INSERT INTO runs_fts (runs_fts, rowid, command, output) VALUES ('delete', ?, ?, ?)",
+                         (run_id, row[0], text))
+            conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def _purge_secrets(self, conn):
+        """Remove execuções com senhas gravadas por versões que ainda não as filtravam."""
+        run_ids = [row[0] for row in conn.execute("SELECT id, command FROM runs WHERE command LIKE '%key=clear%'")
+                   if reveals_secrets(row[1])]
+        if run_ids:
+            with conn:
+                self._delete_rows(conn, run_ids)
+                conn.execute("INSERT INTO runs_fts (runs_fts) VALUES ('optimize')")
+
+    def _enforce_retention(self, conn):
+        if self._used_bytes(conn) <= self.max_bytes:
+            return
+        target = self.max_bytes * RETENTION_TARGET
+        # Sempre fica a execução mais recente, mesmo que sozinha passe do limite
+        while self._used_bytes(conn) > target:
+            oldest = [row[0] for row in conn.execute(
+                "SELECT id FROM runs WHERE id <> (SELECT MAX(id) FROM runs) ORDER BY started_at LIMIT 20")]
+            if not oldest:
+                break
+            with conn:
+                self._delete_rows(conn, oldest)
+                # Numa tabela FTS sem conteúdo, remover grava marcas de exclusão; a fusão dos segmentos
+                # as descarta e devolve o espaço do índice
+                conn.execute("INSERT INTO runs_fts (runs_fts) VALUES ('optimize')")
+        conn.execute("PRAGMA incremental_vacuum").fetchall()
+
+    # --- leitura ----------------------------------------------------------------------------
+
+    def search(self, query="", limit=200, snippets=50):
+        """
+        Execuções que contêm todos os termos (mais recentes primeiro); sem termos, as últimas.
+        As primeiras `snippets` execuções trazem o trecho com a ocorrência.
+        """
+        terms = parse_query(query)
+        columns = "r.id, r.command, r.started_at, r.duration_s, r.exit_code, r.status, r.size, r.stored_size, " \
+                  "r.line_count, r.truncated"
+        conn = self._connect()
+        try:
+            if terms:
+                rows = conn.execute(
+                    f"SELECT {columns} FROM runs_fts JOIN runs r ON r.id = runs_fts.rowid "
+                    "WHERE runs_fts MATCH ? ORDER BY r.started_at DESC LIMIT ?", (fts_query(terms), limit)).fetchall()
+            else:
+                rows = conn.execute(f"SELECT {columns} FROM runs r ORDER BY r.started_at DESC LIMIT ?", (limit,)).fetchall()
+            runs = [HistoryRun(*row[:9], bool(row[9])) for row in rows]
+            if terms:
+                for run in runs[:snippets]:
+                    blob = conn.execute("SELECT output FROM runs WHERE id = ?", (run.id,)).fetchone()[0]
+                    run.snippet = _find_snippet(blob, terms, run.command)
+            return runs
+        finally:
+            conn.close()
+
+    def get_output(self, run_id):
+        """Saída completa de uma execução (texto), ou None se ela não existir mais."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT output FROM runs WHERE id = ?", (run_id,)).fetchone()
+        finally:
+            conn.close()
+        return None if row is None else zlib.decompress(row[0]).decode('utf-8', errors='replace')
+
+    def delete(self, run_id):
+        conn = self._connect()
+        try:
+            with conn:
+                self._delete_rows(conn, [run_id])
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM runs")
+                conn.execute("INSERT INTO runs_fts (runs_fts) VALUES ('delete-all')")
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+        finally:
+            conn.close()
+
+    def stats(self):
+        conn = self._connect()
+        try:
+            runs, size, stored = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM runs").fetchone()
+            used = self._used_bytes(conn)
+        finally:
+            conn.close()
+        return {'runs': runs, 'bytes': size, 'stored_bytes': stored, 'used_bytes': used,
+                'file_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0}
+
+
+default_history = OutputHistory()
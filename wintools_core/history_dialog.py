@@ -0,0 +1,147 @@
+"""Navegador do histórico de saídas: busca de texto completo e reabertura de resultados passados."""
+import time
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QTableWidget, QTableWidgetItem,
+    QHeaderView, QMessageBox
+)
+from PySide6.QtGui import QColor
+
+from wintools_core.history import default_history
+from wintools_core.telemetry import STATUS_OK
+
+MAX_RESULTS = 500
+
+
+def _format_bytes(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.1f} KB" if size >= 1024 else f"{size} B"
+
+
+class HistoryDialog(QDialog):
+    """
+    Lista as execuções gravadas (mais recentes primeiro) e busca em todas as saídas.
+    `on_open(parent, run, text)` exibe um resultado passado sem executar o comando de novo.
+    """
+    COLUMNS = ["Data/Hora", "Comando", "Status", "Código", "Tempo", "Tamanho", "Trecho"]
+
+    def __init__(self, parent=None, on_open=None, history=default_history):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Histórico de Saídas")
+        self.setMinimumSize(1000, 600)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+        self.history = history
+        self.on_open = on_open
+        self.runs = []
+
+        layout = QVBoxLayout(self)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText('🔎 Buscar nas saídas (ex.: gateway 10.20.0.1 | "Endereço IPv4" | ping*)')
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
+        self.search_input.returnPressed.connect(self.open_selected)
+        layout.addWidget(self.search_input)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.doubleClicked.connect(self.open_selected)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        open_button = QPushButton("📂 Abrir Resultado")
+        open_button.clicked.connect(self.open_selected)
+        button_layout.addWidget(open_button)
+        delete_button = QPushButton("🗑️ Excluir")
+        delete_button.clicked.connect(self.delete_selected)
+        button_layout.addWidget(delete_button)
+        clear_button = QPushButton("🧹 Limpar Histórico")
+        clear_button.clicked.connect(self.clear_history)
+        button_layout.addWidget(clear_button)
+        button_layout.addStretch()
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.refresh)
+
+        self.history.flush() # Inclui as execuções que acabaram de terminar
+        self.refresh()
+
+    def refresh(self):
+        self.search_timer.stop()
+        query = self.search_input.text().strip()
+        start = time.perf_counter()
+        try:
+            self.runs = self.history.search(query, limit=MAX_RESULTS)
+        except Exception as e: # Banco inacessível ou consulta inválida: mostra o erro sem fechar a janela
+            self.runs = []
+            self.fill_table()
+            self.status_label.setText(f"❌ Erro ao consultar o histórico: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.fill_table()
+        stats = self.history.stats()
+        found = f"{len(self.runs)}{'+' if len(self.runs) >= MAX_RESULTS else ''} execução(ões)"
+        self.status_label.setText(
+            f"{found} {'encontrada(s)' if query else 'recentes'} em {elapsed_ms:.0f} ms | "
+            f"Histórico: {stats['runs']} execuções, {_format_bytes(stats['used_bytes'])} de "
+            f"{_format_bytes(self.history.max_bytes)} (as mais antigas saem primeiro)")
+
+    def fill_table(self):
+        self.table.setRowCount(len(self.runs))
+        for row, run in enumerate(self.runs):
+            code = "" if run.exit_code is None else str(run.exit_code)
+            duration = "" if run.duration_s is None else f"{run.duration_s:.1f} s"
+            size = _format_bytes(run.size) + (" (cortado)" if run.truncated else "")
+            values = [datetime.fromtimestamp(run.started_at).strftime('%d/%m/%Y %H:%M:%S'), run.command,
+                      run.status, code, duration, size, run.snippet]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 2 and run.status != STATUS_OK:
+                    item.setForeground(QColor(210, 70, 70))
+                self.table.setItem(row, column, item)
+        if self.runs:
+            self.table.selectRow(0)
+
+    def selected_run(self):
+        row = self.table.currentRow()
+        return self.runs[row] if 0 <= row < len(self.runs) else None
+
+    def open_selected(self):
+        run = self.selected_run()
+        if run is None or self.on_open is None:
+            return
+        text = self.history.get_output(run.id)
+        if text is None:
+            QMessageBox.information(self, "Histórico", "Esta execução já saiu do histórico.")
+            self.refresh()
+            return
+        self.on_open(self, run, text)
+
+    def delete_selected(self):
+        run = self.selected_run()
+        if run is not None:
+            self.history.delete(run.id)
+            self.refresh()
+
+    def clear_history(self):
+        answer = QMessageBox.question(self, "Limpar Histórico", "Apagar todas as saídas gravadas?",
+                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if answer == QMessageBox.Yes:
+            self.history.clear()
+            self.refresh()
@@ -0,0 +1,406 @@
+"""
+Sonda HTTP/HTTPS nativa (substitui o curl): tempos por fase, status, cabeçalhos e tamanho do corpo.
+
+Fases de cada requisição (ms):
+- DNS: resolução pelo resolvedor compartilhado (`default_resolver`; resposta do cache é indicada)
+- Conexão: handshake TCP
+- TLS: handshake TLS (só HTTPS)
+- TTFB: do envio da requisição ao primeiro byte da resposta (espera do servidor)
+- Total: do início ao último byte do corpo
+
+As conexões keep-alive voltam para um pool por (esquema, host, porta): sondar
+de novo o mesmo servidor reaproveita a conexão (sem DNS, conexão e TLS). Listas de URLs
+rodam em paralelo com número limitado de workers (probe_many); summarize() resume o lote.
+Sem redirecionamentos automáticos (como o curl sem -L): o 301/302 e o Location aparecem no resultado.
+"""
+import http.client
+import select
+import socket
+import ssl
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from wintools_core.resolver import default_resolver
+from wintools_core.telemetry import default_telemetry, ExecutionRecord, KIND_HTTP, STATUS_OK, STATUS_ERROR, STATUS_TIMEOUT
+
+METHOD_HEAD = "HEAD"
+METHOD_GET = "GET"
+
+DEFAULT_TIMEOUT = 10.0 # segundos por fase de rede (conexão, TLS, cada leitura)
+DEFAULT_WORKERS = 8
+DEFAULT_BODY_PREVIEW = 64 * 1024 # bytes do corpo guardados para exibição (o resto só é contado)
+MAX_IDLE_PER_HOST = 4
+MAX_IDLE_SECONDS = 30.0 # servidores costumam fechar conexões ociosas entre 5 s e 60 s
+READ_CHUNK_SIZE = 64 * 1024
+USER_AGENT = "WinTools"
+
+# Falhas de uma conexão reaproveitada que o servidor já tinha fechado: tenta de novo numa conexão nova
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError,
+                 BrokenPipeError, ConnectionAbortedError)
+
+
+class HttpProbeError(Exception):
+    """URL inválida (esquema não suportado, sem host, porta inválida)."""
+
+
+@dataclass(slots=True)
+class HttpTarget:
+    scheme: str
+    host: str
+    port: int
+    path: str
+
+    @property
+    def key(self):
+        return self.scheme, self.host.lower(), self.port
+
+    @property
+    def host_header(self):
+        host = f"[{self.host}]" if ':' in self.host else self.host
+        default_port = 443 if self.scheme == "https" else 80
+        return host if self.port == default_port else f"{host}:{self.port}"
+
+
+def parse_url(url):
+    """"exemplo.com", "https://host:8443/caminho?x=1" -> HttpTarget (sem esquema = http, como o curl)."""
+    url = url.strip()
+    if "://" not in url:
+        url = "http://" + url
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        raise HttpProbeError(f"Esquema não suportado: {parts.scheme} (use http ou https)")
+    try:
+        port = parts.port
+    except ValueError:
+        raise HttpProbeError(f"Porta inválida em: {url}") from None
+    if not parts.hostname:
+        raise HttpProbeError(f"URL sem host: {url}")
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return HttpTarget(scheme, parts.hostname, port or (443 if scheme == "https" else 80), path)
+
+
+@dataclass(slots=True)
+class HttpResult:
+    """Resultado de uma requisição. Tempos em ms; None = fase não executada (ex.: conexão reaproveitada)."""
+    url: str
+    method: str
+    status: str = STATUS_OK
+    http_status: int | None = None
+    reason: str = ""
+    http_version: str = ""
+    ip: str = ""
+    tls_version: str = ""
+    reused: bool = False
+    dns_cached: bool = False
+    dns_ms: float | None = None
+    connect_ms: float | None = None
+    tls_ms: float | None = None
+    ttfb_ms: float | None = None
+    total_ms: float | None = None
+    body_bytes: int = 0
+    headers: list = field(default_factory=list) # [(nome, valor), ...] na ordem recebida
+    body_preview: bytes = b""
+    error: str = ""
+
+    def header(self, name):
+        name = name.lower()
+        return next((value for key, value in self.headers if key.lower() == name), None)
+
+    def as_dict(self):
+        rounded = lambda value: None if value is None else round(value, 2)
+        return {
+            'url': self.url, 'method': self.method, 'status': self.status, 'http_status': self.http_status,
+            'reason': self.reason, 'http_version': self.http_version, 'ip': self.ip, 'tls_version': self.tls_version,
+            'reused': self.reused, 'dns_cached': self.dns_cached, 'dns_ms': rounded(self.dns_ms),
+            'connect_ms': rounded(self.connect_ms), 'tls_ms': rounded(self.tls_ms), 'ttfb_ms': rounded(self.ttfb_ms),
+            'total_ms': rounded(self.total_ms), 'body_bytes': self.body_bytes, 'headers': dict(self.headers),
+            'error': self.error,
+        }
+
+
+class _PooledConnection:
+    __slots__ = ('connection', 'ip', 'tls_version', 'idle_since')
+
+    def __init__(self, connection, ip, tls_version):
+        self.connection = connection
+        self.ip = ip
+        self.tls_version = tls_version
+        self.idle_since = 0.0
+
+    def usable(self):
+        """Conexão ociosa ainda aberta: nada para ler (dados ou EOF indicariam que o servidor a fechou)."""
+        if time.monotonic() - self.idle_since > MAX_IDLE_SECONDS:
+            return False
+        sock = self.connection.sock
+        if sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+
+class HttpProber:
+    """Executa requisições com tempos por fase e guarda as conexões keep-alive para reaproveitar."""
+    def __init__(self, timeout=DEFAULT_TIMEOUT, verify=True, body_preview=DEFAULT_BODY_PREVIEW, resolver=default_resolver,
+                 telemetry=default_telemetry):
+        self.timeout = timeout
+        self.verify = verify
+        self.body_preview = body_preview
+        self.resolver = resolver
+        self.telemetry = telemetry
+        self._idle = {} # (esquema, host, porta) -> [_PooledConnection, ...]
+        self._lock = threading.Lock()
+        self._ssl_context = None
+
+    @property
+    def ssl_context(self):
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+            if not self.verify:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    def idle_connections(self):
+        with self._lock:
+            return sum(len(pooled) for pooled in self._idle.values())
+
+    def close(self):
+        """Fecha todas as conexões ociosas."""
+        with self._lock:
+            pools = list(self._idle.values())
+            self._idle.clear()
+        for pooled in pools:
+            for entry in pooled:
+                entry.connection.close()
+
+    def _checkout(self, key):
+        with self._lock:
+            pooled = self._idle.get(key)
+            while pooled:
+                entry = pooled.pop()
+                if entry.usable():
+                    entry.connection.sock.settimeout(self.timeout) # O timeout pode ter mudado desde o uso anterior
+                    return entry
+                entry.connection.close()
+        return None
+
+    def _checkin(self, key, entry):
+        entry.idle_since = time.monotonic()
+        with self._lock:
+            pooled = self._idle.setdefault(key, [])
+            if len(pooled) < MAX_IDLE_PER_HOST:
+                pooled.append(entry)
+                return
+        entry.connection.close()
+
+    def _connect(self, target, result, start):
+        """Nova conexão: DNS, TCP e TLS, cada fase medida separadamente."""
+        future = self.resolver.submit(target.host)
+        result.dns_cached = future.done()
+        addresses = future.result(self.timeout)
+        now = time.perf_counter()
+        result.dns_ms = (now - start) * 1000.0
+
+        sock = None
+        last_error = None
+        for family, ip in addresses: # Tenta os endereços em ordem (ex.: IPv6 sem rota -> IPv4)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            connect_start = time.perf_counter()
+            try:
+                sock.connect((ip, target.port))
+            except socket.timeout:
+                sock.close()
+                raise
+            except OSError as e:
+                sock.close()
+                sock, last_error = None, e
+                continue
+            result.connect_ms = (time.perf_counter() - connect_start) * 1000.0
+            result.ip = ip
+            break
+        if sock is None:
+            raise last_error
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        if target.scheme == "https":
+            tls_start = time.perf_counter()
+            try:
+                sock = self.ssl_context.wrap_socket(sock, server_hostname=target.host)
+            except BaseException:
+                sock.close()
+                raise
+            result.tls_ms = (time.perf_counter() - tls_start) * 1000.0
+            result.tls_version = sock.version() or ""
+
+        connection = http.client.HTTPConnection(target.host, target.port, timeout=self.timeout)
+        connection.sock = sock # Já conectado (e com TLS): o http.client só envia e lê
+        return _PooledConnection(connection, result.ip, result.tls_version)
+
+    def _exchange(self, entry, target, method, result):
+        """Envia a requisição e lê a resposta inteira; retorna True se a conexão pode voltar ao pool."""
+        connection = entry.connection
+        request_start = time.perf_counter()
+        connection.request(method, target.path, headers={
+            'Host': target.host_header, 'User-Agent': USER_AGENT, 'Accept': '*/*'})
+        response = connection.getresponse()
+        result.ttfb_ms = (time.perf_counter() - request_start) * 1000.0
+        result.http_status = response.status
+        result.reason = response.reason
+        result.http_version = "HTTP/1.1" if response.version == 11 else "HTTP/1.0"
+        result.headers = response.getheaders()
+
+        preview = bytearray()
+        body_bytes = 0
+        while chunk := response.read1(READ_CHUNK_SIZE):
+            body_bytes += len(chunk)
+            if len(preview) < self.body_preview:
+                preview += chunk[:self.body_preview - len(preview)]
+        response.close() # Só libera a leitura da resposta; o socket continua com a conexão
+        result.body_bytes = body_bytes
+        result.body_preview = bytes(preview)
+        return not response.will_close
+
+    def probe(self, url, method=METHOD_GET):
+        """Uma requisição (bloqueante). Erros de rede não levantam exceção: ficam em `status`/`error`."""
+        result = HttpResult(url, method)
+        start = time.perf_counter()
+        entry = None
+        pooled = False
+        try:
+            target = parse_url(url)
+            entry = self._checkout(target.key)
+            if entry is not None:
+                result.reused = True
+                result.ip, result.tls_version = entry.ip, entry.tls_version
+                try:
+                    keep = self._exchange(entry, target, method, result)
+                except _STALE_ERRORS:
+                    entry.connection.close() # O servidor fechou a conexão ociosa: repete numa nova
+                    entry = None
+                    result.reused = False
+                    start = time.perf_counter()
+            if entry is None:
+                entry = self._connect(target, result, start)
+                keep = self._exchange(entry, target, method, result)
+            if keep:
+                self._checkin(target.key, entry)
+                pooled = True
+            result.status = STATUS_OK if result.http_status < 400 else STATUS_ERROR
+        except socket.timeout:
+            result.status = STATUS_TIMEOUT
+            result.error = f"Tempo limite de {self.timeout:g} s excedido."
+        except ssl.SSLCertVerificationError as e:
+            result.status = STATUS_ERROR
+            result.error = f"Certificado inválido: {e.verify_message or e.reason}"
+        except socket.gaierror as e: # Inclui ResolveError
+            result.status = STATUS_ERROR
+            result.error = e.strerror or str(e)
+        except (HttpProbeError, OSError, http.client.HTTPException) as e:
+            result.status = STATUS_ERROR
+            result.error = str(e) or type(e).__name__
+        finally:
+            if entry is not None and not pooled:
+                entry.connection.close()
+        result.total_ms = (time.perf_counter() - start) * 1000.0
+        if self.telemetry is not None:
+            self._record(result)
+        return result
+
+    def _record(self, result):
+        ended_at = time.time()
+        host = result.url.split("://")[-1].split('/')[0]
+        self.telemetry.record(ExecutionRecord(
+            KIND_HTTP, f"{result.method} {result.url}", f"{result.method} {host}", ended_at - result.total_ms / 1000.0,
+            ended_at, result.total_ms, result.status, result.http_status, result.body_bytes,
+            detail=result.error or ("conexão reaproveitada" if result.reused else "")))
+
+    def probe_many(self, urls, method=METHOD_GET, repeat=1, workers=DEFAULT_WORKERS, on_result=None, stop_event=None):
+        """
+        Sonda `urls` (cada uma `repeat` vezes) com até `workers` requisições simultâneas.
+        As repetições da mesma URL rodam em sequência no mesmo worker, para reaproveitar a conexão.
+        `on_result(índice, HttpResult)` é chamado nas threads dos workers; retorna a lista na ordem de `urls`.
+        """
+        urls = list(urls)
+        results = [[] for _ in urls]
+
+        def run(index):
+            for _ in range(repeat):
+                if stop_event is not None and stop_event.is_set():
+                    return
+                result = self.probe(urls[index], method)
+                results[index].append(result)
+                if on_result:
+                    on_result(index, result)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls) or 1)), thread_name_prefix="wintools-http") as executor:
+            for future in as_completed([executor.submit(run, index) for index in range(len(urls))]):
+                future.result()
+        return [result for per_url in results for result in per_url]
+
+
+def summarize(results):
+    """Resumo de um lote: contagens, mediana/máximo do total e mediana de cada fase (só onde houve a fase)."""
+    ok = [r for r in results if r.status == STATUS_OK]
+    summary = {
+        'requests': len(results), 'ok': len(ok), 'http_errors': sum(r.http_status is not None and r.http_status >= 400 for r in results),
+        'failures': sum(r.http_status is None for r in results), 'reused': sum(r.reused for r in results),
+        'body_bytes': sum(r.body_bytes for r in results),
+    }
+    for phase in ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'total_ms'):
+        values = [getattr(r, phase) for r in results if getattr(r, phase) is not None and r.http_status is not None]
+        summary[f"{phase[:-3]}_median_ms"] = statistics.median(values) if values else None
+    totals = [r.total_ms for r in results if r.http_status is not None]
+    summary['total_max_ms'] = max(totals) if totals else None
+    return summary
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f} ms"
+
+
+def format_result(result, include_body=False):
+    """Texto no estilo do `curl -I`/`curl -v` (status, tempos e cabeçalhos) para o diálogo de saída."""
+    lines = [f"{result.method} {result.url}"]
+    if result.http_status is None:
+        lines.append(f"❌ {result.error}")
+    else:
+        lines.append(f"{result.http_version} {result.http_status} {result.reason}")
+    connection = "reaproveitada (keep-alive)" if result.reused else "nova"
+    lines += [
+        "",
+        f"IP: {result.ip or '-'} | Conexão: {connection}" + (f" | TLS: {result.tls_version}" if result.tls_version else ""),
+        f"DNS: {_ms(result.dns_ms)}{' (cache)' if result.dns_cached else ''} | Conexão TCP: {_ms(result.connect_ms)} | "
+        f"TLS: {_ms(result.tls_ms)} | TTFB: {_ms(result.ttfb_ms)} | Total: {_ms(result.total_ms)}",
+        f"Corpo: {result.body_bytes} bytes",
+    ]
+    if result.headers:
+        lines += ["", "--- Cabeçalhos da Resposta ---"] + [f"{name}: {value}" for name, value in result.headers]
+    if include_body and result.body_preview:
+        charset = "utf-8"
+        content_type = result.header("Content-Type") or ""
+        if "charset=" in content_type:
+            charset = content_type.split("charset=", 1)[1].split(';')[0].strip().strip('"') or charset
+        try:
+            body = result.body_preview.decode(charset, errors='replace')
+        except LookupError:
+            body = result.body_preview.decode('utf-8', errors='replace')
+        lines += ["", "--- Conteúdo ---", body]
+        if result.body_bytes > len(result.body_preview):
+            lines.append(f"\n[... exibidos {len(result.body_preview)} de {result.body_bytes} bytes]")
+    return "\n".join(lines)
+
+
+# Instância compartilhada: as conexões keep-alive sobrevivem entre as sondas do menu
+default_prober = HttpProber()
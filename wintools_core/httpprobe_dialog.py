@@ -0,0 +1,267 @@
+"""Diálogo da sonda HTTP: uma ou várias URLs em paralelo, com os tempos de cada fase numa tabela."""
+import threading
+import time
+
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QPlainTextEdit, QPushButton, QLabel, QComboBox, QSpinBox,
+    QDoubleSpinBox, QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QSplitter
+)
+from PySide6.QtGui import QColor, QFont
+
+from wintools_core import httpprobe
+from wintools_core.telemetry import STATUS_OK, STATUS_TIMEOUT
+
+STATUS_COLORS = {
+    STATUS_OK: QColor(60, 170, 80),
+    STATUS_TIMEOUT: QColor(150, 150, 150),
+}
+ERROR_COLOR = QColor(210, 70, 70)
+
+
+class _ProbeWorker(QThread):
+    """Executa o lote fora da thread da interface e envia os resultados em lotes."""
+    results_ready = Signal(object)
+
+    BATCH_INTERVAL = 0.1 # segundos entre envios para a interface
+
+    def __init__(self, prober, urls, method, repeat, workers, parent=None):
+        super().__init__(parent)
+        self.prober = prober
+        self.urls = urls
+        self.method = method
+        self.repeat = repeat
+        self.workers = workers
+        self.stop_event = threading.Event()
+        self._batch = []
+        self._lock = threading.Lock()
+        self._last_emit = time.monotonic()
+
+    def _on_result(self, index, result):
+        with self._lock:
+            self._batch.append(result)
+            if time.monotonic() - self._last_emit < self.BATCH_INTERVAL:
+                return
+            batch, self._batch = self._batch, []
+            self._last_emit = time.monotonic()
+        self.results_ready.emit(batch)
+
+    def run(self):
+        self.prober.probe_many(self.urls, self.method, repeat=self.repeat, workers=self.workers,
+                               on_result=self._on_result, stop_event=self.stop_event)
+        with self._lock:
+            batch, self._batch = self._batch, []
+        if batch:
+            self.results_ready.emit(batch)
+
+
+def _ms_item(value):
+    item = QTableWidgetItem()
+    if value is not None:
+        item.setData(Qt.DisplayRole, round(value, 1))
+    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+    return item
+
+
+class HttpProbeDialog(QDialog):
+    """
+    Sonda HTTP/HTTPS (substitui o curl): status, cabeçalhos, bytes e tempos de DNS, conexão,
+    TLS, TTFB e total por requisição. Repetições reaproveitam a conexão (keep-alive).
+    """
+    COLUMNS = ["URL", "HTTP", "Conexão", "IP", "DNS (ms)", "TCP (ms)", "TLS (ms)", "TTFB (ms)", "Total (ms)", "Bytes", "Erro"]
+
+    def __init__(self, parent=None, urls="", method=httpprobe.METHOD_GET, prober=httpprobe.default_prober):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Requisição HTTP/HTTPS (Tempos por Fase)")
+        self.setMinimumSize(1000, 650)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+
+        self.shared_prober = prober
+        self.insecure_prober = None # Criado só se o usuário desligar a verificação do certificado
+        self.worker = None
+        self.results = []
+        self.total = 0
+        self.started_at = 0.0
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.urls_input = QPlainTextEdit(urls)
+        self.urls_input.setPlaceholderText("Uma URL por linha (sem esquema = http://)\nEx: https://www.google.com\nintranet:8080/status")
+        self.urls_input.setMaximumHeight(90)
+        form.addRow("URLs:", self.urls_input)
+
+        options_layout = QHBoxLayout()
+        self.method_input = QComboBox()
+        self.method_input.addItem("GET (Conteúdo)", httpprobe.METHOD_GET)
+        self.method_input.addItem("HEAD (Só Cabeçalho)", httpprobe.METHOD_HEAD)
+        self.method_input.setCurrentIndex(0 if method == httpprobe.METHOD_GET else 1)
+        options_layout.addWidget(QLabel("Método:"))
+        options_layout.addWidget(self.method_input)
+        self.repeat_input = QSpinBox()
+        self.repeat_input.setRange(1, 100)
+        self.repeat_input.setToolTip("Requisições por URL, em sequência: a partir da 2ª a conexão é reaproveitada.")
+        options_layout.addWidget(QLabel("Repetições:"))
+        options_layout.addWidget(self.repeat_input)
+        self.workers_input = QSpinBox()
+        self.workers_input.setRange(1, 64)
+        self.workers_input.setValue(httpprobe.DEFAULT_WORKERS)
+        options_layout.addWidget(QLabel("URLs simultâneas:"))
+        options_layout.addWidget(self.workers_input)
+        self.timeout_input = QDoubleSpinBox()
+        self.timeout_input.setRange(0.5, 120.0)
+        self.timeout_input.setValue(httpprobe.DEFAULT_TIMEOUT)
+        self.timeout_input.setSuffix(" s")
+        options_layout.addWidget(QLabel("Timeout:"))
+        options_layout.addWidget(self.timeout_input)
+        self.verify_input = QCheckBox("Verificar certificado")
+        self.verify_input.setChecked(True)
+        self.verify_input.setToolTip("Desmarcado equivale ao curl -k (aceita certificado inválido ou autoassinado).")
+        options_layout.addWidget(self.verify_input)
+        options_layout.addStretch()
+        form.addRow(options_layout)
+        layout.addLayout(form)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("▶️ Executar")
+        self.start_button.clicked.connect(self.start_probe)
+        button_layout.addWidget(self.start_button)
+        self.stop_button = QPushButton("⏹️ Parar")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_probe)
+        button_layout.addWidget(self.stop_button)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.itemSelectionChanged.connect(self.show_details)
+        splitter.addWidget(self.table)
+        self.details_text = QPlainTextEdit()
+        self.details_text.setReadOnly(True)
+        self.details_text.setFont(QFont("Consolas"))
+        self.details_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.details_text.setPlaceholderText("Selecione uma linha para ver os cabeçalhos (e o conteúdo, no GET).")
+        splitter.addWidget(self.details_text)
+        splitter.setSizes([350, 250])
+        layout.addWidget(splitter)
+
+        self.summary_label = QLabel("Pronto.")
+        layout.addWidget(self.summary_label)
+
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+    def current_prober(self):
+        """Prober compartilhado (mantém o keep-alive entre aberturas do diálogo) ou um sem verificação de certificado."""
+        if self.verify_input.isChecked():
+            prober = self.shared_prober
+        else:
+            if self.insecure_prober is None:
+                self.insecure_prober = httpprobe.HttpProber(verify=False)
+            prober = self.insecure_prober
+        prober.timeout = self.timeout_input.value()
+        return prober
+
+    def start_probe(self):
+        """Valida as URLs e inicia o lote em segundo plano."""
+        urls = [line.strip() for line in self.urls_input.toPlainText().splitlines() if line.strip()]
+        if not urls:
+            QMessageBox.warning(self, "Entrada Inválida", "Informe ao menos uma URL.")
+            return
+        invalid = []
+        for url in urls:
+            try:
+                httpprobe.parse_url(url)
+            except httpprobe.HttpProbeError as e:
+                invalid.append(str(e))
+        if invalid:
+            QMessageBox.warning(self, "Entrada Inválida", "\n".join(invalid[:10]))
+            return
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        self.results = []
+        self.details_text.clear()
+        self.total = len(urls) * self.repeat_input.value()
+        self.started_at = time.monotonic()
+        self.worker = _ProbeWorker(self.current_prober(), urls, self.method_input.currentData(),
+                                   self.repeat_input.value(), self.workers_input.value(), self)
+        self.worker.results_ready.connect(self.add_results)
+        self.worker.finished.connect(self.probe_finished)
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.update_summary("Executando")
+        self.worker.start()
+
+    def stop_probe(self):
+        """As requisições em andamento terminam; as repetições seguintes não começam."""
+        if self.worker:
+            self.worker.stop_event.set()
+            self.stop_button.setEnabled(False)
+
+    def add_results(self, results):
+        """Acrescenta um lote de resultados à tabela."""
+        row = self.table.rowCount()
+        self.table.setRowCount(row + len(results))
+        for result in results:
+            http_status = f"{result.http_status} {result.reason}" if result.http_status is not None else result.status
+            connection = "reaproveitada" if result.reused else ("nova (DNS do cache)" if result.dns_cached else "nova")
+            url_item = QTableWidgetItem(result.url)
+            url_item.setData(Qt.UserRole, len(self.results))
+            status_item = QTableWidgetItem(http_status)
+            status_item.setForeground(STATUS_COLORS.get(result.status, ERROR_COLOR))
+            bytes_item = QTableWidgetItem()
+            bytes_item.setData(Qt.DisplayRole, result.body_bytes)
+            items = [url_item, status_item, QTableWidgetItem(connection), QTableWidgetItem(result.ip),
+                     _ms_item(result.dns_ms), _ms_item(result.connect_ms), _ms_item(result.tls_ms),
+                     _ms_item(result.ttfb_ms), _ms_item(result.total_ms), bytes_item, QTableWidgetItem(result.error)]
+            for column, item in enumerate(items):
+                self.table.setItem(row, column, item)
+            self.results.append(result)
+            row += 1
+        if self.table.currentRow() < 0 and self.results:
+            self.table.selectRow(0)
+        self.update_summary("Executando")
+
+    def show_details(self):
+        row = self.table.currentRow()
+        item = self.table.item(row, 0) if row >= 0 else None
+        if item is None:
+            return
+        result = self.results[item.data(Qt.UserRole)]
+        self.details_text.setPlainText(httpprobe.format_result(result, include_body=result.method == httpprobe.METHOD_GET))
+
+    def update_summary(self, state):
+        elapsed = time.monotonic() - self.started_at
+        summary = httpprobe.summarize(self.results)
+        ms = lambda value: "-" if value is None else f"{value:.0f} ms"
+        self.summary_label.setText(
+            f"{state}: {summary['requests']}/{self.total} em {elapsed:.1f}s | OK: {summary['ok']} | "
+            f"HTTP 4xx/5xx: {summary['http_errors']} | Falhas: {summary['failures']} | "
+            f"Reaproveitadas: {summary['reused']} | Mediana: DNS {ms(summary['dns_median_ms'])}, "
+            f"TCP {ms(summary['connect_median_ms'])}, TLS {ms(summary['tls_median_ms'])}, "
+            f"TTFB {ms(summary['ttfb_median_ms'])}, Total {ms(summary['total_median_ms'])} (máx. {ms(summary['total_max_ms'])})"
+        )
+
+    def probe_finished(self):
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.table.setSortingEnabled(True)
+        self.update_summary("Interrompido" if self.worker.stop_event.is_set() else "Concluído")
+
+    def reject(self):
+        """Interrompe o lote antes de fechar o diálogo (Fechar, Esc ou X)."""
+        if self.worker and self.worker.isRunning():
+            self.worker.stop_event.set()
+            self.worker.wait()
+        if self.insecure_prober is not None:
+            self.insecure_prober.close()
+        super().reject()
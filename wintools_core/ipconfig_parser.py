@@ -0,0 +1,173 @@
+"""
+Parser da saída do `ipconfig /all` independente de idioma (pt-BR, en-US, es).
+
+Os padrões são compilados uma única vez no carregamento do módulo e cada linha é
+classificada por uma única expressão combinada (cabeçalho, "Rótulo . . . : valor"
+ou continuação de lista); o rótulo é então resolvido por consulta em dicionário.
+"""
+import re
+from dataclasses import dataclass, field
+
+# Uma única expressão para as três formas de linha do ipconfig /all (os rótulos nunca contêm ".")
+_LINE_PATTERN = re.compile(r"""
+    ^(?:
+        (?P<header>\S[^\r\n]*?):[^\S\r\n]*\r?$
+      | [^\S\r\n]+(?P<label>[^.\r\n]*[^.\s])[ .]*\.[ .]*:[^\S\r\n]?(?P<value>[^\r\n]*?)[^\S\r\n]*\r?$
+      | [^\S\r\n]+(?P<cont>\S+)[^\S\r\n]*\r?$
+    )""", re.MULTILINE | re.VERBOSE)
+
+# Cabeçalho do adaptador: "Ethernet adapter X:", "Adaptador de Rede sem Fio X:", "Adaptador de LAN inalámbrica X:"
+_HEADER_PATTERN = re.compile(
+    r"^(?:(?P<kind_en>.+?)\sadapter\s"
+    r"|Adaptador\s(?:de\s)?(?P<kind_lat>Ethernet|Rede\ssem\sFio|Rede\sLocal|Loopback|LAN\sinalámbrica|"
+    r"túnel|desconhecido|desconocido|PPP)\s)"
+    r"(?P<name>.+)$",
+    re.IGNORECASE
+)
+
+# Sufixos como "(Preferred)", "(Preferencial)", "(Preferido)", "(Duplicate)"
+_STATUS_SUFFIX_PATTERN = re.compile(r"\([^)]*\)$")
+
+# Rótulo (minúsculo) -> campo do AdapterRecord
+_FIELD_LABELS = {
+    'description': ('description', 'descrição', 'descripción'),
+    'mac': ('physical address', 'endereço físico', 'dirección física'),
+    'dhcp_enabled': ('dhcp enabled', 'dhcp habilitado'),
+    'ipv4': (
+        'ipv4 address', 'autoconfiguration ipv4 address',
+        'endereço ipv4', 'endereço ipv4 de configuração automática',
+        'dirección ipv4', 'dirección ipv4 de configuración automática',
+    ),
+    'masks': ('subnet mask', 'máscara de sub-rede', 'máscara de subred'),
+    'gateways': ('default gateway', 'gateway padrão', 'puerta de enlace predeterminada'),
+    'dhcp_server': ('dhcp server', 'servidor dhcp'),
+    'dns_servers': ('dns servers', 'servidores dns'),
+    'ipv6': (
+        'ipv6 address', 'temporary ipv6 address', 'link-local ipv6 address',
+        'endereço ipv6', 'endereço ipv6 temporário', 'endereço ipv6 de link local',
+        'dirección ipv6', 'dirección ipv6 temporal', 'vínculo: dirección ipv6 local',
+    ),
+    'lease_obtained': ('lease obtained', 'concessão obtida', 'concesión obtenida'),
+    'lease_expires': ('lease expires', 'concessão expira', 'la concesión expira'),
+    'media_state': ('media state', 'estado da mídia', 'estado de los medios'),
+    'dns_suffix': (
+        'connection-specific dns suffix', 'sufixo dns específico de conexão',
+        'sufijo dns específico para la conexión',
+    ),
+}
+LABEL_TO_FIELD = {label: name for name, labels in _FIELD_LABELS.items() for label in labels}
+
+_LIST_FIELDS = frozenset(('ipv4', 'masks', 'gateways', 'dns_servers', 'ipv6'))
+_YES_VALUES = frozenset(('yes', 'sim', 'sí', 'si'))
+_DISCONNECTED_VALUES = frozenset(('media disconnected', 'mídia desconectada', 'medios desconectados'))
+
+
+@dataclass(slots=True)
+class AdapterRecord:
+    name: str
+    kind: str = ""
+    description: str = ""
+    mac: str = ""
+    connected: bool = True # O ipconfig só exibe "Estado da mídia" quando o adaptador está desconectado
+    dhcp_enabled: bool | None = None
+    ipv4: list = field(default_factory=list)
+    masks: list = field(default_factory=list)
+    ipv6: list = field(default_factory=list)
+    gateways: list = field(default_factory=list)
+    dns_servers: list = field(default_factory=list)
+    dhcp_server: str = ""
+    lease_obtained: str = ""
+    lease_expires: str = ""
+    dns_suffix: str = ""
+
+    @property
+    def primary_ipv4(self):
+        return self.ipv4[0] if self.ipv4 else ""
+
+    @property
+    def ipv4_gateway(self):
+        """Primeiro gateway IPv4 (o ipconfig lista o gateway IPv6 antes quando existe)."""
+        return next((g for g in self.gateways if ':' not in g), "")
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+
+def _parse_header(header):
+    match = _HEADER_PATTERN.match(header)
+    if not match:
+        return header.strip(), ""
+    kind = match.group('kind_en') or match.group('kind_lat')
+    return match.group('name').strip(), kind.strip()
+
+
+def _clean_value(value):
+    return _STATUS_SUFFIX_PATTERN.sub("", value).strip()
+
+
+def parse_ipconfig(text):
+    """Converte a saída de `ipconfig /all` em uma lista de AdapterRecord (na ordem da saída)."""
+    adapters = []
+    current = None
+    last_list = None # Lista que recebe as linhas de continuação (DNS, gateways...)
+
+    for match in _LINE_PATTERN.finditer(text):
+        header = match.group('header')
+        if header is not None:
+            name, kind = _parse_header(header)
+            current = AdapterRecord(name=name, kind=kind)
+            adapters.append(current)
+            last_list = None
+            continue
+        if current is None:
+            continue # Seção global (nome do host, tipo de nó...)
+
+        label = match.group('label')
+        if label is None:
+            if last_list is not None:
+                last_list.append(_clean_value(match.group('cont')))
+            continue
+
+        last_list = None
+        field_name = LABEL_TO_FIELD.get(label.lower())
+        if field_name is None:
+            continue
+        value = match.group('value')
+        if field_name in _LIST_FIELDS:
+            last_list = getattr(current, field_name)
+            value = _clean_value(value)
+            if value:
+                last_list.append(value)
+        elif field_name == 'media_state':
+            current.connected = value.strip().lower() not in _DISCONNECTED_VALUES
+        elif field_name == 'dhcp_enabled':
+            current.dhcp_enabled = value.strip().lower() in _YES_VALUES
+        else:
+            setattr(current, field_name, value.strip())
+
+    return adapters
+
+
+def format_adapter_summary(adapters):
+    """Texto da "Visualização Limpa": apenas adaptadores conectados com IPv4 válido. Retorna "" se não houver."""
+    lines = ["Informações de IP Local (Filtrado):"]
+    found = False
+    for adapter in adapters:
+        # Filtra adaptadores não conectados, loopbacks e sem IP válido
+        if not adapter.connected or adapter.primary_ipv4 in ("", "127.0.0.1"):
+            continue
+        found = True
+        lines.append("=" * 40)
+        lines.append(f"Adaptador: {adapter.name}")
+        lines.append("  Status: Conectado")
+        lines.append(f"  IPv4: {', '.join(adapter.ipv4)}")
+        lines.append(f"  Máscara: {', '.join(adapter.masks) or 'N/D'}")
+        lines.append(f"  Gateway: {adapter.ipv4_gateway or 'N/D'}")
+        lines.append(f"  MAC: {adapter.mac or 'N/D'}")
+        if adapter.ipv6:
+            lines.append(f"  IPv6: {', '.join(adapter.ipv6)}")
+        if adapter.dns_servers:
+            lines.append(f"  DNS: {', '.join(adapter.dns_servers)}")
+        if adapter.dhcp_enabled and adapter.dhcp_server:
+            lines.append(f"  DHCP: {adapter.dhcp_server} (Concessão expira: {adapter.lease_expires or 'N/D'})")
+    return "\n".join(lines) if found else ""
@@ -0,0 +1,378 @@
+"""
+Tarefas em segundo plano com fila por categoria, prioridades e cancelamento.
+
+Ações lentas (teste de porta, IP externo, ipconfig, comandos com saída em tempo real)
+viram tarefas (`Job`) executadas num pool de threads, sem travar a janela:
+
+- Cada categoria (rede, disco, pacotes, sistema) tem seu limite de tarefas simultâneas;
+  ao atingi-lo, as novas esperam na fila da categoria (ex.: dois winget nunca rodam juntos).
+- Dentro da fila vale a prioridade (alta, normal, baixa) e, no empate, a ordem de chegada.
+- O cancelamento é cooperativo: a tarefa recebe um CancellationToken, consulta
+  `cancelled`/`raise_if_cancelled()` ou registra `on_cancel(callback)` para interromper o
+  que estiver fazendo (ex.: encerrar o processo). Na fila, cancelar apenas a retira.
+- As concluídas ficam guardadas (até `max_finished`) com estado, duração e tempo de espera.
+
+Os ouvintes (`add_listener`) são chamados a cada mudança de estado ou progresso, na thread
+que causou a mudança — quem usa Qt deve repassá-los via Signal (ver jobs_dialog.JobSignals).
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+CATEGORY_NETWORK = "rede"
+CATEGORY_DISK = "disco"
+CATEGORY_PACKAGES = "pacotes"
+CATEGORY_SYSTEM = "sistema"
+
+# Tarefas simultâneas por categoria: disco e gerenciador de pacotes não toleram execuções paralelas
+DEFAULT_LIMITS = {
+    CATEGORY_NETWORK: 4,
+    CATEGORY_DISK: 1,
+    CATEGORY_PACKAGES: 1,
+    CATEGORY_SYSTEM: 2,
+}
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITY_LABELS = {PRIORITY_HIGH: "alta", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "baixa"}
+
+STATE_QUEUED = "na fila"
+STATE_RUNNING = "executando"
+STATE_DONE = "concluído"
+STATE_FAILED = "falhou"
+STATE_CANCELLED = "cancelado"
+FINAL_STATES = (STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+
+DEFAULT_MAX_FINISHED = 200
+
+# Primeira palavra do comando -> categoria (o resto cai em "sistema")
+_COMMAND_CATEGORIES = {
+    "winget": CATEGORY_PACKAGES,
+    "chkdsk": CATEGORY_DISK, "defrag": CATEGORY_DISK, "cleanmgr": CATEGORY_DISK, "fsutil": CATEGORY_DISK,
+    "ipconfig": CATEGORY_NETWORK, "netsh": CATEGORY_NETWORK, "netstat": CATEGORY_NETWORK, "arp": CATEGORY_NETWORK,
+    "route": CATEGORY_NETWORK, "ping": CATEGORY_NETWORK, "tracert": CATEGORY_NETWORK, "pathping": CATEGORY_NETWORK,
+    "nslookup": CATEGORY_NETWORK, "getmac": CATEGORY_NETWORK, "curl": CATEGORY_NETWORK,
+}
+
+
+def category_for_command(command):
+    """Categoria de um comando de console pela primeira palavra (ex.: "winget search vlc" -> pacotes)."""
+    words = command.split() if isinstance(command, str) else list(command)
+    if not words:
+        return CATEGORY_SYSTEM
+    name = words[0].strip('"').replace("\\", "/").rsplit("/", 1)[-1].lower()
+    if name.endswith(".exe"):
+        name = name[:-4]
+    return _COMMAND_CATEGORIES.get(name, CATEGORY_SYSTEM)
+
+
+class JobCancelled(Exception):
+    """Levantada pela tarefa (ou por `raise_if_cancelled`) ao atender um cancelamento."""
+
+
+class JobError(Exception):
+    """Falha esperada, relatada pela própria tarefa: a mensagem vira o `error` do Job."""
+
+
+class CancellationToken:
+    """Sinal de cancelamento compartilhado entre quem pede e a tarefa que executa."""
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """Marca como cancelado e chama (uma única vez) os callbacks registrados."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass # Um callback com erro não impede os demais
+
+    def on_cancel(self, callback):
+        """
+        Registra `callback()` para o cancelamento (chamado na hora se já cancelado).
+        Retorna uma função que remove o registro (use ao terminar o trecho interrompível).
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._discard(callback)
+        callback()
+        return lambda: None
+
+    def _discard(self, callback):
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def wait(self, timeout=None):
+        """Espera o cancelamento por até `timeout` segundos; retorna True se cancelado (útil como sleep)."""
+        return self._event.wait(timeout)
+
+
+class Job:
+    """
+    Uma tarefa: `func(job)` roda numa thread do pool e seu retorno fica em `result`.
+    `progress` vai de 0.0 a 1.0 (None = indeterminado); `message` é um detalhe livre para o painel.
+    Os horários são de time.time(); `duration` e `wait_time` contam até agora enquanto não terminam.
+    """
+    def __init__(self, manager, job_id, title, func, category, priority, on_done):
+        self.manager = manager
+        self.id = job_id
+        self.title = title
+        self.func = func
+        self.category = category
+        self.priority = priority
+        self.on_done = on_done
+        self.token = CancellationToken()
+        self.state = STATE_QUEUED
+        self.progress = None
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.state in FINAL_STATES
+
+    @property
+    def priority_label(self):
+        return PRIORITY_LABELS.get(self.priority, str(self.priority))
+
+    @property
+    def wait_time(self):
+        """Tempo na fila (em segundos)."""
+        return (self.started_at or self.finished_at or time.time()) - self.submitted_at
+
+    @property
+    def duration(self):
+        """Tempo de execução (em segundos), ou None se a tarefa não chegou a iniciar."""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def set_progress(self, fraction=None, message=None):
+        """Atualiza o progresso (0.0 a 1.0, None = indeterminado) e/ou a mensagem; avisa os ouvintes."""
+        self.progress = None if fraction is None else min(max(float(fraction), 0.0), 1.0)
+        if message is not None:
+            self.message = message
+        self.manager._notify(self)
+
+    def cancel(self):
+        self.manager.cancel(self)
+
+    def as_dict(self):
+        return {
+            'id': self.id, 'tarefa': self.title, 'categoria': self.category, 'prioridade': self.priority_label,
+            'estado': self.state, 'progresso': self.progress, 'detalhe': self.message, 'erro': self.error,
+            'espera_s': round(self.wait_time, 3),
+            'duracao_s': None if self.duration is None else round(self.duration, 3),
+        }
+
+
+class JobManager:
+    """
+    Fila de tarefas com limite de simultaneidade por categoria (`limits`) e prioridades.
+    O pool tem uma thread por vaga (soma dos limites) e só é criado na primeira tarefa.
+    Categorias fora de `limits` usam `default_limit`.
+    """
+    def __init__(self, limits=None, default_limit=1, max_finished=DEFAULT_MAX_FINISHED):
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.default_limit = default_limit
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+        self._executor = None
+        self._ids = itertools.count(1)
+        self._queues = {} # categoria -> heap de (prioridade, id, job)
+        self._running = {} # categoria -> tarefas executando
+        self._active = {} # id -> job na fila ou executando (ordem de envio)
+        self._finished = deque(maxlen=max_finished)
+        self._listeners = []
+        self._closed = False
+
+    def limit(self, category):
+        return self.limits.get(category, self.default_limit)
+
+    def submit(self, title, func, category=CATEGORY_SYSTEM, priority=PRIORITY_NORMAL, on_done=None):
+        """
+        Enfileira `func(job)` e retorna o Job (já executando, se havia vaga na categoria).
+        `on_done(job)` é chamado uma vez ao final (concluída, falha ou cancelada), na thread da tarefa
+        — ou na de quem cancelou, se ela ainda estava na fila.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("O gerenciador de tarefas foi encerrado.")
+            job = Job(self, next(self._ids), title, func, category, priority, on_done)
+            heapq.heappush(self._queues.setdefault(category, []), (priority, job.id, job))
+            self._active[job.id] = job
+        self._notify(job)
+        self._dispatch()
+        return job
+
+    def _dispatch(self):
+        """Inicia as tarefas da frente de cada fila enquanto houver vaga na categoria."""
+        started = []
+        with self._lock:
+            if self._closed:
+                return
+            for category, queue in self._queues.items():
+                limit = self.limit(category)
+                while queue and self._running.get(category, 0) < limit:
+                    job = heapq.heappop(queue)[2]
+                    if job.state != STATE_QUEUED:
+                        continue # Cancelada enquanto esperava
+                    self._running[category] = self._running.get(category, 0) + 1
+                    job.state = STATE_RUNNING
+                    job.started_at = time.time()
+                    started.append(job)
+            if started and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(sum(self.limits.values()), 1),
+                                                    thread_name_prefix="wintools-tarefa")
+            executor = self._executor
+        for job in started:
+            self._notify(job)
+            executor.submit(self._run, job)
+
+    def _run(self, job):
+        state, error = STATE_DONE, None
+        try:
+            job.token.raise_if_cancelled()
+            job.result = job.func(job)
+            if job.token.cancelled:
+                state = STATE_CANCELLED
+        except JobCancelled:
+            state = STATE_CANCELLED
+        except JobError as e:
+            state, error = STATE_FAILED, str(e)
+        except Exception as e:
+            state, error = STATE_FAILED, f"{type(e).__name__}: {e}"
+        with self._lock:
+            self._running[job.category] -= 1
+        self._complete(job, state, error, expected=STATE_RUNNING)
+        self._dispatch()
+
+    def _complete(self, job, state, error=None, expected=None):
+        with self._lock:
+            if job.state != expected:
+                return # Já finalizada (ou iniciada pelo _dispatch enquanto era cancelada na fila)
+            job.state = state
+            job.error = error
+            job.finished_at = time.time()
+            if state == STATE_DONE and job.progress is not None:
+                job.progress = 1.0
+            self._active.pop(job.id, None)
+            self._finished.append(job)
+        self._notify(job)
+        if job.on_done:
+            try:
+                job.on_done(job)
+            except Exception:
+                pass
+
+    def cancel(self, job):
+        """Cancela a tarefa: na fila ela sai na hora; executando, o token avisa a própria tarefa."""
+        job.token.cancel()
+        # Se ainda estava na fila, sai agora; a entrada no heap é descartada pelo _dispatch
+        self._complete(job, STATE_CANCELLED, expected=STATE_QUEUED)
+
+    def cancel_all(self):
+        for job in self.jobs(include_finished=False):
+            self.cancel(job)
+
+    def jobs(self, include_finished=True):
+        """Tarefas na fila e executando (em ordem de envio), seguidas das concluídas."""
+        with self._lock:
+            jobs = list(self._active.values())
+            if include_finished:
+                jobs.extend(self._finished)
+        return jobs
+
+    def counts(self):
+        """{estado: quantidade} das tarefas conhecidas."""
+        counts = {}
+        for job in self.jobs():
+            counts[job.state] = counts.get(job.state, 0) + 1
+        return counts
+
+    def clear_finished(self):
+        with self._lock:
+            self._finished.clear()
+
+    def add_listener(self, listener):
+        """`listener(job)` a cada mudança de estado ou de progresso."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, job):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(job)
+            except Exception:
+                pass
+
+    def shutdown(self, wait=False):
+        """Cancela tudo e libera o pool (ao sair do aplicativo)."""
+        self.cancel_all()
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def run_command_job(job, runner):
+    """
+    Corpo de tarefa para um CommandRunner: inicia e espera o processo terminar.
+    Registre `job.token.on_cancel(runner.cancel)` ao enviar (ver submit_command), para que
+    cancelar na fila encerre o runner sem iniciá-lo e, em execução, encerre o processo.
+    """
+    runner.start()
+    runner.wait()
+    job.set_progress(None, f"Código de saída {runner.returncode}" if runner.returncode is not None else "")
+    if runner.cancelled:
+        raise JobCancelled()
+    if runner.error:
+        raise JobError(runner.error.splitlines()[0])
+    return runner.returncode
+
+
+def submit_command(manager, title, runner, category=None, priority=PRIORITY_NORMAL, on_done=None):
+    """Envia um CommandRunner (ainda não iniciado) como tarefa; a categoria sai do comando se omitida."""
+    if category is None:
+        category = category_for_command(runner.command)
+    job = manager.submit(title, lambda job: run_command_job(job, runner), category, priority, on_done=on_done)
+    job.token.on_cancel(runner.cancel)
+    return job
+
+
+default_jobs = JobManager()
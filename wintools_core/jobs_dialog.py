@@ -0,0 +1,170 @@
+"""Painel de tarefas em segundo plano: fila por categoria, progresso, tempos de espera e de execução."""
+from PySide6.QtCore import Qt, QObject, QTimer, Signal
+from PySide6.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget, QTableWidgetItem,
+    QHeaderView, QProgressBar, QAbstractItemView
+)
+from PySide6.QtGui import QColor
+
+from wintools_core import jobs
+
+STATE_COLORS = {
+    jobs.STATE_QUEUED: QColor(150, 150, 150),
+    jobs.STATE_RUNNING: QColor(60, 130, 210),
+    jobs.STATE_DONE: QColor(60, 170, 80),
+    jobs.STATE_FAILED: QColor(210, 70, 70),
+    jobs.STATE_CANCELLED: QColor(200, 150, 40),
+}
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.1f}s"
+
+
+class JobSignals(QObject):
+    """
+    Ponte entre as threads do JobManager e a interface: `changed(job)` a cada mudança,
+    e `on_gui(callback)` embrulha um on_done para que ele rode na thread da interface.
+    """
+    changed = Signal(object)
+    _call = Signal(object, object)
+
+    def __init__(self, manager=jobs.default_jobs, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self._call.connect(self._invoke)
+        self._listener = self.changed.emit
+        manager.add_listener(self._listener)
+
+    def on_gui(self, callback):
+        return lambda job: self._call.emit(callback, job)
+
+    def _invoke(self, callback, job):
+        callback(job)
+
+    def detach(self):
+        self.manager.remove_listener(self._listener)
+
+
+class JobsPanel(QDockWidget):
+    """
+    Lista as tarefas na fila, executando e concluídas (as mais recentes no fim).
+    Cancelar atua nas selecionadas; uma tarefa na fila sai sem chegar a executar.
+    """
+    COLUMNS = ["Tarefa", "Categoria", "Prioridade", "Estado", "Progresso", "Espera", "Duração", "Detalhe"]
+
+    def __init__(self, parent, signals):
+        super().__init__("Tarefas em Segundo Plano", parent)
+        self.setObjectName("jobs_panel")
+        self.manager = signals.manager
+        self.rows = {} # id da tarefa -> linha
+
+        content = QWidget()
+        layout = QVBoxLayout(content)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.summary_label = QLabel("")
+        button_layout.addWidget(self.summary_label)
+        button_layout.addStretch()
+        cancel_button = QPushButton("⏹️ Cancelar Selecionadas")
+        cancel_button.clicked.connect(self.cancel_selected)
+        button_layout.addWidget(cancel_button)
+        clear_button = QPushButton("🧹 Limpar Concluídas")
+        clear_button.clicked.connect(self.clear_finished)
+        button_layout.addWidget(clear_button)
+        layout.addLayout(button_layout)
+        self.setWidget(content)
+
+        signals.changed.connect(self.update_job)
+        # Espera e duração das tarefas ativas avançam sem depender de eventos
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh_times)
+        self.timer.start(500)
+        self.rebuild()
+
+    def rebuild(self):
+        self.table.setRowCount(0)
+        self.rows.clear()
+        for job in self.manager.jobs():
+            self._show_job(job)
+        self.update_summary()
+
+    def update_job(self, job):
+        # As concluídas mais antigas saem do gerenciador (max_finished); a tabela acompanha de tempos em tempos
+        if job.id not in self.rows and len(self.rows) >= 2 * self.manager.max_finished:
+            self.rebuild()
+            return
+        self._show_job(job)
+        self.update_summary()
+
+    def _show_job(self, job):
+        row = self.rows.get(job.id)
+        if row is None:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.rows[job.id] = row
+            values = [job.title, job.category, job.priority_label]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setData(Qt.UserRole, job.id)
+                self.table.setItem(row, column, item)
+            self.table.setItem(row, 3, QTableWidgetItem())
+            for column in (5, 6, 7):
+                self.table.setItem(row, column, QTableWidgetItem())
+            bar = QProgressBar()
+            bar.setTextVisible(True)
+            bar.setMaximumHeight(16)
+            self.table.setCellWidget(row, 4, bar)
+        state_item = self.table.item(row, 3)
+        state_item.setText(job.state)
+        state_item.setForeground(STATE_COLORS.get(job.state, QColor(150, 150, 150)))
+        bar = self.table.cellWidget(row, 4)
+        if job.state == jobs.STATE_RUNNING and job.progress is None:
+            bar.setRange(0, 0) # Indeterminado
+        else:
+            bar.setRange(0, 100)
+            progress = job.progress if job.progress is not None else (1.0 if job.state == jobs.STATE_DONE else 0.0)
+            bar.setValue(round(progress * 100))
+        self.table.item(row, 7).setText(job.error or job.message)
+        self._update_times(row, job)
+
+    def _update_times(self, row, job):
+        self.table.item(row, 5).setText(_seconds(job.wait_time))
+        self.table.item(row, 6).setText(_seconds(job.duration))
+
+    def refresh_times(self):
+        if not self.isVisible():
+            return
+        for job in self.manager.jobs(include_finished=False):
+            row = self.rows.get(job.id)
+            if row is not None:
+                self._update_times(row, job)
+
+    def update_summary(self):
+        counts = self.manager.counts()
+        limits = ", ".join(f"{category} {limit}" for category, limit in self.manager.limits.items())
+        self.summary_label.setText(
+            f"Executando: {counts.get(jobs.STATE_RUNNING, 0)} | Na fila: {counts.get(jobs.STATE_QUEUED, 0)} | "
+            f"Concluídas: {sum(counts.get(state, 0) for state in jobs.FINAL_STATES)} | Limites: {limits}")
+
+    def selected_jobs(self):
+        ids = {self.table.item(index.row(), 0).data(Qt.UserRole) for index in self.table.selectionModel().selectedRows()}
+        return [job for job in self.manager.jobs(include_finished=False) if job.id in ids]
+
+    def cancel_selected(self):
+        for job in self.selected_jobs():
+            job.cancel()
+
+    def clear_finished(self):
+        self.manager.clear_finished()
+        self.rebuild()
@@ -0,0 +1,500 @@
+"""
+Monitor de disponibilidade de longa duração para portas TCP e URLs HTTP/HTTPS.
+
+Todas as verificações rodam num único loop asyncio, agendadas por uma roda de tempo
+(timing wheel): cada alvo ocupa um slot de `tick` segundos e os prazos além de uma volta
+contam voltas, então agendar e disparar custa O(1) por verificação, com centenas de alvos.
+Os primeiros prazos são espalhados ao longo do intervalo e cada slot aceita no máximo
+`max_per_tick` alvos (o excedente passa para os slots seguintes): as verificações saem
+distribuídas, sem rajadas.
+
+Intervalo adaptativo: a cada falha o intervalo do alvo cai pela metade (até `min_interval`),
+para detectar a volta rápido; a cada sucesso ele dobra até voltar ao intervalo configurado.
+
+Estado e alertas: um alvo fica "fora do ar" após `fail_threshold` falhas seguidas e volta
+"no ar" após `recover_threshold` sucessos seguidos. Cada mudança gera um MonitorEvent
+(guardados os últimos MAX_EVENTS) e chama `on_alert`.
+
+Histórico: cada alvo guarda as últimas `history` verificações num buffer circular de arrays
+pré-alocados (horário, latência e resultado), então a memória fica estável em dias de execução.
+"""
+import asyncio
+import math
+import socket
+import ssl
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+
+from wintools_core.httpprobe import HttpProbeError, USER_AGENT, parse_url
+from wintools_core.portscan import STATUS_OPEN, STATUS_REFUSED, STATUS_TIMEOUT, probe_addresses
+from wintools_core.resolver import default_resolver
+
+KIND_TCP = "tcp"
+KIND_HTTP = "http"
+
+# Estado de um alvo
+STATE_UNKNOWN = "aguardando"
+STATE_UP = "no ar"
+STATE_DOWN = "fora do ar"
+
+# Resultado de uma verificação, como guardado no histórico (0 = posição ainda vazia)
+RESULT_OK = 1
+RESULT_FAILED = 2
+RESULT_TIMEOUT = 3
+RESULT_NAMES = {RESULT_OK: "ok", RESULT_FAILED: "falha", RESULT_TIMEOUT: "timeout"}
+
+DEFAULT_INTERVAL = 30.0 # segundos entre verificações de um alvo no ar
+DEFAULT_MIN_INTERVAL = 2.0 # piso do intervalo enquanto o alvo falha
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_FAIL_THRESHOLD = 2
+DEFAULT_RECOVER_THRESHOLD = 2
+DEFAULT_HISTORY = 1440 # verificações por alvo (12 h a cada 30 s; ~13 bytes cada)
+DEFAULT_CONCURRENCY = 128
+DEFAULT_TICK = 0.25 # segundos por slot da roda
+DEFAULT_WHEEL_SLOTS = 512 # uma volta = 128 s com o tick padrão
+DEFAULT_MAX_PER_TICK = 16
+MAX_EVENTS = 1000
+
+
+class MonitorError(Exception):
+    """Alvo inválido (sem porta, URL malformada)."""
+
+
+def parse_target(spec):
+    """
+    "https://site/saude", "http://host:8080" -> (KIND_HTTP, host, porta, HttpTarget);
+    "host:porta", "[ipv6]:porta", "host porta", "tcp://host:porta" -> (KIND_TCP, host, porta, None).
+    """
+    spec = spec.strip()
+    lowered = spec.lower()
+    if lowered.startswith(("http://", "https://")):
+        try:
+            target = parse_url(spec)
+        except HttpProbeError as e:
+            raise MonitorError(str(e)) from None
+        return KIND_HTTP, target.host, target.port, target
+    if lowered.startswith("tcp://"):
+        spec = spec[6:]
+    if ' ' in spec:
+        host, _, port = spec.rpartition(' ')
+    elif spec.startswith('['):
+        host, _, port = spec[1:].partition(']')
+        port = port[1:] if port.startswith(':') else ""
+    else:
+        host, _, port = spec.rpartition(':')
+    host = host.strip()
+    try:
+        port = int(port)
+        if not host or not 1 <= port <= 65535:
+            raise ValueError
+    except ValueError:
+        raise MonitorError(f"Alvo inválido: '{spec}' (use host:porta ou uma URL http(s)://)") from None
+    return KIND_TCP, host, port, None
+
+
+class HistoryRing:
+    """Últimas `size` verificações em arrays pré-alocados: horário (epoch), latência (ms; NaN = falha) e resultado."""
+    __slots__ = ('size', 'times', 'latencies', 'results', 'position', 'count')
+
+    def __init__(self, size=DEFAULT_HISTORY):
+        self.size = size
+        self.times = array('d', bytes(8 * size))
+        self.latencies = array('f', bytes(4 * size))
+        self.results = array('B', bytes(size))
+        self.position = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, timestamp, latency_ms, result):
+        index = self.position
+        self.times[index] = timestamp
+        self.latencies[index] = math.nan if latency_ms is None else latency_ms
+        self.results[index] = result
+        self.position = (index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def __iter__(self):
+        """(horário, latência ou None, resultado), da mais antiga para a mais recente."""
+        start = (self.position - self.count) % self.size
+        for offset in range(self.count):
+            index = (start + offset) % self.size
+            latency = self.latencies[index]
+            yield self.times[index], None if latency != latency else latency, self.results[index]
+
+    def recent(self, count):
+        """Resultados das últimas `count` verificações (a mais recente por último)."""
+        count = min(count, self.count)
+        return [self.results[(self.position - count + offset) % self.size] for offset in range(count)]
+
+    @property
+    def availability(self):
+        """Percentual de verificações OK na janela (None sem verificações)."""
+        return 100.0 * self.results.count(RESULT_OK) / self.count if self.count else None
+
+
+class MonitorTarget:
+    """Um alvo monitorado: configuração, estado, intervalo atual e histórico."""
+    __slots__ = ('label', 'kind', 'host', 'port', 'http', 'ip', 'base_interval', 'interval', 'state', 'since',
+                 'fail_streak', 'ok_streak', 'checks', 'failures', 'total_ms', 'ok_checks', 'last_result',
+                 'last_latency', 'last_error', 'last_check', 'history', 'active', 'due')
+
+    def __init__(self, spec, interval=DEFAULT_INTERVAL, history=DEFAULT_HISTORY):
+        self.kind, self.host, self.port, self.http = parse_target(spec)
+        self.label = spec.strip()
+        self.ip = ""
+        self.base_interval = interval
+        self.interval = interval
+        self.state = STATE_UNKNOWN
+        self.since = time.time()
+        self.fail_streak = 0
+        self.ok_streak = 0
+        self.checks = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.ok_checks = 0
+        self.last_result = 0
+        self.last_latency = None
+        self.last_error = ""
+        self.last_check = None
+        self.history = HistoryRing(history)
+        self.active = True
+        self.due = 0.0 # Prazo da próxima verificação (relógio do loop)
+
+    def record(self, result, latency_ms, error, now, fail_threshold, recover_threshold, min_interval):
+        """Registra uma verificação, ajusta o intervalo e retorna o estado anterior se ele mudou (senão None)."""
+        self.checks += 1
+        self.last_result = result
+        self.last_latency = latency_ms
+        self.last_error = error
+        self.last_check = now
+        self.history.add(now, latency_ms, result)
+        previous = self.state
+        if result == RESULT_OK:
+            self.ok_checks += 1
+            self.total_ms += latency_ms
+            self.ok_streak += 1
+            self.fail_streak = 0
+            self.interval = min(self.base_interval, self.interval * 2)
+            if self.state == STATE_UNKNOWN or (self.state == STATE_DOWN and self.ok_streak >= recover_threshold):
+                self.state = STATE_UP
+        else:
+            self.failures += 1
+            self.fail_streak += 1
+            self.ok_streak = 0
+            self.interval = max(min(min_interval, self.base_interval), self.interval / 2)
+            if self.state != STATE_DOWN and self.fail_streak >= fail_threshold:
+                self.state = STATE_DOWN
+        if self.state == previous:
+            return None
+        self.since = now
+        return previous
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.ok_checks if self.ok_checks else None
+
+    def snapshot(self):
+        return {
+            'label': self.label, 'kind': self.kind, 'host': self.host, 'port': self.port, 'ip': self.ip,
+            'state': self.state, 'since': self.since, 'interval': self.interval, 'base_interval': self.base_interval,
+            'checks': self.checks, 'failures': self.failures, 'availability': self.history.availability,
+            'last_result': RESULT_NAMES.get(self.last_result, ""), 'last_ms': self.last_latency, 'avg_ms': self.avg_ms,
+            'last_error': self.last_error, 'last_check': self.last_check,
+        }
+
+
+@dataclass(slots=True)
+class MonitorEvent:
+    """Mudança de estado de um alvo. `duration_s` = quanto tempo ficou no estado anterior."""
+    timestamp: float
+    label: str
+    previous: str
+    state: str
+    detail: str = ""
+    duration_s: float | None = None
+
+    def as_dict(self):
+        return {'timestamp': self.timestamp, 'label': self.label, 'previous': self.previous, 'state': self.state,
+                'detail': self.detail, 'duration_s': None if self.duration_s is None else round(self.duration_s, 1)}
+
+
+class TimingWheel:
+    """
+    Roda de tempo com voltas: `slots` listas de `tick` segundos. Um prazo além de uma volta
+    fica no slot de destino com o número de voltas que ainda faltam.
+    """
+    def __init__(self, tick=DEFAULT_TICK, slots=DEFAULT_WHEEL_SLOTS, max_per_tick=DEFAULT_MAX_PER_TICK):
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        self.max_per_tick = max_per_tick
+        self.cursor = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def schedule(self, item, delay):
+        """Agenda `item` para daqui a `delay` segundos (arredondado para cima em ticks). Retorna os ticks usados."""
+        count = len(self.slots)
+        ticks = max(1, math.ceil(delay / self.tick - 1e-9))
+        # Slot cheio: adia para o próximo com vaga (limitado a uma volta) para não disparar em rajada
+        for _ in range(count):
+            slot = self.slots[(self.cursor + ticks) % count]
+            if len(slot) < self.max_per_tick:
+                break
+            ticks += 1
+        slot.append([(ticks - 1) // count, item])
+        self.size += 1
+        return ticks
+
+    def advance(self):
+        """Avança um tick e retorna os itens cujo prazo chegou."""
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        slot = self.slots[self.cursor]
+        if not slot:
+            return []
+        due = []
+        waiting = []
+        for entry in slot:
+            if entry[0]:
+                entry[0] -= 1
+                waiting.append(entry)
+            else:
+                due.append(entry[1])
+        slot[:] = waiting
+        self.size -= len(due)
+        return due
+
+
+class HealthMonitor:
+    """
+    Verifica periodicamente portas TCP e URLs HTTP/HTTPS num único loop asyncio.
+    `on_alert(evento, alvo)` e `on_result(alvo)` são chamados na thread do loop.
+    """
+    def __init__(self, timeout=DEFAULT_TIMEOUT, fail_threshold=DEFAULT_FAIL_THRESHOLD,
+                 recover_threshold=DEFAULT_RECOVER_THRESHOLD, min_interval=DEFAULT_MIN_INTERVAL,
+                 history=DEFAULT_HISTORY, concurrency=DEFAULT_CONCURRENCY, tick=DEFAULT_TICK,
+                 wheel_slots=DEFAULT_WHEEL_SLOTS, max_per_tick=DEFAULT_MAX_PER_TICK, verify=True,
+                 on_alert=None, on_result=None):
+        self.timeout = timeout
+        self.fail_threshold = fail_threshold
+        self.recover_threshold = recover_threshold
+        self.min_interval = min_interval
+        self.history = history
+        self.concurrency = concurrency
+        self.tick = tick
+        self.wheel_slots = wheel_slots
+        self.max_per_tick = max_per_tick
+        self.verify = verify
+        self.on_alert = on_alert
+        self.on_result = on_result
+        self.targets = []
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.alert_count = 0 # Total de eventos já gerados (o deque guarda só os últimos)
+        self.checks = 0
+        self.lag_total_ms = 0.0 # Atraso entre o prazo e o disparo de cada verificação
+        self.lag_max_ms = 0.0
+        self._loop = None
+        self._wheel = None
+        self._lock = threading.Lock()
+        self._ssl_context = None
+
+    @property
+    def ssl_context(self):
+        if self._ssl_context is None:
+            context = ssl.create_default_context()
+            if not self.verify:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = context
+        return self._ssl_context
+
+    def add_target(self, spec, interval=DEFAULT_INTERVAL):
+        """Adiciona um alvo (também com o monitor rodando, de qualquer thread). Lança MonitorError."""
+        target = MonitorTarget(spec, interval, self.history)
+        with self._lock:
+            if any(existing.label == target.label for existing in self.targets):
+                raise MonitorError(f"Alvo repetido: {target.label}")
+            self.targets.append(target)
+            loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._schedule, target, 0.0)
+        return target
+
+    def remove_target(self, label):
+        """Remove o alvo; uma verificação já agendada é descartada quando o prazo chegar."""
+        with self._lock:
+            for target in self.targets:
+                if target.label == label:
+                    target.active = False
+                    self.targets.remove(target)
+                    return True
+        return False
+
+    def snapshot(self):
+        with self._lock:
+            targets = list(self.targets)
+        return [target.snapshot() for target in targets]
+
+    def recent_events(self, since_count=0):
+        """Eventos gerados depois de `since_count` (o valor de alert_count numa leitura anterior)."""
+        events = list(self.events)
+        new = self.alert_count - since_count
+        return events[-new:] if 0 < new <= len(events) else (events if new > 0 else [])
+
+    def stats(self):
+        with self._lock:
+            targets = list(self.targets)
+        states = {STATE_UNKNOWN: 0, STATE_UP: 0, STATE_DOWN: 0}
+        for target in targets:
+            states[target.state] += 1
+        return {
+            'targets': len(targets), 'states': states, 'checks': self.checks, 'alerts': self.alert_count,
+            'lag_avg_ms': self.lag_total_ms / self.checks if self.checks else None, 'lag_max_ms': self.lag_max_ms,
+        }
+
+    def _schedule(self, target, delay):
+        if not target.active:
+            return
+        ticks = self._wheel.schedule(target, delay)
+        target.due = self._loop.time() + ticks * self.tick
+
+    async def _check_tcp(self, target):
+        addresses = await default_resolver.resolve_async(target.host)
+        target.ip, status, latency, error = await probe_addresses(addresses, target.port, self.timeout)
+        if status == STATUS_OPEN:
+            return RESULT_OK, latency, ""
+        if status == STATUS_TIMEOUT:
+            return RESULT_TIMEOUT, None, f"Sem resposta em {self.timeout:g} s."
+        return RESULT_FAILED, None, "Conexão recusada." if status == STATUS_REFUSED else error
+
+    async def _check_http(self, target):
+        """GET com Connection: close; o alvo está no ar se a linha de status chega com código < 400."""
+        http = target.http
+        addresses = await default_resolver.resolve_async(http.host)
+        https = http.scheme == "https"
+        start = time.perf_counter()
+        for index, (family, target.ip) in enumerate(addresses): # Em ordem, como o httpprobe (IPv6 sem rota -> IPv4)
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(
+                    target.ip, http.port, family=family, ssl=self.ssl_context if https else None,
+                    server_hostname=http.host if https else None), self.timeout)
+                break
+            except asyncio.TimeoutError:
+                return RESULT_TIMEOUT, None, f"Sem conexão em {self.timeout:g} s."
+            except OSError as e:
+                if isinstance(e, ssl.SSLError) or index == len(addresses) - 1:
+                    raise # Erro de TLS vale para o host; sem outro endereço, o erro é o resultado
+        try:
+            writer.write(f"GET {http.path} HTTP/1.1\r\nHost: {http.host_header}\r\nUser-Agent: {USER_AGENT}\r\n"
+                         f"Accept: */*\r\nConnection: close\r\n\r\n".encode('utf-8'))
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), max(0.001, self.timeout - (time.perf_counter() - start)))
+        except asyncio.TimeoutError:
+            return RESULT_TIMEOUT, None, f"Sem resposta HTTP em {self.timeout:g} s."
+        finally:
+            writer.close()
+        latency = (time.perf_counter() - start) * 1000.0
+        parts = line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+            return RESULT_FAILED, None, "Resposta HTTP inválida." if line else "Conexão fechada sem resposta HTTP."
+        if int(parts[1]) >= 400:
+            return RESULT_FAILED, None, f"HTTP {parts[1]} {parts[2].strip() if len(parts) > 2 else ''}".rstrip()
+        return RESULT_OK, latency, ""
+
+    async def check(self, target):
+        """Uma verificação do alvo: (resultado, latência em ms ou None, erro)."""
+        try:
+            if target.kind == KIND_HTTP:
+                return await self._check_http(target)
+            return await self._check_tcp(target)
+        except ssl.SSLCertVerificationError as e:
+            return RESULT_FAILED, None, f"Certificado inválido: {e.verify_message or e.reason}"
+        except socket.gaierror as e: # Inclui ResolveError
+            return RESULT_FAILED, None, e.strerror or str(e)
+        except ConnectionRefusedError:
+            return RESULT_FAILED, None, "Conexão recusada."
+        except OSError as e:
+            return RESULT_FAILED, None, str(e) or type(e).__name__
+
+    async def _run_check(self, target, semaphore):
+        started = None
+        try:
+            async with semaphore:
+                started = self._loop.time()
+                lag_ms = max(0.0, started - target.due) * 1000.0
+                try:
+                    result, latency, error = await self.check(target)
+                except Exception as e: # Erro inesperado (resolver, HTTP...): conta como falha do alvo
+                    result, latency, error = RESULT_FAILED, None, f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            self.checks += 1
+            self.lag_total_ms += lag_ms
+            if lag_ms > self.lag_max_ms:
+                self.lag_max_ms = lag_ms
+            now = time.time()
+            since = target.since
+            previous = target.record(result, latency, error, now, self.fail_threshold, self.recover_threshold,
+                                     self.min_interval)
+            if previous is not None and not (previous == STATE_UNKNOWN and target.state == STATE_UP):
+                event = MonitorEvent(now, target.label, previous, target.state,
+                                     error if target.state == STATE_DOWN else f"{latency:.1f} ms",
+                                     None if previous == STATE_UNKNOWN else now - since)
+                self.events.append(event)
+                self.alert_count += 1
+                if self.on_alert is not None:
+                    self.on_alert(event, target)
+            if self.on_result is not None:
+                self.on_result(target)
+        except asyncio.CancelledError:
+            started = None # Monitor parando: a verificação interrompida não volta para a roda
+            raise
+        finally:
+            # Sempre reagenda (mesmo se um callback falhar), exceto se a tarefa parou antes de verificar.
+            # O próximo prazo conta do início desta verificação (verificações lentas não se acumulam)
+            if started is not None:
+                self._schedule(target, target.interval - (self._loop.time() - started))
+
+    async def run(self, stop_event):
+        """Monitora os alvos até `stop_event` (threading.Event) ser sinalizado."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        running = set()
+        with self._lock:
+            self._loop = loop
+            self._wheel = TimingWheel(self.tick, self.wheel_slots, self.max_per_tick)
+            targets = list(self.targets)
+        # Primeiros prazos espalhados ao longo do intervalo de cada alvo
+        for index, target in enumerate(targets):
+            self._schedule(target, target.interval * index / len(targets))
+        next_tick = loop.time() + self.tick
+        try:
+            while not stop_event.is_set():
+                delay = next_tick - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_tick += self.tick
+                for target in self._wheel.advance():
+                    if target.active:
+                        task = loop.create_task(self._run_check(target, semaphore))
+                        running.add(task)
+                        task.add_done_callback(running.discard)
+        finally:
+            for task in list(running):
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            with self._lock:
+                self._loop = None
+
+    def run_in_thread(self):
+        """Inicia o monitor numa thread própria; retorna o threading.Event que o interrompe."""
+        stop_event = threading.Event()
+        thread = threading.Thread(target=lambda: asyncio.run(self.run(stop_event)), daemon=True, name="wintools-monitor")
+        thread.start()
+        return stop_event
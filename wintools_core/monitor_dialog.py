@@ -0,0 +1,284 @@
+"""Diálogo do monitor de disponibilidade: portas TCP e URLs HTTP verificadas por horas, com alertas de mudança de estado."""
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QApplication, QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QPlainTextEdit, QPushButton, QLabel,
+    QSpinBox, QDoubleSpinBox, QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QSplitter,
+    QFileDialog
+)
+from PySide6.QtGui import QColor, QFont
+
+from wintools_core import monitor
+from wintools_core.csvtable import export_csv
+
+STATE_COLORS = {
+    monitor.STATE_UP: QColor(60, 170, 80),
+    monitor.STATE_DOWN: QColor(210, 70, 70),
+    monitor.STATE_UNKNOWN: QColor(150, 150, 150),
+}
+MAX_ALERT_LINES = 1000
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _clock(timestamp):
+    return "-" if timestamp is None else datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+
+
+def _duration(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}min {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}min"
+
+
+class HealthMonitorDialog(QDialog):
+    """
+    Monitora portas TCP e URLs HTTP/HTTPS até ser parado. O intervalo encurta enquanto um alvo
+    falha e volta ao normal quando ele se recupera; cada queda/volta entra na lista de alertas.
+    """
+    COLUMNS = ["Alvo", "Tipo", "IP", "Estado", "Há", "Última (ms)", "Média (ms)", "Disponibilidade %",
+               "Verificações", "Falhas", "Intervalo (s)", "Último Erro"]
+
+    def __init__(self, parent=None, targets=""):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Monitor de Disponibilidade (Portas TCP e URLs HTTP)")
+        self.setMinimumSize(1050, 650)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+
+        self.monitor = None
+        self.stop_event = None
+        self.rows = {} # rótulo -> linha
+        self.seen_alerts = 0
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.targets_input = QPlainTextEdit(targets)
+        self.targets_input.setPlaceholderText("Um alvo por linha: host:porta ou URL\nEx: servidor01:3389\n10.0.0.5:1433\nhttps://intranet/saude")
+        self.targets_input.setMaximumHeight(110)
+        form.addRow("Alvos:", self.targets_input)
+
+        options_layout = QHBoxLayout()
+        self.interval_input = QDoubleSpinBox()
+        self.interval_input.setRange(1.0, 3600.0)
+        self.interval_input.setValue(monitor.DEFAULT_INTERVAL)
+        self.interval_input.setSuffix(" s")
+        options_layout.addWidget(QLabel("Intervalo:"))
+        options_layout.addWidget(self.interval_input)
+        self.min_interval_input = QDoubleSpinBox()
+        self.min_interval_input.setRange(0.5, 600.0)
+        self.min_interval_input.setValue(monitor.DEFAULT_MIN_INTERVAL)
+        self.min_interval_input.setSuffix(" s")
+        self.min_interval_input.setToolTip("Enquanto o alvo falha o intervalo cai pela metade a cada falha, até este mínimo.")
+        options_layout.addWidget(QLabel("Mínimo em falha:"))
+        options_layout.addWidget(self.min_interval_input)
+        self.timeout_input = QDoubleSpinBox()
+        self.timeout_input.setRange(0.5, 60.0)
+        self.timeout_input.setValue(monitor.DEFAULT_TIMEOUT)
+        self.timeout_input.setSuffix(" s")
+        options_layout.addWidget(QLabel("Timeout:"))
+        options_layout.addWidget(self.timeout_input)
+        self.threshold_input = QSpinBox()
+        self.threshold_input.setRange(1, 10)
+        self.threshold_input.setValue(monitor.DEFAULT_FAIL_THRESHOLD)
+        self.threshold_input.setToolTip("Falhas seguidas para o alvo ser considerado fora do ar (e sucessos seguidos para voltar).")
+        options_layout.addWidget(QLabel("Falhas p/ alerta:"))
+        options_layout.addWidget(self.threshold_input)
+        self.verify_input = QCheckBox("Verificar certificado")
+        self.verify_input.setChecked(True)
+        options_layout.addWidget(self.verify_input)
+        self.beep_input = QCheckBox("Som nos alertas")
+        self.beep_input.setChecked(True)
+        options_layout.addWidget(self.beep_input)
+        options_layout.addStretch()
+        form.addRow(options_layout)
+        layout.addLayout(form)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("▶️ Iniciar")
+        self.start_button.clicked.connect(self.start_monitor)
+        button_layout.addWidget(self.start_button)
+        self.stop_button = QPushButton("⏹️ Parar")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_monitor)
+        button_layout.addWidget(self.stop_button)
+        self.add_button = QPushButton("➕ Adicionar Alvos Novos")
+        self.add_button.setEnabled(False)
+        self.add_button.setToolTip("Inclui no monitor em andamento os alvos da lista que ainda não estão na tabela.")
+        self.add_button.clicked.connect(self.add_new_targets)
+        button_layout.addWidget(self.add_button)
+        self.export_button = QPushButton("📤 Exportar Histórico")
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.export_history)
+        button_layout.addWidget(self.export_button)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        splitter.addWidget(self.table)
+        self.alerts_text = QPlainTextEdit()
+        self.alerts_text.setReadOnly(True)
+        self.alerts_text.setFont(QFont("Consolas"))
+        self.alerts_text.setMaximumBlockCount(MAX_ALERT_LINES)
+        self.alerts_text.setPlaceholderText("Alertas: cada vez que um alvo cai ou volta aparece aqui, com o horário e a duração.")
+        splitter.addWidget(self.alerts_text)
+        splitter.setSizes([420, 160])
+        layout.addWidget(splitter)
+
+        self.status_label = QLabel("Pronto.")
+        layout.addWidget(self.status_label)
+
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+        # A tabela é atualizada por amostragem do estado do monitor (sem um sinal por verificação)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def _specs(self):
+        return [line.strip() for line in self.targets_input.toPlainText().replace(',', '\n').splitlines() if line.strip()]
+
+    def _add_targets(self, health_monitor, specs):
+        """Adiciona os alvos ao monitor; retorna as mensagens de erro dos inválidos."""
+        errors = []
+        for spec in specs:
+            try:
+                health_monitor.add_target(spec, self.interval_input.value())
+            except monitor.MonitorError as e:
+                errors.append(str(e))
+        return errors
+
+    def start_monitor(self):
+        """Cria o monitor com os alvos informados e inicia as verificações em segundo plano."""
+        specs = self._specs()
+        if not specs:
+            QMessageBox.warning(self, "Entrada Inválida", "Informe ao menos um alvo (host:porta ou URL).")
+            return
+        # Só substitui o monitor atual depois que todos os alvos forem aceitos
+        health_monitor = monitor.HealthMonitor(
+            timeout=self.timeout_input.value(), fail_threshold=self.threshold_input.value(),
+            recover_threshold=self.threshold_input.value(), min_interval=self.min_interval_input.value(),
+            verify=self.verify_input.isChecked())
+        errors = self._add_targets(health_monitor, specs)
+        if errors:
+            QMessageBox.warning(self, "Entrada Inválida", "\n".join(errors[:10]))
+            return
+        self.monitor = health_monitor
+        self.rows = {}
+        self.seen_alerts = 0
+        self.table.setRowCount(0)
+        self.alerts_text.clear()
+        self.stop_event = self.monitor.run_in_thread()
+        self.refresh_timer.start()
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.add_button.setEnabled(True)
+        self.export_button.setEnabled(True)
+        self.refresh()
+
+    def add_new_targets(self):
+        if not self.monitor:
+            return
+        known = {target.label for target in self.monitor.targets}
+        errors = self._add_targets(self.monitor, [spec for spec in self._specs() if spec not in known])
+        if errors:
+            QMessageBox.warning(self, "Entrada Inválida", "\n".join(errors[:10]))
+        self.refresh()
+
+    def stop_monitor(self):
+        """Interrompe as verificações (a tabela, os alertas e o histórico permanecem)."""
+        if self.stop_event:
+            self.stop_event.set()
+        self.refresh_timer.stop()
+        self.refresh()
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.add_button.setEnabled(False)
+
+    def refresh(self):
+        """Atualiza a tabela, acrescenta os alertas novos e o resumo."""
+        if not self.monitor:
+            return
+        now = datetime.now().timestamp()
+        for snapshot in self.monitor.snapshot():
+            row = self.rows.get(snapshot['label'])
+            if row is None:
+                row = self.rows[snapshot['label']] = self.table.rowCount()
+                self.table.insertRow(row)
+                for column in range(len(self.COLUMNS)):
+                    self.table.setItem(row, column, QTableWidgetItem(""))
+            availability = snapshot['availability']
+            values = [
+                snapshot['label'], snapshot['kind'].upper(), snapshot['ip'], snapshot['state'],
+                _duration(now - snapshot['since']), _ms(snapshot['last_ms']), _ms(snapshot['avg_ms']),
+                "-" if availability is None else f"{availability:.1f}", str(snapshot['checks']),
+                str(snapshot['failures']), f"{snapshot['interval']:g}", snapshot['last_error'],
+            ]
+            for column, value in enumerate(values):
+                self.table.item(row, column).setText(value)
+            self.table.item(row, 3).setForeground(STATE_COLORS[snapshot['state']])
+
+        events = self.monitor.recent_events(self.seen_alerts)
+        self.seen_alerts = self.monitor.alert_count
+        for event in events:
+            duration = "" if event.duration_s is None else f" após {_duration(event.duration_s)} {event.previous}"
+            detail = f" - {event.detail}" if event.detail else ""
+            self.alerts_text.appendPlainText(f"[{_clock(event.timestamp)}] {event.label}: {event.state.upper()}{duration}{detail}")
+        if any(event.state == monitor.STATE_DOWN for event in events):
+            if self.beep_input.isChecked():
+                QApplication.beep()
+            QApplication.alert(self) # Pisca na barra de tarefas se a janela não estiver em foco
+
+        stats = self.monitor.stats()
+        states = stats['states']
+        lag = "-" if stats['lag_avg_ms'] is None else f"{stats['lag_avg_ms']:.1f} ms (máx. {stats['lag_max_ms']:.0f} ms)"
+        self.status_label.setText(
+            f"{'Monitorando' if self.stop_event and not self.stop_event.is_set() else 'Parado'}: {stats['targets']} alvo(s) | "
+            f"No ar: {states[monitor.STATE_UP]} | Fora do ar: {states[monitor.STATE_DOWN]} | "
+            f"Aguardando: {states[monitor.STATE_UNKNOWN]} | Verificações: {stats['checks']} | "
+            f"Alertas: {stats['alerts']} | Atraso do agendador: {lag}"
+        )
+        self.setWindowTitle(f"WinTools - Monitor de Disponibilidade ({states[monitor.STATE_DOWN]} fora do ar)"
+                            if states[monitor.STATE_DOWN] else "WinTools - Monitor de Disponibilidade (Portas TCP e URLs HTTP)")
+
+    def export_history(self):
+        """Uma linha por verificação guardada no histórico de cada alvo."""
+        if not self.monitor:
+            return
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Exportar Histórico do Monitor", f"monitor_{timestamp}.csv",
+                                                   "CSV (*.csv);;Todos os Arquivos (*.*)")
+        if not file_path:
+            return
+        rows = []
+        for target in list(self.monitor.targets):
+            for checked_at, latency, result in target.history:
+                rows.append([target.label, datetime.fromtimestamp(checked_at).isoformat(sep=' ', timespec='seconds'),
+                             monitor.RESULT_NAMES.get(result, ""), "" if latency is None else f"{latency:.1f}"])
+        rows.sort(key=lambda row: row[1])
+        try:
+            export_csv(file_path, ["Alvo", "Horário", "Resultado", "Latência (ms)"], rows)
+            QMessageBox.information(self, "Sucesso", f"{len(rows)} verificação(ões) exportada(s) para:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Erro ao Salvar", f"Não foi possível salvar o arquivo:\n{e}")
+
+    def reject(self):
+        """Interrompe o monitor antes de fechar o diálogo (Fechar, Esc ou X)."""
+        if self.stop_event:
+            self.stop_event.set()
+        self.refresh_timer.stop()
+        super().reject()
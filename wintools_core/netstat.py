@@ -0,0 +1,226 @@
+"""
+Parser do `netstat -ano` com índices por porta/remoto/estado/PID e diferenças entre capturas.
+
+Cada conexão vira um ConnRecord (tupla nomeada, compacta). Capturas sucessivas são
+comparadas pela chave (protocolo, local, remoto), gerando apenas as conexões novas,
+fechadas e alteradas (estado ou PID); as contagens por estado e por PID e os índices
+são ajustados a partir da diferença, sem recontar a tabela inteira.
+"""
+import gc
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from operator import attrgetter, itemgetter
+
+ConnRecord = namedtuple('ConnRecord', 'proto local_ip local_port remote_ip remote_port state pid')
+_new_record = tuple.__new__ # Sem o __new__ em Python da namedtuple: a carga inicial cria dezenas de milhares
+
+# Índices por campo, criados no primeiro uso e depois mantidos pela diferença
+_INDEX_KEYS = {
+    'local_port': attrgetter('local_port'),
+    'remote_ip': attrgetter('remote_ip'),
+    'remote': attrgetter('remote_ip', 'remote_port'),
+    'state': attrgetter('state'),
+    'pid': attrgetter('pid'),
+}
+_connection_key = itemgetter(0, 1, 2, 3, 4)
+
+# Estados localizados (pt-BR/es) -> nome canônico do netstat em inglês
+STATE_ALIASES = {
+    'ESCUTANDO': 'LISTENING', 'ESCUCHANDO': 'LISTENING',
+    'ESTABELECIDA': 'ESTABLISHED', 'ESTABLECIDO': 'ESTABLISHED',
+    'AGUARDANDO_FECHAMENTO': 'CLOSE_WAIT', 'ESPERANDO_CIERRE': 'CLOSE_WAIT',
+    'FECHANDO': 'CLOSING', 'CERRANDO': 'CLOSING',
+    'SYN_ENVIADO': 'SYN_SENT', 'SYN_RECEBIDO': 'SYN_RECEIVED',
+}
+
+
+def parse_line(line, aliases=STATE_ALIASES):
+    """Converte uma linha de `netstat -ano` em ConnRecord (None para cabeçalhos/linhas vazias)."""
+    # Endereços "192.168.0.1:443" / "[::1]:80" / "*:*" separados aqui mesmo: roda uma vez por linha da tabela
+    parts = line.split()
+    if len(parts) < 4:
+        return None
+    proto = parts[0]
+    if proto == 'TCP' or proto == 'TCPv6':
+        if len(parts) != 5:
+            return None
+        state = parts[3]
+        state = aliases.get(state, state)
+    elif proto == 'UDP' or proto == 'UDPv6':
+        state = ""
+    else:
+        return None # Cabeçalhos e linhas de nome de processo (netstat -b)
+    local_ip, _, local_port = parts[1].rpartition(':')
+    if local_ip[:1] == '[':
+        local_ip = local_ip[1:-1]
+    remote_ip, _, remote_port = parts[2].rpartition(':')
+    if remote_ip[:1] == '[':
+        remote_ip = remote_ip[1:-1]
+    pid = parts[-1]
+    return _new_record(ConnRecord, (proto, local_ip, int(local_port) if local_port.isdigit() else 0,
+                                    remote_ip, int(remote_port) if remote_port.isdigit() else 0,
+                                    state, int(pid) if pid.isdigit() else 0))
+
+
+def parse_netstat(text):
+    """Converte a saída de `netstat -ano` em uma lista de ConnRecord."""
+    return [record for record in map(parse_line, text.splitlines()) if record is not None]
+
+
+def connection_key(record):
+    """Identidade de uma conexão entre capturas (estado e PID podem mudar)."""
+    return _connection_key(record) # (proto, local_ip, local_port, remote_ip, remote_port)
+
+
+def _state_or_proto(record):
+    return record.state or record.proto
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pausa o coletor de ciclos durante a carga: dezenas de milhares de tuplas novas disparam
+    várias coletas seguidas, e os registros (tuplas imutáveis) nunca formam ciclos.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class NetstatDiff:
+    """Diferença entre duas capturas: listas de ConnRecord novas/fechadas e pares (antes, depois) alterados."""
+    __slots__ = ('added', 'removed', 'changed')
+
+    def __init__(self, added, removed, changed):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+class ConnectionMonitor:
+    """
+    Aplica capturas sucessivas do netstat, retornando só as mudanças.
+
+    O netstat alinha as colunas com largura fixa, então uma conexão inalterada gera
+    exatamente a mesma linha: a comparação é feita entre conjuntos de linhas e só as
+    linhas que mudaram são interpretadas. Conexões, contagens por estado/PID e os
+    índices por porta/remoto/estado/PID são atualizados a partir da diferença.
+    """
+    def __init__(self):
+        self.connections = {} # connection_key -> ConnRecord
+        self.state_counts = Counter()
+        self.pid_counts = Counter()
+        self.refreshes = 0
+        self._lines = frozenset()
+        self._by_line = {} # linha -> ConnRecord
+        self._indexes = {} # nome -> {valor do campo -> {connection_key -> ConnRecord}}
+
+    def __len__(self):
+        return len(self.connections)
+
+    def update(self, text):
+        """Processa uma nova saída do netstat e retorna a NetstatDiff em relação à anterior."""
+        with _gc_paused():
+            return self._apply(text)
+
+    def _apply(self, text):
+        lines = frozenset(text.splitlines())
+        by_line = self._by_line
+        removed = {}
+        for line in self._lines - lines:
+            record = by_line.pop(line, None)
+            if record is not None:
+                removed[record[:5]] = record
+        new_lines = list(lines - self._lines)
+        records = list(map(parse_line, new_lines))
+        by_line.update(zip(new_lines, records)) # Cabeçalhos ficam como None: não são interpretados de novo
+        changed = []
+        if removed:
+            added = []
+            for record in records:
+                if record is None:
+                    continue
+                before = removed.pop(record[:5], None)
+                if before is None:
+                    added.append(record)
+                else:
+                    changed.append((before, record))
+        else: # Primeira captura (ou só conexões novas): tudo entra de uma vez
+            added = [record for record in records if record is not None]
+        self._lines = lines
+
+        connections = self.connections
+        removed = list(removed.values())
+        gone = removed + [before for before, _ in changed]
+        new = added + [after for _, after in changed]
+        for record in removed:
+            del connections[_connection_key(record)]
+        connections.update(zip(map(_connection_key, new), new))
+        if gone or new:
+            self._count(self.state_counts, _state_or_proto, gone, new)
+            self._count(self.pid_counts, attrgetter('pid'), gone, new)
+            self._update_indexes(gone, new)
+        self.refreshes += 1
+        return NetstatDiff(added, removed, changed)
+
+    @staticmethod
+    def _count(counts, field, gone, new):
+        """Ajusta as contagens em lote (Counter.update/subtract em C) e remove as que zeraram."""
+        counts.subtract(map(field, gone))
+        counts.update(map(field, new))
+        for value in set(map(field, gone)):
+            if counts[value] <= 0:
+                del counts[value]
+
+    def _update_indexes(self, gone, new):
+        """Aplica a diferença aos índices já criados: sai o registro antigo, entra o novo."""
+        for name, index in self._indexes.items():
+            key_func = _INDEX_KEYS[name]
+            for record in gone:
+                value = key_func(record)
+                bucket = index.get(value)
+                if bucket is not None:
+                    bucket.pop(_connection_key(record), None)
+                    if not bucket:
+                        del index[value]
+            for record in new:
+                index.setdefault(key_func(record), {})[_connection_key(record)] = record
+
+    def _lookup(self, name, value):
+        """Conexões com `valor` no campo `name`; o índice é construído no primeiro uso."""
+        index = self._indexes.get(name)
+        if index is None:
+            key_func = _INDEX_KEYS[name]
+            index = {}
+            for key, record in self.connections.items():
+                index.setdefault(key_func(record), {})[key] = record
+            self._indexes[name] = index
+        bucket = index.get(value)
+        return list(bucket.values()) if bucket else []
+
+    def by_local_port(self, port):
+        return self._lookup('local_port', port)
+
+    def by_remote(self, ip, port=None):
+        if port is None:
+            return self._lookup('remote_ip', ip)
+        return self._lookup('remote', (ip, port))
+
+    def by_state(self, state):
+        return self._lookup('state', STATE_ALIASES.get(state, state))
+
+    def by_pid(self, pid):
+        return self._lookup('pid', pid)
+
+
+def format_endpoint(ip, port):
+    if ip == '*':
+        return '*:*'
+    return f"[{ip}]:{port}" if ':' in ip else f"{ip}:{port}"
@@ -0,0 +1,249 @@
+"""Diálogo do monitor de conexões (netstat -ano) com atualização periódica e diferenças."""
+import subprocess
+import sys
+import threading
+import time
+
+from PySide6.QtCore import Qt, QObject, QTimer, Signal
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QComboBox, QDoubleSpinBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QTabWidget, QWidget
+)
+from PySide6.QtGui import QColor
+
+from wintools_core.codepage import decode_output
+from wintools_core.netstat import ConnectionMonitor, format_endpoint
+
+NETSTAT_COMMAND = ["netstat", "-ano"]
+MAX_EVENT_ROWS = 5000
+MAX_QUERY_ROWS = 5000
+TOP_PIDS = 15
+
+EVENT_COLORS = {
+    "Nova": QColor(60, 170, 80),
+    "Fechada": QColor(210, 70, 70),
+    "Alterada": QColor(200, 150, 40),
+}
+
+# (rótulo, método de índice do ConnectionMonitor, conversão do valor digitado)
+QUERY_FIELDS = [
+    ("Porta Local", "by_local_port", int),
+    ("IP Remoto", "by_remote", str),
+    ("Estado", "by_state", str.upper),
+    ("PID", "by_pid", int),
+]
+
+
+def _capture_netstat():
+    """Executa o netstat e retorna o texto (levanta OSError/CalledProcessError/TimeoutExpired)."""
+    flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+    result = subprocess.run(NETSTAT_COMMAND, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            stdin=subprocess.DEVNULL, timeout=60, check=True, creationflags=flags)
+    return decode_output(result.stdout)
+
+
+class _RefreshBridge(QObject):
+    """Leva o resultado da captura (feita em outra thread) de volta à thread da interface."""
+    refreshed = Signal(object)
+    failed = Signal(str)
+
+
+class NetstatMonitorDialog(QDialog):
+    """Captura o netstat periodicamente e mostra só o que mudou, com contagens por estado e PID."""
+    EVENT_COLUMNS = ["Hora", "Evento", "Proto", "Endereço Local", "Endereço Remoto", "Estado", "PID"]
+    QUERY_COLUMNS = ["Proto", "Endereço Local", "Endereço Remoto", "Estado", "PID"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Monitor de Conexões (Netstat)")
+        self.setMinimumSize(900, 600)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+
+        self.monitor = ConnectionMonitor()
+        self.monitor_lock = threading.Lock()
+        self.running = False
+        self.refreshing = False
+        self.bridge = _RefreshBridge(self)
+        self.bridge.refreshed.connect(self.apply_refresh)
+        self.bridge.failed.connect(self.refresh_failed)
+
+        layout = QVBoxLayout(self)
+        control_layout = QHBoxLayout()
+        self.interval_input = QDoubleSpinBox()
+        self.interval_input.setRange(1.0, 300.0)
+        self.interval_input.setValue(5.0)
+        self.interval_input.setSuffix(" s")
+        control_layout.addWidget(QLabel("Atualizar a cada:"))
+        control_layout.addWidget(self.interval_input)
+        self.start_button = QPushButton("▶️ Iniciar")
+        self.start_button.clicked.connect(self.start_monitor)
+        control_layout.addWidget(self.start_button)
+        self.stop_button = QPushButton("⏹️ Parar")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_monitor)
+        control_layout.addWidget(self.stop_button)
+        control_layout.addStretch()
+        layout.addLayout(control_layout)
+
+        self.counts_label = QLabel("Nenhuma captura ainda.")
+        self.counts_label.setWordWrap(True)
+        layout.addWidget(self.counts_label)
+
+        self.tabs = QTabWidget()
+        self.events_table = self._create_table(self.EVENT_COLUMNS)
+        self.tabs.addTab(self.events_table, "Alterações")
+
+        query_tab = QWidget()
+        query_layout = QVBoxLayout(query_tab)
+        query_controls = QHBoxLayout()
+        self.query_field = QComboBox()
+        for label, _, _ in QUERY_FIELDS:
+            self.query_field.addItem(label)
+        query_controls.addWidget(self.query_field)
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Valor (Ex: 443, 8.8.8.8, ESTABLISHED, 1044)")
+        self.query_input.returnPressed.connect(self.run_query)
+        query_controls.addWidget(self.query_input)
+        query_button = QPushButton("🔎 Consultar")
+        query_button.clicked.connect(self.run_query)
+        query_controls.addWidget(query_button)
+        query_layout.addLayout(query_controls)
+        self.query_table = self._create_table(self.QUERY_COLUMNS)
+        query_layout.addWidget(self.query_table)
+        self.tabs.addTab(query_tab, "Consulta")
+
+        self.pid_table = self._create_table(["PID", "Conexões"])
+        self.tabs.addTab(self.pid_table, f"Top {TOP_PIDS} PIDs")
+        layout.addWidget(self.tabs)
+
+        self.status_label = QLabel("Pronto.")
+        layout.addWidget(self.status_label)
+
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+        # Uma captura por vez: a próxima só é agendada quando a anterior termina
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def _create_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        return table
+
+    def start_monitor(self):
+        self.running = True
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.refresh()
+
+    def stop_monitor(self):
+        self.running = False
+        self.refresh_timer.stop()
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.status_label.setText("Monitoramento parado.")
+
+    def refresh(self):
+        """Captura e compara o netstat em segundo plano."""
+        if self.refreshing:
+            return
+        self.refreshing = True
+        self.status_label.setText("Capturando netstat -ano...")
+
+        def work():
+            try:
+                text = _capture_netstat()
+                start = time.perf_counter()
+                with self.monitor_lock:
+                    first = self.monitor.refreshes == 0
+                    diff = self.monitor.update(text)
+                    summary = (len(self.monitor), self.monitor.state_counts.most_common(),
+                               self.monitor.pid_counts.most_common(TOP_PIDS))
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+            except (OSError, subprocess.SubprocessError) as e:
+                self.bridge.failed.emit(f"Falha ao executar o netstat: {e}")
+                return
+            self.bridge.refreshed.emit((first, diff, summary, elapsed_ms))
+
+        threading.Thread(target=work, daemon=True, name="wintools-netstat").start()
+
+    def apply_refresh(self, result):
+        first, diff, (total, states, pids), elapsed_ms = result
+        self.refreshing = False
+        if first:
+            self.status_label.setText(f"Captura inicial: {total} conexões ({elapsed_ms:.0f} ms).")
+        else:
+            self._append_events(diff)
+            self.status_label.setText(
+                f"{time.strftime('%H:%M:%S')} — +{len(diff.added)} novas, -{len(diff.removed)} fechadas, "
+                f"~{len(diff.changed)} alteradas ({elapsed_ms:.0f} ms).")
+        self.counts_label.setText(f"Conexões: {total}  |  " + "  |  ".join(f"{state}: {count}" for state, count in states))
+        self.pid_table.setRowCount(len(pids))
+        for row, (pid, count) in enumerate(pids):
+            self.pid_table.setItem(row, 0, QTableWidgetItem(str(pid)))
+            self.pid_table.setItem(row, 1, QTableWidgetItem(str(count)))
+        if self.running:
+            self.refresh_timer.start(int(self.interval_input.value() * 1000))
+
+    def refresh_failed(self, message):
+        self.refreshing = False
+        self.stop_monitor()
+        self.status_label.setText(message)
+
+    def _append_events(self, diff):
+        events = [("Nova", record) for record in diff.added]
+        events += [("Fechada", record) for record in diff.removed]
+        events += [("Alterada", after) for _, after in diff.changed]
+        if not events:
+            return
+        events = events[-MAX_EVENT_ROWS:]
+        now = time.strftime('%H:%M:%S')
+        table = self.events_table
+        at_bottom = table.verticalScrollBar().value() >= table.verticalScrollBar().maximum()
+        table.setUpdatesEnabled(False)
+        overflow = table.rowCount() + len(events) - MAX_EVENT_ROWS
+        for _ in range(max(0, overflow)):
+            table.removeRow(0)
+        row = table.rowCount()
+        table.setRowCount(row + len(events))
+        for event, record in events:
+            values = [now, event, record.proto, format_endpoint(record.local_ip, record.local_port),
+                      format_endpoint(record.remote_ip, record.remote_port), record.state, str(record.pid)]
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(value))
+            table.item(row, 1).setForeground(EVENT_COLORS[event])
+            row += 1
+        table.setUpdatesEnabled(True)
+        if at_bottom:
+            table.scrollToBottom()
+
+    def run_query(self):
+        """Consulta a última captura pelos índices (porta local, IP remoto, estado ou PID)."""
+        _, method, convert = QUERY_FIELDS[self.query_field.currentIndex()]
+        try:
+            value = convert(self.query_input.text().strip())
+        except ValueError:
+            self.status_label.setText("Valor inválido para a consulta.")
+            return
+        with self.monitor_lock:
+            records = list(getattr(self.monitor, method)(value))
+        self.query_table.setRowCount(min(len(records), MAX_QUERY_ROWS))
+        for row, record in enumerate(records[:MAX_QUERY_ROWS]):
+            values = [record.proto, format_endpoint(record.local_ip, record.local_port),
+                      format_endpoint(record.remote_ip, record.remote_port), record.state, str(record.pid)]
+            for column, value in enumerate(values):
+                self.query_table.setItem(row, column, QTableWidgetItem(value))
+        self.status_label.setText(f"Consulta: {len(records)} conexão(ões) encontrada(s).")
+
+    def reject(self):
+        """Interrompe as atualizações antes de fechar o diálogo (Fechar, Esc ou X)."""
+        self.running = False
+        self.refresh_timer.stop()
+        super().reject()
@@ -0,0 +1,123 @@
+"""
+Armazenamento da saída de comandos com uso de memória limitado.
+
+A saída completa fica em um arquivo temporário (em memória até `spool_limit` bytes,
+depois em disco), de forma que a interface só precise manter as últimas linhas visíveis.
+RawCapture guarda, do mesmo jeito, os bytes originais de cada fluxo, antes de qualquer decodificação.
+"""
+import codecs
+import shutil
+import tempfile
+import threading
+
+DEFAULT_SPOOL_LIMIT = 1024 * 1024 # 1 MB em memória antes de ir para o disco
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class OutputStore:
+    """Saída completa de um comando, gravada de forma incremental e lida em blocos."""
+    def __init__(self, spool_limit=DEFAULT_SPOOL_LIMIT):
+        self._file = tempfile.SpooledTemporaryFile(max_size=spool_limit, mode='w+b', prefix="wintools_output_")
+        self.size = 0 # bytes (UTF-8)
+        self.line_count = 0
+        self.closed = False
+
+    def append(self, text):
+        """Acrescenta texto ao final da saída armazenada."""
+        if self.closed or not text:
+            return
+        data = text.encode('utf-8')
+        self._file.seek(0, 2)
+        self._file.write(data)
+        self.size += len(data)
+        self.line_count += text.count('\n')
+
+    def iter_chunks(self, chunk_size=READ_CHUNK_SIZE):
+        """Lê a saída desde o início em blocos de texto, sem carregar tudo na memória."""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        offset = 0
+        while offset < self.size:
+            self._file.seek(offset)
+            data = self._file.read(min(chunk_size, self.size - offset))
+            if not data:
+                break
+            offset += len(data)
+            text = decoder.decode(data, final=offset >= self.size)
+            if text:
+                yield text
+
+    def getvalue(self):
+        """Retorna toda a saída como texto (evite para saídas muito grandes)."""
+        return "".join(self.iter_chunks())
+
+    def close(self):
+        """Descarta o armazenamento temporário."""
+        if not self.closed:
+            self.closed = True
+            self._file.close()
+
+
+class RawCapture:
+    """
+    Bytes originais de cada fluxo (stdout/stderr), sem decodificação: salvar estes bytes
+    reproduz exatamente o que o comando escreveu. `append` é chamado pelas threads de leitura.
+    """
+    def __init__(self, spool_limit=DEFAULT_SPOOL_LIMIT):
+        self.spool_limit = spool_limit
+        self._files = {}
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.closed = False
+
+    def append(self, stream, data):
+        with self._lock:
+            if self.closed or not data:
+                return
+            file = self._files.get(stream)
+            if file is None:
+                file = self._files[stream] = tempfile.SpooledTemporaryFile(
+                    max_size=self.spool_limit, mode='w+b', prefix="wintools_raw_")
+            file.write(data)
+            self._sizes[stream] = self._sizes.get(stream, 0) + len(data)
+
+    def size(self, stream):
+        return self._sizes.get(stream, 0)
+
+    def write_to(self, stream, path):
+        """Grava os bytes do fluxo em `path`; retorna quantos bytes foram gravados."""
+        with self._lock:
+            file = self._files.get(stream)
+            with open(path, 'wb') as target:
+                if file is not None:
+                    file.seek(0)
+                    shutil.copyfileobj(file, target, READ_CHUNK_SIZE)
+                    file.seek(0, 2)
+            return self._sizes.get(stream, 0)
+
+    def close(self):
+        with self._lock:
+            if not self.closed:
+                self.closed = True
+                for file in self._files.values():
+                    file.close()
+                self._files.clear()
+
+
+def tail_lines(text, max_lines):
+    """Retorna apenas as últimas `max_lines` linhas do texto (sem dividir o texto inteiro)."""
+    position = len(text) - 1 if text.endswith('\n') else len(text)
+    for _ in range(max_lines):
+        position = text.rfind('\n', 0, position)
+        if position < 0:
+            return text
+    return text[position + 1:]
+
+
+def split_lines(text, max_lines):
+    """Divide o texto depois das primeiras `max_lines` linhas: (início, restante)."""
+    position = -1
+    for _ in range(max_lines):
+        position = text.find('\n', position + 1)
+        if position < 0:
+            return text, ""
+    return text[:position + 1], text[position + 1:]
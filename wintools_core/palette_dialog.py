@@ -0,0 +1,71 @@
+"""Paleta de comandos (Ctrl+K): busca por prefixo em todos os comandos e sub-comandos do registro."""
+from PySide6.QtCore import Qt, QEvent
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QLabel
+
+from wintools_core.commands import (
+    OUTPUT_WINDOW, OUTPUT_TERMINAL, OUTPUT_MESSAGE, OUTPUT_DIALOG, OUTPUT_EXTERNAL, OUTPUT_SUBMENU
+)
+
+OUTPUT_HINTS = {
+    OUTPUT_WINDOW: "saída na janela",
+    OUTPUT_TERMINAL: "abre terminal",
+    OUTPUT_MESSAGE: "mensagem",
+    OUTPUT_DIALOG: "ferramenta",
+    OUTPUT_EXTERNAL: "programa do Windows",
+    OUTPUT_SUBMENU: "sub-menu",
+}
+
+
+class CommandPaletteDialog(QDialog):
+    """Digite para filtrar; ↑/↓ escolhem e Enter executa. O ID escolhido fica em `selected_id`."""
+    def __init__(self, parent, registry):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Paleta de Comandos (Ctrl+K)")
+        self.setMinimumSize(620, 420)
+        self.registry = registry
+        self.selected_id = None
+
+        layout = QVBoxLayout(self)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔎 Buscar comando (Ex: flush, winget list, ping monitor)...")
+        self.search_input.textChanged.connect(self.update_results)
+        self.search_input.returnPressed.connect(self.accept_current)
+        self.search_input.installEventFilter(self)
+        layout.addWidget(self.search_input)
+        self.results = QListWidget()
+        self.results.itemActivated.connect(self.accept_current)
+        layout.addWidget(self.results)
+        self.hint_label = QLabel("Enter executa • Esc fecha")
+        layout.addWidget(self.hint_label)
+        self.update_results()
+
+    def update_results(self):
+        self.results.clear()
+        for descriptor in self.registry.search(self.search_input.text()):
+            parent = self.registry.parent_of(descriptor)
+            path = f"{parent.label} › {descriptor.label}" if parent else descriptor.label
+            flags = [OUTPUT_HINTS.get(descriptor.output, descriptor.output)]
+            if descriptor.admin:
+                flags.insert(0, "Admin")
+            category = descriptor.category or (parent.category if parent else "")
+            item = QListWidgetItem(f"{category} {path}   [{', '.join(flags)}]".strip())
+            item.setData(Qt.UserRole, descriptor.id)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def eventFilter(self, watched, event):
+        # Setas no campo de busca movem a seleção da lista
+        if watched is self.search_input and event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Up, Qt.Key_Down):
+            row = self.results.currentRow() + (1 if event.key() == Qt.Key_Down else -1)
+            if 0 <= row < self.results.count():
+                self.results.setCurrentRow(row)
+            return True
+        return super().eventFilter(watched, event)
+
+    def accept_current(self, *args):
+        item = self.results.currentItem()
+        if item is None:
+            return
+        self.selected_id = item.data(Qt.UserRole)
+        self.accept()
@@ -0,0 +1,20 @@
+"""Pastas de dados do WinTools (catálogos, caches e históricos persistentes)."""
+import os
+import sys
+
+
+def user_data_dir():
+    """%LOCALAPPDATA%\\WinTools no Windows, ~/.cache/wintools nos demais (criada sob demanda)."""
+    if sys.platform == "win32":
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(r'~\AppData\Local')
+        path = os.path.join(base, 'WinTools')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        path = os.path.join(base, 'wintools')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def user_data_path(name):
+    """Caminho de um arquivo dentro de user_data_dir()."""
+    return os.path.join(user_data_dir(), name)
@@ -0,0 +1,249 @@
+"""
+Scanner de portas TCP assíncrono (asyncio) para vários hosts e portas.
+
+Aceita listas de hosts, faixas CIDR e intervalos de portas ("22,80,443,8000-8100"),
+executa com concorrência limitada e limite de taxa por alvo, e entrega os
+resultados à medida que chegam.
+"""
+import asyncio
+import ipaddress
+import re
+import socket
+import time
+from dataclasses import dataclass
+
+from wintools_core.resolver import default_resolver
+
+# Status possíveis de um resultado
+STATUS_OPEN = "aberta"
+STATUS_REFUSED = "recusada"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "erro"
+
+MAX_HOSTS = 65536 # Evita expandir por engano um /8 inteiro
+STOP_POLL = 0.1 # segundos entre verificações do stop_event durante a varredura
+
+_SPLIT_PATTERN = re.compile(r"[\s,;]+")
+
+
+@dataclass(slots=True)
+class ScanResult:
+    host: str
+    ip: str
+    port: int
+    status: str
+    latency_ms: float | None = None
+    error: str = ""
+
+
+def parse_ports(spec):
+    """Converte "22,80,8000-8100" em uma lista ordenada de portas únicas."""
+    ports = set()
+    for part in _SPLIT_PATTERN.split(spec.strip()):
+        if not part:
+            continue
+        try:
+            if '-' in part:
+                start, end = (int(p) for p in part.split('-', 1))
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ValueError(f"Porta inválida: '{part}'")
+        if not (1 <= start <= end <= 65535):
+            raise ValueError(f"Intervalo de portas inválido: '{part}' (use 1-65535)")
+        ports.update(range(start, end + 1))
+    if not ports:
+        raise ValueError("Nenhuma porta informada.")
+    return sorted(ports)
+
+
+def parse_hosts(spec):
+    """Converte uma lista de hosts/IPs/CIDR (separados por vírgula, espaço ou linha) em hosts individuais."""
+    hosts = []
+    seen = set()
+    for part in _SPLIT_PATTERN.split(spec.strip()):
+        if not part:
+            continue
+        if '/' in part:
+            try:
+                network = ipaddress.ip_network(part, strict=False)
+            except ValueError:
+                raise ValueError(f"Faixa CIDR inválida: '{part}'")
+            if network.num_addresses > MAX_HOSTS:
+                raise ValueError(f"Faixa CIDR muito grande: '{part}' (máximo {MAX_HOSTS} endereços)")
+            # /31, /32 (e /127, /128) não têm endereço de rede/broadcast
+            addresses = network if network.num_addresses <= 2 else network.hosts()
+            candidates = [str(a) for a in addresses]
+        else:
+            candidates = [part]
+        for host in candidates:
+            if host not in seen:
+                seen.add(host)
+                hosts.append(host)
+        if len(hosts) > MAX_HOSTS:
+            raise ValueError(f"Hosts demais na lista (máximo {MAX_HOSTS}).")
+    if not hosts:
+        raise ValueError("Nenhum host informado.")
+    return hosts
+
+
+class _HostRateLimiter:
+    """Espaça as conexões para um mesmo alvo em no máximo `rate` tentativas por segundo."""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = {}
+
+    async def wait(self, key):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot.get(key, now))
+        self._next_slot[key] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def _resolve(host):
+    """
+    Resolve o host pelo resolvedor compartilhado: ([(família, ip), ...], "") ou (None, mensagem de erro).
+    Um nome inválido (ex.: rótulo IDNA vazio ou longo demais) vira erro só na linha dele, sem abortar a varredura.
+    """
+    try:
+        return await default_resolver.resolve_async(host), ""
+    except socket.gaierror as e:
+        return None, e.strerror
+    except ValueError as e: # UnicodeError do codec idna
+        return None, f"Nome inválido: {e}"
+
+
+async def probe_port(ip, port, family=socket.AF_INET, timeout=2.0):
+    """Tenta uma conexão TCP e retorna (status, latência em ms, erro)."""
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+        return STATUS_OPEN, (time.perf_counter() - start) * 1000.0, ""
+    except asyncio.TimeoutError:
+        return STATUS_TIMEOUT, None, ""
+    except ConnectionRefusedError:
+        return STATUS_REFUSED, (time.perf_counter() - start) * 1000.0, ""
+    except OSError as e:
+        return STATUS_ERROR, None, str(e)
+    finally:
+        sock.close()
+
+
+async def probe_addresses(addresses, port, timeout=2.0):
+    """
+    probe_port nos endereços do host, em ordem, como o httpprobe: sem rota ou recusa passa ao
+    próximo (ex.: AAAA sem rota IPv6, serviço só em IPv4); aberta ou timeout encerram.
+    Retorna (ip, status, latência em ms, erro); sem sucesso vale a primeira recusa, ou o último erro.
+    """
+    best = None
+    for family, ip in addresses:
+        status, latency, error = await probe_port(ip, port, family, timeout)
+        if status in (STATUS_OPEN, STATUS_TIMEOUT):
+            return ip, status, latency, error
+        if best is None or best[1] != STATUS_REFUSED:
+            best = (ip, status, latency, error)
+    return best
+
+
+async def scan_iter(hosts, ports, concurrency=500, rate_per_host=0, timeout=2.0, stop_event=None):
+    """
+    Varre todas as combinações host x porta e gera ScanResult conforme cada conexão termina.
+    `rate_per_host` limita as tentativas por segundo em cada host (0 = sem limite).
+    `stop_event` (threading.Event opcional) interrompe a varredura: nenhuma conexão nova é aberta
+    e as que estão em andamento são canceladas em até STOP_POLL segundos, sem esperar o timeout.
+    """
+    resolve_limit = asyncio.Semaphore(min(concurrency, 64))
+
+    async def resolve(host):
+        async with resolve_limit:
+            return host, await _resolve(host)
+
+    results = asyncio.Queue()
+    resolved = []
+    for host, (addresses, error) in await asyncio.gather(*(resolve(h) for h in hosts)):
+        if addresses is None:
+            for port in ports:
+                results.put_nowait(ScanResult(host, "", port, STATUS_ERROR, None, error))
+        else:
+            resolved.append((host, addresses))
+
+    # Intercala os hosts dentro de cada porta para não concentrar a carga em um único alvo
+    targets = ((host, addresses, port) for port in ports for host, addresses in resolved)
+    limiter = _HostRateLimiter(rate_per_host)
+
+    async def worker():
+        for host, addresses, port in targets:
+            if stop_event is not None and stop_event.is_set():
+                break
+            await limiter.wait(addresses[0][1])
+            ip, status, latency, error = await probe_addresses(addresses, port, timeout)
+            await results.put(ScanResult(host, ip, port, status, latency, error))
+
+    total_targets = len(resolved) * len(ports)
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, total_targets)))]
+    done = asyncio.gather(*workers, return_exceptions=True)
+    done.add_done_callback(lambda _: results.put_nowait(None)) # Sentinela de fim
+
+    async def watch_stop():
+        while not stop_event.is_set():
+            await asyncio.sleep(STOP_POLL)
+        for task in workers:
+            task.cancel()
+
+    watcher = asyncio.create_task(watch_stop()) if stop_event is not None else None
+    try:
+        while (result := await results.get()) is not None:
+            yield result
+        for outcome in done.result(): # Propaga exceções inesperadas dos workers (cancelamento não conta)
+            if isinstance(outcome, Exception):
+                raise outcome
+    finally:
+        for task in workers:
+            task.cancel()
+        if watcher is not None:
+            watcher.cancel()
+
+
+async def check_targets_iter(targets, concurrency=500, timeout=2.0):
+    """
+    Testa pares (host, porta) avulsos (não o produto host x porta) e gera ScanResult
+    conforme cada conexão termina. Cada nome é resolvido uma única vez.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    resolutions = {}
+
+    async def check(host, port):
+        async with semaphore:
+            if host not in resolutions:
+                resolutions[host] = asyncio.ensure_future(_resolve(host))
+            addresses, error = await resolutions[host]
+            if addresses is None:
+                return ScanResult(host, "", port, STATUS_ERROR, None, error)
+            ip, status, latency, error = await probe_addresses(addresses, port, timeout)
+            return ScanResult(host, ip, port, status, latency, error)
+
+    for future in asyncio.as_completed([check(host, port) for host, port in targets]):
+        yield await future
+
+
+def run_scan(hosts, ports, on_result, **options):
+    """Executa a varredura em um loop asyncio próprio (útil em threads), chamando `on_result` por resultado."""
+    async def consume():
+        async for result in scan_iter(hosts, ports, **options):
+            on_result(result)
+    asyncio.run(consume())
+
+
+def summarize(results):
+    """Conta os resultados por status."""
+    counts = {STATUS_OPEN: 0, STATUS_REFUSED: 0, STATUS_TIMEOUT: 0, STATUS_ERROR: 0}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return counts
@@ -0,0 +1,214 @@
+"""Diálogo do scanner de portas (vários hosts/portas) com tabela de resultados em tempo real."""
+import threading
+import time
+
+from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QPlainTextEdit, QPushButton,
+    QLabel, QSpinBox, QDoubleSpinBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+)
+from PySide6.QtGui import QColor
+
+from wintools_core import portscan
+
+STATUS_COLORS = {
+    portscan.STATUS_OPEN: QColor(60, 170, 80),
+    portscan.STATUS_REFUSED: QColor(200, 150, 40),
+    portscan.STATUS_TIMEOUT: QColor(150, 150, 150),
+    portscan.STATUS_ERROR: QColor(210, 70, 70),
+}
+
+
+class _ScanWorker(QThread):
+    """Executa o loop asyncio da varredura fora da thread da interface e envia os resultados em lotes."""
+    results_ready = Signal(object)
+    scan_failed = Signal(str)
+
+    BATCH_INTERVAL = 0.1 # segundos entre envios para a interface
+
+    def __init__(self, hosts, ports, options, parent=None):
+        super().__init__(parent)
+        self.hosts = hosts
+        self.ports = ports
+        self.options = options
+        self.stop_event = threading.Event()
+
+    def run(self):
+        batch = []
+        last_emit = time.monotonic()
+
+        def on_result(result):
+            nonlocal last_emit
+            batch.append(result)
+            if time.monotonic() - last_emit >= self.BATCH_INTERVAL:
+                self.results_ready.emit(batch.copy())
+                batch.clear()
+                last_emit = time.monotonic()
+
+        try:
+            portscan.run_scan(self.hosts, self.ports, on_result, stop_event=self.stop_event, **self.options)
+        except Exception as e:
+            self.scan_failed.emit(str(e))
+        if batch:
+            self.results_ready.emit(batch)
+
+
+class PortScanDialog(QDialog):
+    """Scanner de portas TCP para listas de hosts, faixas CIDR e intervalos de portas."""
+    COLUMNS = ["Host", "IP", "Porta", "Status", "Latência (ms)"]
+
+    def __init__(self, parent=None, hosts="", ports="22,80,443,3389"):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Scanner de Portas (Vários Hosts/Portas)")
+        self.setMinimumSize(760, 600)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+
+        self.worker = None
+        self.closing = False
+        self.counts = {}
+        self.started_at = 0.0
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+
+        self.hosts_input = QPlainTextEdit(hosts)
+        self.hosts_input.setPlaceholderText("Hosts, IPs ou faixas CIDR (um por linha ou separados por vírgula)\nEx: 192.168.0.0/24, servidor01, 10.0.0.5")
+        self.hosts_input.setMaximumHeight(90)
+        form.addRow("Hosts:", self.hosts_input)
+
+        self.ports_input = QLineEdit(ports)
+        self.ports_input.setPlaceholderText("Ex: 22,80,443,3389,8000-8100")
+        form.addRow("Portas:", self.ports_input)
+
+        options_layout = QHBoxLayout()
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setRange(1, 5000)
+        self.concurrency_input.setValue(500)
+        options_layout.addWidget(QLabel("Conexões simultâneas:"))
+        options_layout.addWidget(self.concurrency_input)
+        self.timeout_input = QDoubleSpinBox()
+        self.timeout_input.setRange(0.1, 30.0)
+        self.timeout_input.setValue(2.0)
+        self.timeout_input.setSuffix(" s")
+        options_layout.addWidget(QLabel("Timeout:"))
+        options_layout.addWidget(self.timeout_input)
+        self.rate_input = QSpinBox()
+        self.rate_input.setRange(0, 10000)
+        self.rate_input.setValue(0)
+        self.rate_input.setSpecialValueText("Sem limite")
+        options_layout.addWidget(QLabel("Tentativas/s por host:"))
+        options_layout.addWidget(self.rate_input)
+        form.addRow(options_layout)
+        layout.addLayout(form)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("▶️ Iniciar Varredura")
+        self.start_button.clicked.connect(self.start_scan)
+        button_layout.addWidget(self.start_button)
+        self.stop_button = QPushButton("⏹️ Parar")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_scan)
+        button_layout.addWidget(self.stop_button)
+        layout.addLayout(button_layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        self.summary_label = QLabel("Pronto.")
+        layout.addWidget(self.summary_label)
+
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+    def start_scan(self):
+        """Valida a entrada e inicia a varredura em segundo plano."""
+        try:
+            hosts = portscan.parse_hosts(self.hosts_input.toPlainText())
+            ports = portscan.parse_ports(self.ports_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Entrada Inválida", str(e))
+            return
+
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        self.counts = portscan.summarize([])
+        self.total = len(hosts) * len(ports)
+        self.started_at = time.monotonic()
+
+        options = {
+            'concurrency': self.concurrency_input.value(),
+            'timeout': self.timeout_input.value(),
+            'rate_per_host': self.rate_input.value(),
+        }
+        self.worker = _ScanWorker(hosts, ports, options, self)
+        self.worker.results_ready.connect(self.add_results)
+        self.worker.scan_failed.connect(lambda msg: QMessageBox.critical(self, "Erro na Varredura", msg))
+        self.worker.finished.connect(self.scan_finished)
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.update_summary("Varrendo")
+        self.worker.start()
+
+    def stop_scan(self):
+        """Solicita a interrupção da varredura em andamento."""
+        if self.worker:
+            self.worker.stop_event.set()
+            self.stop_button.setEnabled(False)
+
+    def add_results(self, results):
+        """Acrescenta um lote de resultados à tabela."""
+        row = self.table.rowCount()
+        self.table.setRowCount(row + len(results))
+        for result in results:
+            latency = f"{result.latency_ms:.1f}" if result.latency_ms is not None else "-"
+            status = result.status if not result.error else f"{result.status}: {result.error}"
+            values = [result.host, result.ip, result.port, status, latency]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                if column == 3:
+                    item.setForeground(STATUS_COLORS.get(result.status, QColor(150, 150, 150)))
+                self.table.setItem(row, column, item)
+            self.counts[result.status] = self.counts.get(result.status, 0) + 1
+            row += 1
+        self.update_summary("Varrendo")
+
+    def update_summary(self, state):
+        elapsed = time.monotonic() - self.started_at
+        done = sum(self.counts.values())
+        self.summary_label.setText(
+            f"{state}: {done}/{self.total} em {elapsed:.1f}s | "
+            f"Abertas: {self.counts[portscan.STATUS_OPEN]} | Recusadas: {self.counts[portscan.STATUS_REFUSED]} | "
+            f"Timeout: {self.counts[portscan.STATUS_TIMEOUT]} | Erros: {self.counts[portscan.STATUS_ERROR]}"
+        )
+
+    def scan_finished(self):
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.table.setSortingEnabled(True)
+        self.update_summary("Interrompido" if self.worker.stop_event.is_set() else "Concluído")
+
+    def reject(self):
+        """
+        Interrompe a varredura antes de fechar o diálogo (Fechar, Esc ou X). Sem bloquear a interface:
+        com o worker ainda ativo, o diálogo fecha quando ele emitir `finished` (a varredura cancela as
+        conexões pendentes em até portscan.STOP_POLL segundos).
+        """
+        if self.worker and self.worker.isRunning():
+            if not self.closing:
+                self.closing = True
+                self.worker.stop_event.set()
+                self.stop_button.setEnabled(False)
+                self.summary_label.setText("Encerrando a varredura...")
+                self.worker.finished.connect(self._close_after_scan)
+            return
+        super().reject()
+
+    def _close_after_scan(self):
+        self.worker.wait() # `finished` sai no fim do run(): a thread já está terminando
+        super().reject()
@@ -0,0 +1,340 @@
+"""
+Motor de sondagem de latência (ping interno) para vários destinos simultâneos.
+
+Métodos:
+- "icmp": eco ICMP sem privilégios — IcmpSendEcho (iphlpapi) no Windows, socket
+  SOCK_DGRAM/IPPROTO_ICMP no Linux/macOS quando o sistema permite.
+- "tcp": tempo de conexão TCP (o RST de uma porta fechada também conta como resposta).
+
+Cada destino guarda as últimas amostras de RTT em buffers circulares de array('d');
+mín/máx/média, jitter e perda são atualizados a cada amostra e os percentis saem de
+uma janela ordenada mantida de forma incremental.
+"""
+import asyncio
+import bisect
+import math
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from wintools_core.resolver import default_resolver, routable_addresses
+
+METHOD_AUTO = "auto"
+METHOD_ICMP = "icmp"
+METHOD_TCP = "tcp"
+
+DEFAULT_WINDOW = 600 # amostras por destino (10 min a 1/s)
+DEFAULT_TCP_PORT = 443
+
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+
+
+class ProbeError(Exception):
+    """Destino inválido (porta fora de 1-65535, host vazio)."""
+
+
+def split_host_port(spec, default_port=DEFAULT_TCP_PORT):
+    """
+    "host", "host:porta", "[ipv6]:porta" ou IPv6 sem colchetes -> (host, porta, porta_informada).
+    Levanta ProbeError se a porta não for um número de 1 a 65535.
+    """
+    spec = spec.strip()
+    port = None
+    if spec.startswith('['):
+        host, _, rest = spec[1:].partition(']')
+        if rest:
+            if not rest.startswith(':'):
+                raise ProbeError(f"Destino inválido: '{spec}'.")
+            port = rest[1:]
+    elif spec.count(':') == 1:
+        host, port = spec.split(':')
+    else:
+        host = spec # Nome, IPv4 ou IPv6 sem porta
+    host = host.strip()
+    if not host:
+        raise ProbeError(f"Destino sem host: '{spec}'.")
+    explicit = port is not None
+    try:
+        port = int(port if explicit else default_port)
+        if not 1 <= port <= 65535:
+            raise ValueError
+    except (TypeError, ValueError):
+        raise ProbeError(f"Porta inválida em '{spec}' (use um número de 1 a 65535).") from None
+    return host, port, explicit
+
+
+class RttRing:
+    """Janela circular de RTTs (ms) com estatísticas incrementais."""
+    __slots__ = ('size', 'samples', 'sorted_window', 'position', 'sent', 'received',
+                 'min', 'max', 'total', 'jitter', 'last')
+
+    def __init__(self, size=DEFAULT_WINDOW):
+        self.size = size
+        self.samples = array('d') # RTTs na ordem de chegada (circular)
+        self.sorted_window = array('d') # Mesmos valores, ordenados (para percentis)
+        self.position = 0
+        self.sent = 0
+        self.received = 0
+        self.min = float('inf')
+        self.max = 0.0
+        self.total = 0.0
+        self.jitter = 0.0
+        self.last = None
+
+    def add(self, rtt_ms):
+        """Registra uma resposta com RTT em ms."""
+        self.sent += 1
+        self.received += 1
+        if rtt_ms < self.min:
+            self.min = rtt_ms
+        if rtt_ms > self.max:
+            self.max = rtt_ms
+        self.total += rtt_ms
+        if self.last is not None:
+            # Jitter suavizado como no RFC 3550 (J += (|D| - J) / 16)
+            self.jitter += (abs(rtt_ms - self.last) - self.jitter) / 16.0
+        self.last = rtt_ms
+
+        if len(self.samples) < self.size:
+            self.samples.append(rtt_ms)
+        else:
+            evicted = self.samples[self.position]
+            self.samples[self.position] = rtt_ms
+            del self.sorted_window[bisect.bisect_left(self.sorted_window, evicted)]
+        self.position = (self.position + 1) % self.size
+        bisect.insort(self.sorted_window, rtt_ms)
+
+    def add_loss(self):
+        """Registra uma sonda sem resposta."""
+        self.sent += 1
+
+    @property
+    def loss_percent(self):
+        return 100.0 * (self.sent - self.received) / self.sent if self.sent else 0.0
+
+    @property
+    def avg(self):
+        return self.total / self.received if self.received else None
+
+    def percentile(self, p):
+        """Percentil (0-100) da janela atual pelo método do posto mais próximo."""
+        window = self.sorted_window
+        if not window:
+            return None
+        index = min(len(window) - 1, max(0, math.ceil(p / 100.0 * len(window)) - 1))
+        return window[index]
+
+    def summary(self):
+        return {
+            'sent': self.sent, 'received': self.received, 'loss_percent': self.loss_percent,
+            'last': self.last, 'min': self.min if self.received else None, 'max': self.max if self.received else None,
+            'avg': self.avg, 'p50': self.percentile(50), 'p95': self.percentile(95), 'p99': self.percentile(99),
+            'jitter': self.jitter if self.received > 1 else None,
+        }
+
+
+def icmp_available():
+    """Indica se o eco ICMP sem privilégios está disponível neste sistema."""
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            return bool(ctypes.windll.iphlpapi.IcmpCreateFile)
+        except (OSError, AttributeError):
+            return False
+    try:
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP).close()
+        return True
+    except OSError:
+        return False # Linux: fora de net.ipv4.ping_group_range
+
+
+def _icmp_checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class _WindowsIcmp:
+    """Eco ICMP via IcmpSendEcho (iphlpapi.dll), que não exige administrador."""
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+        self.iphlpapi = ctypes.windll.iphlpapi
+        self.iphlpapi.IcmpCreateFile.restype = wintypes.HANDLE
+        self.iphlpapi.IcmpSendEcho.argtypes = [
+            wintypes.HANDLE, wintypes.ULONG, ctypes.c_void_p, wintypes.WORD,
+            ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD, wintypes.DWORD,
+        ]
+        self.iphlpapi.IcmpCloseHandle.argtypes = [wintypes.HANDLE]
+
+    def echo(self, ip, timeout):
+        """Envia um eco (bloqueante) e retorna o RTT em ms ou None."""
+        ctypes = self.ctypes
+        payload = b'WinTools' * 4
+        reply_size = 28 + len(payload) + 8 + 64 # ICMP_ECHO_REPLY + dados + folga
+        reply = ctypes.create_string_buffer(reply_size)
+        address = struct.unpack('<L', socket.inet_aton(ip))[0]
+        handle = self.iphlpapi.IcmpCreateFile()
+        try:
+            count = self.iphlpapi.IcmpSendEcho(handle, address, payload, len(payload), None,
+                                               reply, reply_size, int(timeout * 1000))
+            if not count:
+                return None
+            _, status, rtt = struct.unpack_from('<LLL', reply.raw)
+            return float(max(rtt, 0)) if status == 0 else None
+        finally:
+            self.iphlpapi.IcmpCloseHandle(handle)
+
+
+class ProbeTarget:
+    """Um destino monitorado e suas estatísticas."""
+    def __init__(self, host, method=METHOD_AUTO, port=DEFAULT_TCP_PORT, window=DEFAULT_WINDOW):
+        self.host = host
+        self.method = method
+        self.port = port
+        self.ip = ""
+        self.family = socket.AF_INET
+        self.error = ""
+        self.stats = RttRing(window)
+
+    @property
+    def label(self):
+        return f"{self.host}:{self.port}" if self.method == METHOD_TCP else self.host
+
+    def snapshot(self):
+        row = self.stats.summary()
+        row.update({'label': self.label, 'host': self.host, 'ip': self.ip, 'method': self.method, 'port': self.port, 'error': self.error})
+        return row
+
+
+class ProbeEngine:
+    """Sonda vários destinos em paralelo num único loop asyncio."""
+    def __init__(self, interval=1.0, timeout=1.0, window=DEFAULT_WINDOW):
+        self.interval = interval
+        self.timeout = timeout
+        self.window = window
+        self.targets = []
+        self._icmp = None
+        self._icmp_executor = None
+        self._sequence = os.getpid() & 0xFFFF
+
+    def add_target(self, host, method=METHOD_AUTO, port=DEFAULT_TCP_PORT):
+        """
+        Adiciona um destino. "host:porta" (ou "[ipv6]:porta") usa essa porta em qualquer método
+        e, no automático, força TCP. Levanta ProbeError para porta inválida.
+        """
+        host, port, explicit = split_host_port(host, port)
+        if method == METHOD_AUTO:
+            method = METHOD_TCP if explicit or not icmp_available() else METHOD_ICMP
+        target = ProbeTarget(host, method, port, self.window)
+        self.targets.append(target)
+        return target
+
+    def snapshot(self):
+        return [target.snapshot() for target in self.targets]
+
+    async def _probe_tcp(self, target):
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(target.family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (target.ip, target.port)), self.timeout)
+        except ConnectionRefusedError:
+            pass # O host respondeu (RST)
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            sock.close()
+        return (time.perf_counter() - start) * 1000.0
+
+    async def _probe_icmp_socket(self, target):
+        loop = asyncio.get_running_loop()
+        self._sequence = (self._sequence + 1) & 0xFFFF
+        sequence = self._sequence
+        header = struct.pack('!BBHHH', _ICMP_ECHO_REQUEST, 0, 0, 0, sequence)
+        payload = struct.pack('!d', time.perf_counter()) + b'WinTools'
+        packet = struct.pack('!BBHHH', _ICMP_ECHO_REQUEST, 0, _icmp_checksum(header + payload), 0, sequence) + payload
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        sock.setblocking(False)
+        try:
+            sock.connect((target.ip, 0))
+            start = time.perf_counter()
+            await loop.sock_sendall(sock, packet)
+            deadline = start + self.timeout
+            while (remaining := deadline - time.perf_counter()) > 0:
+                data = await asyncio.wait_for(loop.sock_recv(sock, 1024), remaining)
+                # O kernel entrega só o cabeçalho ICMP (sem IP) e reescreve o identificador
+                if len(data) >= 8 and data[0] == _ICMP_ECHO_REPLY and struct.unpack_from('!H', data, 6)[0] == sequence:
+                    return (time.perf_counter() - start) * 1000.0
+        except (asyncio.TimeoutError, OSError):
+            return None
+        finally:
+            sock.close()
+        return None
+
+    async def _probe_icmp_windows(self, target):
+        if self._icmp is None:
+            self._icmp = _WindowsIcmp()
+            self._icmp_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="wintools-icmp")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._icmp_executor, self._icmp.echo, target.ip, self.timeout)
+
+    async def _run_target(self, target, stop_event):
+        try:
+            addresses = routable_addresses(await default_resolver.resolve_async(target.host), target.port)
+        except socket.gaierror as e:
+            target.error = e.strerror
+            return
+        if target.method == METHOD_ICMP:
+            # O eco ICMP interno é só IPv4: prefere um A a um AAAA que aparece antes
+            addresses = [a for a in addresses if a[0] == socket.AF_INET] or addresses
+        target.family, target.ip = addresses[0]
+        if target.method == METHOD_ICMP:
+            if target.family != socket.AF_INET:
+                target.method = METHOD_TCP # O eco ICMP interno é só IPv4
+                probe = self._probe_tcp
+            else:
+                probe = self._probe_icmp_windows if sys.platform == "win32" else self._probe_icmp_socket
+        else:
+            probe = self._probe_tcp
+
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        while not stop_event.is_set():
+            rtt = await probe(target)
+            if rtt is None:
+                target.stats.add_loss()
+            else:
+                target.stats.add(rtt)
+            next_run += self.interval
+            delay = next_run - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_run = loop.time() # Atrasado (timeout maior que o intervalo): não acumula rajadas
+
+    async def run(self, stop_event):
+        """Sonda todos os destinos até `stop_event` (threading.Event) ser sinalizado."""
+        # Espalha o início das sondas ao longo do intervalo para não disparar todas juntas
+        async def staggered(index, target):
+            await asyncio.sleep(self.interval * index / max(1, len(self.targets)))
+            await self._run_target(target, stop_event)
+        await asyncio.gather(*(staggered(i, t) for i, t in enumerate(self.targets)))
+
+    def run_in_thread(self):
+        """Inicia o motor numa thread própria; retorna o threading.Event que o interrompe."""
+        stop_event = threading.Event()
+        thread = threading.Thread(target=lambda: asyncio.run(self.run(stop_event)), daemon=True, name="wintools-probe")
+        thread.start()
+        return stop_event
@@ -0,0 +1,163 @@
+"""Diálogo do monitor de latência (ping interno) com estatísticas ao vivo por destino."""
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QPlainTextEdit, QPushButton, QLabel,
+    QComboBox, QSpinBox, QDoubleSpinBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+)
+from PySide6.QtGui import QColor
+
+from wintools_core import probe
+
+METHOD_OPTIONS = [
+    ("Automático (ICMP se disponível, senão TCP)", probe.METHOD_AUTO),
+    ("ICMP (Eco)", probe.METHOD_ICMP),
+    ("TCP (Tempo de Conexão)", probe.METHOD_TCP),
+]
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+class LatencyMonitorDialog(QDialog):
+    """Sonda vários destinos ao mesmo tempo e mostra mín/média/p50/p95/p99, jitter e perda."""
+    COLUMNS = ["Destino", "IP", "Método", "Enviados", "Recebidos", "Perda %", "Último",
+               "Mín", "Média", "p50", "p95", "p99", "Jitter"]
+
+    def __init__(self, parent=None, hosts="8.8.8.8"):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Monitor de Latência (Vários Destinos)")
+        self.setMinimumSize(900, 560)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+
+        self.engine = None
+        self.stop_event = None
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.hosts_input = QPlainTextEdit(hosts)
+        self.hosts_input.setPlaceholderText("Um destino por linha (ou separados por vírgula).\nUse host:porta para medir por conexão TCP. Ex: 192.168.0.1, servidor01:3389")
+        self.hosts_input.setMaximumHeight(100)
+        form.addRow("Destinos:", self.hosts_input)
+
+        options_layout = QHBoxLayout()
+        self.method_input = QComboBox()
+        for label, _ in METHOD_OPTIONS:
+            self.method_input.addItem(label)
+        options_layout.addWidget(self.method_input)
+        self.port_input = QSpinBox()
+        self.port_input.setRange(1, 65535)
+        self.port_input.setValue(probe.DEFAULT_TCP_PORT)
+        options_layout.addWidget(QLabel("Porta TCP:"))
+        options_layout.addWidget(self.port_input)
+        self.interval_input = QDoubleSpinBox()
+        self.interval_input.setRange(0.2, 60.0)
+        self.interval_input.setValue(1.0)
+        self.interval_input.setSuffix(" s")
+        options_layout.addWidget(QLabel("Intervalo:"))
+        options_layout.addWidget(self.interval_input)
+        self.timeout_input = QDoubleSpinBox()
+        self.timeout_input.setRange(0.1, 10.0)
+        self.timeout_input.setValue(1.0)
+        self.timeout_input.setSuffix(" s")
+        options_layout.addWidget(QLabel("Timeout:"))
+        options_layout.addWidget(self.timeout_input)
+        form.addRow(options_layout)
+        layout.addLayout(form)
+
+        button_layout = QHBoxLayout()
+        self.start_button = QPushButton("▶️ Iniciar")
+        self.start_button.clicked.connect(self.start_monitor)
+        button_layout.addWidget(self.start_button)
+        self.stop_button = QPushButton("⏹️ Parar")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_monitor)
+        button_layout.addWidget(self.stop_button)
+        layout.addLayout(button_layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel("Pronto. Valores em ms; percentis sobre as últimas "
+                                   f"{probe.DEFAULT_WINDOW} amostras de cada destino.")
+        layout.addWidget(self.status_label)
+
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+        # A tabela é atualizada por amostragem do estado do motor (sem um sinal por resposta)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(500)
+        self.refresh_timer.timeout.connect(self.refresh_table)
+
+    def start_monitor(self):
+        """Cria o motor com os destinos informados e inicia a sondagem em segundo plano."""
+        hosts = [h for h in self.hosts_input.toPlainText().replace(',', '\n').split() if h]
+        if not hosts:
+            QMessageBox.warning(self, "Entrada Inválida", "Informe ao menos um destino.")
+            return
+        method = METHOD_OPTIONS[self.method_input.currentIndex()][1]
+        if method == probe.METHOD_ICMP and not probe.icmp_available():
+            QMessageBox.warning(self, "ICMP Indisponível", "Este sistema não permite eco ICMP sem privilégios. Use TCP ou Automático.")
+            return
+
+        engine = probe.ProbeEngine(interval=self.interval_input.value(), timeout=self.timeout_input.value())
+        try:
+            for host in hosts:
+                engine.add_target(host, method, self.port_input.value())
+        except probe.ProbeError as e:
+            QMessageBox.warning(self, "Entrada Inválida", str(e))
+            return
+        self.engine = engine
+        self.table.setRowCount(len(hosts))
+        for row in range(len(hosts)):
+            for column in range(len(self.COLUMNS)):
+                self.table.setItem(row, column, QTableWidgetItem(""))
+        self.stop_event = self.engine.run_in_thread()
+        self.refresh_timer.start()
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.status_label.setText(f"Monitorando {len(hosts)} destino(s)...")
+
+    def stop_monitor(self):
+        """Interrompe a sondagem (as estatísticas permanecem na tabela)."""
+        if self.stop_event:
+            self.stop_event.set()
+        self.refresh_timer.stop()
+        self.refresh_table()
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.status_label.setText("Monitoramento parado.")
+
+    def refresh_table(self):
+        """Atualiza as células existentes com o estado atual de cada destino."""
+        if not self.engine:
+            return
+        for row, stats in enumerate(self.engine.snapshot()):
+            values = [
+                stats['label'], stats['ip'] or stats['error'], stats['method'].upper(), str(stats['sent']), str(stats['received']),
+                f"{stats['loss_percent']:.1f}", _ms(stats['last']), _ms(stats['min']), _ms(stats['avg']),
+                _ms(stats['p50']), _ms(stats['p95']), _ms(stats['p99']), _ms(stats['jitter']),
+            ]
+            for column, value in enumerate(values):
+                self.table.item(row, column).setText(value)
+            loss_item = self.table.item(row, 5)
+            if stats['error'] or stats['loss_percent'] >= 50:
+                loss_item.setForeground(QColor(210, 70, 70))
+            elif stats['loss_percent'] > 0:
+                loss_item.setForeground(QColor(200, 150, 40))
+            else:
+                loss_item.setForeground(QColor(60, 170, 80))
+
+    def reject(self):
+        """Interrompe a sondagem antes de fechar o diálogo (Fechar, Esc ou X)."""
+        if self.stop_event:
+            self.stop_event.set()
+        self.refresh_timer.stop()
+        super().reject()
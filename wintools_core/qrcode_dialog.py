@@ -0,0 +1,118 @@
+"""Diálogo do QR Code: desenha a matriz direto num QPixmap; arquivo só ao clicar em "Salvar"."""
+import os
+import time
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox, QSpinBox, QFileDialog,
+    QMessageBox, QApplication
+)
+from PySide6.QtGui import QImage, QPixmap
+
+from wintools_core.qrcodes import ERROR_CORRECTION_LEVELS, DEFAULT_ERROR_CORRECTION, QrSettings, default_qr_cache
+
+DEFAULT_MODULE_PIXELS = 10
+
+
+def matrix_to_pixmap(matrix, module_pixels):
+    """Um pixel por módulo (tons de cinza) ampliado sem suavização: bordas nítidas para a leitura."""
+    image = QImage(matrix.pixels, matrix.size, matrix.size, matrix.size, QImage.Format_Grayscale8)
+    side = matrix.size * module_pixels
+    return QPixmap.fromImage(image.scaled(side, side, Qt.IgnoreAspectRatio, Qt.FastTransformation))
+
+
+class QrCodeDialog(QDialog):
+    """Exibe o QR Code com nível de correção e tamanho ajustáveis; salva PNG ou copia para a área de transferência."""
+    def __init__(self, parent, payload, description, cache=default_qr_cache):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - QR Code")
+        self.payload = payload
+        self.cache = cache
+        self.pixmap = None
+
+        layout = QVBoxLayout(self)
+        description_label = QLabel(description)
+        description_label.setWordWrap(True)
+        description_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(description_label)
+
+        self.image_label = QLabel()
+        self.image_label.setAlignment(Qt.AlignCenter)
+        self.image_label.setStyleSheet("background-color: white; padding: 8px;")
+        layout.addWidget(self.image_label, 1)
+
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel("Correção de erros:"))
+        self.correction_input = QComboBox()
+        for code, label in ERROR_CORRECTION_LEVELS:
+            self.correction_input.addItem(f"{code} - {label}", code)
+        self.correction_input.setCurrentIndex([code for code, _ in ERROR_CORRECTION_LEVELS].index(DEFAULT_ERROR_CORRECTION))
+        self.correction_input.currentIndexChanged.connect(self.render)
+        options_layout.addWidget(self.correction_input)
+        options_layout.addWidget(QLabel("Pixels por módulo:"))
+        self.scale_input = QSpinBox()
+        self.scale_input.setRange(2, 30)
+        self.scale_input.setValue(DEFAULT_MODULE_PIXELS)
+        self.scale_input.valueChanged.connect(self.render)
+        options_layout.addWidget(self.scale_input)
+        options_layout.addStretch()
+        layout.addLayout(options_layout)
+
+        self.info_label = QLabel("")
+        layout.addWidget(self.info_label)
+
+        button_layout = QHBoxLayout()
+        self.save_button = QPushButton("💾 Salvar PNG...")
+        self.save_button.clicked.connect(self.save_image)
+        button_layout.addWidget(self.save_button)
+        self.copy_button = QPushButton("📋 Copiar Imagem")
+        self.copy_button.clicked.connect(self.copy_image)
+        button_layout.addWidget(self.copy_button)
+        button_layout.addStretch()
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.render()
+
+    def render(self):
+        settings = QrSettings(error_correction=self.correction_input.currentData())
+        start = time.perf_counter()
+        try:
+            matrix, cached = self.cache.get(self.payload, settings)
+        except ValueError as e: # Conteúdo grande demais para a versão 40 neste nível de correção
+            self.pixmap = None
+            self.image_label.setPixmap(QPixmap())
+            self.image_label.setText(f"Não foi possível gerar o QR Code:\n{e}")
+            self.info_label.setText("")
+            self.save_button.setEnabled(False)
+            self.copy_button.setEnabled(False)
+            return
+        self.pixmap = matrix_to_pixmap(matrix, self.scale_input.value())
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.image_label.setPixmap(self.pixmap)
+        self.save_button.setEnabled(True)
+        self.copy_button.setEnabled(True)
+        origin = "📦 do cache" if cached else "gerado"
+        self.info_label.setText(f"Versão {matrix.version} | {matrix.size}x{matrix.size} módulos | "
+                                f"{self.pixmap.width()} px | {origin} em {elapsed_ms:.1f} ms")
+
+    def save_image(self):
+        if self.pixmap is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar QR Code", os.path.join(os.path.expanduser("~"), "qrcode.png"),
+                                              "Imagem PNG (*.png)")
+        if not path:
+            return
+        if not path.lower().endswith(".png"):
+            path += ".png"
+        if not self.pixmap.save(path, "PNG"):
+            QMessageBox.critical(self, "Erro ao Salvar", f"Não foi possível gravar o arquivo:\n{path}")
+            return
+        self.info_label.setText(f"✅ Salvo em {path}")
+
+    def copy_image(self):
+        if self.pixmap is not None:
+            QApplication.clipboard().setPixmap(self.pixmap)
+            self.info_label.setText("📋 Imagem copiada para a área de transferência.")
@@ -0,0 +1,133 @@
+"""
+QR Codes gerados em memória, com cache LRU pela hash do conteúdo + configurações.
+
+encode() devolve a matriz de módulos (sem imagem do Pillow e sem arquivo temporário);
+o diálogo desenha a matriz direto num QPixmap e só grava um arquivo quando o usuário
+pede "Salvar". Abrir de novo o mesmo QR (ex.: a mesma rede Wi-Fi) vem do cache, sem
+refazer a codificação.
+
+Versões anteriores gravavam qrcode_wintools_<uuid>.png na pasta temporária a cada geração
+e nunca apagavam; cleanup_temp_files() remove essas sobras (chamado ao fechar o WinTools).
+"""
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Nível de correção de erros: (código, descrição). Mais correção = QR maior, mais tolerante a danos
+ERROR_CORRECTION_LEVELS = (
+    ("L", "Baixa (7%)"),
+    ("M", "Média (15%)"),
+    ("Q", "Alta (25%)"),
+    ("H", "Máxima (30%)"),
+)
+DEFAULT_ERROR_CORRECTION = "M" # Suficiente para QR exibido em tela; H só vale para impressos sujeitos a danos
+DEFAULT_BORDER = 4 # Zona de silêncio mínima da especificação (em módulos)
+DEFAULT_CACHE_ENTRIES = 32
+TEMP_FILE_PATTERN = "qrcode_wintools_*.png"
+
+_WIFI_SPECIAL = ('\\', ';', ',', ':', '"')
+
+
+def wifi_payload(ssid, password, encryption):
+    """Conteúdo "WIFI:T:...;S:...;P:...;;" com os caracteres especiais escapados (\\ ; , : ")."""
+    def escape(value):
+        for char in _WIFI_SPECIAL:
+            value = value.replace(char, "\\" + char)
+        return value
+    password_part = f"P:{escape(password)};" if encryption != "nopass" else ""
+    return f"WIFI:T:{encryption};S:{escape(ssid)};{password_part};"
+
+
+@dataclass(frozen=True, slots=True)
+class QrSettings:
+    error_correction: str = DEFAULT_ERROR_CORRECTION
+    border: int = DEFAULT_BORDER
+
+
+@dataclass(frozen=True, slots=True)
+class QrMatrix:
+    """Módulos do QR (com a borda): `pixels` tem size*size bytes, 0 = escuro e 255 = claro (tons de cinza)."""
+    key: str
+    size: int
+    version: int
+    pixels: bytes
+
+
+def qr_key(payload, settings):
+    """Hash do conteúdo + configurações (o conteúdo, que pode conter senha de Wi-Fi, não vira chave em texto)."""
+    raw = json.dumps([payload, settings.error_correction, settings.border], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def encode(payload, settings=QrSettings()):
+    """Codifica `payload` na menor versão que comporta o conteúdo. Requer a biblioteca qrcode."""
+    import qrcode # Carregado só aqui
+    from qrcode import constants
+    from qrcode.exceptions import DataOverflowError
+
+    levels = {"L": constants.ERROR_CORRECT_L, "M": constants.ERROR_CORRECT_M,
+              "Q": constants.ERROR_CORRECT_Q, "H": constants.ERROR_CORRECT_H}
+    qr = qrcode.QRCode(version=None, error_correction=levels[settings.error_correction], border=settings.border)
+    qr.add_data(payload)
+    try:
+        qr.make(fit=True)
+    except (ValueError, DataOverflowError) as e:
+        raise ValueError(f"Conteúdo grande demais para um QR Code com correção {settings.error_correction}; "
+                         "reduza o texto ou escolha um nível de correção menor.") from e
+    matrix = qr.get_matrix()
+    pixels = bytes(0 if dark else 255 for row in matrix for dark in row)
+    return QrMatrix(qr_key(payload, settings), len(matrix), qr.version, pixels)
+
+
+class QrCache:
+    """Matrizes já codificadas, pela hash do conteúdo + configurações; as menos usadas saem primeiro."""
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, payload, settings=QrSettings()):
+        """(matriz, veio_do_cache). Codifica e guarda se ainda não existir."""
+        key = qr_key(payload, settings)
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return matrix, True
+            self.misses += 1
+        matrix = encode(payload, settings)
+        with self._lock:
+            self._entries[key] = matrix
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return matrix, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def cleanup_temp_files(temp_dir=None):
+    """Apaga os PNGs temporários deixados por versões anteriores; retorna quantos foram removidos."""
+    removed = 0
+    for path in glob.glob(os.path.join(temp_dir or tempfile.gettempdir(), TEMP_FILE_PATTERN)):
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass # Aberto em um visualizador: fica para a próxima vez
+    return removed
+
+
+default_qr_cache = QrCache()
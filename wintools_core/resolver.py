@@ -0,0 +1,216 @@
+"""
+Resolvedor DNS compartilhado com cache (TTL + LRU), cache negativo e suporte a IPv6.
+
+Todas as ferramentas de rede do WinTools usam `default_resolver`, de forma que
+verificações repetidas contra os mesmos nomes não consultem o DNS novamente.
+As consultas rodam via getaddrinfo em um pool de threads em segundo plano;
+consultas simultâneas para o mesmo nome compartilham a mesma resolução.
+
+Um nome com vários endereços (ex.: AAAA e A) deve ser tentado em ordem: `connect_any`
+passa ao próximo quando um endereço não tem rota ou recusa, e `routable_addresses`
+descarta os sem rota para quem precisa escolher um só (UDP, sondas repetidas).
+"""
+import ipaddress
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+DEFAULT_TTL = 300.0 # segundos
+DEFAULT_NEGATIVE_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TIMEOUT = 5.0
+
+
+class ResolveError(socket.gaierror):
+    """Falha de resolução (subclasse de socket.gaierror para manter o tratamento existente)."""
+
+
+class Resolver:
+    """Cache de resoluções getaddrinfo com TTL, LRU e cache negativo separado."""
+    def __init__(self, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL, max_entries=DEFAULT_MAX_ENTRIES, workers=8):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._positive = OrderedDict() # (host, família) -> (expira_em, [(família, ip), ...])
+        self._negative = OrderedDict() # (host, família) -> (expira_em, mensagem)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wintools-dns")
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Contadores do cache (para diagnóstico/telemetria)."""
+        with self._lock:
+            return {
+                'hits': self.hits, 'misses': self.misses, 'negative_hits': self.negative_hits,
+                'evictions': self.evictions, 'entries': len(self._positive), 'negative_entries': len(self._negative),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._positive.clear()
+            self._negative.clear()
+
+    def _lookup_cache(self, key):
+        """Consulta os caches; retorna (endereços, erro) ou None se precisar resolver. Chamar com o lock."""
+        now = time.monotonic()
+        entry = self._positive.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._positive.move_to_end(key)
+                self.hits += 1
+                return entry[1], None
+            del self._positive[key]
+        entry = self._negative.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self.negative_hits += 1
+                return None, entry[1]
+            del self._negative[key]
+        return None
+
+    def _store(self, cache, key, value, ttl):
+        cache[key] = (time.monotonic() + ttl, value)
+        cache.move_to_end(key)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+            self.evictions += 1
+
+    def _getaddrinfo(self, key):
+        host, family = key
+        try:
+            infos = socket.getaddrinfo(host, None, family, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                # EAI_AGAIN é falha temporária do servidor DNS: não vale a pena lembrar
+                if e.errno != socket.EAI_AGAIN:
+                    self._store(self._negative, key, e.strerror, self.negative_ttl)
+            raise ResolveError(e.errno, f"Não foi possível resolver o hostname/IP: {host} ({e.strerror})") from None
+        except ValueError as e: # UnicodeError do IDNA (rótulo vazio ou com mais de 63 caracteres), caractere nulo
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._store(self._negative, key, f"nome inválido: {e}", self.negative_ttl)
+            raise ResolveError(socket.EAI_NONAME, f"Não foi possível resolver o hostname/IP: {host} (nome inválido: {e})") from None
+        except BaseException:
+            with self._lock:
+                self._inflight.pop(key, None)
+            raise
+        addresses = []
+        for info_family, _, _, _, sockaddr in infos:
+            address = (info_family, sockaddr[0])
+            if address not in addresses:
+                addresses.append(address)
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._store(self._positive, key, addresses, self.ttl)
+        return addresses
+
+    def submit(self, host, family=socket.AF_UNSPEC):
+        """
+        Inicia (ou reaproveita) a resolução em segundo plano e retorna um Future
+        com a lista [(família, ip), ...]. Resultados em cache retornam um Future já concluído.
+        """
+        key = (host.strip().lower(), family)
+        literal = _literal_address(key[0], family)
+        with self._lock:
+            cached = literal if literal is not None else self._lookup_cache(key)
+            if cached is None:
+                future = self._inflight.get(key)
+                if future is None:
+                    self.misses += 1
+                    future = self._executor.submit(self._getaddrinfo, key)
+                    self._inflight[key] = future
+                return future
+        future = Future()
+        addresses, error = cached
+        if error is not None:
+            future.set_exception(ResolveError(socket.EAI_NONAME, f"Não foi possível resolver o hostname/IP: {host} ({error})"))
+        else:
+            future.set_result(addresses)
+        return future
+
+    def resolve(self, host, family=socket.AF_UNSPEC, timeout=DEFAULT_TIMEOUT):
+        """Resolve o host (usando o cache) e retorna [(família, ip), ...]. Lança ResolveError."""
+        try:
+            return self.submit(host, family).result(timeout)
+        except FutureTimeoutError:
+            raise ResolveError(socket.EAI_AGAIN, f"Tempo esgotado ao resolver o hostname/IP: {host}")
+
+    async def resolve_async(self, host, family=socket.AF_UNSPEC, timeout=DEFAULT_TIMEOUT):
+        """Versão asyncio de resolve(), sem bloquear o loop de eventos."""
+        import asyncio # Só quem já roda um loop paga a importação (o modo linha de comando não precisa)
+        try:
+            # shield: o cancelamento por timeout não deve cancelar a resolução compartilhada
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(self.submit(host, family))), timeout)
+        except asyncio.TimeoutError:
+            raise ResolveError(socket.EAI_AGAIN, f"Tempo esgotado ao resolver o hostname/IP: {host}")
+
+
+def _literal_address(host, family):
+    """Endereços IP literais não passam pelo DNS nem ocupam o cache."""
+    try:
+        address = ipaddress.ip_address(host.split('%', 1)[0])
+    except ValueError:
+        return None
+    address_family = socket.AF_INET6 if address.version == 6 else socket.AF_INET
+    if family not in (socket.AF_UNSPEC, address_family):
+        return None
+    return [(address_family, host)], None
+
+
+def routable_addresses(addresses, port=53):
+    """
+    Os endereços com rota neste computador, na ordem original (ex.: AAAA sem rota IPv6 sai).
+    O connect() de um socket UDP só consulta a tabela de rotas, sem enviar nada. Se nenhum
+    tiver rota, todos são mantidos (o erro aparece na conexão propriamente dita).
+    """
+    usable = []
+    for family, ip in addresses:
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            sock.connect((ip, port))
+        except OSError:
+            continue
+        finally:
+            sock.close()
+        usable.append((family, ip))
+    return usable or list(addresses)
+
+
+def connect_any(addresses, port, timeout):
+    """
+    Conexão TCP bloqueante tentando os endereços em ordem, como o httpprobe: sem rota ou
+    recusa passa ao próximo; timeout encerra (não multiplica a espera pelos endereços).
+    Retorna (socket conectado ou None, ip, erro). Sem sucesso, o erro é a primeira recusa
+    (o host respondeu) ou, não havendo, o último erro.
+    """
+    ip, error = addresses[0][1], None
+    for family, candidate in addresses:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect((candidate, port))
+            return sock, candidate, None
+        except socket.timeout as e:
+            sock.close()
+            return None, candidate, e
+        except OSError as e:
+            sock.close()
+            if not isinstance(error, ConnectionRefusedError):
+                ip, error = candidate, e
+    return None, ip, error
+
+
+# Instância compartilhada por todas as ferramentas de rede
+default_resolver = Resolver()
+
+
+def resolve(host, family=socket.AF_UNSPEC, timeout=DEFAULT_TIMEOUT):
+    """Atalho para default_resolver.resolve()."""
+    return default_resolver.resolve(host, family, timeout)
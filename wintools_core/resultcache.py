@@ -0,0 +1,233 @@
+"""
+Cache dos resultados de comandos lentos e somente leitura (systeminfo, driverquery, ...).
+
+A chave é o comando normalizado (minúsculas, espaços simples). Só entram comandos da
+lista CACHE_POLICIES, cada um com seu TTL, e nunca comandos que alteram o sistema
+(/release, reset, install, ...) ou que exibem segredos (key=clear; ver wintools_core.sensitive).
+
+- Dentro do TTL o resultado é servido na hora.
+- Vencido (até `max_stale`), o resultado antigo ainda é servido na hora enquanto uma
+  nova execução roda em segundo plano e substitui a entrada (stale-while-revalidate).
+- O total guardado respeita `max_bytes`; as entradas menos usadas saem primeiro (LRU).
+- Uma única entrada não passa de `max_entry_bytes`: capture() acumula a saída conforme ela
+  chega e, ao passar do limite, descarta o que já leu e deixa o resultado fora do cache.
+"""
+import io
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from wintools_core.runner import STDERR, STDOUT
+from wintools_core.sensitive import reveals_secrets
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_MAX_STALE = 24 * 3600.0 # Depois disso a entrada é descartada em vez de servida
+
+# (prefixo do comando normalizado, TTL em segundos)
+CACHE_POLICIES = (
+    ("systeminfo", 3600.0),
+    ("driverquery", 1800.0),
+    ("winget list", 600.0),
+    ("netsh wlan show all", 120.0),
+)
+
+# Palavras que indicam comando que altera o sistema: nunca entram no cache
+_MUTATING_PATTERN = re.compile(
+    r"(?:^|\s)(?:/release|/renew|/flushdns|/registerdns|reset|install|uninstall|upgrade|update|"
+    r"delete|remove|add|set|-d|/d)(?=\s|$)"
+)
+
+
+def normalize_command(command):
+    """Chave do cache: comandos do Windows não diferenciam maiúsculas, e espaços extras não importam."""
+    return " ".join(command.split()).lower()
+
+
+def _utf8_size(text):
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def is_mutating(command):
+    return bool(_MUTATING_PATTERN.search(normalize_command(command)))
+
+
+def policy_ttl(command):
+    """TTL do comando, ou None se ele não deve ser guardado."""
+    key = normalize_command(command)
+    if _MUTATING_PATTERN.search(key) or reveals_secrets(key):
+        return None
+    for prefix, ttl in CACHE_POLICIES:
+        if key == prefix or key.startswith(prefix + " "):
+            return ttl
+    return None
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    key: str
+    stdout: str
+    stderr: str
+    returncode: int
+    duration_s: float
+    stored_at: float # time.time()
+    expires_at: float
+    size: int # bytes (UTF-8)
+    hits: int = 0
+
+    @property
+    def age(self):
+        return time.time() - self.stored_at
+
+
+class ResultCache:
+    """Resultados por comando normalizado, com TTL, revalidação em segundo plano e limite total de memória."""
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_stale=DEFAULT_MAX_STALE, max_entry_bytes=None):
+        self.max_bytes = max_bytes
+        # Uma saída gigante não pode expulsar todo o resto
+        self.max_entry_bytes = max_bytes // 4 if max_entry_bytes is None else max_entry_bytes
+        self.max_stale = max_stale
+        self.total_bytes = 0
+        self._entries = OrderedDict() # chave -> CacheEntry (mais recente no fim)
+        self._revalidating = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def is_cacheable(self, command):
+        return policy_ttl(command) is not None
+
+    def lookup(self, command):
+        """(entrada, ainda_válida) ou None. Entradas vencidas há mais de `max_stale` são descartadas."""
+        key = normalize_command(command)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now > entry.expires_at + self.max_stale:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+            return entry, now <= entry.expires_at
+
+    def peek(self, command):
+        """Entrada atual (sem contar como acesso), ou None."""
+        with self._lock:
+            return self._entries.get(normalize_command(command))
+
+    def put(self, command, stdout, stderr, returncode, duration_s):
+        """Guarda um resultado bem-sucedido; retorna a entrada ou None se o comando/resultado não se qualifica."""
+        ttl = policy_ttl(command)
+        if ttl is None or returncode != 0:
+            return None
+        size = _utf8_size(stdout) + _utf8_size(stderr)
+        if size > self.max_entry_bytes:
+            return None
+        key = normalize_command(command)
+        now = time.time()
+        entry = CacheEntry(key, stdout, stderr, returncode, duration_s, now, now + ttl, size)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def _remove(self, key):
+        self.total_bytes -= self._entries.pop(key).size
+
+    def invalidate(self, command):
+        with self._lock:
+            key = normalize_command(command)
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.total_bytes, 'hits': self.hits, 'misses': self.misses}
+
+    def capture(self, command, runner):
+        """
+        Encadeia nos callbacks do CommandRunner (ainda não iniciado) a gravação do resultado no cache.
+        Chame depois de configurar os próprios callbacks (ex.: CommandRunnerBridge.attach).
+        Passando de `max_entry_bytes`, a saída acumulada é liberada na hora e o resultado não é guardado.
+        """
+        if not self.is_cacheable(command):
+            return runner
+        buffers = {STDOUT: io.StringIO(), STDERR: io.StringIO()}
+        size = 0
+        lock = threading.Lock() # stdout e stderr chegam por threads de leitura diferentes
+        on_output, on_finished = runner.on_output, runner.on_finished
+
+        def output(stream, text):
+            nonlocal buffers, size
+            with lock:
+                if buffers is not None:
+                    size += _utf8_size(text)
+                    if size > self.max_entry_bytes:
+                        buffers = None
+                    else:
+                        buffers[STDOUT if stream == STDOUT else STDERR].write(text)
+            if on_output:
+                on_output(stream, text)
+
+        def finished(finished_runner):
+            if buffers is not None and not finished_runner.cancelled and not finished_runner.error:
+                self.put(command, buffers[STDOUT].getvalue(), buffers[STDERR].getvalue(),
+                         finished_runner.returncode, finished_runner.elapsed)
+            if on_finished:
+                on_finished(finished_runner)
+
+        runner.on_output = output
+        runner.on_finished = finished
+        return runner
+
+    def revalidate(self, command, runner_factory, on_done=None, submit=None):
+        """
+        Executa o comando em segundo plano e substitui a entrada. Uma revalidação por comando de cada vez.
+        `on_done(entrada nova ou None)` é chamado na thread do runner. Retorna False se já havia uma em curso.
+        `submit(runner)` inicia o runner (ex.: como tarefa no JobManager, respeitando os limites da
+        categoria); sem ele, runner.start().
+        """
+        key = normalize_command(command)
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+
+        def finished(runner):
+            with self._lock:
+                self._revalidating.discard(key)
+            if on_done:
+                entry = self.peek(command) if not runner.error and runner.returncode == 0 else None
+                try:
+                    on_done(entry)
+                except RuntimeError: # Janela que pediu a revalidação já foi destruída
+                    pass
+
+        runner = runner_factory()
+        runner.on_output = None
+        runner.on_finished = finished
+        self.capture(command, runner)
+        if submit is None:
+            runner.start()
+        else:
+            submit(runner)
+        return True
+
+
+default_cache = ResultCache()
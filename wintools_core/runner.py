@@ -0,0 +1,210 @@
+"""
+Execução de comandos em segundo plano com saída incremental.
+
+O CommandRunner inicia o processo filho, lê stdout e stderr em threads próprias
+e entrega cada pedaço decodificado assim que é produzido, sem bloquear quem chamou.
+Cada leitura cai num buffer pré-alocado (reaproveitado a cada pedaço); os bytes originais
+podem ser guardados sem perdas (`on_raw`) e a codificação é detectada por fluxo
+(BOM, sonda UTF-8 ou página de código do console; ver wintools_core.codepage).
+"""
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from wintools_core.codepage import AutoDecoder
+from wintools_core.telemetry import default_telemetry
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class CommandRunner:
+    """
+    Executa um comando de forma não bloqueante.
+    `on_output(stream, texto)` é chamado a cada pedaço lido; `on_finished(runner)` uma única vez ao final.
+    `on_raw(stream, bytes)` recebe os bytes originais (um memoryview válido só durante a chamada).
+    Os callbacks rodam nas threads de leitura — quem usa Qt deve repassá-los via Signal.
+    Com `encoding=None` a codificação é detectada; uma codificação informada desliga a detecção.
+    Ao terminar, a execução (tempo, status, código e bytes lidos) é registrada em `telemetry`.
+    """
+    def __init__(self, command, shell=True, encoding=None, timeout=None, on_output=None, on_finished=None,
+                 telemetry=default_telemetry, on_raw=None):
+        self.command = command
+        self.shell = shell
+        self.encoding = encoding
+        self.timeout = timeout
+        self.on_output = on_output
+        self.on_finished = on_finished
+        self.on_raw = on_raw
+        self.decoders = {STDOUT: AutoDecoder(encoding), STDERR: AutoDecoder(encoding)}
+
+        self.process = None
+        self.returncode = None
+        self.error = None # Mensagem de erro quando o processo não pôde ser iniciado
+        self.timed_out = False
+        self.cancelled = False
+        self.started_at = None
+        self.finished_at = None
+        self.stdout_bytes = 0
+        self.stderr_bytes = 0
+        self.telemetry = telemetry
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def running(self):
+        return self.started_at is not None and self.finished_at is None
+
+    @property
+    def detected_encoding(self):
+        """Codificação usada na saída (ex.: "utf-8 (sonda UTF-8)"); vazio se nada foi lido."""
+        return self.decoders[STDOUT].describe() or self.decoders[STDERR].describe()
+
+    @property
+    def elapsed(self):
+        """Tempo decorrido (em segundos) desde o início da execução."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def start(self):
+        """Inicia o processo e as threads de leitura; retorna imediatamente (não faz nada se já cancelado)."""
+        with self._lock:
+            if self.started_at is not None:
+                return self
+            self.started_at = time.monotonic()
+        kwargs = popen_options()
+        try:
+            self.process = subprocess.Popen(
+                self.command, shell=self.shell,
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                **kwargs
+            )
+        except FileNotFoundError:
+            name = self.command.split()[0] if isinstance(self.command, str) else self.command[0]
+            self._finish(error=f"Erro: O comando '{name}' não foi encontrado no PATH.")
+            return self
+        except Exception as e:
+            self._finish(error=f"Erro inesperado ao executar o comando:\n{e}")
+            return self
+
+        readers = [
+            threading.Thread(target=self._read_stream, args=(self.process.stdout, STDOUT), daemon=True),
+            threading.Thread(target=self._read_stream, args=(self.process.stderr, STDERR), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        threading.Thread(target=self._wait, args=(readers,), daemon=True).start()
+        return self
+
+    def _read_stream(self, stream, name):
+        decoder = self.decoders[name]
+        view = memoryview(bytearray(READ_CHUNK_SIZE)) # Mesmo buffer para todas as leituras deste fluxo
+        try:
+            while count := stream.readinto1(view):
+                chunk = view[:count]
+                if name == STDOUT:
+                    self.stdout_bytes += count
+                else:
+                    self.stderr_bytes += count
+                if self.on_raw:
+                    self.on_raw(name, chunk)
+                text = decoder.decode(chunk)
+                if text and self.on_output:
+                    self.on_output(name, text)
+            text = decoder.decode(b"", final=True)
+            if text and self.on_output:
+                self.on_output(name, text)
+        finally:
+            stream.close()
+
+    def _wait(self, readers):
+        try:
+            self.process.wait(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self.timed_out = True
+            self._kill_tree()
+            self.process.wait()
+        for reader in readers:
+            reader.join()
+        error = None
+        if self.timed_out:
+            error = f"Erro: O comando excedeu o tempo limite de {self.timeout:g} segundos (Timeout)."
+        self._finish(returncode=self.process.returncode, error=error)
+
+    def _finish(self, returncode=None, error=None):
+        with self._lock:
+            if self.finished_at is not None:
+                return
+            self.returncode = returncode
+            self.error = error
+            self.finished_at = time.monotonic()
+        try:
+            if self.telemetry is not None:
+                self.telemetry.record_runner(self)
+            if self.on_finished:
+                self.on_finished(self)
+        finally:
+            self._done.set()
+
+    def wait(self, timeout=None):
+        """Bloqueia até o fim da execução (inclusive o on_finished); retorna False se `timeout` esgotar."""
+        return self._done.wait(timeout)
+
+    def cancel(self, force=False):
+        """
+        Solicita o encerramento do processo (force=True encerra a árvore inteira imediatamente).
+        Antes do start() (ex.: tarefa ainda na fila), o runner termina como cancelado sem executar.
+        """
+        with self._lock:
+            not_started = self.started_at is None
+            if not_started:
+                self.cancelled = True
+                self.started_at = time.monotonic()
+        if not_started:
+            self._finish()
+            return
+        if not self.running or self.process is None:
+            return
+        self.cancelled = True
+        # No Windows o filho do cmd.exe não recebe o término do shell, então a árvore é sempre encerrada
+        if force or sys.platform == "win32":
+            self._kill_tree()
+        else:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+            except OSError:
+                pass
+
+    def _kill_tree(self):
+        kill_process_tree(self.process)
+
+
+def popen_options():
+    """Argumentos do Popen para processos sem janela que podem ser encerrados com seus filhos."""
+    if sys.platform == "win32":
+        return {'creationflags': subprocess.CREATE_NO_WINDOW}
+    return {'start_new_session': True} # Permite encerrar toda a árvore de processos
+
+
+def kill_process_tree(process):
+    """Encerra o processo e seus filhos (o shell costuma ter filhos, como winget ou ping)."""
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ['taskkill', '/T', '/F', '/PID', str(process.pid)],
+                capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    try:
+        process.kill()
+    except OSError:
+        pass
@@ -0,0 +1,15 @@
+"""
+Comandos cuja saída expõe segredos (ex.: a senha de um perfil Wi-Fi com `key=clear`).
+
+A saída deles é exibida normalmente, mas nunca é guardada: nem no cache de resultados
+(resultcache) nem no histórico de saídas (history), que a comprimiria e indexaria para busca.
+"""
+import re
+
+# Opções que fazem o comando imprimir senhas/chaves em texto puro
+_SECRET_PATTERN = re.compile(r"(?:^|\s)key=clear(?=[\s\"']|$)")
+
+
+def reveals_secrets(command):
+    """True se a saída de `command` pode conter senhas em texto puro."""
+    return bool(_SECRET_PATTERN.search(" ".join(command.split()).lower()))
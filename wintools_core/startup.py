@@ -0,0 +1,88 @@
+"""
+Medição das fases de inicialização do WinTools (importações, QApplication, MainWindow, tema e 1ª pintura).
+
+Ativada pela variável de ambiente WINTOOLS_STARTUP_PROFILE:
+- "1": imprime o relatório no stderr após a primeira pintura da janela;
+- caminho terminado em ".json": grava o relatório nesse arquivo.
+Com WINTOOLS_STARTUP_EXIT=1 a aplicação fecha logo após a primeira pintura
+(usado por benchmarks/bench_startup.py). Este módulo não importa nada pesado:
+ele é o primeiro import do WinTools.py para marcar a origem do relógio.
+"""
+import functools
+import os
+import sys
+import time
+
+PROFILE_ENV = "WINTOOLS_STARTUP_PROFILE"
+EXIT_ENV = "WINTOOLS_STARTUP_EXIT"
+
+
+class StartupProfile:
+    """Fases (início/fim em ms desde a origem) registradas até a primeira pintura."""
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases = {} # nome -> [início_ms, fim_ms]
+        self.marks = {} # nome -> ms
+        self.finished = False
+
+    def _now(self):
+        return (time.perf_counter() - self.origin) * 1000.0
+
+    def begin(self, name):
+        if not self.finished:
+            self.phases[name] = [self._now(), None]
+
+    def end(self, name):
+        if not self.finished and name in self.phases:
+            self.phases[name][1] = self._now()
+
+    def timed(self, name):
+        """Decorador: mede a primeira chamada da função enquanto a inicialização não terminou."""
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if self.finished or name in self.phases:
+                    return function(*args, **kwargs)
+                self.begin(name)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.end(name)
+            return wrapper
+        return decorator
+
+    def mark(self, name):
+        """Registra um instante (ex.: primeira pintura); "first_paint" encerra a medição."""
+        if self.finished:
+            return
+        self.marks[name] = self._now()
+        if name == "first_paint":
+            self.finished = True
+
+    def report(self):
+        phases = {name: round(end - start, 2) for name, (start, end) in self.phases.items() if end is not None}
+        marks = {name: round(value, 2) for name, value in self.marks.items()}
+        return {'phases_ms': phases, 'marks_ms': marks, 'total_ms': marks.get('first_paint')}
+
+    def format_report(self):
+        report = self.report()
+        lines = ["--- WinTools: Tempo de Inicialização ---"]
+        for name, value in report['phases_ms'].items():
+            lines.append(f"{name:<20} {value:>9.1f} ms")
+        for name, value in report['marks_ms'].items():
+            lines.append(f"{name + ' (em)':<20} {value:>9.1f} ms")
+        return "\n".join(lines)
+
+    def emit(self):
+        """Entrega o relatório conforme WINTOOLS_STARTUP_PROFILE; retorna True se deve encerrar (WINTOOLS_STARTUP_EXIT)."""
+        target = os.environ.get(PROFILE_ENV, "")
+        if target.lower().endswith(".json"):
+            import json
+            with open(target, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, indent=2)
+        elif target:
+            print(self.format_report(), file=sys.stderr)
+        return os.environ.get(EXIT_ENV) == "1"
+
+
+startup_profile = StartupProfile()
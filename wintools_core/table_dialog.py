@@ -0,0 +1,273 @@
+"""Diálogo de saída em tabela (ordenar, filtrar, copiar e exportar) para comandos com `/fo csv`."""
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QSortFilterProxyModel, QTimer, Signal
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QLineEdit, QComboBox, QTableView,
+    QHeaderView, QFileDialog, QMessageBox, QApplication, QAbstractItemView
+)
+from PySide6.QtGui import QAction, QKeySequence
+
+from wintools_core.csvtable import CsvRowStream, export_csv, export_json, sort_key_for
+from wintools_core.runner import CommandRunner, STDERR
+
+
+class CsvTableModel(QAbstractTableModel):
+    """Modelo sobre listas de str: as células só viram QVariant quando a view pede (linhas visíveis)."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.header = []
+        self.rows = []
+        self.search_text = [] # Linha inteira em minúsculas, para o filtro "todas as colunas"
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.header)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole or role == Qt.ToolTipRole:
+            return self.rows[index.row()][index.column()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self.header):
+            return self.header[section]
+        return None
+
+    def set_header(self, header):
+        self.beginResetModel()
+        self.header = list(header)
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.search_text.extend('\t'.join(row).casefold() for row in rows)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Ordena em Python com uma chave por linha (numérica quando a coluna inteira é numérica)."""
+        if not 0 <= column < len(self.header) or not self.rows:
+            return
+        key = sort_key_for([row[column] for row in self.rows])
+        self.layoutAboutToBeChanged.emit()
+        order_map = sorted(range(len(self.rows)), key=lambda i: key(self.rows[i][column]), reverse=order == Qt.DescendingOrder)
+        position = [0] * len(order_map)
+        for new_row, old_row in enumerate(order_map):
+            position[old_row] = new_row
+        self.rows = [self.rows[i] for i in order_map]
+        self.search_text = [self.search_text[i] for i in order_map]
+        old_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(old_indexes, [self.index(position[i.row()], i.column()) for i in old_indexes])
+        self.layoutChanged.emit()
+
+
+class RowFilterProxy(QSortFilterProxyModel):
+    """Filtro por substring (sem regex) em uma coluna ou na linha inteira."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.needle = ""
+        self.column = -1
+
+    def set_filter(self, text, column=-1):
+        self.needle = text.casefold()
+        self.column = column
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.needle:
+            return True
+        model = self.sourceModel()
+        if self.column < 0:
+            return self.needle in model.search_text[source_row]
+        return self.needle in model.rows[source_row][self.column].casefold()
+
+
+class _RunnerBridge(QObject):
+    output_received = Signal(str, str)
+    finished = Signal(object)
+
+
+class TableOutputDialog(QDialog):
+    """Executa o comando com `/fo csv` e mostra o resultado numa tabela que cresce em tempo real."""
+    def __init__(self, parent, title, command, transpose=False):
+        super().__init__(parent)
+        self.setWindowTitle(f"WinTools - {title} (Tabela)")
+        self.setMinimumSize(900, 600)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+        self.title = title
+        self.command_executed = command
+
+        self.stream = CsvRowStream(transpose=transpose)
+        self.pending_rows = []
+        self.stderr_text = ""
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"Comando Executado: {command}"))
+
+        filter_layout = QHBoxLayout()
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtrar...")
+        self.filter_input.textChanged.connect(lambda: self.filter_timer.start())
+        filter_layout.addWidget(self.filter_input)
+        self.filter_column = QComboBox()
+        self.filter_column.addItem("Todas as colunas")
+        self.filter_column.currentIndexChanged.connect(self.apply_filter)
+        filter_layout.addWidget(self.filter_column)
+        layout.addLayout(filter_layout)
+
+        self.model = CsvTableModel(self)
+        self.proxy = RowFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.view = QTableView()
+        self.view.setModel(self.proxy)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectItems)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.verticalHeader().setDefaultSectionSize(22)
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        # Ordenação feita pelo modelo (uma chave por linha), não pelo proxy (comparações célula a célula)
+        self.view.horizontalHeader().setSectionsClickable(True)
+        self.view.horizontalHeader().setSortIndicatorShown(True)
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.view.horizontalHeader().sortIndicatorChanged.connect(self.model.sort)
+        copy_action = QAction(self.view)
+        copy_action.setShortcut(QKeySequence.Copy)
+        copy_action.triggered.connect(self.copy_selection)
+        self.view.addAction(copy_action)
+        layout.addWidget(self.view)
+
+        self.status_label = QLabel("⏳ Executando...")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        copy_button = QPushButton("📋 Copiar Seleção")
+        copy_button.clicked.connect(self.copy_selection)
+        button_layout.addWidget(copy_button)
+        export_button = QPushButton("💾 Exportar (CSV/JSON)")
+        export_button.clicked.connect(self.export_data)
+        button_layout.addWidget(export_button)
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filter)
+
+        # Linhas chegam em pedaços; a tabela recebe lotes a cada 100 ms
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(100)
+        self.flush_timer.timeout.connect(self.flush_pending_rows)
+
+        self.bridge = _RunnerBridge(self)
+        self.bridge.output_received.connect(self.append_output)
+        self.bridge.finished.connect(self.command_finished)
+        self.runner = CommandRunner(command, shell=True, timeout=300,
+                                    on_output=self.bridge.output_received.emit, on_finished=self.bridge.finished.emit)
+
+    def start(self):
+        self.runner.start()
+        return self
+
+    def append_output(self, stream, text):
+        if stream == STDERR:
+            self.stderr_text += text
+            return
+        rows = self.stream.feed(text)
+        self._update_header()
+        if rows:
+            self.pending_rows.extend(rows)
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
+
+    def _update_header(self):
+        if self.stream.header is not None and not self.model.header:
+            self.model.set_header(self.stream.header)
+            self.filter_column.addItems(self.stream.header)
+
+    def flush_pending_rows(self):
+        rows, self.pending_rows = self.pending_rows, []
+        self.model.append_rows(rows)
+        if len(self.model.rows) == len(rows):
+            self.view.resizeColumnsToContents() # Só no primeiro lote (custo proporcional às linhas visíveis)
+        self.update_status()
+
+    def update_status(self, state="⏳ Executando..."):
+        total = len(self.model.rows)
+        visible = self.proxy.rowCount()
+        self.status_label.setText(f"{state} | {total} linha(s)" + (f" ({visible} visível(is))" if visible != total else ""))
+
+    def command_finished(self, runner):
+        self.pending_rows.extend(self.stream.close())
+        self._update_header()
+        self.flush_timer.stop()
+        self.flush_pending_rows()
+        header = self.view.horizontalHeader()
+        if header.sortIndicatorSection() >= 0:
+            self.model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+
+        if runner.cancelled:
+            state = "⏹️ Cancelado"
+        elif runner.error:
+            state = f"❌ {runner.error}"
+        else:
+            state = "✅ Concluído" if runner.returncode == 0 else f"⚠️ Código de saída {runner.returncode}"
+        self.update_status(f"{state} | Tempo: {runner.elapsed:.1f}s")
+        if self.stderr_text.strip() and not self.model.rows:
+            self.status_label.setText(self.status_label.text() + f" | {self.stderr_text.strip()}")
+
+    def apply_filter(self):
+        self.filter_timer.stop()
+        self.proxy.set_filter(self.filter_input.text().strip(), self.filter_column.currentIndex() - 1)
+        self.update_status("✅ Concluído" if not self.runner.running else "⏳ Executando...")
+
+    def copy_selection(self):
+        """Copia as células selecionadas (separadas por tabulação) para a área de transferência."""
+        indexes = sorted(self.view.selectionModel().selectedIndexes(), key=lambda i: (i.row(), i.column()))
+        if not indexes:
+            return
+        lines = []
+        current_row = None
+        for index in indexes:
+            if index.row() != current_row:
+                lines.append([])
+                current_row = index.row()
+            lines[-1].append(index.data() or "")
+        QApplication.clipboard().setText("\n".join("\t".join(cells) for cells in lines))
+
+    def export_data(self):
+        """Exporta o conjunto completo (não só as linhas filtradas) direto do modelo."""
+        if not self.model.header:
+            QMessageBox.information(self, "Exportar", "Ainda não há dados para exportar.")
+            return
+        base_name = self.command_executed.split()[0]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Exportar Tabela", f"{base_name}_{timestamp}.csv",
+            "CSV (*.csv);;JSON (*.json);;Todos os Arquivos (*.*)")
+        if not file_path:
+            return
+        try:
+            if file_path.lower().endswith('.json') or (selected_filter.startswith("JSON") and not file_path.lower().endswith('.csv')):
+                export_json(file_path, self.model.header, self.model.rows)
+            else:
+                export_csv(file_path, self.model.header, self.model.rows)
+            QMessageBox.information(self, "Sucesso", f"{len(self.model.rows)} linha(s) exportada(s) para:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Erro ao Salvar", f"Não foi possível salvar o arquivo:\n{e}")
+
+    def reject(self):
+        """Encerra o comando em execução ao fechar a janela (Fechar, Esc ou X)."""
+        if self.runner.running:
+            self.runner.cancel(force=True)
+        super().reject()
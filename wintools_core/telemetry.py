@@ -0,0 +1,212 @@
+"""
+Telemetria das execuções do WinTools: tempos, status e bytes de cada comando.
+
+Cada execução vira um ExecutionRecord (início/fim, tempo total, status, código de saída,
+bytes de stdout/stderr). Os registros recentes ficam em memória (limitados a
+`max_records`) junto com um histograma de latência por comando; a chave do comando
+descarta argumentos variáveis (hosts, IPs, números), de modo que "ping -n 4 8.8.8.8"
+e "ping -n 4 1.1.1.1" caem no mesmo histograma.
+
+Exportação: export_jsonl() grava os registros em JSON Lines; com a variável de ambiente
+WINTOOLS_TRACE=<arquivo.jsonl> cada execução também é anexada ao arquivo assim que termina.
+"""
+import bisect
+import json
+import os
+import platform
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
+
+TRACE_ENV = "WINTOOLS_TRACE"
+DEFAULT_MAX_RECORDS = 10000
+
+# Tipos de execução
+KIND_COMMAND = "comando" # Processo com saída capturada (CommandRunner)
+KIND_TERMINAL = "terminal" # Comando aberto em um terminal externo (só o disparo é medido)
+KIND_PORT = "porta" # Verificação de porta TCP
+KIND_HTTP = "http"
+KIND_CACHE = "cache" # Resultado servido pelo cache de resultados
+
+# Status
+STATUS_OK = "ok"
+STATUS_ERROR = "erro"
+STATUS_TIMEOUT = "timeout"
+STATUS_CANCELLED = "cancelado"
+
+# Limites superiores (ms) dos baldes do histograma; o último balde é "acima de 300 s"
+BUCKET_BOUNDS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000, 120000, 300000)
+
+_KEY_TOKEN_PATTERN = re.compile(r"^[/-]?[a-z][a-z0-9]*$")
+
+
+def runner_status(runner):
+    """Status de um CommandRunner finalizado."""
+    if runner.cancelled:
+        return STATUS_CANCELLED
+    if runner.timed_out:
+        return STATUS_TIMEOUT
+    if runner.error or runner.returncode != 0:
+        return STATUS_ERROR
+    return STATUS_OK
+
+
+def command_key(command):
+    """Comando sem os argumentos variáveis: mantém o executável, subcomandos e opções (/all, -n, list...)."""
+    tokens = " ".join(str(command).split()).lower().split(" ")
+    kept = [tokens[0]] + [token for token in tokens[1:] if _KEY_TOKEN_PATTERN.match(token)]
+    return " ".join(kept)
+
+
+@dataclass(slots=True)
+class ExecutionRecord:
+    kind: str
+    command: str
+    key: str
+    started_at: float # time.time()
+    ended_at: float = 0.0
+    wall_ms: float = 0.0
+    status: str = STATUS_OK
+    exit_code: int | None = None
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    detail: str = ""
+    machine: str = ""
+    version: str = ""
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Contagem por balde logarítmico, com mínimo, máximo e soma para a média."""
+    counts: list = field(default_factory=lambda: [0] * (len(BUCKET_BOUNDS_MS) + 1))
+    count: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    min_ms: float = float('inf')
+    max_ms: float = 0.0
+    stdout_bytes: int = 0
+
+    def add(self, record):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, record.wall_ms)] += 1
+        self.count += 1
+        self.errors += record.status != STATUS_OK
+        self.total_ms += record.wall_ms
+        self.min_ms = min(self.min_ms, record.wall_ms)
+        self.max_ms = max(self.max_ms, record.wall_ms)
+        self.stdout_bytes += record.stdout_bytes
+
+    def percentile(self, p):
+        """Estimativa do percentil `p` (0-100) por interpolação dentro do balde."""
+        if not self.count:
+            return None
+        target = self.count * p / 100.0
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= target:
+                lower = BUCKET_BOUNDS_MS[index - 1] if index else 0.0
+                upper = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                value = lower + (upper - lower) * (target - cumulative) / bucket_count
+                return min(max(value, self.min_ms), self.max_ms)
+            cumulative += bucket_count
+        return self.max_ms
+
+
+class Telemetry:
+    """Registros recentes e histogramas por (tipo, chave do comando). Seguro entre threads."""
+    def __init__(self, max_records=DEFAULT_MAX_RECORDS, trace_path=None):
+        self.records = deque(maxlen=max_records)
+        self.histograms = {}
+        self.trace_path = trace_path if trace_path is not None else os.environ.get(TRACE_ENV) or None
+        self.version = ""
+        self.machine = platform.node()
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        record.machine = self.machine
+        record.version = self.version
+        if not record.ended_at:
+            record.ended_at = time.time()
+        with self._lock:
+            self.records.append(record)
+            histogram = self.histograms.get((record.kind, record.key))
+            if histogram is None:
+                histogram = self.histograms[(record.kind, record.key)] = LatencyHistogram()
+            histogram.add(record)
+            if self.trace_path:
+                try:
+                    with open(self.trace_path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+                except OSError:
+                    self.trace_path = None # Arquivo inacessível: desativa o trace contínuo em vez de falhar a execução
+        return record
+
+    @contextmanager
+    def span(self, kind, command, key=None):
+        """
+        Mede o bloco `with`; o registro é entregue para o chamador preencher status, código e bytes.
+        Uma exceção não tratada marca o registro como erro (e é propagada).
+        """
+        record = ExecutionRecord(kind, str(command), key or command_key(command), time.time())
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.status = STATUS_ERROR
+            record.detail = record.detail or f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.wall_ms = (time.perf_counter() - start) * 1000.0
+            record.ended_at = record.started_at + record.wall_ms / 1000.0
+            self.record(record)
+
+    def record_runner(self, runner):
+        """Registro de um CommandRunner finalizado (chamado pelo próprio runner)."""
+        status = runner_status(runner)
+        wall_s = runner.elapsed
+        ended_at = time.time()
+        command = runner.command if isinstance(runner.command, str) else " ".join(map(str, runner.command))
+        self.record(ExecutionRecord(
+            KIND_COMMAND, command, command_key(command), ended_at - wall_s, ended_at, wall_s * 1000.0,
+            status, runner.returncode, runner.stdout_bytes, runner.stderr_bytes, runner.error or ""))
+
+    def summary(self):
+        """Linhas por comando, das mais lentas (p90) para as mais rápidas."""
+        with self._lock:
+            items = [(kind, key, histogram) for (kind, key), histogram in self.histograms.items()]
+            rows = [{
+                'kind': kind, 'key': key, 'count': h.count, 'errors': h.errors,
+                'mean_ms': h.total_ms / h.count, 'p50_ms': h.percentile(50), 'p90_ms': h.percentile(90),
+                'p99_ms': h.percentile(99), 'max_ms': h.max_ms, 'stdout_bytes': h.stdout_bytes,
+            } for kind, key, h in items]
+        rows.sort(key=lambda row: row['p90_ms'], reverse=True)
+        return rows
+
+    def recent(self, limit=500):
+        with self._lock:
+            return list(self.records)[-limit:]
+
+    def export_jsonl(self, path):
+        """Grava os registros em memória (um JSON por linha); retorna quantos foram gravados."""
+        with self._lock:
+            records = list(self.records)
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+        return len(records)
+
+    def clear(self):
+        with self._lock:
+            self.records.clear()
+            self.histograms.clear()
+
+
+def format_ms(value):
+    if value is None:
+        return "-"
+    return f"{value / 1000.0:.2f} s" if value >= 1000 else f"{value:.1f} ms"
+
+
+default_telemetry = Telemetry()
@@ -0,0 +1,140 @@
+"""Diálogo de telemetria: resumo por comando (histogramas de latência) e execuções recentes."""
+import os
+from datetime import datetime
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget, QTableWidgetItem,
+    QHeaderView, QTabWidget, QFileDialog, QMessageBox
+)
+from PySide6.QtGui import QColor
+
+from wintools_core.telemetry import default_telemetry, format_ms, STATUS_OK, TRACE_ENV
+
+MAX_RECENT_ROWS = 500
+
+
+class _SortableItem(QTableWidgetItem):
+    """Item que ordena pelo valor numérico (não pelo texto formatado)."""
+    def __init__(self, text, sort_value):
+        super().__init__(text)
+        self.sort_value = sort_value
+
+    def __lt__(self, other):
+        if isinstance(other, _SortableItem):
+            return self.sort_value < other.sort_value
+        return super().__lt__(other)
+
+
+def _number(value, text=None):
+    return _SortableItem(text if text is not None else str(value), value if value is not None else -1)
+
+
+class TelemetryDialog(QDialog):
+    """Tempos por comando (média e percentis) e últimas execuções, com exportação do trace em JSONL."""
+    SUMMARY_COLUMNS = ["Tipo", "Comando", "Execuções", "Erros", "Média", "p50", "p90", "p99", "Máx", "Saída (bytes)"]
+    RECENT_COLUMNS = ["Início", "Tipo", "Comando", "Tempo", "Status", "Código", "Stdout", "Stderr", "Detalhe"]
+
+    def __init__(self, parent=None, telemetry=default_telemetry):
+        super().__init__(parent)
+        self.setWindowTitle("WinTools - Telemetria de Execução")
+        self.setMinimumSize(950, 560)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowMaximizeButtonHint)
+        self.telemetry = telemetry
+
+        layout = QVBoxLayout(self)
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+        layout.addWidget(self.info_label)
+
+        self.tabs = QTabWidget()
+        self.summary_table = self._create_table(self.SUMMARY_COLUMNS)
+        self.tabs.addTab(self.summary_table, "Resumo por Comando")
+        self.recent_table = self._create_table(self.RECENT_COLUMNS)
+        self.tabs.addTab(self.recent_table, f"Execuções Recentes (últimas {MAX_RECENT_ROWS})")
+        layout.addWidget(self.tabs)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("🔄 Atualizar")
+        refresh_button.clicked.connect(self.refresh)
+        button_layout.addWidget(refresh_button)
+        export_button = QPushButton("💾 Exportar Trace (JSONL)")
+        export_button.clicked.connect(self.export_trace)
+        button_layout.addWidget(export_button)
+        clear_button = QPushButton("🧹 Limpar")
+        clear_button.clicked.connect(self.clear)
+        button_layout.addWidget(clear_button)
+        button_layout.addStretch()
+        close_button = QPushButton("Fechar")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.refresh()
+
+    def _create_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        return table
+
+    def refresh(self):
+        summary = self.telemetry.summary()
+        table = self.summary_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(summary))
+        for row, data in enumerate(summary):
+            items = [
+                QTableWidgetItem(data['kind']), QTableWidgetItem(data['key']),
+                _number(data['count']), _number(data['errors']),
+                *(_number(data[name], format_ms(data[name])) for name in ('mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms')),
+                _number(data['stdout_bytes'], f"{data['stdout_bytes']:,}".replace(",", ".")),
+            ]
+            if data['errors']:
+                items[3].setForeground(QColor(210, 70, 70))
+            for column, item in enumerate(items):
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+
+        recent = self.telemetry.recent(MAX_RECENT_ROWS)
+        table = self.recent_table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(recent))
+        for row, record in enumerate(reversed(recent)): # Mais recentes primeiro
+            items = [
+                _number(record.started_at, datetime.fromtimestamp(record.started_at).strftime('%H:%M:%S')),
+                QTableWidgetItem(record.kind), QTableWidgetItem(record.command),
+                _number(record.wall_ms, format_ms(record.wall_ms)), QTableWidgetItem(record.status),
+                _number(record.exit_code, "" if record.exit_code is None else str(record.exit_code)),
+                _number(record.stdout_bytes), _number(record.stderr_bytes), QTableWidgetItem(record.detail),
+            ]
+            if record.status != STATUS_OK:
+                items[4].setForeground(QColor(210, 70, 70))
+            for column, item in enumerate(items):
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+
+        total = sum(data['count'] for data in summary)
+        trace = (f"Trace contínuo: {self.telemetry.trace_path}" if self.telemetry.trace_path
+                 else f"Trace contínuo desativado (defina {TRACE_ENV}=arquivo.jsonl para gravar cada execução).")
+        self.info_label.setText(f"{total} execuções em {len(summary)} comandos nesta sessão | {trace}")
+
+    def export_trace(self):
+        default_name = f"wintools_trace_{datetime.now():%Y%m%d_%H%M%S}.jsonl"
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar Trace", os.path.join(os.path.expanduser("~"), default_name),
+                                              "JSON Lines (*.jsonl);;Todos os Arquivos (*.*)")
+        if not path:
+            return
+        try:
+            count = self.telemetry.export_jsonl(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Erro ao Exportar", f"Não foi possível gravar o arquivo:\n{e}")
+            return
+        QMessageBox.information(self, "Trace Exportado", f"{count} execuções gravadas em:\n{path}")
+
+    def clear(self):
+        self.telemetry.clear()
+        self.refresh()